@@ -0,0 +1,138 @@
+"""AIMD download-delay controller for rate-limited hosts, learned across runs.
+
+``RateLimitBackoffMiddleware`` recovers a rate-limit trip (403 / timeout) with
+a fixed cooldown and then restores the slot's configured delay, so a crawl
+never learns what spacing the host actually sustains. :class:`AimdDelay` keeps
+a learned delay per download slot instead, adjusted the way TCP adjusts its
+window:
+
+* **Additive increase** (of rate): after ``clean_streak`` clean responses in a
+  row, the delay drops by ``step`` seconds, never below ``min_delay``.
+* **Multiplicative decrease**: a trip multiplies the delay by ``backoff``
+  (capped at ``max_delay``) and resets the streak.
+
+So a slot creeps towards the host's real limit while it is quiet and retreats
+fast when it overshoots. The cooldown pause itself is unchanged; the learned
+delay is what the slot resumes at afterwards.
+
+Learned delays are persisted to a small JSON file keyed by host (plus the
+egress proxy, when there is one -- each IP has its own limit), both as the
+latest value and per hour of day, so the next run starts near the optimum for
+the time it starts (an origin's capacity differs between peak and off-peak).
+"""
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_DELAY = 1.0
+DEFAULT_MAX_DELAY = 300.0
+DEFAULT_STEP = 1.0
+DEFAULT_BACKOFF = 2.0
+DEFAULT_CLEAN_STREAK = 20
+
+
+class AimdDelay:
+    """Per-key learned delays (see the module docstring).
+
+    Keys are opaque strings chosen by the caller (the middleware uses
+    ``host`` or ``host|proxy-host:port``). ``hour`` is injectable for tests.
+    """
+
+    def __init__(self, min_delay=DEFAULT_MIN_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                 step=DEFAULT_STEP, backoff=DEFAULT_BACKOFF,
+                 clean_streak=DEFAULT_CLEAN_STREAK, state_path=None,
+                 hour=None):
+        self.min_delay = float(min_delay)
+        self.max_delay = max(self.min_delay, float(max_delay))
+        self.step = float(step)
+        self.backoff = max(1.0, float(backoff))
+        self.clean_streak = max(1, int(clean_streak))
+        self.state_path = state_path
+        self._hour = hour or (lambda: time.localtime().tm_hour)
+        self._delays = {}
+        self._streaks = {}
+        # key -> {hour: the delay last in force during that hour of day}
+        self._by_hour = {}
+        self._saved = self._load()
+
+    def _clamp(self, delay):
+        return min(self.max_delay, max(self.min_delay, float(delay)))
+
+    def _set(self, key, delay):
+        self._delays[key] = delay
+        self._by_hour.setdefault(key, {})[str(self._hour())] = round(delay, 3)
+        return delay
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as handle:
+                return json.load(handle).get("keys", {})
+        except (OSError, ValueError) as e:
+            logger.warning("AimdDelay: ignoring unreadable state %s: %s",
+                           self.state_path, e)
+            return {}
+
+    def start(self, key, configured):
+        """The delay ``key`` starts at: the learned value for this hour (else
+        the latest learned value, else ``configured``), clamped."""
+        if key not in self._delays:
+            saved = self._saved.get(key, {})
+            learned = saved.get("by_hour", {}).get(str(self._hour()),
+                                                   saved.get("delay"))
+            self._set(key, self._clamp(
+                learned if learned is not None else configured))
+            self._streaks[key] = 0
+        return self._delays[key]
+
+    def delay(self, key):
+        return self._delays.get(key)
+
+    def on_success(self, key):
+        """Count a clean response; returns the new delay when it just dropped,
+        else ``None``."""
+        if key not in self._delays:
+            return None
+        self._streaks[key] += 1
+        if self._streaks[key] < self.clean_streak:
+            return None
+        self._streaks[key] = 0
+        lowered = self._clamp(self._delays[key] - self.step)
+        if lowered == self._delays[key]:
+            return None
+        return self._set(key, lowered)
+
+    def on_trip(self, key):
+        """Back off after a rate-limit trip; returns the new delay."""
+        if key not in self._delays:
+            return None
+        self._streaks[key] = 0
+        return self._set(key, self._clamp(self._delays[key] * self.backoff))
+
+    def save(self):
+        """Merge this run's learned delays into the state file (atomically)."""
+        if not self.state_path or not self._delays:
+            return
+        keys = dict(self._saved)
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        for key, delay in self._delays.items():
+            entry = dict(keys.get(key, {}))
+            entry["delay"] = round(delay, 3)
+            entry["by_hour"] = {**entry.get("by_hour", {}),
+                                **self._by_hour.get(key, {})}
+            entry["updated_at"] = now
+            keys[key] = entry
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump({"keys": keys}, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        os.replace(tmp, self.state_path)
+        self._saved = keys
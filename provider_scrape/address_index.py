@@ -0,0 +1,187 @@
+"""Offline address-point index for geocoding.
+
+An alternative to the Census batch geocoder for full runs: a user-supplied bulk
+file of address points (an OpenAddresses ``.csv``, or any TIGER/parcel export
+flattened to one row per point) is loaded once into an on-disk SQLite index
+(``scripts/address_index.py``), and ``geocode_enrich.py --backend
+address-index`` then answers lookups in-process -- no network, no WAF,
+predictable throughput.
+
+Rows are keyed with ``geocoding.index_keys``, which is built on the same
+``cache_key`` normalization the geocode cache uses, so an index hit is cached
+exactly like a Census answer (with ``geocode_source="address_index"``). Each
+point is stored under its full address (an ``Exact`` match) and under street +
+zip and street + city + state fallbacks (``Non_Exact``). Any key shared by
+points at different coordinates is marked a tie, the same way Census reports
+an ambiguous address.
+
+Source columns are matched case-insensitively against ``COLUMN_ALIASES``; a
+separate house ``number`` column (OpenAddresses) is prefixed to ``street``.
+"""
+import csv
+import os
+import sqlite3
+
+from provider_scrape import geocoding
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "address_index.sqlite")
+INSERT_CHUNK = 10000
+
+# Our field -> accepted source column names (lowercased).
+COLUMN_ALIASES = {
+    "number": ("number", "house_number", "addr_number"),
+    "street": ("street", "address", "street_address", "fullname"),
+    "city": ("city", "place", "municipality"),
+    "state": ("state", "region"),
+    "zip": ("zip", "postcode", "zipcode", "zip_code"),
+    "latitude": ("latitude", "lat", "y"),
+    "longitude": ("longitude", "lon", "lng", "x"),
+}
+
+
+def _column_map(header):
+    """Map our fields to the source's column names; raises ``ValueError`` if a
+    required one (street, latitude, longitude) is missing."""
+    by_lower = {name.strip().lower(): name for name in header or []}
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in by_lower:
+                columns[field] = by_lower[alias]
+                break
+    missing = [f for f in ("street", "latitude", "longitude") if f not in columns]
+    if missing:
+        raise ValueError("address-point file lacks column(s): %s (header: %s)"
+                         % (", ".join(missing), ", ".join(header or [])))
+    return columns
+
+
+def _point_row(record, columns):
+    """``[id, street, city, state, zip]`` plus ``(lat, lon)`` for one source
+    row, or ``None`` when it has no street or no coordinate."""
+    def value(field):
+        column = columns.get(field)
+        return (record.get(column) or "").strip() if column else ""
+
+    street = value("street")
+    number = value("number")
+    if number and not street.startswith(number):
+        street = "%s %s" % (number, street)
+    latitude, longitude = value("latitude"), value("longitude")
+    if not (street and latitude and longitude):
+        return None
+    return ["", street, value("city"), value("state"), value("zip")], (
+        latitude, longitude)
+
+
+class AddressIndex:
+    """SQLite-backed address-point index (see the module docstring)."""
+
+    def __init__(self, path, create=False):
+        if not create and not os.path.exists(path):
+            raise FileNotFoundError(
+                "address index %s not found; build it with "
+                "scripts/address_index.py" % path)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS address_points ("
+            " key TEXT PRIMARY KEY,"
+            " latitude TEXT, longitude TEXT,"
+            " matched_address TEXT, tie INTEGER NOT NULL DEFAULT 0)"
+            " WITHOUT ROWID")
+        self.conn.commit()
+
+    def add_points(self, points):
+        """Insert ``(row, (latitude, longitude))`` pairs in one transaction.
+
+        A key claimed again at the same coordinates keeps its first point
+        (duplicate rows for one address, e.g. per unit, are common); claimed
+        at different coordinates, exact or fallback, it becomes a tie.
+        """
+        rows = []
+        for row, (latitude, longitude) in points:
+            matched = ", ".join(p for p in row[1:] if p)
+            for _, key in geocoding.index_keys(row):
+                rows.append((key, latitude, longitude, matched))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO address_points"
+                " (key, latitude, longitude, matched_address)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET tie = 1"
+                " WHERE latitude != excluded.latitude"
+                " OR longitude != excluded.longitude", rows)
+
+    def lookup_many(self, rows):
+        """Resolve batch rows; returns ``{id: result}`` shaped like
+        ``geocoding.parse_response_line`` output, one entry per row."""
+        wanted = {}
+        for row in rows:
+            for _, key in geocoding.index_keys(row):
+                wanted[key] = None
+        keys = list(wanted)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            cur = self.conn.execute(
+                "SELECT key, latitude, longitude, matched_address, tie"
+                " FROM address_points WHERE key IN (%s)"
+                % ",".join("?" * len(chunk)), chunk)
+            for key, latitude, longitude, matched, tie in cur:
+                wanted[key] = (latitude, longitude, matched, tie)
+
+        results = {}
+        for row in rows:
+            result = {"id": row[0], "match": "No_Match", "match_type": None,
+                      "matched_address": None, "latitude": None,
+                      "longitude": None}
+            for match_type, key in geocoding.index_keys(row):
+                hit = wanted.get(key)
+                if hit is None:
+                    continue
+                latitude, longitude, matched, tie = hit
+                if tie:
+                    result["match"] = "Tie"
+                else:
+                    result.update(match="Match", match_type=match_type,
+                                  matched_address=matched,
+                                  latitude=latitude, longitude=longitude)
+                break
+            results[row[0]] = result
+        return results
+
+    def count(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM address_points").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def build_index(sources, index_path):
+    """Load address-point CSV file(s) into the index at ``index_path``
+    (created or extended). Returns ``(points_loaded, rows_skipped)``."""
+    index = AddressIndex(index_path, create=True)
+    loaded = skipped = 0
+    try:
+        for source in sources:
+            with open(source, "r", newline="", encoding="utf-8-sig") as handle:
+                reader = csv.DictReader(handle)
+                columns = _column_map(reader.fieldnames)
+                batch = []
+                for record in reader:
+                    point = _point_row(record, columns)
+                    if point is None:
+                        skipped += 1
+                        continue
+                    batch.append(point)
+                    if len(batch) >= INSERT_CHUNK:
+                        index.add_points(batch)
+                        loaded += len(batch)
+                        batch = []
+                index.add_points(batch)
+                loaded += len(batch)
+    finally:
+        index.close()
+    return loaded, skipped
@@ -0,0 +1,311 @@
+"""Shared client for Salesforce Aura (``/s/sfsites/aura``) Apex endpoints.
+
+``kentucky``, ``michigan`` and ``rhode_island`` all talk to Salesforce
+Experience Cloud communities whose Apex methods are called through one Aura
+POST carrying an ``actions`` array. The server runs every action in the array
+and answers with one ``actions[i]`` entry per action -- its own ``state``
+(``SUCCESS`` / ``ERROR`` / ``INCOMPLETE``) and ``returnValue`` -- while the
+HTTP status is a 200 either way.
+
+:class:`AuraClient` packs up to ``batch_size`` independent actions (ZIP
+searches, detail lookups, ...) into one POST -- up to N times fewer round trips
+at the same request rate -- and demultiplexes the answer back to each action's
+own callback:
+
+* a ``SUCCESS`` action calls ``callback(action_result, **cb_kwargs)``. The
+  callback may yield items, requests, or further :class:`AuraAction` objects;
+  the actions yielded while handling one response are packed together into
+  the next batch(es);
+* a failed action alone is re-issued (in a new batch with any other failed
+  actions) up to ``max_retries`` times, then handed to
+  ``errback(reason, **cb_kwargs)``; the other actions in its POST are done;
+* a POST that fails at the transport level (after Scrapy's own retries) hands
+  each of its actions to its errback;
+* a stale framework build id (``fwuid``; Salesforce rotates it on org
+  upgrades and then answers ``aura:clientOutOfSync``) is refreshed **once** for
+  every affected action: the client re-reads it from ``fwuid_url``, parks the
+  affected actions meanwhile, and re-issues them all with the new context.
+
+``batch_size`` defaults to 1 (one action per POST, as before); each spider
+exposes it as ``-a batch=N``. Some orgs enforce a deadline on the whole POST
+(Kentucky's resets requests past ~7s), so raise it with an eye on the
+timeout/reset rate.
+"""
+import json
+import logging
+import re
+from itertools import islice
+from urllib.parse import urlencode
+
+import scrapy
+from scrapy.utils.spider import iterate_spider_output
+
+logger = logging.getLogger(__name__)
+
+APEX_DESCRIPTOR = "aura://ApexActionController/ACTION$execute"
+
+FORM_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
+}
+
+# The event Salesforce answers with once the fwuid in aura.context is stale.
+OUT_OF_SYNC = "clientOutOfSync"
+
+
+def apex_action(classname, method, params, action_id="1;a"):
+    """One ``ApexActionController`` action envelope for the ``actions`` array."""
+    return {
+        "id": action_id,
+        "descriptor": APEX_DESCRIPTOR,
+        "callingDescriptor": "UNKNOWN",
+        "params": {
+            "namespace": "",
+            "classname": classname,
+            "method": method,
+            "params": params,
+            "cacheable": False,
+            "isContinuation": False,
+        },
+    }
+
+
+def aura_body(actions, context, page_uri=None):
+    """URL-encode the Aura form fields for a POST carrying ``actions``."""
+    fields = {
+        "message": json.dumps({"actions": actions}),
+        "aura.context": json.dumps(context),
+    }
+    if page_uri is not None:
+        fields["aura.pageURI"] = page_uri
+    fields["aura.token"] = "null"
+    return urlencode(fields)
+
+
+def load_aura_json(text):
+    """Parse an Aura response body. Error responses come wrapped as
+    ``*/{...}/*ERROR*/``; strip the wrapper before decoding."""
+    text = text.strip()
+    if text.startswith("*/"):
+        text = text[2:]
+    if text.endswith("/*ERROR*/"):
+        text = text[:-len("/*ERROR*/")]
+    return json.loads(text)
+
+
+def extract_fwuid(text):
+    """Extract the framework build id (``fwuid``) from a community page.
+
+    The fwuid is embedded in the page's script tag URLs as URL-encoded JSON
+    and changes with each Salesforce deployment.
+    """
+    # Pattern 1: "fwuid":"<value>" in JSON embedded in the page
+    match = re.search(r'"fwuid"\s*:\s*"([^"]+)"', text)
+    if match:
+        return match.group(1)
+
+    # Pattern 2: URL-encoded fwuid in script src/data-src attributes
+    # e.g., %22fwuid%22%3A%22TOKEN_VALUE%22
+    match = re.search(r'%22fwuid%22%3A%22([^%]+)%22', text)
+    if match:
+        return match.group(1)
+
+    # Pattern 3: fwuid in the auraFW JS URL path segment
+    # e.g., /s/sfsites/auraFW/javascript/TOKEN_VALUE/aura_prod.js
+    match = re.search(r'/auraFW/javascript/([A-Za-z0-9_-]{20,})/', text)
+    if match:
+        return match.group(1)
+
+    return None
+
+
+class AuraAction:
+    """One Apex call waiting to be sent, with where its answer goes."""
+
+    __slots__ = ("classname", "method", "params", "callback", "errback",
+                 "cb_kwargs", "attempt")
+
+    def __init__(self, classname, method, params, callback, errback=None,
+                 cb_kwargs=None):
+        self.classname = classname
+        self.method = method
+        self.params = params
+        self.callback = callback
+        self.errback = errback
+        self.cb_kwargs = cb_kwargs or {}
+        self.attempt = 1
+
+    def __repr__(self):
+        return f"AuraAction({self.method!r}, {self.cb_kwargs!r})"
+
+
+class AuraClient:
+    """Batching Aura client bound to one spider (see the module docstring).
+
+    ``context`` is the ``aura.context`` dict (its ``fwuid`` is updated in
+    place on a refresh); ``request_kwargs`` are passed to every POST.
+    """
+
+    def __init__(self, spider, url, context, page_uri=None, headers=None,
+                 batch_size=1, max_retries=2, fwuid_url=None, max_refreshes=1,
+                 **request_kwargs):
+        self.spider = spider
+        self.url = url
+        self.context = context
+        self.page_uri = page_uri
+        self.headers = {**FORM_HEADERS, **(headers or {})}
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = int(max_retries)
+        self.fwuid_url = fwuid_url
+        self.max_refreshes = int(max_refreshes)
+        self.request_kwargs = request_kwargs
+        self.error_states = 0
+        self.refreshes = 0
+        self._refreshing = False
+        self._parked = []
+
+    @property
+    def _logger(self):
+        return getattr(self.spider, "logger", logger)
+
+    def _inc_stat(self, key, count=1):
+        stats = getattr(getattr(self.spider, "crawler", None), "stats", None)
+        if stats is not None:
+            stats.inc_value(f"aura/{key}", count)
+
+    def action(self, classname, method, params, callback, errback=None, **cb_kwargs):
+        return AuraAction(classname, method, params, callback, errback, cb_kwargs)
+
+    def requests(self, actions, priority=0):
+        """Yield POSTs carrying ``actions`` (any iterable, consumed lazily so a
+        2,800-ZIP sweep isn't built up front), ``batch_size`` per request."""
+        actions = iter(actions)
+        while True:
+            batch = list(islice(actions, self.batch_size))
+            if not batch:
+                return
+            yield self._request(batch, priority)
+
+    def _request(self, batch, priority=0):
+        envelopes = [apex_action(a.classname, a.method, a.params, f"{i};a")
+                     for i, a in enumerate(batch)]
+        self._inc_stat("requests")
+        self._inc_stat("actions", len(batch))
+        return scrapy.Request(
+            self.url,
+            method="POST",
+            body=aura_body(envelopes, self.context, self.page_uri),
+            headers=self.headers,
+            callback=self.parse,
+            errback=self.failed,
+            meta={"aura_actions": batch, "aura_fwuid": self.context.get("fwuid")},
+            dont_filter=True,
+            priority=priority,
+            **self.request_kwargs,
+        )
+
+    def _collect(self, output, pending):
+        """Pass items/requests through; gather AuraActions into ``pending``."""
+        for value in iterate_spider_output(output):
+            if isinstance(value, AuraAction):
+                pending.append(value)
+            else:
+                yield value
+
+    def _give_up(self, action, reason, pending):
+        if action.errback is None:
+            self._logger.warning("Aura: %s %r failed for good: %s",
+                                 action.method, action.cb_kwargs, reason)
+            return
+        yield from self._collect(action.errback(reason, **action.cb_kwargs), pending)
+
+    def parse(self, response):
+        """Demultiplex one POST's answer to its actions' callbacks."""
+        batch = response.meta["aura_actions"]
+        pending = []
+        if OUT_OF_SYNC in response.text:
+            yield from self._stale(batch, response.meta.get("aura_fwuid"), pending)
+            yield from self.requests(pending)
+            return
+        try:
+            results = load_aura_json(response.text).get("actions") or []
+        except ValueError:
+            results = []
+        by_id = {r.get("id"): r for r in results if isinstance(r, dict)}
+        retry = []
+        for i, action in enumerate(batch):
+            result = by_id.get(f"{i};a")
+            if result is None:
+                result = results[i] if i < len(results) else {}
+            state = result.get("state")
+            if state == "SUCCESS":
+                yield from self._collect(
+                    action.callback(result, **action.cb_kwargs), pending)
+                continue
+            self.error_states += 1
+            self._inc_stat("error_states")
+            if action.attempt <= self.max_retries:
+                self._logger.warning(
+                    "Aura: %s %r returned Aura state=%r (attempt %d/%d) -- "
+                    "re-issuing", action.method, action.cb_kwargs, state,
+                    action.attempt, self.max_retries)
+                action.attempt += 1
+                retry.append(action)
+            else:
+                yield from self._give_up(action, f"Aura state={state!r}", pending)
+        yield from self.requests(retry + pending)
+
+    def failed(self, failure):
+        """Transport failure of a whole POST (Scrapy's retries exhausted)."""
+        pending = []
+        for action in failure.request.meta.get("aura_actions", []):
+            yield from self._give_up(action, failure.value, pending)
+        yield from self.requests(pending)
+
+    # --- stale fwuid ------------------------------------------------------ #
+
+    def _stale(self, batch, sent_fwuid, pending):
+        if sent_fwuid != self.context.get("fwuid") and not self._refreshing:
+            # Sent before the last refresh landed: just resend.
+            pending.extend(batch)
+            return
+        self._parked.extend(batch)
+        if self._refreshing:
+            return
+        if not self.fwuid_url or self.refreshes >= self.max_refreshes:
+            yield from self._drop_parked("stale fwuid, no refresh left", pending)
+            return
+        self._refreshing = True
+        self.refreshes += 1
+        self._inc_stat("fwuid_refreshes")
+        self._logger.warning(
+            "Aura: fwuid %s is stale (%s); re-reading it from %s",
+            sent_fwuid, OUT_OF_SYNC, self.fwuid_url)
+        yield scrapy.Request(self.fwuid_url, callback=self._refreshed,
+                             errback=self._refresh_failed, dont_filter=True,
+                             priority=100)
+
+    def _drop_parked(self, reason, pending):
+        parked, self._parked = self._parked, []
+        for action in parked:
+            yield from self._give_up(action, reason, pending)
+
+    def _refreshed(self, response):
+        self._refreshing = False
+        pending = []
+        fwuid = extract_fwuid(response.text)
+        if fwuid is None:
+            self._logger.error("Aura: no fwuid found on %s", response.url)
+            yield from self._drop_parked("stale fwuid, refresh found none", pending)
+        else:
+            self._logger.info("Aura: fwuid refreshed %s -> %s; re-issuing %d "
+                              "action(s)", self.context.get("fwuid"), fwuid,
+                              len(self._parked))
+            self.context["fwuid"] = fwuid
+            pending, self._parked = self._parked, []
+        yield from self.requests(pending)
+
+    def _refresh_failed(self, failure):
+        self._refreshing = False
+        pending = []
+        yield from self._drop_parked(f"fwuid refresh failed: {failure.value}", pending)
+        yield from self.requests(pending)
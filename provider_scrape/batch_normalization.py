@@ -0,0 +1,76 @@
+"""Columnar normalization for spiders that download the whole roster at once.
+
+``california``, ``texas``, ``new_york``, ``illinois`` and ``delaware`` get every
+provider in one CSV/JSON blob, yet each item still went through
+``normalize_item`` on its own in ``NormalizationPipeline`` -- the same
+``"Active"`` status, the same handful of provider types and the same dates
+normalized once per row.
+
+A spider mixing in :class:`BatchNormalizationMixin` passes the items it built
+from the blob through ``self.normalized_batches(items)`` before yielding them.
+Each chunk of ``NORMALIZE_BATCH_SIZE`` items is normalized column by column
+(``normalization.normalize_batch``: every helper runs once per distinct value
+in a column) and remembered in ``spider.prenormalized``; the pipeline then
+skips ``normalize_item`` for those items and only normalizes their
+inspections. The output is identical to the per-item path, and so is the
+pipeline's plan report: the chunks run through the pipeline's
+``NormalizationPlan`` (``spider.normalization_plan``), which counts their steps.
+
+Normalization happens in the spider, before any pipeline, so this is not for
+spiders whose earlier pipelines must see raw values (the incremental manifest,
+checkpoints). ``NORMALIZE_BATCH_SIZE = 0`` (or ``NORMALIZE_ENABLED = False``)
+turns it off: the items are yielded as built.
+"""
+import weakref
+from itertools import islice
+
+import scrapy
+
+from provider_scrape import normalization
+from provider_scrape.pipelines import _field_storage
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+class BatchNormalizationMixin:
+    """Spider-side hook for columnar normalization (see the module docstring).
+
+    Usage:
+        * inherit before ``scrapy.Spider``.
+        * ``yield from self.normalized_batches(items)`` -- ``items`` may be
+          any iterable (a generator over CSV rows is consumed one chunk at a
+          time, so the whole roster isn't held in memory).
+    """
+
+    prenormalized = None  # WeakSet of the items already normalized
+    normalization_plan = None  # set by NormalizationPipeline.open_spider
+
+    def normalized_batches(self, items):
+        settings = getattr(self, "settings", None)
+        size = 0
+        if settings is not None and settings.getbool("NORMALIZE_ENABLED", True):
+            size = settings.getint("NORMALIZE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        if size <= 0:
+            yield from items
+            return
+        if self.prenormalized is None:
+            self.prenormalized = weakref.WeakSet()
+        stats = getattr(getattr(self, "crawler", None), "stats", None)
+        items = iter(items)
+        while True:
+            batch = list(islice(items, size))
+            if not batch:
+                return
+            # Only scrapy Items can be told apart later (dicts aren't
+            # weak-referenceable); anything else is left to the pipeline.
+            scrapy_items = [i for i in batch if isinstance(i, scrapy.Item)]
+            rows = [_field_storage(i) for i in scrapy_items]
+            if self.normalization_plan is not None:
+                self.normalization_plan.run_batch(rows)
+            else:
+                normalization.normalize_batch(rows, self.name)
+            self.prenormalized.update(scrapy_items)
+            if stats is not None:
+                stats.inc_value("normalize/batch/items", len(scrapy_items))
+                stats.inc_value("normalize/batch/batches")
+            yield from batch
@@ -0,0 +1,184 @@
+"""Crash-safe checkpoint for multi-day crawls (Maryland first).
+
+A full Maryland run takes days on a single IP, and a crash, container restart
+or stall-close used to throw all of it away: ``run_spider`` re-ran the crawl
+from the county search. Scrapy's ``JOBDIR`` can't help -- it pickles the
+scheduler queue, but Maryland's pagination requests carry live ASP.NET
+ViewState postbacks bound to a session that is gone after a restart.
+
+So the checkpoint records the crawl's progress at the *spider's* level of
+meaning instead of its requests, in one SQLite file:
+
+* **completed shards** -- (county, facility-type) searches whose pagination
+  chain ran to the end, with the declared/paginated counts for the
+  completeness report. A resumed run doesn't search them again.
+* **pending details** -- providers found on a results page whose item has not
+  been emitted yet: the detail URL and the results-row fields it needs. A
+  resumed run re-issues them directly, no pagination needed.
+* **emitted items** -- every item built so far, raw (before normalization),
+  keyed by the spider's provider id. A resumed run re-emits them first, so the
+  ``-O`` output is again the full snapshot, and skips those providers.
+
+Everything is committed as it happens (WAL), so a kill at any point loses at
+most the in-flight work. A checkpoint older than ``max_age_days`` is discarded
+rather than resumed (an abandoned run must not leak into next week's crawl),
+and the spider clears it once a run finishes normally.
+"""
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Long enough to outlive a multi-day run plus a few restarts; short enough that
+# an abandoned run's progress is never resumed into the next scheduled crawl.
+DEFAULT_MAX_AGE_DAYS = 14
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class CrawlCheckpoint:
+    """SQLite store of one crawl's completed shards, pending details and
+    emitted items (see the module docstring). ``clock`` is injectable for
+    tests."""
+
+    def __init__(self, path, max_age_days=DEFAULT_MAX_AGE_DAYS, clock=time.time):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self._clock = clock
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS checkpoint_meta ("
+            " key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS completed_shards ("
+            " shard TEXT PRIMARY KEY, declared INTEGER, found INTEGER,"
+            " completed_at TEXT);"
+            "CREATE TABLE IF NOT EXISTS pending_details ("
+            " key TEXT PRIMARY KEY, url TEXT NOT NULL, fields TEXT NOT NULL,"
+            " added_at TEXT);"
+            "CREATE TABLE IF NOT EXISTS emitted_items ("
+            " key TEXT PRIMARY KEY, item TEXT NOT NULL, emitted_at TEXT);"
+        )
+        self.conn.commit()
+        started = self._meta("started_at")
+        if started is not None and clock() - float(started) > max_age_days * 86400:
+            logger.warning("Checkpoint %s is older than %d days; starting fresh.",
+                           path, max_age_days)
+            self.clear()
+        elif started is None:
+            self._set_meta("started_at", clock())
+        self._emitted = {row[0] for row in self.conn.execute(
+            "SELECT key FROM emitted_items")}
+
+    def _meta(self, key):
+        row = self.conn.execute(
+            "SELECT value FROM checkpoint_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO checkpoint_meta (key, value) VALUES (?, ?)",
+            (key, str(value)))
+        self.conn.commit()
+
+    def _count(self, table):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    @property
+    def resumable(self):
+        """True when an earlier run left progress to resume from."""
+        return bool(self._emitted) or any(
+            self._count(t) for t in ("completed_shards", "pending_details"))
+
+    def summary(self):
+        return {
+            "shards": self._count("completed_shards"),
+            "pending": self._count("pending_details"),
+            "items": len(self._emitted),
+        }
+
+    # -- shards ----------------------------------------------------------------
+
+    def completed_shards(self):
+        """``{shard: (declared, found)}`` for every completed shard."""
+        return {shard: (declared, found) for shard, declared, found in
+                self.conn.execute(
+                    "SELECT shard, declared, found FROM completed_shards")}
+
+    def complete_shard(self, shard, declared, found):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO completed_shards"
+            " (shard, declared, found, completed_at) VALUES (?, ?, ?, ?)",
+            (shard, declared, found, _now_iso()))
+        self.conn.commit()
+
+    # -- details ---------------------------------------------------------------
+
+    def add_pending(self, entries):
+        """Record ``(key, url, fields)`` detail requests (one transaction)."""
+        now = _now_iso()
+        rows = [(str(key), url, json.dumps(fields, ensure_ascii=False), now)
+                for key, url, fields in entries if str(key) not in self._emitted]
+        if rows:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pending_details"
+                " (key, url, fields, added_at) VALUES (?, ?, ?, ?)", rows)
+            self.conn.commit()
+
+    def pending(self):
+        """``[(key, url, fields)]`` details scheduled but never emitted."""
+        return [(key, url, json.loads(fields)) for key, url, fields in
+                self.conn.execute(
+                    "SELECT key, url, fields FROM pending_details ORDER BY added_at")]
+
+    # -- items -----------------------------------------------------------------
+
+    def has_item(self, key):
+        return key is not None and str(key) in self._emitted
+
+    def record_item(self, key, item):
+        """Store an emitted item and retire its pending detail. A key already
+        stored (e.g. an item re-emitted on resume) is left as is."""
+        if key is None or str(key) in self._emitted:
+            return False
+        key = str(key)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO emitted_items (key, item, emitted_at)"
+            " VALUES (?, ?, ?)",
+            (key, json.dumps(item, ensure_ascii=False, default=str), _now_iso()))
+        self.conn.execute("DELETE FROM pending_details WHERE key = ?", (key,))
+        self.conn.commit()
+        self._emitted.add(key)
+        return True
+
+    def emitted_items(self):
+        """``(key, item dict)`` for every stored item, oldest first."""
+        for key, item in self.conn.execute(
+                "SELECT key, item FROM emitted_items ORDER BY rowid"):
+            try:
+                yield key, json.loads(item)
+            except ValueError:
+                logger.warning("Checkpoint item %r is unreadable; refetching", key)
+                self._emitted.discard(key)
+
+    # -- lifecycle -------------------------------------------------------------
+
+    def clear(self):
+        """Forget all progress (the run finished, or the checkpoint is stale)."""
+        for table in ("completed_shards", "pending_details", "emitted_items",
+                      "checkpoint_meta"):
+            self.conn.execute(f"DELETE FROM {table}")
+        self.conn.commit()
+        self._emitted = set()
+        self._set_meta("started_at", self._clock())
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,842 @@
+"""Scrapy extensions (registered in settings.EXTENSIONS; each is inert unless
+its ``*_ENABLED`` setting is on).
+
+* :class:`ConcurrencyAutotuner` -- finds an origin's throughput knee at run
+  time instead of a hand-tuned ``CONCURRENT_REQUESTS``.
+* :class:`MetricsExporter` -- per-spider/host/proxy latency, status, item and
+  queue metrics as OpenMetrics text, for Prometheus.
+* :class:`StallWatchdog` -- detects a crawl that stopped making progress,
+  dumps where it is stuck, and recovers (closes leaked Playwright pages, or
+  restarts the spider).
+"""
+import asyncio
+import logging
+import os
+import statistics
+import time
+from urllib.parse import urlparse
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_TARGET = "global"
+# Per-window upward drift of the base latency (see the class docstring).
+BASE_LATENCY_DRIFT = 1.02
+# Statuses that count as a failed request for the success rate.
+FAILURE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Download-latency histogram bounds (seconds). Spans the ~1s API hosts up to
+# Maryland's 17-34s detail pages and their 120s timeout.
+DEFAULT_LATENCY_BUCKETS = (0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+# Crawl-stats counters exported as-is: stat key -> (metric family, labels).
+STAT_COUNTERS = {
+    "retry/count": ("scrapy_retries", {}),
+    "retry/max_reached": ("scrapy_retries_exhausted", {}),
+    "ratelimit/backoff/http": ("scrapy_ratelimit_backoffs", {"reason": "http"}),
+    "ratelimit/backoff/timeout": ("scrapy_ratelimit_backoffs", {"reason": "timeout"}),
+    "ratelimit/gave_up/http": ("scrapy_ratelimit_gave_up", {"reason": "http"}),
+    "ratelimit/gave_up/timeout": ("scrapy_ratelimit_gave_up", {"reason": "timeout"}),
+}
+
+
+class _Window:
+    __slots__ = ("latencies", "ok", "failed")
+
+    def __init__(self):
+        self.latencies = []
+        self.ok = 0
+        self.failed = 0
+
+
+class ConcurrencyAutotuner:
+    """Vegas-style concurrency tuning, per download slot or globally.
+
+    Maryland's FacilityDetail endpoint, for example, is server-side
+    concurrency-limited: past ~5 in-flight requests latency climbs and then
+    everything times out (congestion collapse), and where that knee sits moves
+    between peak and off-peak hours.
+
+    The approach is TCP Vegas's: every ``AUTOTUNE_INTERVAL`` seconds, per tuned
+    target, compare the window's median download latency with the best (base)
+    latency seen so far. ``concurrency * (1 - base / latency)`` estimates how many
+    requests are queued at the origin rather than being served:
+
+    * below ``AUTOTUNE_ALPHA`` -- the origin has headroom: +1 (if the target was
+      actually saturated, i.e. more concurrency would be used);
+    * above ``AUTOTUNE_BETA`` -- requests are queueing: -1;
+    * otherwise hold.
+
+    A success rate under ``AUTOTUNE_MIN_SUCCESS`` (timeouts, 5xx, 429) is the
+    collapse signal and halves concurrency outright. The base latency drifts up
+    slowly (``BASE_LATENCY_DRIFT`` per window) so a permanently slower origin
+    resets it instead of pinning the tuner low forever.
+
+    Opt-in per spider via settings; bounded by the spider's declared
+    ``AUTOTUNE_MIN_CONCURRENCY`` / ``AUTOTUNE_MAX_CONCURRENCY``. Scope:
+
+    * ``"slot"`` (default) tunes each download slot's ``concurrency`` -- for an
+      origin whose limit is per host;
+    * ``"global"`` tunes the downloader's total in-flight cap
+      (``CONCURRENT_REQUESTS``) from the pooled samples of the matched hosts --
+      for an origin limited across all of a crawl's slots (Maryland's proxies each
+      have their own single-flight slot, but share the one origin).
+
+    Every change is logged at INFO and recorded under ``autotune/<target>/*`` in
+    the crawl stats.
+    """
+
+    def __init__(self, crawler):
+        s = crawler.settings
+        if not s.getbool("AUTOTUNE_ENABLED", False):
+            raise NotConfigured
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.scope = s.get("AUTOTUNE_SCOPE", "slot")
+        if self.scope not in ("slot", GLOBAL_TARGET):
+            raise NotConfigured(f"AUTOTUNE_SCOPE must be 'slot' or 'global', "
+                                f"not {self.scope!r}")
+        self.min_concurrency = max(1, s.getint("AUTOTUNE_MIN_CONCURRENCY", 1))
+        self.max_concurrency = max(
+            self.min_concurrency, s.getint("AUTOTUNE_MAX_CONCURRENCY", 16)
+        )
+        self.interval = s.getfloat("AUTOTUNE_INTERVAL", 60.0)
+        self.min_samples = s.getint("AUTOTUNE_MIN_SAMPLES", 5)
+        self.alpha = s.getfloat("AUTOTUNE_ALPHA", 1.0)
+        self.beta = s.getfloat("AUTOTUNE_BETA", 3.0)
+        self.min_success = s.getfloat("AUTOTUNE_MIN_SUCCESS", 0.9)
+        self.domains = tuple(d.lower() for d in s.getlist("AUTOTUNE_DOMAINS", []))
+        self._windows = {}
+        self._base = {}
+        self._answered = set()
+        self._task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(
+            ext.response_downloaded, signal=signals.response_downloaded
+        )
+        crawler.signals.connect(
+            ext.request_left_downloader, signal=signals.request_left_downloader
+        )
+        return ext
+
+    def spider_opened(self, spider):
+        from twisted.internet import task
+
+        logger.info(
+            "Autotuner: tuning %s concurrency within [%d, %d] every %ds",
+            "global" if self.scope == GLOBAL_TARGET else "per-slot",
+            self.min_concurrency, self.max_concurrency, int(self.interval))
+        self._task = task.LoopingCall(self.tick)
+        self._task.start(self.interval, now=False)
+
+    def spider_closed(self, spider):
+        if self._task is not None and self._task.running:
+            self._task.stop()
+
+    # -- sampling ----------------------------------------------------------
+
+    def _downloader(self):
+        engine = getattr(self.crawler, "engine", None)
+        return getattr(engine, "downloader", None)
+
+    def _target(self, request):
+        """The tuned target a request counts towards, or ``None``."""
+        if self.domains:
+            host = (urlparse(request.url).hostname or "").lower()
+            if not any(d in host for d in self.domains):
+                return None
+        if self.scope == GLOBAL_TARGET:
+            return GLOBAL_TARGET
+        downloader = self._downloader()
+        return downloader.get_slot_key(request) if downloader else None
+
+    def _window(self, target):
+        window = self._windows.get(target)
+        if window is None:
+            window = self._windows[target] = _Window()
+        return window
+
+    def response_downloaded(self, response, request, spider):
+        target = self._target(request)
+        if target is None:
+            return
+        self._answered.add(id(request))
+        window = self._window(target)
+        if response.status in FAILURE_STATUSES:
+            window.failed += 1
+            return
+        window.ok += 1
+        # Only real pages time the origin: a 403/404 is answered before any
+        # work is done and would drag the base latency down.
+        latency = request.meta.get("download_latency")
+        if latency is not None and response.status < 400:
+            window.latencies.append(latency)
+
+    def request_left_downloader(self, request, spider):
+        # Fires for every download, after response_downloaded when there was a
+        # response -- so an unanswered request is a download error (timeout,
+        # refused connection, ...).
+        if id(request) in self._answered:
+            self._answered.discard(id(request))
+            return
+        target = self._target(request)
+        if target is not None:
+            self._window(target).failed += 1
+
+    # -- control loop ------------------------------------------------------
+
+    def _get_limit(self, target):
+        downloader = self._downloader()
+        if downloader is None:
+            return None
+        if target == GLOBAL_TARGET:
+            return downloader.total_concurrency
+        slot = downloader.slots.get(target)
+        return slot.concurrency if slot is not None else None
+
+    def _set_limit(self, target, value):
+        downloader = self._downloader()
+        if target == GLOBAL_TARGET:
+            downloader.total_concurrency = value
+        else:
+            downloader.slots[target].concurrency = value
+
+    def _saturated(self, target):
+        """Whether the target is using all of its current concurrency (only
+        then does more concurrency buy throughput)."""
+        downloader = self._downloader()
+        if target == GLOBAL_TARGET:
+            return len(downloader.active) >= downloader.total_concurrency
+        slot = downloader.slots.get(target)
+        return slot is not None and (
+            bool(slot.queue) or len(slot.transferring) >= slot.concurrency
+        )
+
+    def decide(self, target, window, current):
+        """``(new_concurrency, reason)`` for one window (``reason`` ``None``
+        means hold)."""
+        total = window.ok + window.failed
+        if total < self.min_samples:
+            return current, None
+        success = window.ok / total
+        if success < self.min_success:
+            return (max(self.min_concurrency, current // 2),
+                    f"success rate {success:.0%} < {self.min_success:.0%}")
+        if not window.latencies:
+            return current, None
+        latency = statistics.median(window.latencies)
+        base = self._base.get(target)
+        base = latency if base is None else min(latency, base * BASE_LATENCY_DRIFT)
+        self._base[target] = base
+        queued = current * (1 - base / latency) if latency > 0 else 0.0
+        self._record(target, "queued", round(queued, 2))
+        if queued > self.beta:
+            return (max(self.min_concurrency, current - 1),
+                    f"~{queued:.1f} queued at origin (latency {latency:.1f}s "
+                    f"vs base {base:.1f}s)")
+        if queued < self.alpha and self._saturated(target):
+            return (min(self.max_concurrency, current + 1),
+                    f"headroom (latency {latency:.1f}s vs base {base:.1f}s)")
+        return current, None
+
+    def tick(self):
+        windows, self._windows = self._windows, {}
+        for target, window in windows.items():
+            current = self._get_limit(target)
+            if current is None:
+                continue
+            clamped = min(self.max_concurrency, max(self.min_concurrency, current))
+            new, reason = self.decide(target, window, clamped)
+            if new != current:
+                self._set_limit(target, new)
+                self._record(target, "adjustments", inc=True)
+                logger.info("Autotuner: %s concurrency %d -> %d (%s)",
+                            target, current, new, reason or "bounds")
+            self._record(target, "concurrency", new)
+
+    def _record(self, target, key, value=None, inc=False):
+        if self.stats is None:
+            return
+        if inc:
+            self.stats.inc_value(f"autotune/{target}/{key}")
+        else:
+            self.stats.set_value(f"autotune/{target}/{key}", value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(round(value, 6) if isinstance(value, float) else value)
+
+
+class _Family:
+    """One metric family's samples, rendered in OpenMetrics text format."""
+
+    def __init__(self, name, kind, help_text):
+        self.name, self.kind, self.help = name, kind, help_text
+        self.samples = []
+
+    def add(self, suffix, labels, value):
+        self.samples.append((self.name + suffix, labels, value))
+
+    def render(self):
+        lines = [f"# TYPE {self.name} {self.kind}", f"# HELP {self.name} {self.help}"]
+        lines += [f"{name}{_labels(labels)} {_number(value)}"
+                  for name, labels, value in self.samples]
+        return lines
+
+
+class MetricsExporter:
+    """Per-spider/host/proxy crawl metrics in OpenMetrics text format.
+
+    Scrapy's own visibility is the periodic LogStats line and the final stats
+    dump; with five spiders running in parallel under ``run_spiders.sh``,
+    finding the one that stalled meant grepping five logs. This keeps live
+    metrics instead, labelled by ``spider``, ``host`` and ``proxy`` (the
+    ProxyPoolMiddleware proxy id, or ``direct``):
+
+    * ``scrapy_download_latency_seconds`` -- histogram of ``download_latency``;
+    * ``scrapy_responses_total`` -- responses by status code;
+    * ``scrapy_download_errors_total`` -- downloads that ended with no response
+      (timeouts, refused connections, ...);
+    * ``scrapy_items_scraped_total`` and ``scrapy_items_per_minute``;
+    * retries and RateLimitBackoffMiddleware cooldowns (from the crawl stats);
+    * queue depths -- scheduler backlog, in-flight downloads, and each download
+      slot's queued/transferring requests;
+    * Playwright pages open now and at peak (from scrapy-playwright's stats);
+    * ``scrapy_last_activity_timestamp_seconds`` -- the last response or item,
+      so ``time() - that`` in Grafana is the stall detector.
+
+    Two ways out, both optional:
+
+    * ``METRICS_TEXTFILE`` -- rewritten (atomically) every
+      ``METRICS_INTERVAL`` seconds and at close, for node_exporter's textfile
+      collector; ``%(spider)s`` in the path is replaced by the spider name so
+      parallel spiders each get their own file.
+    * ``METRICS_PORT`` -- serve ``/metrics`` over HTTP on ``METRICS_HOST``
+      (default 127.0.0.1). A ``[low, high]`` port range, like
+      ``TELNETCONSOLE_PORT``, takes the first free port, so parallel crawl
+      processes don't collide; the chosen port is logged.
+
+    Settings: ``METRICS_ENABLED`` (default False), the two above,
+    ``METRICS_INTERVAL`` (default 15) and ``METRICS_LATENCY_BUCKETS``.
+    """
+
+    def __init__(self, crawler):
+        s = crawler.settings
+        if not s.getbool("METRICS_ENABLED", False):
+            raise NotConfigured
+        self.textfile = s.get("METRICS_TEXTFILE") or None
+        self.portrange = [int(p) for p in s.getlist("METRICS_PORT", [])]
+        self.host = s.get("METRICS_HOST", "127.0.0.1")
+        if not self.textfile and not self.portrange:
+            raise NotConfigured("MetricsExporter needs METRICS_TEXTFILE or METRICS_PORT")
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.interval = s.getfloat("METRICS_INTERVAL", 15.0)
+        self.buckets = tuple(sorted(
+            float(b) for b in s.getlist("METRICS_LATENCY_BUCKETS", DEFAULT_LATENCY_BUCKETS)
+        ))
+        self.spider_name = None
+        # (host, proxy) -> [per-bucket counts..., +Inf count, sum]
+        self._latency = {}
+        # (host, proxy, status) -> count
+        self._responses = {}
+        # (host, proxy) -> count
+        self._errors = {}
+        self._answered = set()
+        self._items = 0
+        self._items_per_minute = 0.0
+        self._items_mark = (time.time(), 0)
+        self._last_activity = None
+        self._start_time = None
+        self._task = None
+        self._port = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(
+            ext.response_downloaded, signal=signals.response_downloaded
+        )
+        crawler.signals.connect(
+            ext.request_left_downloader, signal=signals.request_left_downloader
+        )
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        return ext
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def spider_opened(self, spider):
+        from twisted.internet import task
+
+        self.spider_name = spider.name
+        self._start_time = self._last_activity = time.time()
+        self._items_mark = (self._start_time, 0)
+        if self.portrange:
+            self._listen()
+        if self.textfile:
+            self._task = task.LoopingCall(self.write_textfile)
+            self._task.start(self.interval, now=False)
+
+    def spider_closed(self, spider):
+        if self._task is not None and self._task.running:
+            self._task.stop()
+        if self.textfile:
+            self.write_textfile()
+        if self._port is not None:
+            self._port.stopListening()
+            self._port = None
+
+    def _listen(self):
+        from scrapy.utils.reactor import listen_tcp
+        from twisted.internet.error import CannotListenError
+        from twisted.web.resource import Resource
+        from twisted.web.server import Site
+
+        exporter = self
+
+        class _MetricsResource(Resource):
+            isLeaf = True
+
+            def render_GET(self, request):
+                request.setHeader(b"Content-Type", OPENMETRICS_CONTENT_TYPE.encode())
+                return exporter.render().encode("utf-8")
+
+        site = Site(_MetricsResource())
+        site.noisy = False
+        try:
+            self._port = listen_tcp(self.portrange, self.host, site)
+        except CannotListenError as e:
+            logger.warning("Metrics endpoint disabled: %s", e)
+            return
+        address = self._port.getHost()
+        logger.info("Metrics endpoint on http://%s:%d/metrics",
+                    address.host, address.port)
+
+    def write_textfile(self):
+        path = self.textfile % {"spider": self.spider_name or "spider"}
+        directory = os.path.dirname(path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as handle:
+                handle.write(self.render())
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, e)
+
+    # -- sampling ------------------------------------------------------------
+
+    @staticmethod
+    def _key(request):
+        host = (urlparse(request.url).hostname or "").lower()
+        proxy = request.meta.get("download_slot") if request.meta.get("proxy") else None
+        return host, proxy or "direct"
+
+    def response_downloaded(self, response, request, spider):
+        self._answered.add(id(request))
+        self._last_activity = time.time()
+        host, proxy = self._key(request)
+        status_key = (host, proxy, response.status)
+        self._responses[status_key] = self._responses.get(status_key, 0) + 1
+        latency = request.meta.get("download_latency")
+        if latency is None:
+            return
+        counts = self._latency.get((host, proxy))
+        if counts is None:
+            counts = self._latency[(host, proxy)] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if latency <= bound:
+                counts[i] += 1
+        counts[-2] += 1
+        counts[-1] += latency
+
+    def request_left_downloader(self, request, spider):
+        if id(request) in self._answered:
+            self._answered.discard(id(request))
+            return
+        key = self._key(request)
+        self._errors[key] = self._errors.get(key, 0) + 1
+
+    def item_scraped(self, item, response, spider):
+        self._items += 1
+        self._last_activity = time.time()
+
+    # -- rendering -----------------------------------------------------------
+
+    def _items_rate(self, now):
+        """Items/min since the previous call at least one interval ago."""
+        mark_time, mark_items = self._items_mark
+        if now - mark_time >= self.interval:
+            self._items_per_minute = (self._items - mark_items) * 60.0 / (now - mark_time)
+            self._items_mark = (now, self._items)
+        return self._items_per_minute
+
+    def render(self):
+        """The current metrics as an OpenMetrics text exposition."""
+        now = time.time()
+        base = {"spider": self.spider_name or ""}
+        families = []
+
+        latency = _Family("scrapy_download_latency_seconds", "histogram",
+                          "Download latency (connect to last byte).")
+        for (host, proxy), counts in sorted(self._latency.items()):
+            labels = {**base, "host": host, "proxy": proxy}
+            for bound, count in zip(self.buckets, counts):
+                latency.add("_bucket", {**labels, "le": _number(float(bound))}, count)
+            latency.add("_bucket", {**labels, "le": "+Inf"}, counts[-2])
+            latency.add("_count", labels, counts[-2])
+            latency.add("_sum", labels, round(counts[-1], 6))
+        families.append(latency)
+
+        responses = _Family("scrapy_responses", "counter", "Responses by status code.")
+        for (host, proxy, status), count in sorted(self._responses.items()):
+            responses.add("_total", {**base, "host": host, "proxy": proxy,
+                                     "status": str(status)}, count)
+        families.append(responses)
+
+        errors = _Family("scrapy_download_errors", "counter",
+                         "Downloads that ended without a response.")
+        for (host, proxy), count in sorted(self._errors.items()):
+            errors.add("_total", {**base, "host": host, "proxy": proxy}, count)
+        families.append(errors)
+
+        items = _Family("scrapy_items_scraped", "counter", "Items scraped.")
+        items.add("_total", base, self._items)
+        families.append(items)
+        rate = _Family("scrapy_items_per_minute", "gauge",
+                       "Items scraped per minute over the last interval.")
+        rate.add("", base, round(self._items_rate(now), 3))
+        families.append(rate)
+
+        stat_families = {}
+        for key, (name, labels) in STAT_COUNTERS.items():
+            family = stat_families.get(name)
+            if family is None:
+                family = stat_families[name] = _Family(
+                    name, "counter", f"Crawl stat {key.rsplit('/', 1)[0]}.")
+            value = self.stats.get_value(key, 0) if self.stats is not None else 0
+            family.add("_total", {**base, **labels}, value)
+        families.extend(stat_families.values())
+
+        families.extend(self._queue_families(base))
+        families.extend(self._playwright_families(base))
+
+        activity = _Family("scrapy_last_activity_timestamp_seconds", "gauge",
+                           "Time of the last response or item.")
+        if self._last_activity is not None:
+            activity.add("", base, round(self._last_activity, 3))
+        families.append(activity)
+        started = _Family("scrapy_start_timestamp_seconds", "gauge",
+                          "Time the spider opened.")
+        if self._start_time is not None:
+            started.add("", base, round(self._start_time, 3))
+        families.append(started)
+
+        lines = []
+        for family in families:
+            lines.extend(family.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _queue_families(self, base):
+        engine = getattr(self.crawler, "engine", None)
+        downloader = getattr(engine, "downloader", None)
+        pending = _Family("scrapy_scheduler_pending", "gauge",
+                          "Requests waiting in the scheduler.")
+        slot = getattr(engine, "_slot", None)
+        scheduler = getattr(slot, "scheduler", None)
+        try:
+            pending.add("", base, len(scheduler))
+        except TypeError:
+            pass
+        active = _Family("scrapy_downloader_active", "gauge",
+                         "Requests in the downloader (queued or in flight).")
+        queued = _Family("scrapy_slot_queued", "gauge",
+                         "Requests queued in a download slot.")
+        transferring = _Family("scrapy_slot_transferring", "gauge",
+                               "Requests in flight in a download slot.")
+        if downloader is not None:
+            active.add("", base, len(downloader.active))
+            for key, dslot in sorted(downloader.slots.items()):
+                labels = {**base, "slot": key}
+                queued.add("", labels, len(dslot.queue))
+                transferring.add("", labels, len(dslot.transferring))
+        return [pending, active, queued, transferring]
+
+    def _playwright_families(self, base):
+        if self.stats is None or self.stats.get_value("playwright/page_count") is None:
+            return []
+        opened = self.stats.get_value("playwright/page_count", 0)
+        closed = self.stats.get_value("playwright/page_count/closed", 0)
+        pages = _Family("scrapy_playwright_pages_open", "gauge",
+                        "Playwright pages currently open.")
+        pages.add("", base, max(0, opened - closed))
+        peak = _Family("scrapy_playwright_pages_max_concurrent", "gauge",
+                       "Most Playwright pages open at once.")
+        peak.add("", base, self.stats.get_value("playwright/page_count/max_concurrent", 0))
+        return [pages, peak]
+
+
+class StallWatchdog:
+    """No-progress watchdog with diagnostics and auto-recovery, for any spider.
+
+    A crawl can wedge with nothing above DEBUG logged: the Playwright page
+    leak (``playwright_utils.py``) exhausts the per-context page semaphore and
+    every remaining request blocks forever at ``0 pages/min``; a dead origin
+    or proxy leaves every request hanging until its timeout, retried. Either
+    way the spider burns the rest of a nightly window until it is killed.
+
+    Every ``STALLWATCH_INTERVAL`` seconds this compares responses received +
+    items scraped with the previous check. After ``STALLWATCH_WINDOWS``
+    consecutive windows with neither, the spider is stalled: it logs one
+    diagnostic dump at ERROR (scheduler backlog, in-flight requests per
+    download slot, the oldest in-flight request and its age, and each
+    Playwright context's page-semaphore holders -- the open pages, with their
+    URL and age), then takes the next action from ``STALLWATCH_ACTIONS``, one
+    per further stalled window, until progress resumes:
+
+    * ``close_pages`` -- close Playwright pages open since before the stall
+      began. Their ``close`` event releases the semaphore slot, un-wedging a
+      leak-exhausted pool.
+    * ``reschedule`` -- re-queue (``dont_filter``) every request in flight for
+      longer than the stall, in case its download will never complete.
+    * ``retry`` -- log ``Retryable Error`` and close the spider
+      (reason ``stalled``), so ``run_spiders.sh`` / ``scripts/run_spiders.py``
+      restart it.
+    * ``close`` -- close the spider (reason ``stalled``) without a restart.
+
+    Default ``["close_pages", "retry"]``: free leaked pages first, restart the
+    spider if that didn't help. Any progress resets the count. Stats:
+    ``stallwatch/stalls`` and ``stallwatch/action/<action>``.
+
+    Off unless a spider opts in with ``STALLWATCH_ENABLED`` (the Playwright
+    spiders do, in ``custom_settings``; ``-s STALLWATCH_ENABLED=1`` for any
+    other run). Maryland has its own watchdog and keeps it off.
+    """
+
+    ACTIONS = ("close_pages", "reschedule", "retry", "close")
+
+    def __init__(self, crawler):
+        s = crawler.settings
+        if not s.getbool("STALLWATCH_ENABLED", False):
+            raise NotConfigured
+        self.actions = s.getlist("STALLWATCH_ACTIONS", ["close_pages", "retry"])
+        unknown = sorted(set(self.actions) - set(self.ACTIONS))
+        if unknown:
+            raise NotConfigured(f"Unknown STALLWATCH_ACTIONS: {', '.join(unknown)}")
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.interval = s.getfloat("STALLWATCH_INTERVAL", 300.0)
+        self.windows = max(1, s.getint("STALLWATCH_WINDOWS", 6))
+        self.spider = None
+        self._last_progress = 0
+        # When progress was last seen (a check that saw it, or the start).
+        self._progress_time = time.time()
+        self._stalled_windows = 0
+        # id(request) -> (request, time it reached the downloader)
+        self._in_flight = {}
+        # id(page) -> (page, time first seen open)
+        self._pages = {}
+        self._closing = False
+        self._task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(
+            ext.request_reached_downloader, signal=signals.request_reached_downloader
+        )
+        crawler.signals.connect(
+            ext.request_left_downloader, signal=signals.request_left_downloader
+        )
+        return ext
+
+    def spider_opened(self, spider):
+        from twisted.internet import task
+
+        self.spider = spider
+        self._progress_time = time.time()
+        self._task = task.LoopingCall(self.check)
+        # now=False: first check one interval in, once the crawl is underway.
+        self._task.start(self.interval, now=False)
+
+    def spider_closed(self, spider):
+        if self._task is not None and self._task.running:
+            self._task.stop()
+
+    def request_reached_downloader(self, request, spider):
+        self._in_flight[id(request)] = (request, time.time())
+
+    def request_left_downloader(self, request, spider):
+        self._in_flight.pop(id(request), None)
+
+    @property
+    def _logger(self):
+        # Through the spider's logger so the records carry the spider (the
+        # single-process runner routes, and spots "Retryable Error", by that).
+        return self.spider.logger if self.spider is not None else logger
+
+    # -- detection -----------------------------------------------------------
+
+    def _progress(self):
+        if self.stats is None:
+            return 0
+        return ((self.stats.get_value("response_received_count", 0) or 0)
+                + (self.stats.get_value("item_scraped_count", 0) or 0))
+
+    def check(self):
+        now = time.time()
+        self._track_pages(now)
+        progress = self._progress()
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self._progress_time = now
+            self._stalled_windows = 0
+            return
+        self._stalled_windows += 1
+        if self._stalled_windows < self.windows:
+            return
+        stalled_s = self._stalled_windows * self.interval
+        if self._stalled_windows == self.windows:
+            if self.stats is not None:
+                self.stats.inc_value("stallwatch/stalls")
+        self._logger.error("STALL: no responses or items for ~%ds.\n%s",
+                           stalled_s, self.diagnostics(now))
+        step = self._stalled_windows - self.windows
+        if step < len(self.actions):
+            self.act(self.actions[step], self._progress_time)
+
+    # -- diagnostics ---------------------------------------------------------
+
+    def _downloader(self):
+        engine = getattr(self.crawler, "engine", None)
+        return getattr(engine, "downloader", None)
+
+    def _playwright_contexts(self):
+        """``{name: BrowserContextWrapper}`` of the crawl's Playwright handler
+        (empty when there is none, or it never launched)."""
+        from provider_scrape.handlers import playwright_handler_of
+
+        downloader = self._downloader()
+        handlers = getattr(getattr(downloader, "handlers", None), "_handlers", {})
+        seen = []
+        for handler in handlers.values():
+            playwright = playwright_handler_of(handler)
+            if playwright is not None and playwright not in seen:
+                seen.append(playwright)
+        contexts = {}
+        for playwright in seen:
+            contexts.update(getattr(playwright, "context_wrappers", {}) or {})
+        return contexts
+
+    def _open_pages(self):
+        pages = []
+        for wrapper in self._playwright_contexts().values():
+            pages.extend(page for page in wrapper.context.pages if not page.is_closed())
+        return pages
+
+    def _track_pages(self, now):
+        pages = self._open_pages()
+        self._pages = {id(page): self._pages.get(id(page), (page, now))
+                       for page in pages}
+
+    def diagnostics(self, now=None):
+        """A multi-line snapshot of where the crawl is stuck."""
+        now = time.time() if now is None else now
+        lines = []
+        engine = getattr(self.crawler, "engine", None)
+        scheduler = getattr(getattr(engine, "_slot", None), "scheduler", None)
+        try:
+            lines.append(f"  scheduler: {len(scheduler)} pending")
+        except TypeError:
+            pass
+        downloader = self._downloader()
+        if downloader is not None:
+            for key, slot in sorted(downloader.slots.items()):
+                lines.append(
+                    f"  slot {key}: {len(slot.transferring)} in flight, "
+                    f"{len(slot.queue)} queued (concurrency {slot.concurrency}, "
+                    f"delay {slot.delay:g}s)")
+        if self._in_flight:
+            request, started = min(self._in_flight.values(), key=lambda v: v[1])
+            lines.append(f"  {len(self._in_flight)} request(s) in the downloader; "
+                         f"oldest {now - started:.0f}s: {request.url}")
+        for name, wrapper in sorted(self._playwright_contexts().items()):
+            pages = [p for p in wrapper.context.pages if not p.is_closed()]
+            free = getattr(wrapper.semaphore, "_value", "?")
+            lines.append(f"  playwright context {name!r}: {len(pages)} page(s) "
+                         f"holding the semaphore, {free} free")
+            for page in pages:
+                seen = self._pages.get(id(page), (page, now))[1]
+                lines.append(f"    page open {now - seen:.0f}s: {page.url}")
+        return "\n".join(lines) or "  (no engine state available)"
+
+    # -- actions -------------------------------------------------------------
+
+    def act(self, action, stalled_since):
+        if self.stats is not None:
+            self.stats.inc_value(f"stallwatch/action/{action}")
+        getattr(self, f"_{action}")(stalled_since)
+
+    def _close_pages(self, stalled_since):
+        stale = [page for page, seen in self._pages.values()
+                 if seen <= stalled_since and not page.is_closed()]
+        self._logger.error("Stall recovery: closing %d Playwright page(s) open "
+                           "since before the stall.", len(stale))
+        # scrapy-playwright only runs under the asyncio reactor, so there is a
+        # running loop whenever there are pages to close.
+        for page in stale:
+            asyncio.ensure_future(page.close()).add_done_callback(self._page_closed)
+
+    def _page_closed(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self._logger.warning("Could not close page: %s", future.exception())
+
+    def _reschedule(self, stalled_since):
+        engine = getattr(self.crawler, "engine", None)
+        stuck = [request for request, started in self._in_flight.values()
+                 if started <= stalled_since]
+        self._logger.error("Stall recovery: re-scheduling %d request(s) in flight "
+                           "since before the stall.", len(stuck))
+        for request in stuck:
+            meta = {k: v for k, v in request.meta.items() if k != "playwright_page"}
+            meta["stallwatch_rescheduled"] = meta.get("stallwatch_rescheduled", 0) + 1
+            engine.crawl(request.replace(meta=meta, dont_filter=True))
+
+    def _retry(self, stalled_since):
+        # run_spider (run_spiders.sh) and scripts/run_spiders.py re-run a
+        # spider whose log contains this marker.
+        self._logger.error("Retryable Error")
+        self._close(stalled_since)
+
+    def _close(self, stalled_since):
+        engine = getattr(self.crawler, "engine", None)
+        if engine is None or self._closing:
+            return
+        self._closing = True
+        self._logger.error("Stall recovery: closing the spider (reason=stalled).")
+        engine.close_spider(self.spider, "stalled")
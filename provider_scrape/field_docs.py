@@ -54,12 +54,14 @@ FIELD_DOCS = {
     "geocode_source": "Where latitude/longitude came from, set by the post-run "
                       "geocoding step: \"state\" (supplied by the source "
                       "state), \"census\" (derived from address via the US "
-                      "Census geocoder), or \"unmatched\" (attempted, no usable "
-                      "point). Empty when geocoding was not attempted.",
+                      "Census geocoder), \"address_index\" (derived from a "
+                      "local address-point index), or \"unmatched\" "
+                      "(attempted, no usable point). Empty when geocoding was "
+                      "not attempted.",
     "geocode_confidence": "Confidence of a geocoded coordinate: \"exact\" or "
-                          "\"approximate\" for a Census match, or \"tie\"/"
-                          "\"no_match\" when unmatched. Empty for "
-                          "state-supplied coordinates.",
+                          "\"approximate\" for a Census or address-index "
+                          "match, or \"tie\"/\"no_match\" when unmatched. "
+                          "Empty for state-supplied coordinates.",
 
     # Numbers / types
     "capacity": "Licensed capacity coerced to an integer when it is a clean "
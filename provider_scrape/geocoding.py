@@ -5,7 +5,9 @@ values / ``dict`` items in and returns values out, with no Scrapy objects,
 network, or file I/O. All HTTP, caching, and file handling lives in the
 ``scripts/geocode_enrich.py`` CLI that consumes these helpers.
 
-The backend is the free US Census Bureau batch geocoder. The flow is:
+The default backend is the free US Census Bureau batch geocoder; an offline
+address-point index (``scripts/address_index.py``) can stand in for it, keyed by
+the same :func:`cache_key` normalization (see :func:`index_keys`). The flow is:
 
   1. :func:`build_batch_row` turns a candidate item into one CSV row for the
      batch request (``[id, street, city, state, zip]``).
@@ -36,7 +38,10 @@ MAX_BATCH_SIZE = 3000
 # `geocode_source` values.
 SOURCE_STATE = "state"          # coordinate came from the spider / source state
 SOURCE_CENSUS = "census"        # coordinate derived by the Census geocoder
+SOURCE_ADDRESS_INDEX = "address_index"  # derived from a local address-point index
 SOURCE_UNMATCHED = "unmatched"  # geocoding attempted but produced no usable point
+# Sources that mean "we derived this coordinate from the address".
+GEOCODED_SOURCES = (SOURCE_CENSUS, SOURCE_ADDRESS_INDEX)
 
 
 def _present(value):
@@ -115,6 +120,26 @@ def cache_key(row):
     return "|".join(parts)
 
 
+def index_keys(row):
+    """Lookup keys for a batch row in an address-point index, best first.
+
+    Returns ``[(match_type, key), ...]``: the full :func:`cache_key` as an
+    ``"Exact"`` match, then street + zip and street + city + state as
+    ``"Non_Exact"`` fallbacks (so a record with a wrong or missing city, or a
+    missing zip, still resolves). A fallback is only offered when the pieces it
+    needs are present. The same function builds the index, so the two sides
+    always normalize identically.
+    """
+    street, city, state, zip_code = (
+        " ".join(str(p).split()).lower() for p in row[1:5])
+    keys = [("Exact", cache_key(row))]
+    if street and zip_code:
+        keys.append(("Non_Exact", "zip|%s|%s" % (street, zip_code)))
+    if street and city and state:
+        keys.append(("Non_Exact", "city|%s|%s|%s" % (street, city, state)))
+    return keys
+
+
 def parse_response_line(fields):
     """Normalize one Census batch response row (already CSV-split) to a dict.
 
@@ -150,10 +175,11 @@ def parse_response_line(fields):
     return result
 
 
-def apply_result(item, result):
+def apply_result(item, result, source=SOURCE_CENSUS):
     """Merge one parsed geocode ``result`` back into ``item`` (in place).
 
-    Sets ``geocode_source`` / ``geocode_confidence`` from the match, and fills
+    Sets ``geocode_source`` (``source``, the backend that matched, or
+    ``unmatched``) / ``geocode_confidence`` from the match, and fills
     ``latitude`` / ``longitude`` on a successful match. Never overwrites
     coordinates the item already has (defensive; such items are not sent to the
     geocoder in the first place). Returns the same ``item``.
@@ -162,7 +188,7 @@ def apply_result(item, result):
     has_point = _present(result.get("latitude")) and _present(
         result.get("longitude"))
     if match == "Match" and has_point:
-        item["geocode_source"] = SOURCE_CENSUS
+        item["geocode_source"] = source
         item["geocode_confidence"] = (
             "exact" if result.get("match_type") == "Exact" else "approximate")
         if not has_coordinates(item):
@@ -0,0 +1,99 @@
+"""Hybrid http/https download handler: Playwright only when a request asks.
+
+``scrapy_playwright``'s handler, installed project-wide, starts the Playwright
+driver (a Node process) on ``engine_started`` for *every* spider -- including
+the pure-API ones (georgia, delaware, connecticut, iowa, michigan, utah, ...)
+that never send a browser request. Under ``run_spiders.sh -c 5`` that is five
+idle drivers' worth of startup time and resident memory in one container.
+
+``HybridDownloadHandler`` is Scrapy's native HTTP/1.1 handler (persistent
+connection pool) for plain requests, and delegates a request carrying
+``meta["playwright"]`` to a wrapped ``ScrapyPlaywrightDownloadHandler`` that is
+only *launched* on the first such request. A spider that never asks for a
+browser never starts Playwright at all.
+
+The wrapped handler is constructed up front (cheap: no driver process) and
+exposed as :attr:`HybridDownloadHandler.playwright_handler`, so spider-level
+hooks that patch it at ``spider_opened`` (the stealth-context middlewares) see
+the same instance the browser requests will use -- see
+:func:`playwright_handler_of`.
+
+On close it logs how many browser vs. plain requests it handled and how many
+browser contexts were launched (``playwright/context_count``).
+"""
+import asyncio
+import logging
+
+from scrapy import signals
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from scrapy_playwright.handler import ScrapyPlaywrightDownloadHandler
+from twisted.internet.defer import inlineCallbacks
+
+logger = logging.getLogger(__name__)
+
+
+def playwright_handler_of(handler):
+    """The ``ScrapyPlaywrightDownloadHandler`` behind a download handler.
+
+    Returns ``handler`` itself when it already is one (a spider that pins the
+    Playwright handler in ``custom_settings``), the wrapped instance for a
+    :class:`HybridDownloadHandler`, and ``None`` otherwise.
+    """
+    if isinstance(handler, ScrapyPlaywrightDownloadHandler):
+        return handler
+    return getattr(handler, "playwright_handler", None)
+
+
+class HybridDownloadHandler(HTTP11DownloadHandler):
+    """Native HTTP/1.1 downloads, with lazily launched Playwright on demand."""
+
+    def __init__(self, settings, crawler):
+        super().__init__(settings, crawler)
+        self.stats = crawler.stats
+        self.playwright_handler = ScrapyPlaywrightDownloadHandler.from_crawler(
+            crawler)
+        # The wrapped handler wires its driver launch to engine_started; take
+        # that over so the launch happens on the first browser request instead.
+        crawler.signals.disconnect(
+            self.playwright_handler._engine_started, signals.engine_started)
+        self._launch = None
+        self._browser_requests = 0
+        self._http_requests = 0
+
+    def download_request(self, request, spider):
+        if not request.meta.get("playwright"):
+            self._http_requests += 1
+            return super().download_request(request, spider)
+        self._browser_requests += 1
+        return self.playwright_handler._deferred_from_coro(
+            self._download_with_browser(request, spider))
+
+    async def _download_with_browser(self, request, spider):
+        if self._launch is None:
+            logger.info(
+                "HybridDownloadHandler: first browser request; starting Playwright")
+            self._launch = asyncio.ensure_future(self.playwright_handler._launch())
+        # Concurrent first requests all wait on the one launch.
+        await self._launch
+        return await self.playwright_handler._download_request(request, spider)
+
+    @inlineCallbacks
+    def close(self):
+        yield super().close()
+        yield self.playwright_handler.close()
+        # One instance per scheme (http and https), so accumulate, don't set.
+        self.stats.inc_value("hybrid_handler/browser_requests",
+                             self._browser_requests)
+        self.stats.inc_value("hybrid_handler/http_requests", self._http_requests)
+        if not (self._http_requests or self._browser_requests):
+            return
+        if self._launch is None:
+            logger.info(
+                "HybridDownloadHandler: %d plain HTTP request(s); Playwright "
+                "never started", self._http_requests)
+        else:
+            logger.info(
+                "HybridDownloadHandler: %d plain HTTP request(s), %d browser "
+                "request(s); %d browser context(s) launched",
+                self._http_requests, self._browser_requests,
+                self.stats.get_value("playwright/context_count", 0))
@@ -0,0 +1,122 @@
+"""Project-wide HTTP response cache policy: per-spider TTL + revalidation.
+
+Scrapy's ``HttpCacheMiddleware`` is enabled project-wide (``settings.py``) with
+``TTLRevalidatePolicy`` as its policy, but it is a pass-through for every
+spider that doesn't opt in: a spider caches only when it sets a positive
+``HTTPCACHE_TTL`` (seconds) in its ``custom_settings``, e.g. the bulk CSV
+exports (``california``, ``new_york``) for a day and Maryland's detail pages
+for a week.
+
+Within the TTL a cached response is replayed without touching the network --
+which is what makes a ``run_spider`` restart after a crash or a "Retryable
+Error" cheap: every page the previous attempt finished comes straight from
+disk. Past the TTL the entry is kept (``HTTPCACHE_EXPIRATION_SECS = 0``) and
+the request is *revalidated*: it goes out with ``If-None-Match`` /
+``If-Modified-Since`` built from the cached ``ETag`` / ``Last-Modified`` (when
+the origin sent them), and a ``304 Not Modified`` -- or a 5xx from a struggling
+origin -- is answered from the cache.
+
+``SessionSafeHttpCacheMiddleware`` takes the built-in middleware's slot (900),
+right next to the download handler, so it works the same whatever
+``DOWNLOAD_HANDLERS`` routes to: a plain request that scrapy-playwright passes
+through to Scrapy's HTTP handler is cached like any other. Browser-driven requests (``meta["playwright"]``) are never cached --
+their "response" is a rendered DOM tied to a live page, not a replayable
+HTTP body.
+"""
+import re
+from time import time
+
+from scrapy.downloadermiddlewares.httpcache import HttpCacheMiddleware
+from scrapy.extensions.httpcache import RFC2616Policy, rfc1123_to_epoch
+from scrapy.http import Response
+
+# Statuses worth replaying. Blocks (403/429), server errors and 304s are never
+# stored -- replaying a rate-limit page for a week would be far worse than
+# re-fetching.
+CACHEABLE_STATUSES = (200, 203, 300, 301, 308)
+
+
+class TTLRevalidatePolicy(RFC2616Policy):
+    """RFC 2616 revalidation with a spider-chosen freshness lifetime.
+
+    Settings (all per-spider via ``custom_settings``):
+        HTTPCACHE_TTL: seconds a stored response is served without asking the
+            origin. ``0`` (the default) disables caching for the spider.
+        HTTPCACHE_CACHE_METHODS: HTTP methods eligible for caching (default
+            ``["GET", "HEAD"]``). Opt a spider's idempotent POST in here (the
+            New York export); ASP.NET postback chains stay out by default.
+        HTTPCACHE_URL_PATTERNS: optional regexes; when set, only URLs matching
+            one of them are cached. Lets a session-driven spider (Maryland)
+            cache its leaf pages without replaying the session-priming pages.
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.ttl = settings.getint("HTTPCACHE_TTL", 0)
+        self.methods = {
+            m.upper()
+            for m in settings.getlist("HTTPCACHE_CACHE_METHODS", ["GET", "HEAD"])
+        }
+        self.url_patterns = [
+            re.compile(p) for p in settings.getlist("HTTPCACHE_URL_PATTERNS")
+        ]
+
+    def should_cache_request(self, request):
+        if self.ttl <= 0:
+            return False
+        if request.meta.get("playwright"):
+            return False
+        if request.method.upper() not in self.methods:
+            return False
+        if self.url_patterns and not any(
+            p.search(request.url) for p in self.url_patterns
+        ):
+            return False
+        return super().should_cache_request(request)
+
+    def should_cache_response(self, response, request):
+        cc = self._parse_cachecontrol(response)
+        if b"no-store" in cc:
+            return False
+        # Unlike plain RFC 2616 we keep a 200 without validators too: the TTL
+        # supplies the freshness the origin didn't, and a stale entry without
+        # validators is simply re-downloaded in full.
+        return response.status in CACHEABLE_STATUSES
+
+    def is_cached_response_fresh(self, cachedresponse, request):
+        ccreq = self._parse_cachecontrol(request)
+        if b"no-cache" not in ccreq:
+            stored = rfc1123_to_epoch(cachedresponse.headers.get(b"Date"))
+            # No Date header means we can't age the entry: treat it as stale
+            # and revalidate rather than serving it forever.
+            if stored is not None and time() - stored < self.ttl:
+                return True
+        self._set_conditional_validators(request, cachedresponse)
+        return False
+
+
+class SessionSafeHttpCacheMiddleware(HttpCacheMiddleware):
+    """``HttpCacheMiddleware`` that never replays a stored ``Set-Cookie``.
+
+    A cached page keeps the headers it was stored with, including any
+    ``Set-Cookie`` -- replayed a week later, that would overwrite a live
+    session cookie (e.g. Maryland's detail jar) with a long-expired one. The
+    cookie middleware only ever sees cookies from real network responses.
+    """
+
+    @staticmethod
+    def _strip_cookies(result):
+        if isinstance(result, Response) and "cached" in result.flags:
+            result.headers.pop(b"Set-Cookie", None)
+        return result
+
+    def process_request(self, request, spider):
+        return self._strip_cookies(super().process_request(request, spider))
+
+    def process_response(self, request, response, spider):
+        return self._strip_cookies(
+            super().process_response(request, response, spider))
+
+    def process_exception(self, request, exception, spider):
+        return self._strip_cookies(
+            super().process_exception(request, exception, spider))
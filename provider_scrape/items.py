@@ -211,7 +211,8 @@ class ProviderItem(scrapy.Item):
     # (see provider_scrape/geocoding.py). `latitude`/`longitude` are filled from
     # the address for states that don't publish coordinates; these two fields
     # record where each coordinate came from so downstream consumers can filter.
-    geocode_source = scrapy.Field()      # "state" | "census" | "unmatched" | None
+    # "state" | "census" | "address_index" | "unmatched" | None
+    geocode_source = scrapy.Field()
     geocode_confidence = scrapy.Field()  # "exact" | "approximate" | "tie" | "no_match" | None
 
     # Ohio specific fields
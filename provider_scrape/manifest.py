@@ -0,0 +1,207 @@
+"""Persistent per-spider provider manifest for incremental crawls.
+
+Most of a state's licenses don't change week to week, yet every run re-fetches
+every provider's detail (and inspection) pages from scratch -- days of work on
+a single IP for Maryland. The manifest remembers, per provider, a fingerprint
+of its *listing-level* row (what the cheap search/results page already told us)
+alongside the last complete item built from it. On the next run a spider that
+sees the same fingerprint again skips the detail fetches and re-emits the
+stored item, so the output feed is still the same full snapshot.
+
+Strictly opt-in: a spider only consults the manifest when run with
+``-a incremental=1`` *and* it mixes in :class:`IncrementalManifestMixin`. The
+store itself is opened/closed by ``ManifestPipeline`` (see ``pipelines.py``),
+which also records each freshly built item. Without the flag (the default)
+nothing here runs and every provider is fetched as before.
+
+Storage is one SQLite file per spider under ``PROVIDER_MANIFEST_DIR`` (default:
+``manifests/`` at the repo root), keyed by ``license_number`` -- or whatever
+stable listing-level id a spider exposes via ``manifest_key`` when the listing
+row has no license number (e.g. Maryland's ``fi``).
+
+Staleness is bounded by the fingerprint: anything the listing row shows
+(status, address, type, ...) invalidates the entry. Changes visible *only* on a
+detail page (a new inspection) are not seen until the listing row changes, so
+run a full crawl periodically (just drop ``-a incremental=1``) -- it re-records
+every provider.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+from itemadapter import ItemAdapter
+
+from provider_scrape.items import ProviderItem
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MANIFEST_DIR = os.path.join(REPO_ROOT, "manifests")
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def fingerprint(row):
+    """Stable content hash of a listing-level row (any JSON-able value).
+
+    Keys are sorted so dict ordering never changes the hash; non-JSON values
+    (e.g. a ``Decimal``) fall back to ``str``.
+    """
+    payload = json.dumps(row, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def incremental_requested(spider):
+    """True when the spider was run with a truthy ``-a incremental=...``."""
+    return str(getattr(spider, "incremental", "")).strip().lower() in _TRUTHY
+
+
+def manifest_path(directory, spider_name):
+    """Path of one spider's manifest file inside ``directory``."""
+    return os.path.join(directory or DEFAULT_MANIFEST_DIR,
+                        f"{spider_name}.sqlite")
+
+
+class ProviderManifest:
+    """SQLite store of ``key -> (fingerprint, last item)`` for one spider."""
+
+    def __init__(self, path):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS provider_manifest ("
+            " license_number TEXT PRIMARY KEY,"
+            " fingerprint TEXT NOT NULL,"
+            " item TEXT NOT NULL,"
+            " updated_at TEXT)"
+        )
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM provider_manifest").fetchone()[0]
+
+    def lookup(self, key, fp):
+        """Return the stored item dict when ``key``'s fingerprint is ``fp``.
+
+        ``None`` for an unknown key, a changed fingerprint, or an unreadable
+        stored item (all of which mean "fetch it again").
+        """
+        row = self.conn.execute(
+            "SELECT fingerprint, item FROM provider_manifest"
+            " WHERE license_number = ?", (str(key),)).fetchone()
+        if row is None or row[0] != fp:
+            return None
+        try:
+            return json.loads(row[1])
+        except ValueError:
+            logger.warning("Manifest entry for %r is unreadable; refetching",
+                           key)
+            return None
+
+    def record(self, key, fp, item):
+        """Store (or replace) ``key``'s fingerprint and its complete item."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO provider_manifest"
+            " (license_number, fingerprint, item, updated_at)"
+            " VALUES (?, ?, ?, ?)",
+            (str(key), fp,
+             json.dumps(item, ensure_ascii=False, default=str),
+             datetime.now(timezone.utc).isoformat()))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def item_from_manifest(stored):
+    """Rebuild a :class:`ProviderItem` from a stored item dict.
+
+    Fields no longer declared on ``ProviderItem`` (renamed/removed since the
+    entry was written) are dropped rather than raising.
+    """
+    item = ProviderItem()
+    for key, value in stored.items():
+        if key in ProviderItem.fields:
+            item[key] = value
+    return item
+
+
+class IncrementalManifestMixin:
+    """Spider-side hooks for ``-a incremental=1`` crawls.
+
+    Usage:
+        * inherit before ``scrapy.Spider``.
+        * at the listing level, before scheduling detail fetches, call
+          ``self.manifest_reuse(key, row)``. A returned item is the unchanged
+          provider's last complete item -- yield it instead of the detail
+          requests. ``None`` means "crawl it" (and remembers the fingerprint so
+          ``ManifestPipeline`` records the resulting item).
+        * call ``self.manifest_forget(key)`` on a path that emits a *partial*
+          item (e.g. a failed detail fetch), so it is not stored as complete.
+        * override :meth:`manifest_key` when the item's listing-level id isn't
+          ``license_number``.
+
+    ``self.manifest`` is set by ``ManifestPipeline`` when incremental mode is
+    on; until then every call is a no-op.
+    """
+
+    manifest = None
+
+    def manifest_key(self, item):
+        """Listing-level key of a built item (default ``license_number``)."""
+        return item.get("license_number")
+
+    def _manifest_pending(self):
+        pending = self.__dict__.get("_manifest_fps")
+        if pending is None:
+            pending = self.__dict__["_manifest_fps"] = {}
+        return pending
+
+    def _manifest_stat(self, key):
+        stats = getattr(getattr(self, "crawler", None), "stats", None)
+        if stats is not None:
+            stats.inc_value(f"manifest/{key}")
+
+    def manifest_reuse(self, key, row):
+        """Return the stored item for an unchanged listing row, else ``None``."""
+        if self.manifest is None or key is None:
+            return None
+        fp = fingerprint(row)
+        stored = self.manifest.lookup(key, fp)
+        if stored is not None:
+            self._manifest_stat("reused")
+            return item_from_manifest(stored)
+        self._manifest_pending()[str(key)] = fp
+        self._manifest_stat("fetched")
+        return None
+
+    def manifest_forget(self, key):
+        """Don't record the item emitted for ``key`` (it is incomplete)."""
+        if key is not None:
+            self._manifest_pending().pop(str(key), None)
+
+    def manifest_capture(self, item):
+        """Record a freshly built item under its pending fingerprint, if any.
+
+        Called by ``ManifestPipeline``; an item re-emitted from the manifest has
+        no pending fingerprint and is left as stored.
+        """
+        if self.manifest is None:
+            return False
+        key = self.manifest_key(item)
+        if key is None:
+            return False
+        fp = self._manifest_pending().pop(str(key), None)
+        if fp is None:
+            return False
+        self.manifest.record(key, fp, ItemAdapter(item).asdict())
+        self._manifest_stat("recorded")
+        return True
@@ -125,6 +125,12 @@ class ProxyPoolMiddleware:
     their own slot. An already-assigned proxy (a retry) is never reassigned, so a
     request rides out its slot's rate-limit cooldown on the same IP.
 
+    Every pooled response/exception is also reported to the pool
+    (``pool.record``): with health scoring enabled (``ProxyHealth``) that drives
+    the weighted pick and quarantine, logged at WARNING when it trips. A request
+    flagged ``meta['proxy_repin']`` lets the pool move its affinity key off a
+    quarantined proxy.
+
     Must run **before** ``HttpProxyMiddleware`` (default order 750) so the proxy
     it sets is honored; register it at a lower order (see settings).
 
@@ -159,6 +165,7 @@ class ProxyPoolMiddleware:
         self._err_types = {}
         self._err_types_last = {}
         self._pool_ids = []
+        self._health = None
         self._report_task = None
 
     @classmethod
@@ -190,7 +197,9 @@ class ProxyPoolMiddleware:
             return None
         affinity = request.meta.get("proxy_affinity")
         if affinity is not None:
-            proxy_id, proxy_url = pool.for_key(affinity)
+            proxy_id, proxy_url = pool.for_key(
+                affinity, repin=bool(request.meta.get("proxy_repin"))
+            )
         else:
             proxy_id, proxy_url = pool.next_rotating()
         request.meta["proxy"] = proxy_url
@@ -211,22 +220,51 @@ class ProxyPoolMiddleware:
         if pid in self._counts:
             if 200 <= response.status < 300:
                 self._count(pid, "ok")
+                # download_latency is the handler's own timing (connect to
+                # last byte), so it excludes time spent queued behind the slot
+                # delay.
+                self._record(spider, pid, "ok",
+                             response.meta.get("download_latency"), response)
             elif response.status == 403:
                 self._count(pid, "blk")
+                self._record(spider, pid, "blk", response=response)
             else:
                 self._count(pid, "oth")
+                if response.status >= 500 or response.status == 429:
+                    self._record(spider, pid, "err", response=response)
         return response
 
     def process_exception(self, request, exception, spider):
         pid = request.meta.get("download_slot")
         if pid in self._counts:
             self._count(pid, "err")
+            self._record(spider, pid, "err")
             etype = type(exception).__name__
             self._err_types[etype] = self._err_types.get(etype, 0) + 1
             if self.stats is not None:
                 self.stats.inc_value(f"proxy_pool/exception/{etype}")
         return None
 
+    def _record(self, spider, proxy_id, outcome, latency=None, response=None):
+        """Feed an outcome to the pool's health scorer (if it has one) and
+        surface a quarantine when it trips one. A response replayed from
+        HTTPCACHE never went through the proxy, so it isn't scored."""
+        pool = getattr(spider, "proxy_pool", None)
+        if not pool or getattr(pool, "health", None) is None:
+            return
+        if response is not None and "cached" in response.flags:
+            return
+        if pool.record(proxy_id, outcome, latency):
+            self.logger.warning(
+                "[proxy-pool] %s quarantined for %ds after %d consecutive "
+                "failures — routing its traffic to the other proxies.",
+                proxy_id,
+                int(pool.health.cooloff),
+                pool.health.fail_threshold,
+            )
+            if self.stats is not None:
+                self.stats.inc_value(f"proxy_pool/{proxy_id}/quarantined")
+
     def _bucket(self, proxy_id):
         return self._counts.setdefault(
             proxy_id, {"req": 0, "ok": 0, "blk": 0, "oth": 0, "err": 0}
@@ -253,6 +291,7 @@ class ProxyPoolMiddleware:
         if not pool:
             return
         self._pool_ids = list(pool.ids)
+        self._health = getattr(pool, "health", None)
         for pid in self._pool_ids:
             self._bucket(pid)
         if self.interval and self.interval > 0:
@@ -282,7 +321,10 @@ class ProxyPoolMiddleware:
             self._last[pid] = dict(self._bucket(pid))
             for k in totals:
                 totals[k] += delta.get(k, 0)
-            parts.append(f"{pid} {delta['ok']}/{delta['blk']}/{delta['err']}")
+            part = f"{pid} {delta['ok']}/{delta['blk']}/{delta['err']}"
+            if self._health is not None and self._health.is_quarantined(pid):
+                part += " (quarantined)"
+            parts.append(part)
             if delta["ok"] == 0 and (delta["req"] >= 2 or delta["err"] or delta["blk"]):
                 quiet.append((pid, delta["req"], delta["err"], delta["blk"]))
         # Break the window's err count down by exception class so the log says
@@ -373,6 +415,21 @@ class RateLimitBackoffMiddleware:
     * ``RATELIMIT_BACKOFF_TIMEOUT_EXCEPTIONS`` (list of exception class names,
       default ``["TimeoutError", "TCPTimedOutError"]``); the timeout path fires
       only for requests carrying ``meta['timeout_backoff']``.
+
+    With ``RATELIMIT_AIMD_ENABLED`` the delay a slot returns to after a
+    cooldown is no longer the fixed configured one but a learned one
+    (:class:`provider_scrape.adaptive_delay.AimdDelay`): a streak of clean 2xx
+    responses tightens it by a step, every trip (403 or opted-in timeout)
+    multiplies it, and the learned values are saved at spider close so the next
+    run starts from them. Settings:
+
+    * ``RATELIMIT_AIMD_ENABLED`` (bool, default False)
+    * ``RATELIMIT_AIMD_MIN_DELAY`` / ``RATELIMIT_AIMD_MAX_DELAY`` (seconds,
+      default 1 / 300) — the learned delay stays in this range
+    * ``RATELIMIT_AIMD_STEP`` (seconds, default 1) — additive tightening
+    * ``RATELIMIT_AIMD_CLEAN_STREAK`` (int, default 20) — clean responses per step
+    * ``RATELIMIT_AIMD_BACKOFF`` (factor, default 2) — multiplicative backoff
+    * ``RATELIMIT_AIMD_STATE`` (path, default none = don't persist)
     """
 
     def __init__(self, crawler):
@@ -410,10 +467,36 @@ class RateLimitBackoffMiddleware:
                 ["TimeoutError", "TCPTimedOutError"],
             )
         )
+        self.aimd = None
+        if self.enabled and s.getbool("RATELIMIT_AIMD_ENABLED", False):
+            from provider_scrape.adaptive_delay import AimdDelay
+
+            self.aimd = AimdDelay(
+                min_delay=s.getfloat("RATELIMIT_AIMD_MIN_DELAY", 1.0),
+                max_delay=s.getfloat("RATELIMIT_AIMD_MAX_DELAY", 300.0),
+                step=s.getfloat("RATELIMIT_AIMD_STEP", 1.0),
+                backoff=s.getfloat("RATELIMIT_AIMD_BACKOFF", 2.0),
+                clean_streak=s.getint("RATELIMIT_AIMD_CLEAN_STREAK", 20),
+                state_path=s.get("RATELIMIT_AIMD_STATE") or None,
+            )
+        # download-slot key -> AIMD key, once the slot has been primed with its
+        # starting (learned) delay.
+        self._aimd_slots = {}
 
     @classmethod
     def from_crawler(cls, crawler):
-        return cls(crawler)
+        mw = cls(crawler)
+        if mw.aimd is not None:
+            crawler.signals.connect(mw._save_aimd, signal=signals.spider_closed)
+        return mw
+
+    def _save_aimd(self, spider=None):
+        try:
+            self.aimd.save()
+        except OSError as e:
+            logging.getLogger(__name__).warning(
+                "Could not save learned rate-limit delays to %s: %s",
+                self.aimd.state_path, e)
 
     def _domain_matches(self, request):
         if not self.domains:
@@ -422,6 +505,17 @@ class RateLimitBackoffMiddleware:
         return any(d in host for d in self.domains)
 
     def process_response(self, request, response, spider):
+        # A response replayed from HTTPCACHE never reached the origin: it says
+        # nothing about the rate limit, so it neither trains (or persists) the
+        # AIMD delay nor triggers a cooldown -- retrying would replay it anyway.
+        if "cached" in response.flags:
+            return response
+        if (
+            self.aimd is not None
+            and 200 <= response.status < 300
+            and self._domain_matches(request)
+        ):
+            self._aimd_success(request, spider)
         if (
             not self.enabled
             or response.status not in self.codes
@@ -429,6 +523,7 @@ class RateLimitBackoffMiddleware:
         ):
             return response
 
+        self._aimd_trip(request, spider)
         retries = request.meta.get("ratelimit_retries", 0)
         if retries >= self.max_retries:
             spider.logger.error(
@@ -437,9 +532,11 @@ class RateLimitBackoffMiddleware:
                 request.url,
                 retries,
             )
+            self._inc_stat("ratelimit/gave_up/http")
             return response
 
         slot_key = self._pause_slot(request, self.cooldown)
+        self._inc_stat("ratelimit/backoff/http")
         spider.logger.warning(
             "Rate-limit %s on %s — pausing slot %r for %.0fs, then retry %d/%d.",
             response.status,
@@ -475,6 +572,7 @@ class RateLimitBackoffMiddleware:
         ):
             return None
 
+        self._aimd_trip(request, spider)
         retries = request.meta.get("timeout_retries", 0)
         if retries >= self.timeout_max_retries:
             spider.logger.warning(
@@ -485,9 +583,11 @@ class RateLimitBackoffMiddleware:
             )
             # Stop the retry here rather than letting RetryMiddleware add more.
             request.meta["dont_retry"] = True
+            self._inc_stat("ratelimit/gave_up/timeout")
             return None
 
         slot_key = self._pause_slot(request, self.timeout_cooldown)
+        self._inc_stat("ratelimit/backoff/timeout")
         spider.logger.info(
             "Timeout on %s — origin likely saturated; pausing slot %r for %.0fs, "
             "then retry %d/%d.",
@@ -502,6 +602,87 @@ class RateLimitBackoffMiddleware:
             dont_filter=True,
         )
 
+    def _slot(self, request):
+        """``(slot_key, slot)`` for the request's download slot; either may be
+        ``None`` when there is no engine/downloader or no slot yet."""
+        engine = getattr(self.crawler, "engine", None)
+        downloader = getattr(engine, "downloader", None)
+        if downloader is None:
+            return None, None
+        slot_key = downloader.get_slot_key(request)
+        return slot_key, downloader.slots.get(slot_key)
+
+    @staticmethod
+    def _aimd_key(request):
+        """Host, plus the egress proxy's host:port when there is one -- the
+        limit is per IP, and proxy ids (slot keys) are reassigned between runs.
+        """
+        key = (urlparse(request.url).hostname or "").lower()
+        proxy = request.meta.get("proxy")
+        if proxy:
+            parts = urlparse(proxy)
+            key += f"|{parts.hostname}:{parts.port}"
+        return key
+
+    def _aimd_slot(self, request):
+        """The request's slot, primed on first sight with its starting delay."""
+        slot_key, slot = self._slot(request)
+        if slot is None:
+            return None, None, None
+        key = self._aimd_slots.get(slot_key)
+        if key is None:
+            key = self._aimd_slots[slot_key] = self._aimd_key(request)
+            saved = getattr(slot, "_ratelimit_saved", None)
+            configured = saved[0] if saved is not None else slot.delay
+            self._apply_delay(slot, self.aimd.start(key, configured))
+        return slot_key, slot, key
+
+    @staticmethod
+    def _apply_delay(slot, delay):
+        # Mid-cooldown, change what the slot will be restored to, not the pause.
+        saved = getattr(slot, "_ratelimit_saved", None)
+        if saved is not None:
+            slot._ratelimit_saved = (delay, saved[1])
+        else:
+            slot.delay = delay
+
+    def _aimd_success(self, request, spider):
+        slot_key, slot, key = self._aimd_slot(request)
+        if slot is None:
+            return
+        delay = self.aimd.on_success(key)
+        if delay is not None:
+            self._apply_delay(slot, delay)
+            self._aimd_stat(slot_key, delay)
+            spider.logger.debug(
+                "AIMD: %d clean responses on slot %r — delay tightened to %.1fs.",
+                self.aimd.clean_streak, slot_key, delay)
+
+    def _aimd_trip(self, request, spider):
+        if self.aimd is None:
+            return
+        slot_key, slot, key = self._aimd_slot(request)
+        if slot is None:
+            return
+        delay = self.aimd.on_trip(key)
+        self._apply_delay(slot, delay)
+        self._aimd_stat(slot_key, delay)
+        spider.logger.info(
+            "AIMD: rate-limit trip on slot %r — delay backed off to %.1fs.",
+            slot_key, delay)
+
+    def _aimd_stat(self, slot_key, delay):
+        stats = getattr(self.crawler, "stats", None)
+        if stats is not None:
+            stats.set_value(f"ratelimit/aimd/{slot_key}/delay", round(delay, 3))
+
+    def _inc_stat(self, key):
+        # Cooldown/give-up counts in the crawl stats (and so the metrics
+        # exporter): how often the slot had to back off, not just that it did.
+        stats = getattr(self.crawler, "stats", None)
+        if stats is not None:
+            stats.inc_value(key)
+
     def _pause_slot(self, request, cooldown):
         """Raise the request's download-slot delay for the cooldown window.
 
@@ -516,12 +697,7 @@ class RateLimitBackoffMiddleware:
         """
         from twisted.internet import reactor
 
-        engine = getattr(self.crawler, "engine", None)
-        downloader = getattr(engine, "downloader", None)
-        if downloader is None:
-            return None
-        slot_key = downloader.get_slot_key(request)
-        slot = downloader.slots.get(slot_key)
+        slot_key, slot = self._slot(request)
         if slot is None:
             return slot_key
 
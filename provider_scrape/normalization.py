@@ -18,14 +18,149 @@ Decisions honored (see ``data_cleanup_implementation_plan.md`` §3):
 
 Later tasks (03–08) fill in the individual steps; for now the orchestrators are
 no-ops so the pipeline can be wired in with zero behavior change.
+
+The hot per-value steps (status / facility-category lookups, date parsing,
+name title-casing) repeat heavily within a state -- the same few dozen status
+strings and date formats across 100k+ rows -- so their pure core is memoized
+in bounded LRU caches (see :func:`configure_memoization`). Only the computed
+*value* is cached: the "unmapped"/"unparseable" warnings are still logged on
+every call.
 """
+import functools
 import logging
 import re
+from collections import OrderedDict
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+# --------------------------------------------------------------------------- #
+# Memoization of the pure per-value helpers
+# --------------------------------------------------------------------------- #
+
+# Entries per memoized helper. Distinct values per state are in the hundreds
+# for statuses/types and the low thousands for dates and names, so this keeps
+# a whole state's working set while bounding memory on a 100k-row bulk state.
+DEFAULT_MEMO_SIZE = 4096
+
+
+_MISSING = object()
+
+
+class _Memoized:
+    """A pure helper behind a bounded LRU cache of its results.
+
+    ``configure(0)`` turns the cache off (every call computes); resizing starts
+    a fresh cache. Hit/miss counters accumulate across resizes.
+
+    Calling the instance looks the arguments up and computes on a miss.
+    :meth:`lookup` and :meth:`store` split the two, for a caller whose miss
+    path takes inputs that must not key the cache (see ``_parse_date``).
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.maxsize = None
+        self._cache = OrderedDict()
+        self._hits = self._misses = 0
+        functools.update_wrapper(self, func)
+
+    def configure(self, maxsize):
+        maxsize = max(0, int(maxsize))
+        if maxsize == self.maxsize:
+            return
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+
+    def clear(self):
+        self._cache = OrderedDict()
+
+    def lookup(self, key):
+        """The cached result for ``key``, or ``_MISSING``."""
+        if not self.maxsize:
+            return _MISSING
+        cache = self._cache
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            self._misses += 1
+        else:
+            self._hits += 1
+            try:
+                cache.move_to_end(key)
+            except KeyError:  # evicted meanwhile (another thread)
+                pass
+        return result
+
+    def store(self, key, result):
+        if not self.maxsize:
+            return
+        cache = self._cache
+        cache[key] = result
+        while len(cache) > self.maxsize:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+
+    def __call__(self, *args):
+        result = self.lookup(args)
+        if result is _MISSING:
+            result = self.func(*args)
+            self.store(args, result)
+        return result
+
+    def stats(self):
+        """``(hits, misses)`` since import."""
+        return self._hits, self._misses
+
+
+_MEMOIZED = {}
+
+
+def _memoized(name):
+    def decorate(func):
+        memo = _MEMOIZED[name] = _Memoized(func)
+        memo.configure(DEFAULT_MEMO_SIZE)
+        return memo
+    return decorate
+
+
+# Set once the caches have been sized for this process (see below).
+_memo_size = None
+
+
+def configure_memoization(maxsize=DEFAULT_MEMO_SIZE):
+    """Size every helper's cache to ``maxsize`` entries (0 disables them).
+
+    The caches are process-wide, so every spider of a multi-spider run
+    (``scripts/run_spiders.py``) shares them -- the helpers are pure, so that
+    is only a hit-rate question. So they are sized once per process, from the
+    project's ``NORMALIZE_MEMO_SIZE``: by ``run_spiders.py`` at start-up, or
+    else by the first ``NormalizationPipeline`` to open (see
+    :func:`ensure_memoization`). An unchanged size keeps the warm caches.
+    """
+    global _memo_size
+    _memo_size = max(0, int(maxsize))
+    for memo in _MEMOIZED.values():
+        memo.configure(_memo_size)
+
+
+def ensure_memoization(maxsize=DEFAULT_MEMO_SIZE):
+    """:func:`configure_memoization` unless this process already sized the
+    caches; returns the size in effect. A later, different ``maxsize`` (a
+    spider's ``custom_settings``) is ignored rather than resizing -- and so
+    clearing -- the caches under the spiders already running."""
+    if _memo_size is None:
+        configure_memoization(maxsize)
+    return _memo_size
+
+
+def memo_stats():
+    """``{helper: (hits, misses)}`` for every memoized helper."""
+    return {name: memo.stats() for name, memo in _MEMOIZED.items()}
+
+
 # --------------------------------------------------------------------------- #
 # Task 03 — whitespace & string hygiene
 # --------------------------------------------------------------------------- #
@@ -99,6 +234,11 @@ def title_case_name(value):
     """
     if not isinstance(value, str) or not value.isupper():
         return value
+    return _title_case(value)
+
+
+@_memoized("title_case_name")
+def _title_case(value):
     return " ".join(_title_token(t) for t in value.split())
 
 
@@ -115,9 +255,15 @@ DATE_FIELDS = ("status_date", "license_begin_date", "license_expiration")
 INSPECTION_DATE_FIELDS = ("date", "status_updated", "az_date_resolved",
                           "in_correction_date")
 
-# strptime patterns tried in order for purely numeric dates.
+# strptime patterns tried in order for purely numeric dates -- the slow path,
+# for whatever the shapes below don't recognize.
 _NUMERIC_DATE_PATTERNS = ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%Y/%m/%d")
 
+# A trailing clock time ("05/07/2026 08:42 AM", "... 14:30:00"), dropped so a
+# date+time timestamp normalizes to its date.
+_CLOCK_TIME = r"(?:\s+\d{1,2}:\d{2}(?::\d{2})?(?:\s*[AaPp][Mm])?)?"
+_CLOCK_TIME_RE = re.compile(r"\s+\d{1,2}:\d{2}(?::\d{2})?(?:\s*[AaPp][Mm])?$")
+
 # Month-name lookup covering full names and abbreviations, including the
 # AP-style "Sept." (4 letters, with period) seen in inspection dates. Keyed by
 # the lower-cased token with any trailing period removed.
@@ -139,6 +285,63 @@ _MONTH_NUMBERS = {
 # "Sept. 23, 2025" / "January 5, 2024" / "Dec 1, 2025".
 _MONTH_NAME_DATE_RE = re.compile(r"^([A-Za-z]+)\.?\s+(\d{1,2}),\s+(\d{4})$")
 
+# The fast path: each date shape as one precompiled regex (the clock-time
+# suffix baked in), yielding (year, month, day) strings. A shape only accepts
+# what the strptime patterns above accept, with the same result -- the
+# separator must repeat (``\2``), so ``2024-01/02`` still falls through.
+_DATE_SHAPES = (
+    # YYYY-MM-DD / YYYY/MM/DD
+    ("ymd", re.compile(r"^(\d{4})([-/])(\d{1,2})\2(\d{1,2})" + _CLOCK_TIME + "$"),
+     lambda m: (m.group(1), m.group(3), m.group(4))),
+    # M/D/YYYY / MM-DD-YYYY
+    ("mdy", re.compile(r"^(\d{1,2})([-/])(\d{1,2})\2(\d{4})" + _CLOCK_TIME + "$"),
+     lambda m: (m.group(4), m.group(1), m.group(3))),
+    # Sept. 23, 2025
+    ("month_name", re.compile(
+        r"^([A-Za-z]+)\.?\s+(\d{1,2}),\s+(\d{4})" + _CLOCK_TIME + "$"),
+     lambda m: (m.group(3), _MONTH_NUMBERS.get(m.group(1).lower()), m.group(2))),
+)
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# The shapes in trial order with shape ``i`` moved to the front, per ``i``.
+_SHAPE_ORDERS = tuple(
+    tuple(_DATE_SHAPES[j] + (j,) for j in [i] + [
+        k for k in range(len(_DATE_SHAPES)) if k != i])
+    for i in range(len(_DATE_SHAPES)))
+
+# (state, field) -> index into _DATE_SHAPES of the shape that parsed that
+# field's last value; tried first next time (a field keeps one format).
+_LEARNED_DATE_SHAPES = {}
+
+
+def _iso_date(year, month, day):
+    """``YYYY-MM-DD`` for valid calendar parts (strings or ints), else None."""
+    if month is None:
+        return None
+    year, month, day = int(year), int(month), int(day)
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return None
+    days = _DAYS_IN_MONTH[month - 1]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        days = 29
+    if day > days:
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _sniff_date(candidate, hint=None):
+    """Parse ``candidate`` with the first matching shape, the one learned for
+    ``hint`` first; None when no shape recognizes it."""
+    first = _LEARNED_DATE_SHAPES.get(hint, 0) if hint is not None else 0
+    for _, regex, parts, index in _SHAPE_ORDERS[first]:
+        match = regex.match(candidate)
+        if match is None:
+            continue
+        iso = _iso_date(*parts(match))
+        if iso is not None and hint is not None and index != first:
+            _LEARNED_DATE_SHAPES[hint] = index
+        return iso
+    return None
+
 
 def _parse_month_name_date(value: str):
     """Parse a 'Month D, YYYY' / 'Mon. D, YYYY' date; return datetime or None."""
@@ -154,7 +357,7 @@ def _parse_month_name_date(value: str):
         return None
 
 
-def normalize_date(value):
+def normalize_date(value, hint=None):
     """Convert a date string to ISO 8601 ``YYYY-MM-DD`` (date only).
 
     Handles ``M/D/YYYY``, ``MM/DD/YYYY``, ``YYYY-MM-DD``, ISO-with-time
@@ -164,21 +367,42 @@ def normalize_date(value):
 
     On an unparseable value the **original value is returned unchanged and a
     warning is logged** — we never silently drop or corrupt date data.
+
+    ``hint`` (``(state, field)``) lets a field's format, once seen, be tried
+    first for its next values; it never changes the result, so the parse is
+    memoized on ``value`` alone and the hint only consulted on a cache miss.
     """
-    if not isinstance(value, str):
+    if not isinstance(value, str) or not value.strip():
         return value
-    candidate = value.strip()
-    if not candidate:
+    parsed = _parse_date_core.lookup(value)
+    if parsed is _MISSING:
+        parsed = _parse_date(value, hint)
+        _parse_date_core.store(value, parsed)
+    if parsed is None:
+        logger.warning("normalize_date: could not parse date %r (left unchanged)",
+                       value)
         return value
+    return parsed
+
+
+def _parse_date(value, hint=None):
+    """The ISO ``YYYY-MM-DD`` form of a non-empty date string, or None.
+
+    Uncached; ``hint`` only orders the shapes tried (see ``normalize_date``).
+    """
+    candidate = value.strip()
     # ISO with a time component (e.g. "2025-10-01T06:00:00.000Z") -> date part.
     if "T" in candidate:
         candidate = candidate.split("T", 1)[0]
+    # Fast path: sniff the shape and build the ISO string directly, with no
+    # strptime attempts (each miss of which raises) and no datetime.
+    iso = _sniff_date(candidate, hint)
+    if iso is not None:
+        return iso
     # Drop a trailing clock time (e.g. "05/07/2026 08:42 AM" or "... 14:30:00")
     # so a date+time timestamp normalizes to its date. Month-name dates
     # ("Sept. 23, 2025") have no trailing clock time and are left untouched.
-    candidate = re.sub(
-        r"\s+\d{1,2}:\d{2}(?::\d{2})?(?:\s*[AaPp][Mm])?$", "", candidate
-    ).strip()
+    candidate = _CLOCK_TIME_RE.sub("", candidate).strip()
     for pattern in _NUMERIC_DATE_PATTERNS:
         try:
             return datetime.strptime(candidate, pattern).strftime("%Y-%m-%d")
@@ -187,9 +411,15 @@ def normalize_date(value):
     parsed = _parse_month_name_date(candidate)
     if parsed is not None:
         return parsed.strftime("%Y-%m-%d")
-    logger.warning("normalize_date: could not parse date %r (left unchanged)",
-                   value)
-    return value
+    return None
+
+
+@_memoized("normalize_date")
+def _parse_date_core(value):
+    """``_parse_date`` keyed on the value alone: its result never depends on
+    the hint, so ``normalize_date`` looks values up here and passes the hint
+    only on a miss (a :meth:`_Memoized.store` of the result)."""
+    return _parse_date(value)
 
 
 # --------------------------------------------------------------------------- #
@@ -363,7 +593,7 @@ def canonical_status(value):
     """
     if not isinstance(value, str):
         return value
-    canonical = STATUS_MAP.get(value.strip().lower())
+    canonical = _status_lookup(value)
     if canonical is None:
         logger.warning("canonical_status: unmapped status %r -> 'unknown'",
                        value)
@@ -371,6 +601,11 @@ def canonical_status(value):
     return canonical
 
 
+@_memoized("canonical_status")
+def _status_lookup(value):
+    return STATUS_MAP.get(value.strip().lower())
+
+
 # Authored source of truth: canonical facility category -> raw provider_type
 # values (the 73 distinct values from the Task 01 inventory). ``facility_category``
 # is an additive facet — ``provider_type`` keeps its exact state value (D2).
@@ -598,10 +833,7 @@ def facility_category_from_type(provider_type):
     """
     if not isinstance(provider_type, str):
         return None
-    key = re.sub(
-        r"\s*\(probation(?:al|ary)?\)$", "", provider_type.strip().lower()
-    )
-    category = FACILITY_CATEGORY_MAP.get(key)
+    category = _facility_category_lookup(provider_type)
     if category is None:
         logger.warning(
             "facility_category_from_type: unmapped provider_type %r -> 'other'",
@@ -610,6 +842,15 @@ def facility_category_from_type(provider_type):
     return category
 
 
+_PROBATION_SUFFIX_RE = re.compile(r"\s*\(probation(?:al|ary)?\)$")
+
+
+@_memoized("facility_category_from_type")
+def _facility_category_lookup(provider_type):
+    key = _PROBATION_SUFFIX_RE.sub("", provider_type.strip().lower())
+    return FACILITY_CATEGORY_MAP.get(key)
+
+
 # --------------------------------------------------------------------------- #
 # Task 07 — field collapse (state-specific -> common, additive D2)
 # --------------------------------------------------------------------------- #
@@ -687,7 +928,7 @@ def _coerce_bool(value):
     return bool(value)
 
 
-def collapse_state_fields(item: dict) -> dict:
+def collapse_state_fields(item: dict, collapse_map=None) -> dict:
     """Populate common fields from their single populated source field.
 
     Rules (plan §6, D2):
@@ -695,8 +936,18 @@ def collapse_state_fields(item: dict) -> dict:
       - Copy only when **exactly one** source field is populated (never guess).
       - Keep the source field in place (additive).
       - ``head_start`` is coerced to a boolean.
+
+    ``collapse_map`` defaults to ``FIELD_COLLAPSE_MAP``; a normalization plan
+    passes the subset whose source fields its state actually has.
     """
-    for common, sources in FIELD_COLLAPSE_MAP.items():
+    _collapse(item, FIELD_COLLAPSE_MAP if collapse_map is None else collapse_map)
+    return item
+
+
+def _collapse(item, collapse_map):
+    """``collapse_state_fields``; returns True if a common field was set."""
+    collapsed = False
+    for common, sources in collapse_map.items():
         if _is_present(item.get(common)):
             continue
         present = [item[src] for src in sources if _is_present(item.get(src))]
@@ -706,7 +957,8 @@ def collapse_state_fields(item: dict) -> dict:
         if common in _BOOLEAN_COLLAPSE_FIELDS:
             value = _coerce_bool(value)
         item[common] = value
-    return item
+        collapsed = True
+    return collapsed
 
 
 # --------------------------------------------------------------------------- #
@@ -826,80 +1078,241 @@ def parse_address_components(value):
     return (city, state, zip_code)
 
 
+# --------------------------------------------------------------------------- #
+# normalize_item's steps, and per-state plans of them
+# --------------------------------------------------------------------------- #
+#
+# Each step is ``step(item, state) -> bool`` (True when the step found a value
+# to work on). The factories take the fields a step covers, so a plan can
+# build a step over just the fields its state populates.
+
+def _whitespace_step(item, state):
+    # Every string/list value. ``inspections`` is handled separately (it is a
+    # list of dicts, not strings).
+    cleaned = False
+    for key, value in list(item.items()):
+        if key == "inspections":
+            continue
+        if isinstance(value, (str, list)):
+            item[key] = clean_whitespace(value)
+            cleaned = True
+    return cleaned
+
+
+def _name_case_step(fields):
+    def name_case(item, state):
+        found = False
+        for field in fields:
+            if item.get(field) is not None:
+                item[field] = title_case_name(item[field])
+                found = True
+        return found
+    return name_case
+
+
+def _collapse_step(collapse_map):
+    def collapse(item, state):
+        return _collapse(item, collapse_map)
+    return collapse
+
+
+def _date_step(fields):
+    def dates(item, state):
+        found = False
+        for field in fields:
+            if item.get(field) is not None:
+                item[field] = normalize_date(item[field], (state, field))
+                found = True
+        return found
+    return dates
+
+
+def _numeric_step(capacity, ages_served, coordinates):
+    def numeric(item, state):
+        found = False
+        if capacity and item.get(CAPACITY_FIELD) is not None:
+            item[CAPACITY_FIELD] = normalize_capacity(item[CAPACITY_FIELD])
+            found = True
+        if ages_served and item.get(AGES_SERVED_FIELD) is not None:
+            item[AGES_SERVED_FIELD] = normalize_ages_served(
+                item[AGES_SERVED_FIELD])
+            found = True
+        for coord in coordinates:
+            if item.get(coord) is not None:
+                item[coord] = normalize_coordinate(item[coord])
+                found = True
+        return found
+    return numeric
+
+
+def _status_step(item, state):
+    # Replaced in place (D4).
+    if item.get("status") is None:
+        return False
+    item["status"] = canonical_status(item["status"])
+    return True
+
+
+def _facility_category_step(item, state):
+    # Derived additively from provider_type (D2); provider_type itself is
+    # left untouched.
+    if item.get("provider_type") is None:
+        return False
+    item["facility_category"] = facility_category_from_type(
+        item["provider_type"])
+    return True
+
+
+def _address_step(item, state):
+    # Cleanup in place (D1) + best-effort component parse (additive, D2).
+    # Components are only set when clearly parsed and not already set. When
+    # the scraper already supplied all of city/state/zip (e.g. from structured
+    # source fields), skip the parse entirely: it can add nothing and would
+    # otherwise log a spurious "no ZIP" warning for a street-only `address`.
+    if item.get("address") is None:
+        return False
+    item["address"] = clean_address(item["address"])
+    already_have_components = all(
+        _is_present(item.get(key)) for key in ("city", "state", "zip"))
+    if item.get("address") and not already_have_components:
+        city, parsed_state, zip_code = parse_address_components(item["address"])
+        for key, parsed in (("city", city), ("state", parsed_state),
+                            ("zip", zip_code)):
+            if parsed is not None and not _is_present(item.get(key)):
+                item[key] = parsed
+    return True
+
+
+def compile_steps(fields=None):
+    """``[(name, step)]``: normalize_item's steps, in order, restricted to
+    the ones that can apply to an item whose fields are within ``fields``
+    (every step over every field when ``fields`` is None)."""
+    def has(field):
+        return fields is None or field in fields
+
+    steps = [("whitespace", _whitespace_step)]
+    names = tuple(f for f in NAME_FIELDS if has(f))
+    if names:
+        steps.append(("name_case", _name_case_step(names)))
+    # Only the common fields with a source the state has; the collapsed
+    # common fields feed none of the later steps.
+    collapse_map = {}
+    for common, sources in FIELD_COLLAPSE_MAP.items():
+        present = [src for src in sources if has(src)]
+        if present:
+            collapse_map[common] = present
+    if collapse_map:
+        steps.append(("collapse", _collapse_step(collapse_map)))
+    dates = tuple(f for f in DATE_FIELDS if has(f))
+    if dates:
+        steps.append(("dates", _date_step(dates)))
+    coordinates = tuple(f for f in COORDINATE_FIELDS if has(f))
+    if has(CAPACITY_FIELD) or has(AGES_SERVED_FIELD) or coordinates:
+        steps.append(("numeric", _numeric_step(
+            has(CAPACITY_FIELD), has(AGES_SERVED_FIELD), coordinates)))
+    if has("status"):
+        steps.append(("status", _status_step))
+    if has("provider_type"):
+        steps.append(("facility_category", _facility_category_step))
+    if has("address"):
+        steps.append(("address", _address_step))
+    return steps
+
+
+_ALL_STEPS = compile_steps()
+STEP_NAMES = tuple(name for name, _ in _ALL_STEPS)
+
+
 def normalize_item(item: dict, state: str) -> dict:
     """Apply all normalization steps to one provider item, in order.
 
     ``state`` is ``spider.name`` (e.g. ``"montana"``) and is the key into any
     per-state mapping tables. Mutates and returns the same ``dict``.
 
-    The processing order (filled in by later tasks) is:
-      1. whitespace / string hygiene
-      2. field collapse (state-specific -> common)
+    The processing order is:
+      1. whitespace / string hygiene (then name casing)
+      2. field collapse (state-specific -> common), before the format/vocab
+         steps so a collapsed value is format-normalized by them
       3. date normalization
       4. numeric / type normalization
       5. controlled vocabulary (status, facility_category)
       6. address cleanup + component parse
+
+    A :class:`NormalizationPlan` runs the same steps, minus the ones a
+    state's items never need.
     """
-    # 1. whitespace / string hygiene on every string/list value. ``inspections``
-    #    is handled separately (it is a list of dicts, not strings).
-    for key, value in list(item.items()):
-        if key == "inspections":
-            continue
-        if isinstance(value, (str, list)):
-            item[key] = clean_whitespace(value)
+    for _, step in _ALL_STEPS:
+        step(item, state)
+    return item
 
-    # Name casing on the explicit name-field allowlist only.
-    for field in NAME_FIELDS:
-        if item.get(field) is not None:
-            item[field] = title_case_name(item[field])
 
-    # 2. field collapse (state-specific -> common) before format/vocab steps,
-    #    so a collapsed value is then format-normalized by the steps below.
-    collapse_state_fields(item)
+class NormalizationPlan:
+    """``normalize_item`` compiled for one state's items.
 
-    # 3. date normalization -> ISO 8601.
-    for field in DATE_FIELDS:
-        if item.get(field) is not None:
-            item[field] = normalize_date(item[field])
+    Most states populate a few dozen of ``ProviderItem``'s fields, yet
+    ``normalize_item`` checks every name, date and coordinate field and every
+    ``FIELD_COLLAPSE_MAP`` source on every item. A plan keeps only the steps
+    (and, within a step, the fields) that the fields seen so far can reach --
+    learned from the first item, and widened whenever an item brings a field
+    the plan hasn't seen, so the result is always exactly ``normalize_item``'s.
 
-    # 4. numeric / type normalization.
-    if item.get(CAPACITY_FIELD) is not None:
-        item[CAPACITY_FIELD] = normalize_capacity(item[CAPACITY_FIELD])
-    if item.get(AGES_SERVED_FIELD) is not None:
-        item[AGES_SERVED_FIELD] = normalize_ages_served(
-            item[AGES_SERVED_FIELD])
-    for coord in COORDINATE_FIELDS:
-        if item.get(coord) is not None:
-            item[coord] = normalize_coordinate(item[coord])
-
-    # 5. controlled vocabulary. status is replaced in place (D4); the
-    #    facility_category facet is derived additively from provider_type (D2)
-    #    and provider_type itself is left untouched.
-    if item.get("status") is not None:
-        item["status"] = canonical_status(item["status"])
-    if item.get("provider_type") is not None:
-        item["facility_category"] = facility_category_from_type(
-            item["provider_type"])
-
-    # 6. address cleanup (in place, D1) + best-effort component parse (additive,
-    #    D2). Components are only set when clearly parsed and not already set.
-    #    When the scraper already supplied all of city/state/zip (e.g. from
-    #    structured source fields), skip the parse entirely: it can add nothing
-    #    and would otherwise log a spurious "no ZIP" warning for a street-only
-    #    `address`.
-    if item.get("address") is not None:
-        item["address"] = clean_address(item["address"])
-        already_have_components = all(
-            _is_present(item.get(key)) for key in ("city", "state", "zip"))
-        if item.get("address") and not already_have_components:
-            city, parsed_state, zip_code = parse_address_components(
-                item["address"])
-            for key, parsed in (("city", city), ("state", parsed_state),
-                                ("zip", zip_code)):
-                if parsed is not None and not _is_present(item.get(key)):
-                    item[key] = parsed
+    ``counts`` is how many items each step actually had a value to work on;
+    :meth:`report` summarizes it per run. Items normalized column-wise
+    (:meth:`run_batch`) count towards the same report.
+    """
 
-    return item
+    def __init__(self, state, fields=()):
+        self.state = state
+        self.fields = frozenset(fields)
+        self.steps = compile_steps(self.fields)
+        self.items = 0
+        self.widened = 0
+        self.counts = dict.fromkeys((name for name, _ in self.steps), 0)
+
+    def _widen(self, fields):
+        if not self.fields.issuperset(fields):
+            self.fields = self.fields.union(fields)
+            if self.items:
+                self.widened += 1
+            self.steps = compile_steps(self.fields)
+            for name, _ in self.steps:
+                self.counts.setdefault(name, 0)
+
+    def run(self, item):
+        """Normalize ``item`` in place; returns it."""
+        self._widen(item.keys())
+        counts = self.counts
+        for name, step in self.steps:
+            if step(item, self.state):
+                counts[name] += 1
+        self.items += 1
+        return item
+
+    def run_batch(self, rows):
+        """:func:`normalize_batch` over ``rows``, counted as :meth:`run`
+        would have counted them one by one; returns ``rows``."""
+        names = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        self._widen(names)
+        batch_counts = {}
+        normalize_batch(rows, self.state, batch_counts)
+        counts = self.counts
+        for name, count in batch_counts.items():
+            counts[name] += count
+        self.items += len(rows)
+        return rows
+
+    def report(self):
+        """One line: the steps run (with how many items each touched) and
+        the steps this state's items never need."""
+        ran = ", ".join(f"{name} {self.counts[name]}"
+                        for name in STEP_NAMES if name in self.counts)
+        skipped = ", ".join(name for name in STEP_NAMES
+                            if name not in self.counts) or "none"
+        return (f"{self.state}: {self.items} item(s), {len(self.fields)} "
+                f"field(s), plan widened {self.widened}x; steps run: {ran}; "
+                f"never needed: {skipped}")
 
 
 def normalize_inspection(inspection: dict, state: str) -> dict:
@@ -913,5 +1326,217 @@ def normalize_inspection(inspection: dict, state: str) -> dict:
             inspection[key] = clean_whitespace(value)
     for field in INSPECTION_DATE_FIELDS:
         if inspection.get(field) is not None:
-            inspection[field] = normalize_date(inspection[field])
+            inspection[field] = normalize_date(
+                inspection[field], (state, "inspections." + field))
     return inspection
+
+
+# --------------------------------------------------------------------------- #
+# Batch (columnar) normalization
+# --------------------------------------------------------------------------- #
+
+class _Missing:
+    """A field the row doesn't have at all (as opposed to one set to None)."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+# Fields ``normalize_item`` may add to an item, in the order it adds them.
+ADDED_FIELDS = tuple(FIELD_COLLAPSE_MAP) + (
+    "facility_category", "city", "state", "zip")
+
+# Result types safe to share between rows: a cached result is handed to
+# every row with the same input, so it must not be a mutable list/dict.
+_SHAREABLE = (str, int, float, bool, type(None), tuple)
+
+
+def _map_distinct(column, func):
+    """Replace each non-None cell of ``column`` with ``func(cell)``, calling
+    ``func`` once per distinct (type, value)."""
+    results = {}
+    for i, value in enumerate(column):
+        if value is None or value is MISSING:
+            continue
+        if value.__class__ is str:
+            key = value
+        else:
+            try:
+                key = (value.__class__, value)
+                hash(key)
+            except TypeError:
+                column[i] = func(value)
+                continue
+        try:
+            column[i] = results[key]
+        except KeyError:
+            result = func(value)
+            if isinstance(result, _SHAREABLE):
+                results[key] = result
+            column[i] = result
+
+
+def _present(value):
+    return value is not MISSING and _is_present(value)
+
+
+def _rows_with_values(columns):
+    """How many rows have a non-None value in at least one of ``columns``."""
+    return sum(1 for cells in zip(*columns)
+               if any(c is not None and c is not MISSING for c in cells))
+
+
+def normalize_columns(columns: dict, state: str, counts=None) -> dict:
+    """Apply ``normalize_item``'s steps to a batch of rows held as columns.
+
+    ``columns`` maps field name -> list of that field's value in each row
+    (all lists the same length; ``MISSING`` where a row lacks the field).
+    Each step runs once per column instead of once per item, and the pure
+    per-value helpers run once per distinct value in the column; the
+    cross-field steps (collapse, address components) walk the rows of just
+    the columns involved. The result is exactly what ``normalize_item`` gives
+    row by row, except that a warning about an unparseable value is logged
+    once per distinct value rather than once per row. Columns a step fills
+    in (``ADDED_FIELDS``) are created as needed. Mutates and returns
+    ``columns``; ``inspections`` is left alone, as in ``normalize_item``.
+
+    With a ``counts`` dict, it is filled in as a :class:`NormalizationPlan`
+    counts: step name -> how many rows that step had a value to work on
+    (only the steps the columns can reach).
+    """
+    rows = len(next(iter(columns.values()), ()))
+
+    def column(name):
+        if name not in columns:
+            columns[name] = [MISSING] * rows
+        return columns[name]
+
+    def count(name, fields):
+        if counts is not None:
+            present = [columns[f] for f in fields if f in columns]
+            if present:
+                counts[name] = _rows_with_values(present)
+
+    # 1. whitespace / string hygiene, then name casing.
+    if counts is not None:
+        strings = [values for name, values in columns.items()
+                   if name != "inspections"]
+        counts["whitespace"] = sum(
+            1 for cells in zip(*strings)
+            if any(isinstance(c, (str, list)) for c in cells))
+    for name, values in columns.items():
+        if name != "inspections":
+            _map_distinct(values, clean_whitespace)
+    count("name_case", NAME_FIELDS)
+    for field in NAME_FIELDS:
+        if field in columns:
+            _map_distinct(columns[field], title_case_name)
+
+    # 2. field collapse, row by row over the source columns present.
+    collapsed = set()
+    for common, sources in FIELD_COLLAPSE_MAP.items():
+        source_columns = [columns[src] for src in sources if src in columns]
+        if not source_columns:
+            continue
+        if counts is not None:
+            counts.setdefault("collapse", 0)
+        target = columns.get(common)
+        for i in range(rows):
+            if target is not None and _present(target[i]):
+                continue
+            present = [values[i] for values in source_columns
+                       if _present(values[i])]
+            if len(present) != 1:
+                continue
+            value = present[0]
+            if common in _BOOLEAN_COLLAPSE_FIELDS:
+                value = _coerce_bool(value)
+            if target is None:
+                target = column(common)
+            target[i] = value
+            collapsed.add(i)
+    if counts is not None and "collapse" in counts:
+        counts["collapse"] = len(collapsed)
+
+    # 3. dates.
+    count("dates", DATE_FIELDS)
+    for field in DATE_FIELDS:
+        if field in columns:
+            hint = (state, field)
+            _map_distinct(columns[field],
+                          lambda value: normalize_date(value, hint))
+
+    # 4. numeric / type normalization.
+    count("numeric", (CAPACITY_FIELD, AGES_SERVED_FIELD) + COORDINATE_FIELDS)
+    for field, func in ((CAPACITY_FIELD, normalize_capacity),
+                        (AGES_SERVED_FIELD, normalize_ages_served)):
+        if field in columns:
+            _map_distinct(columns[field], func)
+    for coord in COORDINATE_FIELDS:
+        if coord in columns:
+            _map_distinct(columns[coord], normalize_coordinate)
+
+    # 5. controlled vocabulary.
+    count("status", ("status",))
+    count("facility_category", ("provider_type",))
+    if "status" in columns:
+        _map_distinct(columns["status"], canonical_status)
+    if "provider_type" in columns:
+        categories = list(columns["provider_type"])
+        _map_distinct(categories, facility_category_from_type)
+        target = None
+        for i, provider_type in enumerate(columns["provider_type"]):
+            if provider_type is not None and provider_type is not MISSING:
+                if target is None:
+                    target = column("facility_category")
+                target[i] = categories[i]
+
+    # 6. address cleanup + component parse, once per distinct address.
+    count("address", ("address",))
+    if "address" in columns:
+        addresses = columns["address"]
+        _map_distinct(addresses, clean_address)
+        parsed_by_address = {}
+        for i, address in enumerate(addresses):
+            if not address or address is MISSING:
+                continue
+            if all(key in columns and _present(columns[key][i])
+                   for key in ("city", "state", "zip")):
+                continue
+            try:
+                parsed = parsed_by_address[address]
+            except KeyError:
+                parsed = parsed_by_address[address] = \
+                    parse_address_components(address)
+            except TypeError:  # an unhashable (non-string) address
+                parsed = parse_address_components(address)
+            for key, value in zip(("city", "state", "zip"), parsed):
+                if value is not None and not (
+                        key in columns and _present(columns[key][i])):
+                    column(key)[i] = value
+
+    return columns
+
+
+def normalize_batch(rows, state: str, counts=None):
+    """``normalize_item`` over a list of item dicts, through
+    ``normalize_columns`` (which fills in ``counts``, if given). Each dict is
+    updated in place, its fields in the same order ``normalize_item`` leaves
+    them. Returns ``rows``."""
+    names = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+    columns = {name: [row.get(name, MISSING) for row in rows] for name in names}
+    normalize_columns(columns, state, counts)
+    added = [(name, columns[name]) for name in ADDED_FIELDS if name in columns]
+    for i, row in enumerate(rows):
+        for name in row:
+            row[name] = columns[name][i]
+        for name, values in added:
+            if values[i] is not MISSING and name not in row:
+                row[name] = values[i]
+    return rows
@@ -0,0 +1,161 @@
+"""Dedicated process pool for CPU-bound PDF render + OCR, with backpressure.
+
+Maryland's inspection-report fallback renders a PDF page with pdfium and OCRs
+it with tesserocr. Offloading that with ``asyncio.to_thread`` shares the default
+thread pool with everything else and keeps the work under one GIL next to the
+reactor. :class:`OcrPool` instead runs it in a ``ProcessPoolExecutor`` (spawned,
+not forked, so no reactor/thread state is copied into the children), started
+lazily on the first submission and warmed by an optional per-process
+``initializer`` -- the spider uses that to build one tesserocr API per worker
+instead of one per call.
+
+Backpressure: the pool admits at most ``max_pending`` PDFs between "request
+yielded" and "OCR finished". The spider passes each OCR-bound request through
+:meth:`OcrPool.admit` before yielding it, and releases the slot once the OCR
+result -- or the download failure -- comes back. So a backlog of OCR work
+throttles further ~1 MB PDF fetches instead of piling bodies up in memory.
+The gate sits on the spider side on purpose: a request held back here was
+never handed to Scrapy, so it holds no ``CONCURRENT_REQUESTS`` slot. (Waiting
+in a downloader middleware would: Scrapy counts a request as active from the
+moment the downloader takes it, so a full pool would stall every other request
+too.) A held request is scheduled through the engine when a slot frees up.
+
+:class:`OcrResultCache` is a content-addressed store of OCR results keyed by
+the PDF's SHA-256 (plus a calibration tag), so a report seen in any earlier run
+is never rendered or OCR'd again -- whatever URL or session served it.
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+class OcrPool:
+    """A lazily started process pool with a bounded number of in-flight jobs.
+
+    ``schedule(request)`` hands a held request back to Scrapy once a slot frees
+    up (the spider passes one that calls ``crawler.engine.crawl``); without
+    one, :meth:`admit` never holds a request back.
+    """
+
+    def __init__(self, workers, max_pending=None, initializer=None, stats=None,
+                 schedule=None):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending or self.workers * 2))
+        self.initializer = initializer
+        self.stats = stats
+        self.schedule = schedule
+        self._executor = None
+        self._held = deque()
+        self.pending = 0
+
+    def _inc(self, key, count=1):
+        if self.stats is not None:
+            self.stats.inc_value(f"ocr_pool/{key}", count)
+
+    @property
+    def held(self):
+        """How many requests are waiting for a slot."""
+        return len(self._held)
+
+    def admit(self, request):
+        """Take a slot for OCR-bound ``request`` and return it to be yielded, or
+        hold it and return ``None`` while all ``max_pending`` slots are taken.
+
+        The slot is marked in ``meta["ocr_slot"]``; a retried copy of the
+        request (RetryMiddleware keeps meta) reuses it.
+        """
+        if self.pending < self.max_pending or self.schedule is None:
+            self.pending += 1
+            request.meta["ocr_slot"] = True
+            return request
+        self._held.append(request)
+        self._inc("backpressure_waits")
+        return None
+
+    def release(self):
+        """Return a slot taken by :meth:`admit` (safe to call once per slot).
+
+        With requests held, the slot passes straight to the oldest of them,
+        which is scheduled.
+        """
+        if self.pending <= 0:
+            return
+        if self._held:
+            request = self._held.popleft()
+            request.meta["ocr_slot"] = True
+            self.schedule(request)
+        else:
+            self.pending -= 1
+
+    def _ensure_started(self):
+        if self._executor is None:
+            logger.info(
+                "OcrPool: starting %d OCR worker process(es), up to %d PDF(s) "
+                "in flight", self.workers, self.max_pending)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        """Run picklable ``fn(*args)`` in a worker process and await its result."""
+        future = self._ensure_started().submit(fn, *args)
+        self._inc("submitted")
+        result = await asyncio.wrap_future(future)
+        self._inc("completed")
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            # Don't block the reactor on queued work; the crawl is over.
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._held.clear()
+
+
+class OcrResultCache:
+    """SQLite map of ``version:sha256(pdf)`` -> extracted text.
+
+    Stores definitive results only (an address, or ``""`` for "OCR ran and
+    found none"); the caller skips failures so they are retried next run. WAL
+    + a busy timeout, like the geocode cache, in case two runs share the file.
+    """
+
+    def __init__(self, path, version=""):
+        self.version = version
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_results ("
+            " pdf_key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at TEXT)"
+        )
+        self.conn.commit()
+
+    def key(self, pdf_bytes):
+        return f"{self.version}:{hashlib.sha256(pdf_bytes).hexdigest()}"
+
+    def get(self, key):
+        row = self.conn.execute(
+            "SELECT result FROM ocr_results WHERE pdf_key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key, result):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ocr_results (pdf_key, result, created_at)"
+            " VALUES (?, ?, ?)",
+            (key, result, datetime.now(timezone.utc).isoformat()),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,238 @@
+"""Learned search-area plans for spiders that enumerate by geography.
+
+Several sources can only be enumerated one area at a time: Kentucky answers
+one exact ZIP per search (2,800 of them, ~75% empty), Utah walks a list of
+~350 ZIPs, North Dakota a grid of distance-search nodes. Every run pays one
+request per empty area, week after week, to learn the same "nothing here".
+
+A :class:`PartitionPlan` remembers, per area key, what its last queries
+returned, and plans the next run from it:
+
+* **hot** -- areas that had providers last time, and areas never queried
+  before -- are always searched;
+* **cold** -- areas empty on their last ``COLD_AFTER`` queries -- are skipped,
+  except for a rotating slice of the stalest ones (1/``AUDIT_ROTATION`` of
+  them per run) re-checked at low priority, so a new provider in a
+  "known-empty" ZIP still surfaces within a few runs;
+* **audit** mode (``-a partition=audit``) searches every area, and re-learns
+  the whole plan;
+* **split / merge** -- for spiders whose searches have a result cap (North
+  Dakota's 100-result distance search) an area that came back capped is
+  planned as its children straight away, instead of re-running a search
+  known to saturate before splitting it live; once its children's combined
+  count drops back under the cap, the parent is planned again instead.
+
+Strictly opt-in, like the provider manifest: a spider mixes in
+:class:`PartitionPlannerMixin` and only plans when run with ``-a partition=1``
+(``run_spiders.sh -i`` passes it). Otherwise every area is searched as before
+and nothing is recorded. The plan is one SQLite file per spider next to the
+manifests (``<PROVIDER_MANIFEST_DIR>/<spider>.partitions.sqlite``).
+"""
+import logging
+import math
+import os
+import sqlite3
+import time
+
+from provider_scrape.manifest import _TRUTHY, manifest_path
+
+logger = logging.getLogger(__name__)
+
+# Consecutive empty answers before an area is treated as cold -- one empty
+# answer can be a transient hiccup; two in a row (a week apart) is a pattern.
+COLD_AFTER = 2
+# Every cold area is re-checked at least once every this many planned runs.
+AUDIT_ROTATION = 8
+# Scheduler priority of the cold re-checks: after all the areas that can
+# actually return data.
+COLD_PRIORITY = -10
+
+
+def partition_mode(spider):
+    """``"plan"``, ``"audit"`` or ``None`` from the spider's ``-a partition=``."""
+    value = str(getattr(spider, "partition", "") or "").strip().lower()
+    if value == "audit":
+        return "audit"
+    return "plan" if value in _TRUTHY else None
+
+
+def partition_path(directory, spider_name):
+    """Path of one spider's partition plan inside ``directory``."""
+    return manifest_path(directory, f"{spider_name}.partitions")
+
+
+class PartitionPlan:
+    """SQLite store of per-area search outcomes (see the module docstring).
+    ``clock`` is injectable for tests."""
+
+    def __init__(self, path, clock=time.time):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self._clock = clock
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS partition_areas ("
+            " area TEXT PRIMARY KEY,"
+            " hits INTEGER NOT NULL,"
+            " capped INTEGER NOT NULL DEFAULT 0,"
+            " empty_runs INTEGER NOT NULL DEFAULT 0,"
+            " last_queried REAL)"
+        )
+        self.conn.commit()
+        self.counts = {"hot": 0, "new": 0, "rechecked": 0, "skipped": 0,
+                       "split": 0, "merged": 0}
+
+    def __len__(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM partition_areas").fetchone()[0]
+
+    def _rows(self):
+        return {area: (hits, bool(capped), empty_runs, last_queried)
+                for area, hits, capped, empty_runs, last_queried in
+                self.conn.execute(
+                    "SELECT area, hits, capped, empty_runs, last_queried"
+                    " FROM partition_areas")}
+
+    def record(self, area, hits, capped=False):
+        """Store one search's outcome for ``area``."""
+        area = str(area)
+        row = self.conn.execute(
+            "SELECT empty_runs FROM partition_areas WHERE area = ?",
+            (area,)).fetchone()
+        empty_runs = 0
+        if not hits:
+            empty_runs = (row[0] if row else 0) + 1
+        self.conn.execute(
+            "INSERT OR REPLACE INTO partition_areas"
+            " (area, hits, capped, empty_runs, last_queried)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (area, int(hits), int(bool(capped)), empty_runs, self._clock()))
+        self.conn.commit()
+
+    def plan(self, areas, audit=False, children=None, cap=None):
+        """Return ``[(area, priority)]`` to search this run, hot areas first.
+
+        ``children(area)`` lists a capped area's sub-areas (or None when it
+        can't be split further); ``cap`` is the search's result cap, below
+        which a split area's children are merged back into it.
+        """
+        rows = self._rows()
+        self.counts = dict.fromkeys(self.counts, 0)
+        hot, cold = [], []
+
+        def expand(area, seen):
+            row = rows.get(area)
+            kids = children(area) if children and row and row[1] else None
+            if kids and area not in seen:
+                kid_rows = [rows.get(k) for k in kids]
+                if cap and all(kid_rows) and not any(r[1] for r in kid_rows) \
+                        and sum(r[0] for r in kid_rows) < cap:
+                    self.counts["merged"] += 1
+                    hot.append(area)
+                    return
+                self.counts["split"] += 1
+                for kid in kids:
+                    expand(kid, seen | {area})
+                return
+            if row is None:
+                self.counts["new"] += 1
+                hot.append(area)
+            elif row[0] or row[2] < COLD_AFTER:
+                self.counts["hot"] += 1
+                hot.append(area)
+            else:
+                cold.append((row[3] or 0, area))
+
+        for area in areas:
+            expand(str(area), frozenset())
+
+        if audit:
+            recheck = [area for _, area in cold]
+        else:
+            cold.sort()
+            share = math.ceil(len(cold) / AUDIT_ROTATION)
+            recheck = [area for _, area in cold[:share]]
+        self.counts["rechecked"] = len(recheck)
+        self.counts["skipped"] = len(cold) - len(recheck)
+        return ([(area, 0) for area in hot]
+                + [(area, 0 if audit else COLD_PRIORITY) for area in recheck])
+
+    def close(self):
+        self.conn.close()
+
+
+class PartitionPlannerMixin:
+    """Spider-side hooks for ``-a partition=1`` crawls.
+
+    Usage:
+        * inherit before ``scrapy.Spider``.
+        * build the search requests from ``self.partition_plan(areas)`` -- the
+          ``(area, priority)`` pairs to search this run (every area, priority
+          0, when planning is off). ``areas`` are string keys the spider can
+          rebuild a request from.
+        * call ``self.partition_record(area, hits)`` once an area's search has
+          answered (not on a failed one); pass ``capped=True`` when it hit the
+          result cap and was split.
+        * spiders with capped searches override :meth:`partition_children`
+          and set ``partition_cap``.
+    """
+
+    partition = None   # the -a partition=1|audit argument
+    partitions = None  # the PartitionPlan, while planning is on
+    partition_cap = None
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.partition_setup(crawler)
+        return spider
+
+    def partition_setup(self, crawler):
+        mode = partition_mode(self)
+        if mode is None:
+            return
+        from scrapy import signals
+
+        path = partition_path(
+            crawler.settings.get("PROVIDER_MANIFEST_DIR"), self.name)
+        self.partitions = PartitionPlan(path)
+        self.partition_audit = mode == "audit"
+        crawler.signals.connect(self._partition_close,
+                                signal=signals.spider_closed)
+
+    def partition_children(self, area):
+        """Sub-areas of a capped ``area``, or None (no splitting)."""
+        return None
+
+    def partition_plan(self, areas):
+        areas = list(areas)
+        if self.partitions is None:
+            return [(area, 0) for area in areas]
+        planned = self.partitions.plan(
+            areas, audit=getattr(self, "partition_audit", False),
+            children=self.partition_children, cap=self.partition_cap)
+        counts = self.partitions.counts
+        self.logger.info(
+            "Partition plan (%s): %d of %d area(s) to search -- %d hot, %d "
+            "new, %d cold re-checked, %d cold skipped, %d split, %d merged",
+            "audit" if getattr(self, "partition_audit", False) else "plan",
+            len(planned), len(areas), counts["hot"], counts["new"],
+            counts["rechecked"], counts["skipped"], counts["split"],
+            counts["merged"])
+        stats = getattr(getattr(self, "crawler", None), "stats", None)
+        if stats is not None:
+            for key, value in counts.items():
+                stats.set_value(f"partition/{key}", value)
+        return planned
+
+    def partition_record(self, area, hits, capped=False):
+        if self.partitions is not None:
+            self.partitions.record(area, hits, capped=capped)
+
+    def _partition_close(self, spider):
+        if spider is self and self.partitions is not None:
+            self.partitions.close()
+            self.partitions = None
@@ -5,9 +5,16 @@
 
 
 # useful for handling different item types with a single interface
+import scrapy
 from itemadapter import ItemAdapter
 
 from provider_scrape import normalization
+from provider_scrape.manifest import (
+    IncrementalManifestMixin,
+    ProviderManifest,
+    incremental_requested,
+    manifest_path,
+)
 
 
 class VaScrapePipeline:
@@ -15,12 +22,65 @@ class VaScrapePipeline:
         return item
 
 
+def _field_storage(item):
+    """The mapping to normalize ``item`` through, in place.
+
+    A dict is its own storage, and a ``scrapy.Item`` keeps its fields in a
+    plain dict (``_values``) -- normalizing that directly skips Item's per-key
+    field checks, which is safe because the steps only ever write
+    ``ProviderItem``/``InspectionItem`` fields. Any other item type (attrs,
+    dataclass, ...) goes through its ``ItemAdapter``, also in place.
+    """
+    if type(item) is dict:
+        return item
+    if isinstance(item, scrapy.Item):
+        values = getattr(item, "_values", None)
+        if type(values) is dict:
+            return values
+    return ItemAdapter(item)
+
+
+def _inspection_dict(inspection):
+    """``inspection`` as the plain dict exporters expect (a dict is reused)."""
+    if type(inspection) is dict:
+        return inspection
+    return ItemAdapter(inspection).asdict()
+
+
 class NormalizationPipeline:
     """Normalize each scraped item via the pure helpers in ``normalization``.
 
     Controlled by the ``NORMALIZE_ENABLED`` setting (default ``True``). When
     disabled the item is passed through untouched, which is how a
     non-normalized run is produced to recover raw values (decision D4).
+
+    ``NORMALIZE_MEMO_SIZE`` sizes the per-helper value caches (0 turns them
+    off). The caches are process-wide, so the size is a project setting,
+    applied once per process (see ``normalization.configure_memoization``);
+    a spider overriding it gets a warning, not a resize. Their hits/misses
+    over the spider's run are reported as ``normalize/memo/<helper>/hits|misses``
+    stats -- under a multi-spider run these include the other spiders'
+    lookups over the same period.
+
+    The item is normalized in place: no ``asdict()`` deep copy of the whole
+    item and no write-back of every field
+    (``scripts/bench_normalization_pipeline.py`` measures the difference).
+    Inspections come out as plain dicts, as they always have: the feed
+    exporters write a list field with ``str()``, and an ``InspectionItem``'s
+    repr would change the CSV ``inspections`` column. The pipelines before
+    this one (checkpoint, manifest) serialize their raw copy on the spot, so
+    they never see the normalized values.
+
+    Items a bulk-download spider already normalized column-wise (see
+    ``provider_scrape/batch_normalization.py``) skip ``normalize_item``; only
+    their inspections are normalized here.
+
+    Items run through a per-spider ``NormalizationPlan``: ``normalize_item``'s
+    steps restricted to the fields the spider's items actually carry. The
+    plan is also handed to the spider as ``spider.normalization_plan``, so a
+    bulk spider's column-wise batches count towards it. At close, how many
+    items each step touched is logged and reported as ``normalize/plan/<step>``
+    stats.
     """
 
     def open_spider(self, spider):
@@ -30,18 +90,131 @@ class NormalizationPipeline:
                 "NormalizationPipeline disabled (NORMALIZE_ENABLED=False); "
                 "items pass through untouched."
             )
+            return
+        wanted = spider.settings.getint(
+            "NORMALIZE_MEMO_SIZE", normalization.DEFAULT_MEMO_SIZE)
+        size = normalization.ensure_memoization(wanted)
+        if size != max(0, wanted):
+            spider.logger.warning(
+                "NORMALIZE_MEMO_SIZE=%d ignored: the normalization value "
+                "caches are shared by the whole process and already hold "
+                "%d entries each.", wanted, size)
+        self._memo_start = normalization.memo_stats()
+        self.plan = normalization.NormalizationPlan(spider.name)
+        spider.normalization_plan = self.plan
+
+    def close_spider(self, spider):
+        if not self.enabled:
+            return
+        stats = getattr(getattr(spider, "crawler", None), "stats", None)
+        hits = misses = 0
+        for name, (end_hits, end_misses) in normalization.memo_stats().items():
+            start_hits, start_misses = self._memo_start.get(name, (0, 0))
+            name_hits, name_misses = end_hits - start_hits, end_misses - start_misses
+            hits += name_hits
+            misses += name_misses
+            if stats is not None:
+                stats.set_value(f"normalize/memo/{name}/hits", name_hits)
+                stats.set_value(f"normalize/memo/{name}/misses", name_misses)
+        if hits + misses:
+            spider.logger.info(
+                "NormalizationPipeline: value caches answered %d of %d "
+                "lookups (%.0f%%).", hits, hits + misses,
+                100.0 * hits / (hits + misses))
+        if self.plan.items:
+            spider.logger.info("NormalizationPipeline plan: %s",
+                               self.plan.report())
+            if stats is not None:
+                stats.set_value("normalize/plan/fields", len(self.plan.fields))
+                for name, count in self.plan.counts.items():
+                    stats.set_value(f"normalize/plan/{name}", count)
 
     def process_item(self, item, spider):
         if not self.enabled:
             return item
-        adapter = ItemAdapter(item)
-        data = adapter.asdict()
-        data = normalization.normalize_item(data, spider.name)
-        if data.get("inspections"):
-            data["inspections"] = [
-                normalization.normalize_inspection(i, spider.name)
-                for i in data["inspections"]
+        fields = _field_storage(item)
+        prenormalized = getattr(spider, "prenormalized", None)
+        if prenormalized is not None and item in prenormalized:
+            prenormalized.discard(item)
+        else:
+            self.plan.run(fields)
+        inspections = fields.get("inspections")
+        if inspections:
+            fields["inspections"] = [
+                normalization.normalize_inspection(
+                    _inspection_dict(inspection), spider.name)
+                for inspection in inspections
             ]
-        for key, value in data.items():
-            adapter[key] = value
+        return item
+
+
+class CheckpointPipeline:
+    """Record each item in the spider's crash-safe checkpoint, if it has one.
+
+    A spider run with a checkpoint (Maryland's ``-a checkpoint``) opens a
+    :class:`~provider_scrape.checkpoint.CrawlCheckpoint` as ``spider.checkpoint``;
+    this stores every item under ``spider.checkpoint_key(item)`` so a resumed
+    run can re-emit it instead of fetching it again. Like ``ManifestPipeline``
+    it runs before normalization, so the stored (and replayed) item is raw.
+    Otherwise a pass-through.
+    """
+
+    def process_item(self, item, spider):
+        checkpoint = getattr(spider, "checkpoint", None)
+        if checkpoint is not None:
+            checkpoint.record_item(
+                spider.checkpoint_key(item), ItemAdapter(item).asdict())
+        return item
+
+
+class ManifestPipeline:
+    """Open the incremental-crawl manifest and record freshly built items.
+
+    Active only for a spider run with ``-a incremental=1``; otherwise (the
+    default) it is a pass-through. Runs *before* ``NormalizationPipeline`` so
+    the manifest stores raw scraped values -- a re-emitted item then goes
+    through normalization exactly like a freshly scraped one. See
+    ``provider_scrape/manifest.py``.
+    """
+
+    def open_spider(self, spider):
+        self.manifest = None
+        if not incremental_requested(spider):
+            return
+        if not isinstance(spider, IncrementalManifestMixin):
+            spider.logger.warning(
+                "ManifestPipeline: %s does not support incremental mode; "
+                "crawling every provider.", spider.name)
+            return
+        path = manifest_path(
+            spider.settings.get("PROVIDER_MANIFEST_DIR"), spider.name)
+        self.manifest = ProviderManifest(path)
+        spider.manifest = self.manifest
+        spider.logger.info(
+            "ManifestPipeline: incremental mode, %d known provider(s) in %s",
+            len(self.manifest), path)
+
+    def process_item(self, item, spider):
+        if self.manifest is not None:
+            spider.manifest_capture(item)
+        return item
+
+    def close_spider(self, spider):
+        if self.manifest is not None:
+            spider.manifest = None
+            self.manifest.close()
+
+
+class WorkQueuePipeline:
+    """Complete a distributed worker's work item with the item it produced.
+
+    Active only for a spider run with ``-a queue=...`` (``spider.work_queue``
+    set; see ``provider_scrape/work_queue.py``); otherwise a pass-through. Runs
+    *after* ``NormalizationPipeline``: the queue holds the final items, which
+    ``scripts/merge_work_queue.py`` writes out as they are.
+    """
+
+    def process_item(self, item, spider):
+        if getattr(spider, "work_queue", None) is not None:
+            spider.work_capture(item)
         return item
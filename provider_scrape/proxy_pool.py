@@ -18,12 +18,20 @@ Assignment has two modes:
 * **Rotating** (``next_rotating``): session-independent requests (detail GETs,
   PDFs) round-robin across the whole pool — where the throughput is won.
 
+Optionally (``health=``) the pool also scores each proxy from observed outcomes
+(:class:`ProxyHealth`): rotating picks are weighted by score instead of blind
+round-robin, a proxy that keeps failing is quarantined for a cool-off, and new
+sticky keys avoid quarantined proxies. With every proxy healthy the weighted
+pick degenerates to the same round-robin order.
+
 Proxy URLs carry credentials, so never log them; log the stable, cred-free slot
 id (``proxy_id``) instead.
 """
 import itertools
+import json
 import os
 import re
+import time
 from urllib.parse import quote, urlsplit, urlunsplit
 
 
@@ -73,10 +81,110 @@ def redact(proxy_url):
     return urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
 
 
+def host_port(endpoint):
+    """The cred-free ``host:port`` of a proxy URL or bare endpoint."""
+    if "://" not in endpoint:
+        endpoint = f"//{endpoint}"
+    return urlsplit(endpoint).netloc.rpartition("@")[2]
+
+
+# ProxyHealth tuning. EWMA weight of the newest outcome; consecutive failures
+# (timeouts/errors/403s, no success in between) that trigger a quarantine; how
+# long a quarantined proxy sits out; and the weight floor that keeps a degraded
+# (but not quarantined) proxy probed often enough to show it has recovered.
+HEALTH_ALPHA = 0.3
+QUARANTINE_FAILURES = 3
+QUARANTINE_SECONDS = 120.0
+MIN_WEIGHT = 0.05
+
+
+class ProxyHealth:
+    """Per-proxy EWMA latency, error rate and 403 rate, plus quarantine.
+
+    Fed by ``ProxyPoolMiddleware`` via :meth:`ProxyPool.record`. A proxy's
+    weight is ``(1 - error_rate) * (1 - block_rate)`` scaled by how its latency
+    compares with the pool's fastest, floored at ``MIN_WEIGHT``; a proxy with no
+    samples yet counts as healthy so it gets tried. ``QUARANTINE_FAILURES``
+    failures in a row take a proxy out of rotation for ``cooloff`` seconds.
+    """
+
+    def __init__(self, proxy_ids, alpha=HEALTH_ALPHA,
+                 fail_threshold=QUARANTINE_FAILURES, cooloff=QUARANTINE_SECONDS,
+                 clock=time.monotonic):
+        self.alpha = alpha
+        self.fail_threshold = max(1, int(fail_threshold))
+        self.cooloff = float(cooloff)
+        self.clock = clock
+        self._state = {
+            pid: {"latency": None, "err": 0.0, "blk": 0.0, "streak": 0,
+                  "until": 0.0, "quarantines": 0}
+            for pid in proxy_ids
+        }
+
+    def _ewma(self, old, sample):
+        return sample if old is None else old + self.alpha * (sample - old)
+
+    def record(self, proxy_id, outcome, latency=None):
+        """Fold one outcome -- ``"ok"``, ``"blk"`` (403) or ``"err"`` -- in.
+
+        Returns True when this outcome just put the proxy into quarantine.
+        """
+        state = self._state.get(proxy_id)
+        if state is None:
+            return False
+        state["err"] = self._ewma(state["err"], 1.0 if outcome == "err" else 0.0)
+        state["blk"] = self._ewma(state["blk"], 1.0 if outcome == "blk" else 0.0)
+        if outcome == "ok":
+            state["streak"] = 0
+            if latency is not None:
+                state["latency"] = self._ewma(state["latency"], float(latency))
+            return False
+        state["streak"] += 1
+        if state["streak"] < self.fail_threshold:
+            return False
+        state["streak"] = 0
+        state["until"] = self.clock() + self.cooloff
+        state["quarantines"] += 1
+        return True
+
+    def is_quarantined(self, proxy_id):
+        state = self._state.get(proxy_id)
+        return state is not None and state["until"] > self.clock()
+
+    def weight(self, proxy_id):
+        """Selection weight; 0 while quarantined."""
+        state = self._state[proxy_id]
+        if state["until"] > self.clock():
+            return 0.0
+        weight = (1.0 - state["err"]) * (1.0 - state["blk"])
+        if state["latency"]:
+            known = [s["latency"] for s in self._state.values() if s["latency"]]
+            weight *= min(known) / state["latency"]
+        return max(MIN_WEIGHT, weight)
+
+    def seed(self, proxy_id, latency):
+        """Start ``proxy_id`` from a measured latency (e.g. a pre-crawl probe)
+        instead of "unknown", so the first picks are already weighted."""
+        state = self._state.get(proxy_id)
+        if state is not None and latency:
+            state["latency"] = float(latency)
+
+    def snapshot(self, proxy_id):
+        """``{latency, err, blk, quarantined, quarantines}`` for reporting."""
+        state = self._state[proxy_id]
+        return {
+            "latency": state["latency"],
+            "err": state["err"],
+            "blk": state["blk"],
+            "quarantined": state["until"] > self.clock(),
+            "quarantines": state["quarantines"],
+        }
+
+
 class ProxyPool:
     """An ordered set of proxy endpoints with sticky and rotating assignment."""
 
-    def __init__(self, proxy_urls, proxy_ids=None):
+    def __init__(self, proxy_urls, proxy_ids=None, health=None):
         self._urls = list(proxy_urls)
         if not self._urls:
             raise ValueError("ProxyPool needs at least one proxy URL")
@@ -88,6 +196,17 @@ class ProxyPool:
         self._rotate = itertools.cycle(range(len(self._urls)))
         self._assign = itertools.cycle(range(len(self._urls)))
         self._affinity = {}
+        # Health-weighted selection (opt-in): a ProxyHealth over these ids, the
+        # smooth weighted round-robin accumulators, and sticky keys per proxy.
+        self.health = health
+        # proxy_id -> probed first-byte latency (seconds), from the report the
+        # pre-crawl probe writes (see load_pool); seeds ProxyHealth.
+        self.probe_latency = {}
+        # proxy_id -> cred-free host:port; used to match probe-report
+        # entries to slots.
+        self.endpoints = {i: host_port(u) for i, u in zip(self._ids, self._urls)}
+        self._current = [0.0] * len(self._urls)
+        self._pinned = [0] * len(self._urls)
 
     def __len__(self):
         return len(self._urls)
@@ -96,16 +215,84 @@ class ProxyPool:
     def ids(self):
         return list(self._ids)
 
+    def enable_health(self, **kwargs):
+        """Turn on health-weighted selection (``kwargs`` go to ProxyHealth).
+
+        Proxies with a probed latency start from it (see ``probe_latency``).
+        """
+        self.health = ProxyHealth(self._ids, **kwargs)
+        for proxy_id, latency in self.probe_latency.items():
+            self.health.seed(proxy_id, latency)
+        return self.health
+
+    def record(self, proxy_id, outcome, latency=None):
+        """Report a request outcome for ``proxy_id`` (no-op without health).
+
+        Returns True when it just quarantined the proxy.
+        """
+        if self.health is None:
+            return False
+        return self.health.record(proxy_id, outcome, latency)
+
+    def _weighted_index(self):
+        """Smooth weighted round-robin (nginx-style) over current weights.
+
+        Deterministic: each proxy accrues its weight every pick and the leader
+        pays back the total, so picks interleave in proportion to weight (equal
+        weights give plain round-robin). If every proxy is quarantined, the one
+        whose cool-off ends first is used rather than stalling the crawl.
+        """
+        weights = [self.health.weight(pid) for pid in self._ids]
+        total = sum(weights)
+        if not total:
+            return min(range(len(self._ids)),
+                       key=lambda i: self.health._state[self._ids[i]]["until"])
+        for i, weight in enumerate(weights):
+            self._current[i] += weight
+        best = max(range(len(weights)), key=lambda i: self._current[i])
+        self._current[best] -= total
+        return best
+
     def next_rotating(self):
-        """Return ``(proxy_id, proxy_url)`` for the next proxy, round-robin."""
-        i = next(self._rotate)
+        """Return ``(proxy_id, proxy_url)`` for the next proxy.
+
+        Round-robin, or weighted by health score when health is enabled.
+        """
+        i = self._weighted_index() if self.health else next(self._rotate)
         return self._ids[i], self._urls[i]
 
-    def for_key(self, key):
-        """Return ``(proxy_id, proxy_url)`` pinned to ``key`` (assigned once)."""
-        if key not in self._affinity:
-            self._affinity[key] = next(self._assign)
-        i = self._affinity[key]
+    def _assign_index(self):
+        if self.health is None:
+            return next(self._assign)
+        # Least-loaded proxy that isn't quarantined; ties go in pool order, so
+        # a healthy pool hands keys out round-robin exactly as before.
+        candidates = [i for i, pid in enumerate(self._ids)
+                      if not self.health.is_quarantined(pid)]
+        if not candidates:
+            return next(self._assign)
+        return min(candidates, key=lambda i: self._pinned[i])
+
+    def for_key(self, key, repin=False):
+        """Return ``(proxy_id, proxy_url)`` pinned to ``key`` (assigned once).
+
+        ``repin=True`` -- for a request that may safely change IP, e.g. one that
+        starts a fresh session -- moves the key off its proxy if that proxy is
+        quarantined and a healthy one exists.
+        """
+        i = self._affinity.get(key)
+        if i is None:
+            i = self._assign_index()
+        elif repin and self.health is not None \
+                and self.health.is_quarantined(self._ids[i]):
+            replacement = self._assign_index()
+            if self.health.is_quarantined(self._ids[replacement]):
+                return self._ids[i], self._urls[i]
+            self._pinned[i] -= 1
+            i = replacement
+        else:
+            return self._ids[i], self._urls[i]
+        self._affinity[key] = i
+        self._pinned[i] += 1
         return self._ids[i], self._urls[i]
 
 
@@ -132,20 +319,59 @@ def build_pool(endpoints, username=None, password=None, id_prefix="proxy"):
             url = f"http://{endpoint}"
         urls.append(url)
         ids.append(f"{id_prefix}-{i}")
-    return ProxyPool(urls, ids) if urls else None
+    if not urls:
+        return None
+    return ProxyPool(urls, ids)
+
+
+def health_report_path(env_path):
+    """Where the pre-crawl probe report for ``env_path`` lives: alongside it,
+    ``webshare.env`` -> ``webshare_health.json``."""
+    return os.path.splitext(env_path)[0] + "_health.json"
+
+
+def load_probe_latencies(report_path):
+    """``{endpoint: first-byte seconds}`` for the healthy proxies in a probe
+    report written by ``scripts/update_webshare_proxies.py --probe``; ``{}``
+    when the report is absent or unreadable."""
+    if not report_path or not os.path.exists(report_path):
+        return {}
+    try:
+        with open(report_path, "r", encoding="utf-8") as handle:
+            report = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    latencies = {}
+    for entry in report.get("proxies", []):
+        if entry.get("healthy") and entry.get("first_byte_ms"):
+            latencies[entry["endpoint"]] = entry["first_byte_ms"] / 1000.0
+    return latencies
 
 
 def load_pool(env_path=None, endpoints=None, username=None, password=None,
-              id_prefix="proxy"):
+              id_prefix="proxy", report_path=None):
     """Resolve pool config from an env file and/or explicit values.
 
     Explicit args win over env-file values. ``endpoints`` may be a raw string
     (comma/whitespace separated) or a list. Returns ``None`` when nothing is
     configured, so callers fall back to single-IP mode.
+
+    Probed latencies from ``report_path`` (default: the env file's
+    ``health_report_path``, if it exists) are attached as ``probe_latency``.
     """
     env = load_env_file(env_path) if env_path else {}
     user = username or env.get("webshare_proxy_username")
     pw = password or env.get("webshare_proxy_password")
     raw = endpoints if endpoints is not None else env.get("webshare_proxy_endpoints")
     endpoint_list = raw if isinstance(raw, (list, tuple)) else parse_endpoints(raw)
-    return build_pool(endpoint_list, user, pw, id_prefix=id_prefix)
+    pool = build_pool(endpoint_list, user, pw, id_prefix=id_prefix)
+    if pool is not None:
+        if report_path is None and env_path:
+            report_path = health_report_path(env_path)
+        latencies = load_probe_latencies(report_path)
+        pool.probe_latency = {
+            proxy_id: latencies[endpoint]
+            for proxy_id, endpoint in pool.endpoints.items()
+            if endpoint in latencies
+        }
+    return pool
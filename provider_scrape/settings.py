@@ -60,6 +60,10 @@ DOWNLOADER_MIDDLEWARES = {
     # unless a spider exposes a truthy `proxy_pool`. Must run before the built-in
     # HttpProxyMiddleware (750) so the proxy it sets is honored.
     "provider_scrape.middlewares.ProxyPoolMiddleware": 610,
+    # HTTP response cache (see HTTPCACHE_* below): the built-in middleware's
+    # slot, swapped for a subclass that never replays stored Set-Cookie headers.
+    "scrapy.downloadermiddlewares.httpcache.HttpCacheMiddleware": None,
+    "provider_scrape.httpcache.SessionSafeHttpCacheMiddleware": 900,
 }
 
 # Seconds between ProxyPoolMiddleware's per-IP activity reports (INFO). Only
@@ -71,20 +75,71 @@ PROXY_POOL_STATS_INTERVAL = 300.0
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-#EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-#}
+EXTENSIONS = {
+    # Vegas-style concurrency autotuner (per slot or global in-flight cap).
+    # Disabled unless a spider sets AUTOTUNE_ENABLED (e.g. maryland
+    # ``-a autotune=true``); bounds come from AUTOTUNE_MIN/MAX_CONCURRENCY.
+    "provider_scrape.extensions.ConcurrencyAutotuner": 500,
+    # Live per-spider/host/proxy metrics as OpenMetrics text (latency
+    # histograms, status codes, items/min, retries, queue depths, Playwright
+    # pages). Disabled unless METRICS_ENABLED; see below.
+    "provider_scrape.extensions.MetricsExporter": 510,
+    # No-progress watchdog: after STALLWATCH_WINDOWS windows with no responses
+    # or items it logs diagnostics, closes leaked Playwright pages, then closes
+    # the spider with "Retryable Error" so run_spiders.sh restarts it.
+    # Disabled unless a spider sets STALLWATCH_ENABLED (the Playwright
+    # spiders do, in custom_settings).
+    "provider_scrape.extensions.StallWatchdog": 520,
+}
+
+#STALLWATCH_ENABLED = True
+# 6 x 5 minutes: long enough that a slow-but-alive crawl (a minutes-long
+# browser callback, a big bulk export) never trips it.
+STALLWATCH_INTERVAL = 300
+STALLWATCH_WINDOWS = 6
+# One action per further stalled window (close_pages, reschedule, retry, close).
+STALLWATCH_ACTIONS = ["close_pages", "retry"]
+
+# MetricsExporter outputs (either or both). run_spiders.sh sets these per
+# spider when METRICS_DIR is exported. %(spider)s is the spider name.
+#METRICS_ENABLED = True
+#METRICS_TEXTFILE = "metrics/%(spider)s.prom"
+# Serve /metrics on the first free port in the range (like TELNETCONSOLE_PORT).
+#METRICS_PORT = [9410, 9450]
+#METRICS_INTERVAL = 15
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 ITEM_PIPELINES = {
+    # Crash-safe checkpoint (spiders run with -a checkpoint only; pass-through
+    # otherwise). Raw values, like the manifest, so a replay is normalized once.
+    "provider_scrape.pipelines.CheckpointPipeline": 240,
+    # Incremental-crawl manifest (-a incremental=1 only; pass-through
+    # otherwise). Before normalization so it stores raw scraped values.
+    "provider_scrape.pipelines.ManifestPipeline": 250,
     # Runs after item construction so exporters see normalized values.
     "provider_scrape.pipelines.NormalizationPipeline": 300,
+    # Distributed crawls (-a queue=... only; pass-through otherwise): the
+    # shared work queue collects the final, normalized items for the merger.
+    "provider_scrape.pipelines.WorkQueuePipeline": 350,
 }
 
 # Master switch for scrape-time normalization (data cleanup pipeline). Set to
 # False for a non-normalized run when raw scraped values are needed (D4).
 NORMALIZE_ENABLED = True
+# Entries in each normalization helper's value cache (status/type lookups,
+# date parsing, name casing); 0 disables the caches. The caches are shared by
+# every spider in a process, so this is applied once per process: set it here
+# or on the command line, not in a spider's custom_settings.
+NORMALIZE_MEMO_SIZE = 4096
+# Items per chunk for the bulk-download spiders' columnar normalization
+# (provider_scrape/batch_normalization.py); 0 normalizes them per item.
+NORMALIZE_BATCH_SIZE = 5000
+
+# Where ManifestPipeline keeps each spider's incremental-crawl manifest
+# (<dir>/<spider>.sqlite). Unset -> manifests/ at the repo root. Only used by a
+# spider run with -a incremental=1.
+#PROVIDER_MANIFEST_DIR = "manifests"
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
@@ -99,21 +154,33 @@ NORMALIZE_ENABLED = True
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
-# Enable and configure HTTP caching (disabled by default)
+# On-disk HTTP response cache with per-spider TTL + conditional revalidation
+# (provider_scrape/httpcache.py). The middleware is on for every spider but
+# caches nothing unless the spider sets a positive HTTPCACHE_TTL (seconds) in
+# its custom_settings. Stale entries are kept (EXPIRATION_SECS = 0) so they can
+# be revalidated with If-None-Match / If-Modified-Since instead of refetched.
+# Entries live under .scrapy/httpcache/<spider>/ (git-ignored); point
+# HTTPCACHE_DIR at an absolute path (e.g. -s HTTPCACHE_DIR=/data/httpcache) to
+# share it across checkouts/containers. Delete the directory to start cold.
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-#HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
-#HTTPCACHE_DIR = "httpcache"
-#HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+HTTPCACHE_ENABLED = True
+HTTPCACHE_POLICY = "provider_scrape.httpcache.TTLRevalidatePolicy"
+HTTPCACHE_TTL = 0
+HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_DIR = "httpcache"
+HTTPCACHE_GZIP = True
+HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
 
 # Set settings whose default value is deprecated to a future-proof value
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 FEED_EXPORT_ENCODING = "utf-8"
 
+# Native HTTP/1.1 for plain requests; Playwright is launched only on the first
+# request that sets meta["playwright"] (provider_scrape/handlers.py), so the
+# pure-API spiders never start a browser driver.
 DOWNLOAD_HANDLERS = {
-    "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
-    "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
+    "http": "provider_scrape.handlers.HybridDownloadHandler",
+    "https": "provider_scrape.handlers.HybridDownloadHandler",
 }
 PLAYWRIGHT_BROWSER_TYPE = "chromium"
 PLAYWRIGHT_LAUNCH_OPTIONS = {
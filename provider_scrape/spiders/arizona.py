@@ -128,11 +128,11 @@ class StealthContextMiddleware:
         return mw
 
     def spider_opened(self, spider):
-        from scrapy_playwright.handler import ScrapyPlaywrightDownloadHandler
+        from provider_scrape.handlers import playwright_handler_of
 
         handlers = spider.crawler.engine.downloader.handlers._handlers
-        handler = handlers.get("https")
-        if not isinstance(handler, ScrapyPlaywrightDownloadHandler):
+        handler = playwright_handler_of(handlers.get("https"))
+        if handler is None:
             spider.logger.warning(
                 "StealthContextMiddleware: scrapy-playwright handler not found; "
                 "stealth patches NOT applied."
@@ -161,6 +161,7 @@ class ArizonaSpider(scrapy.Spider):
     handle_httpstatus_list = [403]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "ROBOTSTXT_OBEY": False,
         "CONCURRENT_REQUESTS": 1,
         "CONCURRENT_REQUESTS_PER_DOMAIN": 1,
@@ -9,6 +9,7 @@ class ArkansasSpider(PlaywrightErrbackMixin, scrapy.Spider):
     start_urls = ["https://ardhslicensing.my.site.com/elicensing/s/search-provider/find-provider-cc?language=en_US&tab=CC"]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "DOWNLOAD_HANDLERS": {
             "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
             "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
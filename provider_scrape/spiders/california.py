@@ -3,8 +3,9 @@ import csv
 from io import StringIO
 
 from ..items import ProviderItem
+from ..batch_normalization import BatchNormalizationMixin
 
-class CaclSpider(scrapy.Spider):
+class CaclSpider(BatchNormalizationMixin, scrapy.Spider):
     name = 'california'
     allowed_domains = ['www.ccld.dss.ca.gov']
     start_urls = [
@@ -12,6 +13,13 @@ class CaclSpider(scrapy.Spider):
         'https://www.ccld.dss.ca.gov/transparencyapi/api/DownloadStateData?id=CHILDCAREHOMEmorethan8&GUID=8cdb2366-1db9-4977-bf5a-06ae048b824d'
     ]
 
+    custom_settings = {
+        # The bulk exports change at most daily: a re-run within a day (e.g. a
+        # run_spiders.sh retry) replays them from the HTTP cache, and after
+        # that they're revalidated (see provider_scrape/httpcache.py).
+        "HTTPCACHE_TTL": 24 * 60 * 60,
+    }
+
     def start_requests(self):
         headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
@@ -55,31 +63,34 @@ class CaclSpider(scrapy.Spider):
         # Use DictReader to easily parse the CSV into dictionaries
         reader = csv.DictReader(csv_file)
 
-        for row in reader:
-            provider = ProviderItem()
-            provider['source_state'] = "California"
-            provider['provider_type'] = row['Facility Type']
-            provider['license_number'] = row['Facility Number']
-            provider['provider_name'] = row['Facility Name']
-            provider['license_holder'] = row['Licensee']
-            provider['administrator'] = row['Facility Administrator']
-            provider['phone'] = row['Facility Telephone Number']
-            provider['address'] = f"{row['Facility Address']}, {row['Facility City']}, {row['Facility State']} {row['Facility Zip']}"
-            provider['county'] = row['County Name']
-            provider['ca_regional_office'] = row['Regional Office']
-            provider['capacity'] = row['Facility Capacity']
-            provider['status'] = row['Facility Status']
-            # Have this as CA specific for now, might be able to map it better later
-            provider['ca_license_first_date'] = row['License First Date']
-            provider['ca_closed_date'] = row['Closed Date']
-            provider['ca_citation_numbers'] = row['Citation Numbers']
-            provider['ca_all_visit_dates'] = row['All Visit Dates']
-            provider['ca_inspection_visit_dates'] = row['Inspection Visit Dates']
-            provider['ca_other_visit_dates'] = row['Other Visit Dates']
-            provider['ca_complaint_info'] = row['Complaint Info- Date, #Sub Aleg, # Inc Aleg, # Uns Aleg, # TypeA, # TypeB ...']
-            provider['ca_inspect_typea'] = row['Inspect TypeA']
-            provider['ca_inspect_typeb'] = row['Inspect TypeB']
-            provider['ca_other_typea'] = row['Other TypeA']
-            provider['ca_other_typeb'] = row['Other TypeB']
+        yield from self.normalized_batches(
+            self._build_provider(row) for row in reader)
 
-            yield provider
+    def _build_provider(self, row):
+        """One ``ProviderItem`` from a row of the export."""
+        provider = ProviderItem()
+        provider['source_state'] = "California"
+        provider['provider_type'] = row['Facility Type']
+        provider['license_number'] = row['Facility Number']
+        provider['provider_name'] = row['Facility Name']
+        provider['license_holder'] = row['Licensee']
+        provider['administrator'] = row['Facility Administrator']
+        provider['phone'] = row['Facility Telephone Number']
+        provider['address'] = f"{row['Facility Address']}, {row['Facility City']}, {row['Facility State']} {row['Facility Zip']}"
+        provider['county'] = row['County Name']
+        provider['ca_regional_office'] = row['Regional Office']
+        provider['capacity'] = row['Facility Capacity']
+        provider['status'] = row['Facility Status']
+        # Have this as CA specific for now, might be able to map it better later
+        provider['ca_license_first_date'] = row['License First Date']
+        provider['ca_closed_date'] = row['Closed Date']
+        provider['ca_citation_numbers'] = row['Citation Numbers']
+        provider['ca_all_visit_dates'] = row['All Visit Dates']
+        provider['ca_inspection_visit_dates'] = row['Inspection Visit Dates']
+        provider['ca_other_visit_dates'] = row['Other Visit Dates']
+        provider['ca_complaint_info'] = row['Complaint Info- Date, #Sub Aleg, # Inc Aleg, # Uns Aleg, # TypeA, # TypeB ...']
+        provider['ca_inspect_typea'] = row['Inspect TypeA']
+        provider['ca_inspect_typeb'] = row['Inspect TypeB']
+        provider['ca_other_typea'] = row['Other TypeA']
+        provider['ca_other_typeb'] = row['Other TypeB']
+        return provider
@@ -43,6 +43,7 @@ from urllib.parse import quote
 import scrapy
 
 from provider_scrape.items import InspectionItem, ProviderItem
+from provider_scrape.manifest import IncrementalManifestMixin
 
 BASE_URL = "https://www.211childcare.org"
 PROVIDER_URL = BASE_URL + "/providers/{}.json"
@@ -359,7 +360,7 @@ def rates_from_shifts(shifts):
     return out
 
 
-class ConnecticutSpider(scrapy.Spider):
+class ConnecticutSpider(IncrementalManifestMixin, scrapy.Spider):
     name = "connecticut"
     allowed_domains = ["www.211childcare.org"]
 
@@ -522,6 +523,13 @@ class ConnecticutSpider(scrapy.Spider):
             self.missing += 1
             return
 
+        # -a incremental=1: an unchanged provider record re-emits the last
+        # complete item and skips its Phase 3 inspection-detail fan-out.
+        cached = self.manifest_reuse(provider_id, data)
+        if cached is not None:
+            yield self._emit_provider(provider_id, cached)
+            return
+
         item = self._item_from_provider(data, provider_id)
         raw_inspections = data.get("inspections") or []
         summaries = self._summary_inspections(raw_inspections)
@@ -555,6 +563,11 @@ class ConnecticutSpider(scrapy.Spider):
                 errback=self.inspection_errback,
             )
 
+    def manifest_key(self, item):
+        """Key the manifest on the swept id: unlike ``license_number`` it is
+        present on every record (plan Sec 4.2)."""
+        return item.get("ct_provider_id")
+
     def _emit_provider(self, provider_id, item):
         self.sweep_ids.add(provider_id)
         self.emitted += 1
@@ -731,12 +744,14 @@ class ConnecticutSpider(scrapy.Spider):
                 self._merge_inspection_detail(provider_id, inspection_id, data)
             else:
                 self.inspection_detail_failures += 1
+                self.manifest_forget(provider_id)
                 self.logger.warning(
                     "Connecticut: inspection %s (provider %s) returned a null "
                     "detail body", inspection_id, provider_id,
                 )
         except Exception:
             self.inspection_detail_failures += 1
+            self.manifest_forget(provider_id)
             self.logger.exception(
                 "Connecticut: inspection %s detail failed to parse for "
                 "provider %s -- keeping the provider, dropping this "
@@ -749,6 +764,7 @@ class ConnecticutSpider(scrapy.Spider):
         provider_id = failure.request.meta.get("provider_id")
         inspection_id = failure.request.meta.get("inspection_id")
         self.inspection_detail_failures += 1
+        self.manifest_forget(provider_id)
         # Same contract as parse_inspection_detail: the logging must never be
         # what strands the parent, so the decrement stays outside the guard.
         try:
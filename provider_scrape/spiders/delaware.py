@@ -72,6 +72,7 @@ from urllib.parse import urlencode
 
 import scrapy
 
+from provider_scrape.batch_normalization import BatchNormalizationMixin
 from provider_scrape.items import InspectionItem, ProviderItem
 
 BASE_URL = "https://data.delaware.gov/resource"
@@ -389,7 +390,7 @@ def parse_portal_ids(data):
     return ids
 
 
-class DelawareSpider(scrapy.Spider):
+class DelawareSpider(BatchNormalizationMixin, scrapy.Spider):
     name = "delaware"
     allowed_domains = ["data.delaware.gov", "education.delaware.gov"]
 
@@ -475,11 +476,10 @@ class DelawareSpider(scrapy.Spider):
         )
 
         if phase == "providers":
-            for row in rows:
-                item = self._build_provider_item(row)
-                if item is not None:
-                    self.providers_emitted += 1
-                    yield item
+            items = [item for item in map(self._build_provider_item, rows)
+                     if item is not None]
+            self.providers_emitted += len(items)
+            yield from self.normalized_batches(items)
         else:
             self._accumulator(phase).extend(rows)
 
@@ -68,6 +68,7 @@ class FloridaSpider(scrapy.Spider):
     ]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "DOWNLOAD_HANDLERS": {
             "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
             "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
@@ -5,12 +5,14 @@ import scrapy
 from scrapy_playwright.page import PageMethod
 
 from ..items import ProviderItem
+from ..batch_normalization import BatchNormalizationMixin
 
 
-class IllinoisSpider(scrapy.Spider):
+class IllinoisSpider(BatchNormalizationMixin, scrapy.Spider):
     name = "illinois"
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "DOWNLOAD_HANDLERS": {
             "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
             "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
@@ -88,33 +90,36 @@ class IllinoisSpider(scrapy.Spider):
 
         dict_reader = csv.DictReader(csv_file)
 
-        for row in dict_reader:
-            # Consolidate language fields into a single list, filtering out empty values.
-            languages = [
-                lang
-                for lang in [
-                    row.get("Language1"),
-                    row.get("Language2"),
-                    row.get("Language3"),
-                ]
-                if lang
+        yield from self.normalized_batches(
+            self._build_provider(row) for row in dict_reader)
+
+    def _build_provider(self, row):
+        """One ``ProviderItem`` from a row of the export."""
+        # Consolidate language fields into a single list, filtering out empty values.
+        languages = [
+            lang
+            for lang in [
+                row.get("Language1"),
+                row.get("Language2"),
+                row.get("Language3"),
             ]
-
-            provider = ProviderItem()
-            provider["source_state"] = "Illinois"
-            provider["il_provider_id"] = row.get("ProviderID")
-            provider["provider_name"] = row.get("DoingBusinessAs")
-            provider["address"] = (
-                f"{row.get('Street')}, {row.get('City')}, CA {row.get('Zip')}"
-            )
-            provider["county"] = row.get("County")
-            provider["phone"] = row.get("Phone")
-            provider["il_facility_type"] = row.get("FacilityType")
-            provider["il_day_age_range"] = row.get("DayAgeRange")
-            provider["il_night_age_range"] = row.get("NightAgeRange")
-            provider["il_day_capacity"] = row.get("DayCapacity")
-            provider["il_night_capacity"] = row.get("NightCapacity")
-            provider["status"] = row.get("Status")
-            provider["languages"] = languages
-
-            yield provider
+            if lang
+        ]
+
+        provider = ProviderItem()
+        provider["source_state"] = "Illinois"
+        provider["il_provider_id"] = row.get("ProviderID")
+        provider["provider_name"] = row.get("DoingBusinessAs")
+        provider["address"] = (
+            f"{row.get('Street')}, {row.get('City')}, CA {row.get('Zip')}"
+        )
+        provider["county"] = row.get("County")
+        provider["phone"] = row.get("Phone")
+        provider["il_facility_type"] = row.get("FacilityType")
+        provider["il_day_age_range"] = row.get("DayAgeRange")
+        provider["il_night_age_range"] = row.get("NightAgeRange")
+        provider["il_day_capacity"] = row.get("DayCapacity")
+        provider["il_night_capacity"] = row.get("NightCapacity")
+        provider["status"] = row.get("Status")
+        provider["languages"] = languages
+        return provider
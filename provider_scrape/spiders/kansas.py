@@ -38,6 +38,7 @@ import re
 import scrapy
 
 from provider_scrape.items import InspectionItem, ProviderItem
+from provider_scrape.manifest import IncrementalManifestMixin
 
 SEARCH_URL = "https://khap.kdhe.ks.gov/OIDS/OIDS_Search.aspx"
 
@@ -204,7 +205,7 @@ def _cell_text(td):
     return "; ".join(texts) if texts else None
 
 
-class KansasSpider(scrapy.Spider):
+class KansasSpider(IncrementalManifestMixin, scrapy.Spider):
     """Spider for Kansas KDHE/KOEC child care licensing data (OIDS)."""
 
     name = "kansas"
@@ -312,9 +313,10 @@ class KansasSpider(scrapy.Spider):
                     token, values,
                 )
                 continue
-            _owner, _license_number, city, zip_raw, county, program_type = values[:6]
+            _owner, license_number, city, zip_raw, county, program_type = values[:6]
             rows.append({
                 "token": token,
+                "license_number": license_number,
                 "city": city,
                 "zip": zip_raw,
                 "county": county,
@@ -342,6 +344,17 @@ class KansasSpider(scrapy.Spider):
                 self.duplicate_rows += 1
                 continue
             self.seen.add(row["token"])
+            # -a incremental=1: an unchanged listing row re-emits the last
+            # complete item instead of minting + fetching its detail. The
+            # token is a grid control id, not provider data, so it's left out
+            # of the fingerprint.
+            cached = self.manifest_reuse(
+                row.get("license_number") or None,
+                {k: v for k, v in row.items() if k != "token"},
+            )
+            if cached is not None:
+                yield cached
+                continue
             yield self._mint_request(response, row)
 
         if len(rows) >= PAGE_SIZE:
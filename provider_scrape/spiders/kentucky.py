@@ -22,16 +22,30 @@ One endpoint, two Apex methods (``SSP_ChildCareProviderSearchController``):
     Keyed by ``(providerId, licenseNumber)`` -- both are required, or the
     connection resets exactly like the Sec 2.7 timeout (plan Sec 5.5).
 
+Both calls go through the shared Aura client (provider_scrape/aura.py):
+``-a batch=N`` packs N independent actions -- ZIP searches, or the detail
+lookups found by one response -- into one POST, retrying only the actions that
+come back in an ERROR state and refreshing a stale ``fwuid`` from the search
+page once for all of them.
+
+With ``-a partition=1`` the sweep is planned from the previous runs
+(provider_scrape/partition.py): ZIPs that came back empty twice in a row are
+only re-checked on a rotating, low-priority slice, so most runs search only
+the ~700 ZIPs that can return data.
+
 See tasks/kentucky_epic/kentucky_plan.md for the full recon writeup (a live,
 statewide 2,800-ZIP enumeration and a headless-browser audit of the search UI).
 """
 import json
 import re
-from urllib.parse import urlencode
+from itertools import groupby
 
 import scrapy
 
+from provider_scrape.aura import AuraClient
 from provider_scrape.items import InspectionItem, ProviderItem
+from provider_scrape.manifest import IncrementalManifestMixin
+from provider_scrape.partition import PartitionPlannerMixin
 
 AURA_URL = (
     "https://kynect.ky.gov/benefits/s/sfsites/aura"
@@ -46,7 +60,8 @@ AURA_PAGE_URI = "/benefits/s/child-care-provider?origin=program-page&language=en
 # Captured from a browser DevTools session against the search page on
 # 2026-08-20; Kentucky's org will bump this a few times a year on Salesforce
 # release upgrades (plan Sec 5.6). When it goes stale the endpoint answers
-# every action with an Aura ERROR state instead of data -- see closed().
+# with an aura:clientOutOfSync error instead of data; the Aura client then
+# re-reads the current one from SEARCH_PAGE_URL (once per run) -- see closed().
 FWUID = (
     "OUcwT3JDYUZld21JQ2ZOckR1VnppUWtVMjdnTGFERUU2S3FfSVdrcU92bkExNC4xOTIu"
     "ODM4ODYwOA"
@@ -63,7 +78,6 @@ AURA_CONTEXT = {
 }
 
 HEADERS = {
-    "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
     "Origin": "https://kynect.ky.gov",
     "Referer": f"{SEARCH_PAGE_URL}?origin=program-page&language=en_US",
 }
@@ -101,8 +115,9 @@ AGE_FLAGS = (
     ("SchoolAge", "school", "School Age"),
 )
 
-# An Aura ERROR state (plan Sec 5.2) is re-issued this many times before the
-# ZIP is given up on and logged as failed.
+# An action in an Aura ERROR state (plan Sec 5.2) is re-issued this many times
+# before its ZIP is given up on and logged as failed (or its provider is
+# emitted from the search summary alone).
 MAX_ERROR_RETRIES = 2
 
 # Baseline unique count (full live enumeration 2026-08-20: 2,010). Warn if a
@@ -110,14 +125,7 @@ MAX_ERROR_RETRIES = 2
 EXPECTED_MIN_PROVIDERS = 1800
 
 
-def _aura_body(message):
-    """URL-encode the four Aura form fields for one action envelope."""
-    return urlencode({
-        "message": json.dumps(message),
-        "aura.context": json.dumps(AURA_CONTEXT),
-        "aura.pageURI": AURA_PAGE_URI,
-        "aura.token": "null",
-    })
+APEX_CLASSNAME = "SSP_ChildCareProviderSearchController"
 
 
 def _num(value, cast=int):
@@ -205,7 +213,8 @@ def ages_from_flags(record):
     return ", ".join(labels) or None, flags
 
 
-class KentuckySpider(scrapy.Spider):
+class KentuckySpider(IncrementalManifestMixin, PartitionPlannerMixin,
+                     scrapy.Spider):
     name = "kentucky"
     allowed_domains = ["kynect.ky.gov"]
 
@@ -216,7 +225,10 @@ class KentuckySpider(scrapy.Spider):
         # 92% success (plan Sec 2.7). Four is the measured ceiling; the
         # default sits at 2 (Ryan, 2026-08-20) -- this is a state benefits
         # portal, and the extra time buys a comfortable margin under the
-        # deadline. Exposed as `-a concurrency=N` (see from_crawler).
+        # deadline. Exposed as `-a concurrency=N` (see from_crawler). The
+        # same deadline covers a whole batched POST (`-a batch=N`): its
+        # actions run one after another server-side, so batch searches only
+        # as far as the reset rate stays flat.
         "CONCURRENT_REQUESTS": 2,
         "CONCURRENT_REQUESTS_PER_DOMAIN": 2,
         "DOWNLOAD_DELAY": 0,
@@ -228,18 +240,28 @@ class KentuckySpider(scrapy.Spider):
         "ROBOTSTXT_OBEY": False,
     }
 
-    def __init__(self, zips=None, details=1, concurrency=2, *args, **kwargs):
+    def __init__(self, zips=None, details=1, concurrency=2, batch=1, *args,
+                 **kwargs):
         super().__init__(*args, **kwargs)
         self.zip_list = self._parse_zips(zips)
         self.do_details = str(details).strip().lower() not in ("0", "false")
         self.concurrency = int(concurrency)
+        self.aura = AuraClient(
+            self, AURA_URL, dict(AURA_CONTEXT), page_uri=AURA_PAGE_URI,
+            headers=HEADERS, batch_size=int(batch),
+            max_retries=MAX_ERROR_RETRIES, fwuid_url=SEARCH_PAGE_URL,
+        )
 
         self.seen = set()          # ProviderIds already emitted/scheduled
         self.zips_done = 0
         self.zips_with_hits = 0
         self.zips_failed = set()   # ZIPs that never resolved (Aura ERROR loop)
         self.detail_failures = 0
-        self.error_state_count = 0
+
+    @property
+    def error_state_count(self):
+        """Actions answered with a non-SUCCESS Aura state, retries included."""
+        return self.aura.error_states
 
     @classmethod
     def from_crawler(cls, crawler, *args, **kwargs):
@@ -281,82 +303,43 @@ class KentuckySpider(scrapy.Spider):
 
     # --- enumeration (search) ------------------------------------------- #
 
-    def _search_request(self, zip5, attempt=1):
+    def _search_action(self, zip5):
         query_data = {**QUERY_DATA_BASE, "zipCode5": f"{zip5:05d}"}
-        message = {"actions": [{
-            "id": "84;a",
-            "descriptor": "aura://ApexActionController/ACTION$execute",
-            "callingDescriptor": "UNKNOWN",
-            "params": {
-                "namespace": "",
-                "classname": "SSP_ChildCareProviderSearchController",
-                "method": "getChildCareProviderDetails",
-                "params": {"queryData": query_data},
-                "cacheable": False, "isContinuation": False,
-            },
-        }]}
-        return scrapy.Request(
-            AURA_URL,
-            method="POST",
-            body=_aura_body(message),
-            headers=HEADERS,
-            callback=self.parse_search,
-            errback=self.search_errback,
-            meta={"zip": zip5, "attempt": attempt},
-            dont_filter=True,
+        return self.aura.action(
+            APEX_CLASSNAME, "getChildCareProviderDetails",
+            {"queryData": query_data},
+            callback=self.parse_search, errback=self.search_failed, zip5=zip5,
         )
 
     def start_requests(self):
         self.logger.info(
-            "Kentucky: sweeping %d ZIP(s) (details=%s, concurrency=%d)",
-            len(self.zip_list), self.do_details, self.concurrency,
+            "Kentucky: sweeping %d ZIP(s) (details=%s, concurrency=%d, "
+            "batch=%d)", len(self.zip_list), self.do_details,
+            self.concurrency, self.aura.batch_size,
         )
-        for zip5 in self.zip_list:
-            yield self._search_request(zip5)
-
-    def search_errback(self, failure):
-        """A ZIP that exhausted RETRY_TIMES without a usable response -- the
-        default RetryMiddleware already covers the Sec 2.7 connection-reset
-        exceptions, so reaching here means every retry failed."""
-        zip5 = failure.request.meta.get("zip")
+        plan = self.partition_plan(f"{zip5:05d}" for zip5 in self.zip_list)
+        for priority, group in groupby(plan, key=lambda entry: entry[1]):
+            yield from self.aura.requests(
+                (self._search_action(int(zip5)) for zip5, _ in group),
+                priority=priority)
+
+    def search_failed(self, reason, zip5):
+        """A ZIP whose search never resolved: its POST exhausted RETRY_TIMES
+        (the default RetryMiddleware already covers the Sec 2.7 connection
+        resets, so reaching here means every retry failed), or the action
+        kept coming back in an Aura ERROR state."""
         self.zips_done += 1
         self.zips_failed.add(zip5)
         self.logger.warning(
-            "Kentucky: ZIP %05d search failed after all retries (%s) -- a "
-            "pocket of providers may be missing (plan Sec 2.7)",
-            zip5, failure.value,
+            "Kentucky: ZIP %05d search failed (%s) -- a pocket of providers "
+            "may be missing (plan Sec 2.7)", zip5, reason,
         )
         self._maybe_log_progress()
 
-    def parse_search(self, response):
-        zip5 = response.meta["zip"]
-        data = response.json()
-        # HTTP 200 does not mean the action succeeded -- Aura's real status
-        # is actions[0].state (plan Sec 5.2). HttpErrorMiddleware cannot help
-        # here since the transport-level response is always a 200.
-        action = (data.get("actions") or [{}])[0]
-        if action.get("state") != "SUCCESS":
-            self.error_state_count += 1
-            attempt = response.meta.get("attempt", 1)
-            if attempt <= MAX_ERROR_RETRIES:
-                self.logger.warning(
-                    "Kentucky: ZIP %05d search returned Aura state=%r "
-                    "(attempt %d/%d) -- re-issuing",
-                    zip5, action.get("state"), attempt, MAX_ERROR_RETRIES,
-                )
-                yield self._search_request(zip5, attempt=attempt + 1)
-                return
-            self.zips_failed.add(zip5)
-            self.zips_done += 1
-            self.logger.warning(
-                "Kentucky: ZIP %05d search gave up after %d Aura ERROR "
-                "responses in a row -- if this count is high across the "
-                "run, `fwuid` may have gone stale (plan Sec 5.6)",
-                zip5, attempt,
-            )
-            self._maybe_log_progress()
-            return
-
+    def parse_search(self, action, zip5):
+        """One SUCCESS search action (the Aura client has already dealt with
+        ERROR states -- HTTP 200 does not mean the action succeeded, plan
+        Sec 5.2)."""
         self.zips_done += 1
         payload = action.get("returnValue") or {}
         # A ZIP with no providers returns SUCCESS with no returnValue.
@@ -364,16 +347,15 @@ class KentuckySpider(scrapy.Spider):
         # is the normal answer for ~75% of the 2,800 ZIPs, so it is the quiet
         # path: no warning, no items, no requests.
         raw = payload.get("returnValue")
-        if not raw:
-            self._maybe_log_progress()
-            return
-
         # Unlike the detail call, the search's returnValue.returnValue is a
         # JSON *string* that needs a second json.loads (plan Sec 5.3).
-        decoded = json.loads(raw)
-        records = decoded.get("sspChildCareProviderDetails") or []
-        if records:
-            self.zips_with_hits += 1
+        records = (json.loads(raw).get("sspChildCareProviderDetails") or []
+                   if raw else [])
+        self.partition_record(f"{zip5:05d}", len(records))
+        if not records:
+            self._maybe_log_progress()
+            return
+        self.zips_with_hits += 1
 
         for record in records:
             provider_id = _num(record.get("ProviderId"))
@@ -383,7 +365,13 @@ class KentuckySpider(scrapy.Spider):
             item = self._item_from_summary(record, provider_id)
             license_number = record.get("ProviderCLRNumber")
             if self.do_details and license_number:
-                yield self._detail_request(provider_id, license_number, item)
+                # -a incremental=1: an unchanged summary record re-emits the
+                # last complete item instead of re-fetching its detail.
+                cached = self.manifest_reuse(item.get("license_number"), record)
+                if cached is not None:
+                    yield cached
+                    continue
+                yield self._detail_action(provider_id, license_number, item)
             else:
                 yield item
 
@@ -468,68 +456,36 @@ class KentuckySpider(scrapy.Spider):
 
     # --- detail (per provider) ------------------------------------------ #
 
-    def _detail_request(self, provider_id, license_number, item):
-        message = {"actions": [{
-            "id": "84;a",
-            "descriptor": "aura://ApexActionController/ACTION$execute",
-            "callingDescriptor": "UNKNOWN",
-            "params": {
-                "namespace": "",
-                "classname": "SSP_ChildCareProviderSearchController",
-                "method": "fetchBrightwheelDetailsForProvider",
-                # Both keys are required -- a null licenseNumber resets the
-                # connection exactly like the Sec 2.7 timeout (plan Sec 5.5).
-                "params": {"providerId": provider_id,
-                           "licenseNumber": license_number},
-                "cacheable": False, "isContinuation": False,
-            },
-        }]}
-        return scrapy.Request(
-            AURA_URL,
-            method="POST",
-            body=_aura_body(message),
-            headers=HEADERS,
-            callback=self.parse_detail,
-            errback=self.detail_errback,
-            meta={"item": item, "provider_id": provider_id},
-            dont_filter=True,
+    def _detail_action(self, provider_id, license_number, item):
+        return self.aura.action(
+            APEX_CLASSNAME, "fetchBrightwheelDetailsForProvider",
+            # Both keys are required -- a null licenseNumber resets the
+            # connection exactly like the Sec 2.7 timeout (plan Sec 5.5).
+            {"providerId": provider_id, "licenseNumber": license_number},
+            callback=self.parse_detail, errback=self.detail_failed,
+            item=item, provider_id=provider_id,
         )
 
-    def detail_errback(self, failure):
-        """If a detail call fails after all retries, still emit the item from
-        the summary alone (capacity/inspections unset) -- losing a whole
-        provider over one optional call is the worst available outcome
-        (plan Sec 3.2)."""
-        item = failure.request.meta.get("item")
-        if item is not None:
-            self.detail_failures += 1
-            self.logger.warning(
-                "Kentucky: detail request failed for provider %s (%s); "
-                "emitting summary-only item",
-                failure.request.meta.get("provider_id"), failure.value,
-            )
-            yield item
-
-    def parse_detail(self, response):
-        item = response.meta["item"]
-        data = response.json()
-        action = (data.get("actions") or [{}])[0]
-        if action.get("state") != "SUCCESS":
-            self.error_state_count += 1
-            self.detail_failures += 1
-            self.logger.warning(
-                "Kentucky: detail for provider %s returned Aura state=%r; "
-                "emitting summary-only item",
-                response.meta.get("provider_id"), action.get("state"),
-            )
-            yield item
-            return
+    def detail_failed(self, reason, item, provider_id):
+        """If a detail call fails after all retries (transport or Aura
+        ERROR state), still emit the item from the summary alone
+        (capacity/inspections unset) -- losing a whole provider over one
+        optional call is the worst available outcome (plan Sec 3.2)."""
+        self.detail_failures += 1
+        self.manifest_forget(item.get("license_number"))
+        self.logger.warning(
+            "Kentucky: detail request failed for provider %s (%s); "
+            "emitting summary-only item", provider_id, reason,
+        )
+        yield item
 
+    def parse_detail(self, action, item, provider_id):
         # Unlike search, returnValue.returnValue is already a dict here, not
         # a JSON string (plan Sec 5.3).
         result = (action.get("returnValue") or {}).get("returnValue") or {}
         if not result.get("bIsSuccess"):
             self.detail_failures += 1
+            self.manifest_forget(item.get("license_number"))
             yield item
             return
 
@@ -641,11 +597,13 @@ class KentuckySpider(scrapy.Spider):
         # Diagnostic per plan Sec 3.3: lots of ResponseFailed/ConnectionLost
         # and zero HTTP error codes is the Sec 2.7 deadline -- lower
         # concurrency, don't add delay or proxies. A high ERROR-state count
-        # instead points at Sec 5.6 (fwuid gone stale).
+        # instead points at Sec 5.6 (fwuid gone stale) -- the client refreshes
+        # it once per run, so a second rotation mid-run still shows up here.
         if self.error_state_count > 20:
             self.logger.warning(
-                "Kentucky: %d requests returned an Aura ERROR state -- if "
-                "unexpectedly high, check whether `fwuid` has gone stale "
-                "(plan Sec 5.6); it is a framework build id that Salesforce "
-                "rotates on org upgrades.", self.error_state_count,
+                "Kentucky: %d actions returned an Aura ERROR state (%d fwuid "
+                "refresh(es)) -- if unexpectedly high, check whether `fwuid` "
+                "has gone stale (plan Sec 5.6); it is a framework build id "
+                "that Salesforce rotates on org upgrades.",
+                self.error_state_count, self.aura.refreshes,
             )
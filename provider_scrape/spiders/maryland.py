@@ -3,15 +3,27 @@ import json
 import logging
 import os
 import re
+import threading
 
 import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
 import scrapy
 import tesserocr
 from scrapy import signals
+from scrapy.utils.project import data_path
 from twisted.internet import task
 
+from provider_scrape.checkpoint import CrawlCheckpoint
 from provider_scrape.items import InspectionItem, ProviderItem
-from provider_scrape.proxy_pool import load_pool
+from provider_scrape.manifest import IncrementalManifestMixin, item_from_manifest
+from provider_scrape.ocr_pool import OcrPool, OcrResultCache
+from provider_scrape.proxy_pool import QUARANTINE_SECONDS, load_pool
+from provider_scrape.work_queue import (
+    DistributedCrawlMixin,
+    default_worker_id,
+    open_work_queue,
+    work_id,
+)
 
 # tessdata path for tesserocr — bundled fast model
 TESSDATA_DIR = os.environ.get("TESSDATA_PREFIX", "/tmp/tessdata")
@@ -182,6 +194,85 @@ STALL_DEGRADED_MIN_PROGRESS = 5
 # rotation. See maryland_performance_epic + RateLimitBackoffMiddleware (recovers
 # the occasional edge trip instead of dropping it).
 DEFAULT_DELAY = 33
+# Floor for the learned delay under ``-a adaptive_delay`` (AIMD, see
+# RateLimitBackoffMiddleware): the measured edge is 30s, so the controller may
+# claw back DEFAULT_DELAY's safety margin but never step onto the edge itself.
+ADAPTIVE_MIN_DELAY = 31
+
+
+# One tesserocr API per thread (per process, in an OCR pool worker), built on
+# first use and reused: ``tesserocr.image_to_text`` would re-initialize Tesseract
+# and reload the model on every call. Thread-local because a PyTessBaseAPI is
+# not safe to share across threads (the to_thread path can run several at once).
+_tess = threading.local()
+
+
+def _tess_api():
+    api = getattr(_tess, "api", None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(path=TESSDATA_DIR)
+        _tess.api = api
+    return api
+
+
+def _warm_ocr_worker():
+    """OcrPool initializer: load the Tesseract model once, at worker start."""
+    try:
+        _tess_api()
+    except Exception as e:  # surfaced again, per PDF, by extract_address_from_pdf
+        logging.getLogger("maryland").warning(f"OCR worker warm-up failed: {e}")
+
+
+# The ADDRESS row of the (image-based, fixed-layout) inspection report, in
+# pixels of a page rendered at OCR_SCALE: y=1750-1950 of the 3300x2550 bitmap a
+# landscape report renders to at 2x. Only this band is rasterized.
+OCR_SCALE = 2
+ADDRESS_BAND = (1750, 1950)
+# Bump when the band, scale or parsing changes so cached OCR results (keyed by
+# PDF hash, see OcrResultCache) from the old calibration are not reused.
+OCR_CACHE_VERSION = "band-1750-1950@2"
+
+
+def _render_address_band(pdf_bytes):
+    """Rasterize just the ADDRESS band of page 1 as 8-bit grayscale.
+
+    pdfium crops at render time (``crop`` is in PDF canvas units: what to cut
+    off the left, bottom, right and top), so the other ~92% of the page is
+    never drawn, and the gray bitmap goes to Tesseract as raw bytes with no
+    PIL conversion. Pixel-identical to rendering the page and cropping.
+    Returns ``(buffer, width, height, stride)``.
+    """
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        page = pdf[0]
+        _, height = page.get_size()
+        top, bottom = (y / OCR_SCALE for y in ADDRESS_BAND)
+        bitmap = page.render(
+            scale=OCR_SCALE,
+            crop=(0, max(0.0, height - bottom), 0, top),
+            force_bitmap_format=pdfium_c.FPDFBitmap_Gray,
+        )
+        return bytes(bitmap.buffer), bitmap.width, bitmap.height, bitmap.stride
+    finally:
+        pdf.close()
+
+
+def _address_from_ocr_text(text):
+    """The address on (or right after) the OCR'd ``ADDRESS:`` line, or ``""``."""
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+
+    # Find "ADDRESS:" and extract the address from the same or next line
+    for i, line in enumerate(lines):
+        if "ADDRESS" in line.upper():
+            # Address may be after the colon on the same line
+            after_colon = line.split(":", 1)[-1].strip()
+            if after_colon:
+                return _format_address(after_colon)
+            # Or on the next line
+            if i + 1 < len(lines):
+                return _format_address(lines[i + 1])
+            break
+    return ""
 
 
 def extract_address_from_pdf(pdf_bytes):
@@ -189,36 +280,15 @@ def extract_address_from_pdf(pdf_bytes):
 
     The PDFs are image-based with a consistent form layout. The ADDRESS field
     is on page 1, containing street, city, state, and zip in a row.
+
+    Returns the address, ``""`` when OCR ran but found no ADDRESS line (a
+    definitive answer, safe to cache), or ``None`` when rendering/OCR failed.
     """
     try:
-        pdf = pdfium.PdfDocument(pdf_bytes)
-        try:
-            page = pdf[0]
-            bitmap = page.render(scale=2)
-            img = bitmap.to_pil()
-        finally:
-            pdf.close()
-
-        # Crop to the ADDRESS region (consistent position across all reports)
-        # At 2x scale on landscape letter (3300x2550), the ADDRESS row is ~y=1750-1950
-        crop = img.crop((0, 1750, 3300, 1950))
-
-        text = tesserocr.image_to_text(crop, path=TESSDATA_DIR)
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
-
-        # Find "ADDRESS:" and extract the address from the same or next line
-        for i, line in enumerate(lines):
-            if "ADDRESS" in line.upper():
-                # Address may be after the colon on the same line
-                after_colon = line.split(":", 1)[-1].strip()
-                if after_colon:
-                    return _format_address(after_colon)
-                # Or on the next line
-                if i + 1 < len(lines):
-                    return _format_address(lines[i + 1])
-                break
-
-        return None
+        buffer, width, height, stride = _render_address_band(pdf_bytes)
+        api = _tess_api()
+        api.SetImageBytes(buffer, width, height, 1, stride)
+        return _address_from_ocr_text(api.GetUTF8Text())
     except Exception as e:
         logging.getLogger("maryland").warning(f"OCR address extraction failed: {e}")
         return None
@@ -239,7 +309,7 @@ def _format_address(raw):
     return raw.strip()
 
 
-class MarylandSpider(scrapy.Spider):
+class MarylandSpider(IncrementalManifestMixin, DistributedCrawlMixin, scrapy.Spider):
     name = "maryland"
     allowed_domains = ["checkccmd.org", "findaprogram.marylandexcels.org"]
     start_urls = ["https://www.checkccmd.org/"]
@@ -298,6 +368,41 @@ class MarylandSpider(scrapy.Spider):
         # is NOT opted in and keeps the patient 180s + full retry budget.
         "RATELIMIT_BACKOFF_TIMEOUT_COOLDOWN": 45,
         "RATELIMIT_BACKOFF_TIMEOUT_MAX_RETRIES": 4,
+        # Learned per-IP delay (inert unless ``-a adaptive_delay=true`` turns
+        # RATELIMIT_AIMD_ENABLED on in from_crawler): tighten 0.5s per 20 clean
+        # responses, back off 1.5x per trip, never past 5 minutes.
+        "RATELIMIT_AIMD_STEP": 0.5,
+        "RATELIMIT_AIMD_CLEAN_STREAK": 20,
+        "RATELIMIT_AIMD_BACKOFF": 1.5,
+        "RATELIMIT_AIMD_MAX_DELAY": 300,
+        # Maryland runs its own no-progress watchdog (_check_stall), which
+        # counts parsed results pages as progress and only closes on a
+        # sustained zero; the generic StallWatchdog would double up on it.
+        "STALLWATCH_ENABLED": False,
+        # Concurrency autotuner (inert unless ``-a autotune=true`` turns
+        # AUTOTUNE_ENABLED on in from_crawler). Global scope: the origin's knee
+        # is shared across every proxy slot (each of which is single-flight),
+        # so the lever is CONCURRENT_REQUESTS, starting from ``concurrency``.
+        # Bounded to [2, 10] -- 8 parallel GETs were already measured to
+        # collapse the detail endpoint at peak -- and judged over 5-minute
+        # windows since a detail GET alone takes ~17-34s.
+        "AUTOTUNE_SCOPE": "global",
+        "AUTOTUNE_DOMAINS": ["checkccmd.org"],
+        "AUTOTUNE_MIN_CONCURRENCY": 2,
+        "AUTOTUNE_MAX_CONCURRENCY": 10,
+        "AUTOTUNE_INTERVAL": 300,
+        # Cache the leaf pages for a week (provider_scrape/httpcache.py): a
+        # restart after a crash or a "Retryable Error" replays every detail page,
+        # EXCELS lookup and inspection PDF already fetched instead of re-paying
+        # ~33s of single-flight spacing each. The session-priming home/search
+        # pages and the pagination postbacks are never cached -- a replayed
+        # ViewState/session would desync the live search chain.
+        "HTTPCACHE_TTL": 7 * 24 * 60 * 60,
+        "HTTPCACHE_URL_PATTERNS": [
+            r"/FacilityDetail\.aspx",
+            r"/PublicReports/PrintTask\.aspx",
+            r"findaprogram\.marylandexcels\.org/api/",
+        ],
     }
 
     @classmethod
@@ -312,6 +417,57 @@ class MarylandSpider(scrapy.Spider):
         crawler.settings.set(
             "CONCURRENT_REQUESTS", spider.concurrency, priority="spider"
         )
+        if spider.adaptive_delay:
+            # Start from (and keep learning) each IP's sustainable spacing
+            # instead of the fixed ``delay``; an explicit lower ``-a delay``
+            # lowers the floor with it.
+            crawler.settings.set("RATELIMIT_AIMD_ENABLED", True, priority="spider")
+            crawler.settings.set(
+                "RATELIMIT_AIMD_MIN_DELAY",
+                min(ADAPTIVE_MIN_DELAY, spider.delay),
+                priority="spider",
+            )
+            crawler.settings.set(
+                "RATELIMIT_AIMD_STATE",
+                os.path.join(data_path("ratelimit", createdir=True),
+                             "maryland.json"),
+                priority="spider",
+            )
+        if spider.autotune:
+            crawler.settings.set("AUTOTUNE_ENABLED", True, priority="spider")
+        if spider.queue_url:
+            # Distributed mode: the shared queue is the crash-safe record of
+            # progress (an abandoned lease expires back to another worker), so
+            # a local checkpoint would only fight it.
+            spider.checkpoint_path = None
+            spider.work_queue = open_work_queue(spider.queue_url, name="maryland")
+            spider.work_setup(crawler)
+        if spider.checkpoint_path:
+            if spider.checkpoint_path == "default":
+                spider.checkpoint_path = os.path.join(
+                    data_path("checkpoint", createdir=True), "maryland.sqlite"
+                )
+            spider.checkpoint = CrawlCheckpoint(spider.checkpoint_path)
+        if spider.ocr_fallback and spider.ocr_cache_path:
+            if spider.ocr_cache_path == "default":
+                spider.ocr_cache_path = os.path.join(
+                    data_path("ocr", createdir=True), "ocr_cache.sqlite"
+                )
+            spider.ocr_cache = OcrResultCache(
+                spider.ocr_cache_path, version=OCR_CACHE_VERSION
+            )
+        if spider.ocr_fallback and spider.ocr_workers > 0:
+            spider.ocr_pool = OcrPool(
+                spider.ocr_workers,
+                max_pending=spider.ocr_queue,
+                initializer=_warm_ocr_worker,
+                schedule=spider._schedule_ocr_request,
+            )
+            # crawler.stats is only created after the spider (Crawler.crawl's
+            # _apply_settings), so hand it to the pool once the spider opens.
+            crawler.signals.connect(
+                spider._attach_ocr_stats, signal=signals.spider_opened
+            )
         # NOTE: from_crawler runs *before* Scrapy attaches the LOG_FILE handler
         # (Crawler.crawl calls _create_spider ahead of _update_root_log_handler),
         # so anything logged here never reaches the log file. Defer the run-mode
@@ -326,14 +482,23 @@ class MarylandSpider(scrapy.Spider):
     def _log_run_mode(self, *args, **kwargs):
         """Log single-IP vs proxy-pool mode. Connected to spider_opened (not done
         in from_crawler) so the line actually lands in the log file."""
+        if self.work_queue is not None:
+            self.logger.info(
+                f"MarylandSpider: distributed {self.role} on queue "
+                f"{self.work_queue.path} (worker {self.work_worker}, up to "
+                f"{self.work_batch} leased items)."
+            )
         if self.proxy_pool:
             self.logger.info(
                 "MarylandSpider: proxy pool ENABLED — %d egress IPs (%s); each "
                 "held to single-flight DOWNLOAD_DELAY=%ss on its own slot; "
-                "EXCELS direct.",
+                "%s; EXCELS direct.",
                 len(self.proxy_pool),
                 ", ".join(self.proxy_pool.ids),
                 self.delay,
+                "health-weighted selection"
+                if self.proxy_pool.health is not None
+                else "round-robin selection",
             )
         else:
             self.logger.info(
@@ -357,16 +522,36 @@ class MarylandSpider(scrapy.Spider):
         stall_close=True,
         concurrency=DEFAULT_CONCURRENCY,
         detail_timeout=DETAIL_DOWNLOAD_TIMEOUT,
+        ocr_workers=0,
+        ocr_queue=None,
+        ocr_cache="default",
+        proxy_health=False,
+        proxy_cooloff=QUARANTINE_SECONDS,
+        adaptive_delay=False,
+        autotune=False,
+        checkpoint=None,
+        queue=None,
+        role="worker",
+        worker_id=None,
+        lease_batch=None,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         # Seconds between consecutive checkccmd.org requests, per egress IP.
         self.delay = float(delay)
+        # Learn the per-IP spacing (AIMD) instead of holding ``delay`` fixed;
+        # persisted under .scrapy/ratelimit/ across runs. Opt-in.
+        self.adaptive_delay = str(adaptive_delay).lower() in (
+            "true", "1", "yes", "on"
+        )
         # Global in-flight cap; the origin's detail endpoint is concurrency-
         # limited (see DEFAULT_CONCURRENCY). Applied as CONCURRENT_REQUESTS in
         # from_crawler so ``-a concurrency=<n>`` works.
         self.concurrency = int(concurrency)
+        # Let ConcurrencyAutotuner move that cap towards the origin's current
+        # knee (within AUTOTUNE_MIN/MAX_CONCURRENCY) instead of holding it.
+        self.autotune = str(autotune).lower() in ("true", "1", "yes", "on")
         # Per-request timeout for detail GETs. The origin is slow (~17-34s
         # baseline, see DETAIL_DOWNLOAD_TIMEOUT); tune with ``-a detail_timeout=``.
         self.detail_timeout = float(detail_timeout)
@@ -392,6 +577,13 @@ class MarylandSpider(scrapy.Spider):
                 endpoints=None if proxies is None else proxies,
                 id_prefix="webshare",
             )
+        # Health-weighted proxy selection (opt-in, ``-a proxy_health=true``):
+        # rotating detail GETs favour fast, error-free proxies; a proxy with
+        # repeated failures sits out ``-a proxy_cooloff`` seconds; new shards
+        # (and restarted chains) avoid quarantined proxies. See ProxyHealth.
+        self.proxy_health = str(proxy_health).lower() in ("true", "1", "yes", "on")
+        if self.proxy_pool and self.proxy_health:
+            self.proxy_pool.enable_health(cooloff=float(proxy_cooloff))
         self.seen_fi = set()
         # Pages whose rows we've successfully parsed, per county. Used to avoid
         # re-extracting a page that's delivered twice (e.g. a late retry) and to
@@ -423,6 +615,58 @@ class MarylandSpider(scrapy.Spider):
         # inspection-report PDF + OCR. Disable (``-a ocr_fallback=false``) for a
         # pure-fast run that downloads zero PDFs.
         self.ocr_fallback = str(ocr_fallback).lower() not in ("false", "0", "no")
+        # Optional dedicated OCR process pool (``-a ocr_workers=N``): render +
+        # OCR each PDF in one of N spawned workers, each holding a warm
+        # Tesseract, with at most ``ocr_queue`` (default 2N) PDFs between
+        # download and OCR result. 0 (default) keeps OCR on asyncio.to_thread.
+        # Built in from_crawler, which has the stats collector.
+        self.ocr_workers = int(ocr_workers)
+        self.ocr_queue = int(ocr_queue) if ocr_queue else None
+        self.ocr_pool = None
+        # OCR results keyed by PDF hash, kept across runs (``-a ocr_cache=PATH``;
+        # default .scrapy/ocr/ocr_cache.sqlite; ``off`` disables). Opened in
+        # from_crawler, so a bare MarylandSpider() (tests) never touches disk.
+        self.ocr_cache_path = (
+            None
+            if str(ocr_cache).lower() in ("off", "none", "false", "0", "no", "")
+            else str(ocr_cache)
+        )
+        self.ocr_cache = None
+        # Crash-safe resume (``-a checkpoint=true`` for the default
+        # .scrapy/checkpoint/maryland.sqlite, or ``-a checkpoint=PATH``): record
+        # completed shards, pending details and emitted items as the crawl goes,
+        # and pick up from there after a crash/stall-close instead of starting
+        # over. Off by default. Opened in from_crawler (see CrawlCheckpoint).
+        if checkpoint is None or str(checkpoint).lower() in (
+            "off", "none", "false", "0", "no", ""
+        ):
+            self.checkpoint_path = None
+        elif str(checkpoint).lower() in ("true", "1", "yes", "on"):
+            self.checkpoint_path = "default"
+        else:
+            self.checkpoint_path = str(checkpoint)
+        self.checkpoint = None
+        # Shards a resumed run must not search again (see _resume_from_checkpoint).
+        self._completed_shards = {}
+        # fis whose item went out partial (see _forget_partial): neither the
+        # manifest nor the checkpoint may store it as complete.
+        self._partial_fis = set()
+        # Distributed mode (``-a queue=sqlite:///path`` or ``redis://...``; see
+        # provider_scrape/work_queue.py): one ``-a role=coordinator`` run
+        # enqueues the shards, then any number of workers (the default role,
+        # each with its own IPs) lease shards and details from the shared
+        # queue. ``-a lease_batch`` caps the items a worker holds at once
+        # (default 2x concurrency); ``-a worker_id`` names it in the queue.
+        self.queue_url = queue or None
+        self.role = str(role).lower()
+        if self.role not in ("worker", "coordinator"):
+            raise ValueError(
+                f"role must be 'worker' or 'coordinator', not {role!r}"
+            )
+        self.work_worker = worker_id or default_worker_id()
+        self.work_batch = (
+            int(lease_batch) if lease_batch else max(2, 2 * self.concurrency)
+        )
         # Optional debug filter: ``-a counties="Howard,Carroll"`` restricts the
         # crawl to counties whose dropdown label contains one of these terms
         # (case-insensitive). Used for limited verification runs.
@@ -476,6 +720,16 @@ class MarylandSpider(scrapy.Spider):
             f"— launching one search per (county, facility type) shard"
         )
 
+        if self.work_queue is not None:
+            if self.role == "coordinator":
+                self._enqueue_shards(counties)
+            else:
+                # The form options are loaded: start leasing shards/details.
+                self.work_start()
+            return
+
+        yield from self._resume_from_checkpoint()
+
         # Shard each county's search by facility type. A single county search
         # (all types) for a big county paginates 60-140 deep, and deep ASP.NET
         # "skip to page N" postbacks get tarpitted past 180s and truncate/deadlock
@@ -492,27 +746,79 @@ class MarylandSpider(scrapy.Spider):
         for fac_type in self._fac_types:
             for county in counties:
                 shard = self._shard_key(county, fac_type)
-                self.parsed_pages_by_county[shard] = set()
-                self.nav_attempts_by_county[shard] = {}
-                self.chain_restarts_by_county[shard] = 0
-                yield scrapy.Request(
-                    "https://www.checkccmd.org/",
-                    callback=self.parse_county_search,
-                    cb_kwargs={
-                        "county_key": shard,
-                        "county": county,
-                        "fac_type": fac_type,
-                    },
-                    meta={"cookiejar": shard, "proxy_affinity": shard},
-                    dont_filter=True,
-                    priority=RESULTS_PRIORITY,
-                )
+                if self._shard_done(shard):
+                    continue
+                yield self._shard_request(shard, county, fac_type)
 
     @staticmethod
     def _shard_key(county, fac_type):
         """Pagination-tracking key for one (county, facility-type) search shard."""
         return f"{county} [{fac_type}]"
 
+    def _shard_request(self, shard, county, fac_type, status=None):
+        """Start one shard's search chain: reset its pagination tracking and
+        load the search form in a fresh session (own cookie jar + ViewState).
+
+        ``status`` (a license-status value) makes it a status sub-shard -- see
+        ``_split_shard_by_status``.
+        """
+        self.parsed_pages_by_county[shard] = set()
+        self.nav_attempts_by_county[shard] = {}
+        self.chain_restarts_by_county[shard] = 0
+        cb_kwargs = {"county_key": shard, "county": county, "fac_type": fac_type}
+        if status is not None:
+            cb_kwargs["status"] = status
+        return scrapy.Request(
+            "https://www.checkccmd.org/",
+            callback=self.parse_county_search,
+            cb_kwargs=cb_kwargs,
+            # A fresh session: free to move off a quarantined proxy.
+            meta={"cookiejar": shard, "proxy_affinity": shard,
+                  "proxy_repin": True},
+            dont_filter=True,
+            priority=RESULTS_PRIORITY,
+        )
+
+    def _enqueue_shards(self, counties):
+        """Coordinator: enqueue one work item per (county, facility type)
+        shard, in the same type-outer order ``parse`` would crawl them. Shards
+        outrank details, so workers start every chain before draining details."""
+        added = self.work_queue.put(
+            (
+                work_id("shard", self._shard_key(county, fac_type)),
+                "shard",
+                {"county": county, "fac_type": fac_type, "status": None},
+                1,
+            )
+            for fac_type in self._fac_types
+            for county in counties
+        )
+        self.logger.info(
+            f"Coordinator: enqueued {added} new shards "
+            f"({len(self._fac_types) * len(counties)} total) on "
+            f"{self.work_queue.path}."
+        )
+
+    def work_requests(self, work):
+        """The request for one leased shard or detail (DistributedCrawlMixin)."""
+        payload = work.payload
+        if work.kind == "shard":
+            fac_type = payload["fac_type"]
+            if payload.get("status_label"):
+                fac_type = f"{fac_type}/{payload['status_label']}"
+            shard = self._shard_key(payload["county"], fac_type)
+            return [self._shard_request(shard, payload["county"],
+                                        payload["fac_type"], payload.get("status"))]
+        if work.kind == "detail":
+            return [self._detail_request(payload["url"], payload["fields"])]
+        self.logger.error(f"Work queue: unknown work item kind {work.kind!r}")
+        return []
+
+    def work_item_id(self, item):
+        """A scraped item completes its provider's ``detail`` work item."""
+        fi = self.manifest_key(item)
+        return work_id("detail", fi) if fi else None
+
     def parse_county_search(self, response, county_key, county, fac_type, status=None):
         """Submit the search for one shard.
 
@@ -556,24 +862,28 @@ class MarylandSpider(scrapy.Spider):
         across the pool), and is not split further. The oversized parent is not
         paginated — the sub-shards cover the same providers, shallower.
         """
+        if self.work_queue is not None:
+            # Distributed: the sub-shards go back on the queue (so they fan
+            # across workers too) and the parent is done.
+            self.work_queue.put(
+                (
+                    work_id("shard", self._shard_key(
+                        county, f"{fac_type}/{status_label}")),
+                    "shard",
+                    {"county": county, "fac_type": fac_type,
+                     "status": status_value, "status_label": status_label},
+                    1,
+                )
+                for status_value, status_label in self._license_status_options
+            )
+            self.work_done(work_id("shard", self._shard_key(county, fac_type)),
+                           {"split": True})
+            return
         for status_value, status_label in self._license_status_options:
             sub = self._shard_key(county, f"{fac_type}/{status_label}")
-            self.parsed_pages_by_county[sub] = set()
-            self.nav_attempts_by_county[sub] = {}
-            self.chain_restarts_by_county[sub] = 0
-            yield scrapy.Request(
-                "https://www.checkccmd.org/",
-                callback=self.parse_county_search,
-                cb_kwargs={
-                    "county_key": sub,
-                    "county": county,
-                    "fac_type": fac_type,
-                    "status": status_value,
-                },
-                meta={"cookiejar": sub, "proxy_affinity": sub},
-                dont_filter=True,
-                priority=RESULTS_PRIORITY,
-            )
+            if self._shard_done(sub):
+                continue
+            yield self._shard_request(sub, county, fac_type, status_value)
 
     def parse_results(
         self,
@@ -672,6 +982,8 @@ class MarylandSpider(scrapy.Spider):
             f"[{county_key}] Found {len(rows)} provider rows on page {current_page}."
         )
 
+        # Details scheduled from this page, checkpointed in one transaction.
+        pending = []
         for row in rows:
             cols = row.css("td")
             link = cols[0].css("a::attr(href)").get() if cols else None
@@ -680,8 +992,8 @@ class MarylandSpider(scrapy.Spider):
                 # when duplicate pagination chains cause the same page to be
                 # processed more than once.
                 fi_match = re.search(r"fi=(\d+)", link)
-                if fi_match:
-                    fi = fi_match.group(1)
+                fi = fi_match.group(1) if fi_match else None
+                if fi:
                     if fi in self.seen_fi:
                         continue
                     self.seen_fi.add(fi)
@@ -697,6 +1009,17 @@ class MarylandSpider(scrapy.Spider):
                     cols[5].css("::text").get("").strip() if len(cols) > 5 else None
                 )
 
+                # -a incremental=1: a results row unchanged since the last run
+                # re-emits that provider's last complete item, skipping the
+                # slow detail GET (and its EXCELS/PDF follow-ups) entirely.
+                cached = self.manifest_reuse(
+                    fi,
+                    [c.css("::text").getall() for c in cols[1:]],
+                )
+                if cached is not None:
+                    yield cached
+                    continue
+
                 # Details ride one shared, self-warming session jar rather than
                 # this county's pagination session (see DETAIL_COOKIEJAR): the fi
                 # is a global key and a detail needs only a warm session + the
@@ -705,14 +1028,23 @@ class MarylandSpider(scrapy.Spider):
                 # details drained after their county session had died.
                 # response.follow sets the referer from this results page
                 # (SearchResults.aspx) automatically.
+                fields = {
+                    "address": address or None,
+                    "school_name": school_name or None,
+                    "program_type": program_type or None,
+                }
+                if fi and self.work_queue is not None:
+                    # Distributed: any worker (any IP) may fetch this detail.
+                    pending.append((work_id("detail", fi), "detail",
+                                    {"url": response.urljoin(link),
+                                     "fields": fields}, 0))
+                    continue
+                if fi:
+                    pending.append((fi, response.urljoin(link), fields))
                 yield response.follow(
                     link,
                     callback=self.parse_detail,
-                    cb_kwargs={
-                        "address": address or None,
-                        "school_name": school_name or None,
-                        "program_type": program_type or None,
-                    },
+                    cb_kwargs=fields,
                     # Idempotent, non-chain-critical: fail fast (not 180s). On a
                     # timeout, treat it as origin saturation (timeout_backoff) —
                     # pause the slot and retry a bounded few times rather than
@@ -725,11 +1057,113 @@ class MarylandSpider(scrapy.Spider):
                     },
                 )
 
+        if self.work_queue is not None:
+            self.work_queue.put(pending)
+        elif self.checkpoint is not None:
+            self.checkpoint.add_pending(pending)
+
         # Advance the chain to the next page (sequential, with windowed-pager
         # "..." jumps). The end of pagination is when no next link is offered.
         next_target = self._resolve_next_page(pager_row, current_page)
         if next_target and next_target not in parsed_pages:
             yield from self._navigate_to(response, county_key, next_target)
+        elif self.work_queue is not None:
+            self.work_done(work_id("shard", county_key), {
+                "declared": self.declared_total_by_county.get(county_key),
+                "found": self.found_count_by_county.get(county_key, 0),
+            })
+        elif self.checkpoint is not None:
+            # Chain ran to the end: every row is either emitted or pending, so
+            # a resumed run need not search this shard again.
+            self.checkpoint.complete_shard(
+                county_key,
+                self.declared_total_by_county.get(county_key),
+                self.found_count_by_county.get(county_key, 0),
+            )
+
+    def manifest_key(self, item):
+        """Key the manifest on the facility id (``fi``): it's what the results
+        row carries, whereas the license number is only on the detail page."""
+        match = re.search(r"fi=(\d+)", item.get("provider_url") or "")
+        return match.group(1) if match else None
+
+    def checkpoint_key(self, item):
+        """The checkpoint keys emitted items on the same fi (CheckpointPipeline).
+        A partial item gets no key, so it isn't recorded and its detail stays
+        pending: a resumed run fetches it again instead of replaying it."""
+        fi = self.manifest_key(item)
+        if fi is not None and fi in self._partial_fis:
+            self._partial_fis.discard(fi)
+            return None
+        return fi
+
+    def _forget_partial(self, item):
+        """Mark an item about to be yielded as partial (its EXCELS/PDF
+        enrichment failed): not stored as complete in the manifest or the
+        checkpoint, so the next run fetches it again."""
+        fi = self.manifest_key(item)
+        self.manifest_forget(fi)
+        if fi is not None:
+            self._partial_fis.add(fi)
+        self._inc_stat("maryland/partial_items")
+
+    def _shard_done(self, shard):
+        """True for a shard a resumed run already completed (not re-searched)."""
+        if shard not in self._completed_shards:
+            return False
+        self.logger.debug(f"[{shard}] completed before the restart — skipping.")
+        return True
+
+    def _resume_from_checkpoint(self):
+        """Pick a crashed run back up from its checkpoint (``-a checkpoint``).
+
+        Re-emits every item the earlier run(s) built -- so this run's ``-O``
+        feed is again the full snapshot, not just the remainder -- re-issues the
+        details that were scheduled but never emitted, and marks completed
+        shards (with their declared/paginated counts, for the completeness
+        report) so ``parse`` doesn't search them again. Their fis are seeded
+        into ``seen_fi``, so a shard that *is* re-searched (it was mid-chain at
+        the crash) only fetches providers not already covered.
+        """
+        if self.checkpoint is None or not self.checkpoint.resumable:
+            return
+        summary = self.checkpoint.summary()
+        self.logger.info(
+            f"Resuming from checkpoint {self.checkpoint.path}: "
+            f"{summary['shards']} shards complete, {summary['items']} items "
+            f"emitted, {summary['pending']} details pending."
+        )
+        self._completed_shards = self.checkpoint.completed_shards()
+        for shard, (declared, found) in self._completed_shards.items():
+            if declared is not None:
+                self.declared_total_by_county[shard] = declared
+            self.found_count_by_county[shard] = found or 0
+        for fi, stored in self.checkpoint.emitted_items():
+            self.seen_fi.add(fi)
+            self._inc_stat("checkpoint/items_replayed")
+            yield item_from_manifest(stored)
+        for fi, url, fields in self.checkpoint.pending():
+            if fi in self.seen_fi:
+                continue
+            self.seen_fi.add(fi)
+            self._inc_stat("checkpoint/details_resumed")
+            yield self._detail_request(url, fields)
+
+    def _detail_request(self, url, fields):
+        """A detail GET issued away from its results page (a resumed or
+        leased detail): like a bounced detail's re-issue, it restores the
+        SearchResults referer by hand and rides the shared detail session."""
+        return scrapy.Request(
+            url,
+            callback=self.parse_detail,
+            cb_kwargs=fields,
+            headers={"Referer": SEARCH_RESULTS_REFERER},
+            meta={
+                "cookiejar": DETAIL_COOKIEJAR,
+                "download_timeout": self.detail_timeout,
+                "timeout_backoff": True,
+            },
+        )
 
     @staticmethod
     def _resolve_next_page(pager_row, current_page):
@@ -824,6 +1258,13 @@ class MarylandSpider(scrapy.Spider):
         # terminal failure.
         new_meta = dict(request.meta)
         new_meta.pop("retry_times", None)
+        if self.proxy_health:
+            # The session lives in the cookie jar and the ViewState in the form
+            # body, neither tied to the egress IP: let the pool move the chain
+            # off its proxy if the failures just quarantined it.
+            for key in ("proxy", "download_slot"):
+                new_meta.pop(key, None)
+            new_meta["proxy_repin"] = True
         return request.replace(
             meta=new_meta,
             dont_filter=True,
@@ -869,6 +1310,13 @@ class MarylandSpider(scrapy.Spider):
         responses = stats.get_value("response_received_count", 0) or 0
         items = stats.get_value("item_scraped_count", 0) or 0
         progress = self._pages_parsed + items
+        if self.work_queue is not None and not self._work_held:
+            # A distributed worker with no leases is waiting on the others,
+            # not wedged.
+            self._stall_last_responses = responses
+            self._stall_last_progress = progress
+            self._slow_windows = self._stall_windows = 0
+            return
         d_resp = responses - self._stall_last_responses
         d_prog = progress - self._stall_last_progress
         self._stall_last_responses = responses
@@ -913,6 +1361,13 @@ class MarylandSpider(scrapy.Spider):
                     f"(reason=stalled) so it doesn't hang; disable with "
                     f"-a stall_close=off."
                 )
+                if self.checkpoint is not None:
+                    # The progress so far is checkpointed: have run_spider
+                    # restart the crawl, which resumes rather than starts over.
+                    self.logger.error(
+                        "Retryable Error: stalled with a checkpoint — restart "
+                        "to resume from it."
+                    )
                 engine.close_spider(self, "stalled")
 
     def closed(self, reason):
@@ -927,6 +1382,23 @@ class MarylandSpider(scrapy.Spider):
         stall_task = getattr(self, "_stall_task", None)
         if stall_task is not None and stall_task.running:
             stall_task.stop()
+        if self.ocr_pool is not None:
+            self.ocr_pool.shutdown()
+        if self.ocr_cache is not None:
+            self.ocr_cache.close()
+        if self.checkpoint is not None:
+            if reason == "finished":
+                # The output is complete; the next run must start afresh.
+                self.checkpoint.clear()
+                self.logger.info("Run finished — checkpoint cleared.")
+            else:
+                summary = self.checkpoint.summary()
+                self.logger.info(
+                    f"Checkpoint kept ({reason}): {summary['shards']} shards, "
+                    f"{summary['items']} items, {summary['pending']} pending "
+                    f"details — re-run with the same -a checkpoint to resume."
+                )
+            self.checkpoint.close()
 
         incomplete = []
         total_declared = 0
@@ -963,7 +1435,9 @@ class MarylandSpider(scrapy.Spider):
         # guardrail was blind to it. Compare items actually scraped against the
         # declared total so a detail-draining shortfall is loud too.
         stats = getattr(getattr(self, "crawler", None), "stats", None)
-        if stats is not None and total_declared:
+        # A distributed worker's details come from every worker's shards, so
+        # only the merged queue can be checked (scripts/merge_work_queue.py).
+        if stats is not None and total_declared and self.work_queue is None:
             scraped = stats.get_value("item_scraped_count", 0) or 0
             if scraped < total_declared:
                 self.logger.error(
@@ -1167,6 +1641,8 @@ class MarylandSpider(scrapy.Spider):
                 f"EXCELS parse failed for license "
                 f"{item.get('license_number')}: {e}"
             )
+            # Not a true miss: the record (and its coordinates) may exist.
+            self._forget_partial(item)
 
         if record:
             self._apply_excels_location(item, record)
@@ -1215,15 +1691,25 @@ class MarylandSpider(scrapy.Spider):
         in pool mode the host IP carries only these PDFs, single-flight at the 33s
         host delay, well under the per-IP ceiling; in single-IP mode the flag is a
         no-op and the PDF shares the one host slot as before.
+
+        With an OCR pool (``-a ocr_workers``) the request is held back, not
+        yielded, while the pool is saturated -- the pool schedules it once a
+        slot frees up; the errback hands the slot back and still yields the
+        item if the PDF can't be fetched.
         """
         if self.ocr_fallback and first_report_url:
-            yield scrapy.Request(
+            request = scrapy.Request(
                 first_report_url,
                 callback=self.parse_inspection_pdf,
+                errback=self._inspection_pdf_failed,
                 cb_kwargs={"item": item},
                 meta={"proxy_bypass": True},
                 dont_filter=True,
             )
+            if self.ocr_pool is not None:
+                request = self.ocr_pool.admit(request)
+            if request is not None:
+                yield request
         else:
             yield item
 
@@ -1241,10 +1727,39 @@ class MarylandSpider(scrapy.Spider):
         return ", ".join(p for p in [street, city_state_zip] if p)
 
     async def parse_inspection_pdf(self, response, item):
-        """Extract precise address from an inspection report PDF via OCR."""
-        # Run CPU-bound OCR in a thread pool to avoid blocking the reactor
+        """Extract precise address from an inspection report PDF via OCR.
+
+        A report already OCR'd in any earlier run (same bytes) is answered from
+        the OCR result cache without rendering anything.
+        """
         pdf_bytes = response.body
-        precise_address = await asyncio.to_thread(extract_address_from_pdf, pdf_bytes)
+        cache_key = precise_address = None
+        if self.ocr_cache is not None:
+            cache_key = self.ocr_cache.key(pdf_bytes)
+            precise_address = self.ocr_cache.get(cache_key)
+            self._inc_stat(
+                "ocr_cache/hit" if precise_address is not None else "ocr_cache/miss"
+            )
+        if precise_address is not None:
+            self._release_ocr_slot(response.meta)
+        elif self.ocr_pool is not None:
+            # Multi-core: render + OCR in a warm worker process.
+            try:
+                precise_address = await self.ocr_pool.run(
+                    extract_address_from_pdf, pdf_bytes
+                )
+            finally:
+                self._release_ocr_slot(response.meta)
+        else:
+            # Run CPU-bound OCR in a thread pool to avoid blocking the reactor
+            precise_address = await asyncio.to_thread(
+                extract_address_from_pdf, pdf_bytes
+            )
+        # None = OCR failed: leave it uncached so the next run tries again.
+        if cache_key is not None and precise_address is not None:
+            self.ocr_cache.put(cache_key, precise_address)
+        if precise_address is None:
+            self._forget_partial(item)
         if precise_address:
             self.logger.debug(
                 f"OCR address for {item.get('provider_name')}: {precise_address}"
@@ -1252,6 +1767,40 @@ class MarylandSpider(scrapy.Spider):
             item["address"] = precise_address
         yield item
 
+    def _inc_stat(self, key):
+        stats = getattr(getattr(self, "crawler", None), "stats", None)
+        if stats is not None:
+            stats.inc_value(key)
+
+    def _attach_ocr_stats(self, *args, **kwargs):
+        if self.ocr_pool is not None:
+            self.ocr_pool.stats = self.crawler.stats
+
+    def _schedule_ocr_request(self, request):
+        """OcrPool ``schedule``: crawl a PDF request it held back."""
+        self.crawler.engine.crawl(request)
+
+    def _release_ocr_slot(self, meta):
+        if meta.get("ocr_slot") and self.ocr_pool is not None:
+            meta["ocr_slot"] = False
+            self.ocr_pool.release()
+
+    def _inspection_pdf_failed(self, failure):
+        """Errback for the PDF fallback: free its OCR slot, keep the item.
+
+        The item already carries the results-page address, so a PDF that can't
+        be downloaded costs precision, not the provider.
+        """
+        request = failure.request
+        self._release_ocr_slot(request.meta)
+        item = request.cb_kwargs["item"]
+        self.logger.warning(
+            f"Inspection PDF failed for {item.get('provider_name')} "
+            f"({failure.value!r}); keeping the results-page address."
+        )
+        self._forget_partial(item)
+        yield item
+
     def _get_first_report_url(self, response):
         """Get the URL of the first inspection report PDF from the detail page."""
         rows = response.css("#MainContent_grdInspection tr")
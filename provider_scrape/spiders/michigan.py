@@ -5,6 +5,7 @@ import urllib.parse
 import scrapy
 from scrapy.http import TextResponse
 
+from provider_scrape.aura import APEX_DESCRIPTOR, extract_fwuid
 from provider_scrape.items import InspectionItem, ProviderItem
 
 # Aura API endpoint for Salesforce Experience Cloud
@@ -37,7 +38,7 @@ MICHIGAN_COUNTIES = [
 ]
 
 # Aura descriptor for OmniStudio Apex action execution
-AURA_DESCRIPTOR = "aura://ApexActionController/ACTION$execute"
+AURA_DESCRIPTOR = APEX_DESCRIPTOR
 
 # Apex class that contains all the facility search/detail methods
 APEX_CLASSNAME = "cchirp_getFacilityDetails"
@@ -449,31 +450,9 @@ class MichiganSpider(scrapy.Spider):
     # ---- Response parsing helpers ----
 
     def _extract_fwuid(self, response):
-        """Extract the fwuid token from the initial HTML page.
-
-        The fwuid is embedded in the page's script tag URLs as URL-encoded JSON
-        and changes with each Salesforce deployment.
-        """
-        body = response.text
-
-        # Pattern 1: "fwuid":"<value>" in JSON embedded in the page
-        match = re.search(r'"fwuid"\s*:\s*"([^"]+)"', body)
-        if match:
-            return match.group(1)
-
-        # Pattern 2: URL-encoded fwuid in script src/data-src attributes
-        # e.g., %22fwuid%22%3A%22TOKEN_VALUE%22
-        match = re.search(r'%22fwuid%22%3A%22([^%]+)%22', body)
-        if match:
-            return match.group(1)
-
-        # Pattern 3: fwuid in the auraFW JS URL path segment
-        # e.g., /s/sfsites/auraFW/javascript/TOKEN_VALUE/aura_prod.js
-        match = re.search(r'/auraFW/javascript/([A-Za-z0-9_-]{20,})/', body)
-        if match:
-            return match.group(1)
-
-        return None
+        """Extract the fwuid token from the initial HTML page (the shared
+        Aura helper, see provider_scrape/aura.py)."""
+        return extract_fwuid(response.text)
 
     def _extract_action_result(self, data, action_index=0):
         """Extract the result for a specific action from the Aura response.
@@ -353,12 +353,12 @@ class StealthContextMiddleware:
         return mw
 
     def spider_opened(self, spider):
-        from scrapy_playwright.handler import ScrapyPlaywrightDownloadHandler
+        from provider_scrape.handlers import playwright_handler_of
 
         handlers = spider.crawler.engine.downloader.handlers._handlers
-        handler = handlers.get("https")
+        handler = playwright_handler_of(handlers.get("https"))
 
-        if not isinstance(handler, ScrapyPlaywrightDownloadHandler):
+        if handler is None:
             spider.logger.warning(
                 "StealthContextMiddleware: scrapy-playwright handler not found "
                 "for https — stealth context patch not applied."
@@ -404,6 +404,7 @@ class MinnesotaSpider(scrapy.Spider):
     name = "minnesota"
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "RANDOMIZE_DOWNLOAD_DELAY": True,
         "CONCURRENT_REQUESTS": 1,
         "CONCURRENT_REQUESTS_PER_DOMAIN": 1,
@@ -10,6 +10,7 @@ class MontanaSpider(PlaywrightErrbackMixin, scrapy.Spider):
     start_urls = ["https://mtdphhs.my.site.com/MAQCSChildCareLicensing/s/provider-search?language=en_US"]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         # Each detail request is a full headless-browser page. Firing 16 of
         # them (the Scrapy default) at this single Salesforce host is what
         # drove the goto timeouts; keep the browser page pressure modest.
@@ -401,6 +401,7 @@ class NevadaSpider(scrapy.Spider):
     ]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         # Per-row detail fetches are cheap GETs but be polite to the state site.
         "CONCURRENT_REQUESTS": 4,
         "DOWNLOAD_DELAY": 0.5,
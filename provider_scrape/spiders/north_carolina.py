@@ -517,6 +517,7 @@ class NorthCarolinaSpider(scrapy.Spider):
     allowed_domains = ["ncchildcare.ncdhhs.gov"]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "PLAYWRIGHT_DEFAULT_NAVIGATION_TIMEOUT": 90 * 1000,
         "RETRY_TIMES": 2,
         "DOWNLOAD_DELAY": 0.5,
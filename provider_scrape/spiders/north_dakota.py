@@ -15,6 +15,11 @@ therefore enumerate the whole state with an adaptive geographic grid:
 
 Each unique provider id is then fetched from ``/api/programs/{id}`` for the full
 record (capacity, ages, vacancies, license dates, ...).
+
+With ``-a partition=1`` the grid is planned from the previous runs
+(provider_scrape/partition.py): nodes that found nobody are only re-checked on
+a rotating slice, and a node that saturated last time is searched as its four
+densified children straight away (and merged back once they thin out).
 """
 import json
 import math
@@ -22,6 +27,7 @@ import math
 import scrapy
 
 from provider_scrape.items import ProviderItem
+from provider_scrape.partition import PartitionPlannerMixin
 
 # The public search endpoint was renamed publicSearch -> programsPublicSearch
 # (~2026-08); the old name now 401s. No cookie/session is required.
@@ -67,6 +73,26 @@ HEADERS = {
 }
 
 
+def node_key(lat, lon, half_mi, depth):
+    """Partition-plan key of one search node (see parse_node_key)."""
+    return f"{lat:.6f},{lon:.6f},{half_mi:g},{depth}"
+
+
+def parse_node_key(key):
+    lat, lon, half_mi, depth = key.split(",")
+    return float(lat), float(lon), float(half_mi), int(depth)
+
+
+def child_nodes(lat, lon, half_mi, depth):
+    """The four densified nodes covering a saturated node's cell."""
+    child_half = half_mi / 2.0
+    off_lat = child_half / MI_PER_DEG_LAT
+    off_lon = child_half / MI_PER_DEG_LON
+    return [(round(lat + si * off_lat, 6), round(lon + sj * off_lon, 6),
+             child_half, depth + 1)
+            for si in (-1, 1) for sj in (-1, 1)]
+
+
 def iso_date(value):
     """Return the ``YYYY-MM-DD`` part of an ISO timestamp (e.g.
     ``2025-08-11T00:00:00Z`` -> ``2025-08-11``). Passes other values through."""
@@ -91,7 +117,7 @@ def age_range(age, unit_label):
     return f"{age} {unit}".strip()
 
 
-class NorthDakotaSpider(scrapy.Spider):
+class NorthDakotaSpider(PartitionPlannerMixin, scrapy.Spider):
     name = "north_dakota"
     allowed_domains = ["search.ec.hhs.nd.gov"]
 
@@ -103,6 +129,8 @@ class NorthDakotaSpider(scrapy.Spider):
         "ROBOTSTXT_OBEY": False,
     }
 
+    partition_cap = RESULT_CAP
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.seen = set()  # provider ids already scheduled for detail
@@ -110,7 +138,10 @@ class NorthDakotaSpider(scrapy.Spider):
 
     # --- enumeration (search) ------------------------------------------- #
 
-    def _search_request(self, lat, lon, half_mi, depth):
+    def _search_request(self, lat, lon, half_mi, depth, priority=0):
+        # Rounded so a node's partition key is the same whether it was
+        # densified live or planned from the key (see partition_children).
+        lat, lon = round(lat, 6), round(lon, 6)
         filters = dict(FILTER_TEMPLATE)
         filters["location"] = {"latitude": lat, "longitude": lon}
         body = {"filters": filters, "sort": "distance"}
@@ -127,6 +158,7 @@ class NorthDakotaSpider(scrapy.Spider):
             callback=self.parse_search,
             meta={"lat": lat, "lon": lon, "half_mi": half_mi, "depth": depth},
             dont_filter=True,
+            priority=priority,
         )
 
     def start_requests(self):
@@ -145,8 +177,16 @@ class NorthDakotaSpider(scrapy.Spider):
             "North Dakota: seeding %d primary grid nodes at %.0f-mi spacing",
             len(points), GRID_SPACING_MI,
         )
-        for lat, lon in points:
-            yield self._search_request(lat, lon, half, 0)
+        plan = self.partition_plan(
+            node_key(round(lat, 6), round(lon, 6), half, 0) for lat, lon in points)
+        for key, priority in plan:
+            yield self._search_request(*parse_node_key(key), priority=priority)
+
+    def partition_children(self, area):
+        lat, lon, half_mi, depth = parse_node_key(area)
+        if depth >= MAX_DENSIFY_DEPTH or half_mi <= MIN_HALF_MI:
+            return None
+        return [node_key(*node) for node in child_nodes(lat, lon, half_mi, depth)]
 
     def parse_search(self, response):
         data = response.json()
@@ -170,24 +210,20 @@ class NorthDakotaSpider(scrapy.Spider):
             )
 
         # Densify on saturation: subdivide the cell into 4 finer nodes.
+        densified = False
         if len(results) >= RESULT_CAP:
             far = max((r.get("locationFilterDistance") or 0) for r in results)
             corner = half_mi * math.sqrt(2)
             if far < corner and depth < MAX_DENSIFY_DEPTH and half_mi > MIN_HALF_MI:
-                child_half = half_mi / 2.0
-                off_lat = child_half / MI_PER_DEG_LAT
-                off_lon = child_half / MI_PER_DEG_LON
+                densified = True
                 self.logger.info(
                     "North Dakota: SATURATED (%.4f,%.4f) depth=%d "
                     "radius=%.2fmi < corner=%.2fmi -> densify into 4 at %.1f-mi",
-                    lat, lon, depth, far, corner, child_half,
+                    lat, lon, depth, far, corner, half_mi / 2.0,
                 )
-                for si in (-1, 1):
-                    for sj in (-1, 1):
-                        yield self._search_request(
-                            lat + si * off_lat, lon + sj * off_lon,
-                            child_half, depth + 1,
-                        )
+                for node in child_nodes(lat, lon, half_mi, depth):
+                    yield self._search_request(
+                        *node, priority=response.request.priority)
             elif far < corner:
                 self.logger.warning(
                     "North Dakota: (%.4f,%.4f) still saturated at depth cap "
@@ -195,6 +231,9 @@ class NorthDakotaSpider(scrapy.Spider):
                     lat, lon, far, corner,
                 )
 
+        self.partition_record(node_key(lat, lon, half_mi, depth), len(results),
+                              capped=densified)
+
         if self.node_count % 50 == 0:
             self.logger.info(
                 "North Dakota: %d search nodes processed, %d unique providers",
@@ -499,11 +499,11 @@ class StealthContextMiddleware:
         return mw
 
     def spider_opened(self, spider):
-        from scrapy_playwright.handler import ScrapyPlaywrightDownloadHandler
+        from provider_scrape.handlers import playwright_handler_of
 
         handlers = spider.crawler.engine.downloader.handlers._handlers
-        handler = handlers.get("https")
-        if not isinstance(handler, ScrapyPlaywrightDownloadHandler):
+        handler = playwright_handler_of(handlers.get("https"))
+        if handler is None:
             spider.logger.warning(
                 "StealthContextMiddleware: scrapy-playwright handler not "
                 "found; stealth patches NOT applied."
@@ -554,6 +554,7 @@ class RhodeIslandSpider(scrapy.Spider):
     allowed_domains = ["earlylearningprograms.dhs.ri.gov"]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "CONCURRENT_REQUESTS": 1,
         "CONCURRENT_REQUESTS_PER_DOMAIN": 1,
         "RETRY_TIMES": 3,
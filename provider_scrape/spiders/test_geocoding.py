@@ -92,6 +92,19 @@ def test_cache_key_distinguishes_different_addresses():
     assert geocoding.cache_key(row_a) != geocoding.cache_key(row_b)
 
 
+def test_index_keys_exact_first_then_fallbacks():
+    row = ["1", "123  Main St", "Springfield", "IL", "62704"]
+    keys = geocoding.index_keys(row)
+    assert keys[0] == ("Exact", geocoding.cache_key(row))
+    assert keys[1:] == [
+        ("Non_Exact", "zip|123 main st|62704"),
+        ("Non_Exact", "city|123 main st|springfield|il"),
+    ]
+    # A fallback is only offered when its pieces are present.
+    assert [t for t, _ in geocoding.index_keys(["1", "1 A St", "", "", "62704"])] \
+        == ["Exact", "Non_Exact"]
+
+
 # --------------------------------------------------------------------------- #
 # parse_response_line
 # --------------------------------------------------------------------------- #
@@ -164,6 +177,17 @@ def test_apply_result_non_exact_is_approximate():
     assert item["geocode_source"] == "census"
 
 
+def test_apply_result_stamps_the_matching_backend():
+    item = {}
+    result = {"match": "Match", "match_type": "Exact",
+              "latitude": "40.2", "longitude": "-90.1"}
+    geocoding.apply_result(item, result, geocoding.SOURCE_ADDRESS_INDEX)
+    assert item["geocode_source"] == "address_index"
+    unmatched = geocoding.apply_result({}, {"match": "No_Match"},
+                                       geocoding.SOURCE_ADDRESS_INDEX)
+    assert unmatched["geocode_source"] == "unmatched"
+
+
 def test_apply_result_no_match_leaves_coords_empty():
     item = {"latitude": None, "longitude": None}
     geocoding.apply_result(item, {"match": "No_Match"})
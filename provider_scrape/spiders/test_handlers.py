@@ -0,0 +1,76 @@
+"""Tests for the hybrid http/https download handler (provider_scrape.handlers)."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from scrapy.http import Request
+from scrapy_playwright.handler import ScrapyPlaywrightDownloadHandler
+
+from provider_scrape.handlers import HybridDownloadHandler, playwright_handler_of
+
+
+class _FakePlaywright:
+    """Stand-in for the wrapped ScrapyPlaywrightDownloadHandler."""
+
+    def __init__(self):
+        self.launches = 0
+        self.downloads = []
+
+    def _deferred_from_coro(self, coro):
+        return coro  # the test drives the coroutine itself
+
+    async def _launch(self):
+        self.launches += 1
+        await asyncio.sleep(0)
+
+    async def _download_request(self, request, spider):
+        self.downloads.append(request.url)
+        return f"browser:{request.url}"
+
+
+def _handler():
+    # Bypass __init__: it builds a real Playwright handler, which needs the
+    # asyncio reactor installed.
+    handler = HybridDownloadHandler.__new__(HybridDownloadHandler)
+    handler.playwright_handler = _FakePlaywright()
+    handler._launch = None
+    handler._browser_requests = 0
+    handler._http_requests = 0
+    return handler
+
+
+def test_playwright_handler_of():
+    hybrid = _handler()
+    assert playwright_handler_of(hybrid) is hybrid.playwright_handler
+    pinned = ScrapyPlaywrightDownloadHandler.__new__(ScrapyPlaywrightDownloadHandler)
+    assert playwright_handler_of(pinned) is pinned
+    assert playwright_handler_of(SimpleNamespace()) is None
+    assert playwright_handler_of(None) is None
+
+
+def test_plain_request_uses_native_handler_and_never_launches():
+    handler = _handler()
+    with patch.object(HTTP11DownloadHandler, "download_request",
+                      return_value="native") as native:
+        out = handler.download_request(Request("https://example.com/api"), None)
+    assert out == "native"
+    native.assert_called_once()
+    assert handler._launch is None
+    assert handler.playwright_handler.launches == 0
+    assert handler._http_requests == 1
+
+
+def test_browser_requests_share_one_lazy_launch():
+    handler = _handler()
+    requests = [Request(f"https://example.com/{i}", meta={"playwright": True})
+                for i in range(3)]
+
+    async def run():
+        return await asyncio.gather(
+            *[handler.download_request(r, None) for r in requests])
+
+    results = asyncio.run(run())
+    assert results == [f"browser:{r.url}" for r in requests]
+    assert handler.playwright_handler.launches == 1
+    assert handler._browser_requests == 3
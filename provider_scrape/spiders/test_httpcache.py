@@ -0,0 +1,105 @@
+"""Tests for the per-spider TTL HTTP cache (provider_scrape.httpcache)."""
+from email.utils import formatdate
+from time import time
+from types import SimpleNamespace
+
+import pytest
+from scrapy import Spider
+from scrapy.http import Request, Response
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.request import RequestFingerprinter
+
+from provider_scrape import settings as project_settings
+from provider_scrape.httpcache import (
+    SessionSafeHttpCacheMiddleware,
+    TTLRevalidatePolicy,
+)
+
+URL = "https://www.checkccmd.org/FacilityDetail.aspx?fi=1"
+
+
+def _policy(**overrides):
+    return TTLRevalidatePolicy(Settings({"HTTPCACHE_TTL": 3600, **overrides}))
+
+
+def _cached(age, headers=None):
+    hdrs = {"Date": formatdate(time() - age, usegmt=True), **(headers or {})}
+    return Response(URL, status=200, headers=hdrs)
+
+
+def test_ttl_zero_caches_nothing():
+    assert not _policy(HTTPCACHE_TTL=0).should_cache_request(Request(URL))
+
+
+def test_playwright_and_post_requests_are_not_cached():
+    policy = _policy()
+    assert policy.should_cache_request(Request(URL))
+    assert not policy.should_cache_request(Request(URL, meta={"playwright": True}))
+    assert not policy.should_cache_request(Request(URL, method="POST"))
+    assert _policy(HTTPCACHE_CACHE_METHODS=["GET", "POST"]).should_cache_request(
+        Request(URL, method="POST"))
+
+
+def test_url_patterns_limit_what_is_cached():
+    policy = _policy(HTTPCACHE_URL_PATTERNS=[r"/FacilityDetail\.aspx"])
+    assert policy.should_cache_request(Request(URL))
+    assert not policy.should_cache_request(Request("https://www.checkccmd.org/"))
+
+
+@pytest.mark.parametrize("status, expected", [
+    (200, True), (301, True), (304, False), (403, False), (500, False),
+])
+def test_only_replayable_statuses_are_stored(status, expected):
+    # No validators needed: the TTL supplies the freshness.
+    response = Response(URL, status=status)
+    assert _policy().should_cache_response(response, Request(URL)) is expected
+
+
+def test_fresh_within_ttl_then_revalidates_with_validators():
+    policy = _policy()
+    assert policy.is_cached_response_fresh(_cached(age=60), Request(URL))
+
+    request = Request(URL)
+    stale = _cached(age=7200, headers={"ETag": '"abc"',
+                                       "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"})
+    assert not policy.is_cached_response_fresh(stale, request)
+    assert request.headers[b"If-None-Match"] == b'"abc"'
+    assert request.headers[b"If-Modified-Since"] == b"Mon, 05 Oct 2026 10:00:00 GMT"
+
+
+def test_not_modified_is_answered_from_cache():
+    policy = _policy()
+    cached = _cached(age=7200)
+    assert policy.is_cached_response_valid(
+        cached, Response(URL, status=304), Request(URL))
+    assert not policy.is_cached_response_valid(
+        cached, Response(URL, status=200), Request(URL))
+
+
+def test_replayed_response_drops_stored_set_cookie(tmp_path):
+    settings = Settings({
+        **{k: getattr(project_settings, k) for k in dir(project_settings)
+           if k.startswith("HTTPCACHE_")},
+        "HTTPCACHE_DIR": str(tmp_path),
+        "HTTPCACHE_TTL": 3600,
+    })
+    crawler = SimpleNamespace(settings=settings,
+                              request_fingerprinter=RequestFingerprinter())
+    spider = Spider(name="teststate")
+    spider.crawler = crawler
+    mw = SessionSafeHttpCacheMiddleware(settings, MemoryStatsCollector(crawler))
+    mw.spider_opened(spider)
+
+    request = Request(URL)
+    assert mw.process_request(request, spider) is None  # cold
+    live = Response(URL, status=200, body=b"detail",
+                    headers={"Set-Cookie": "ASP.NET_SessionId=old"})
+    assert mw.process_response(request, live, spider) is live
+    assert live.headers.get(b"Set-Cookie")  # the live response keeps it
+
+    replay = mw.process_request(Request(URL), spider)
+    assert "cached" in replay.flags
+    assert replay.body == b"detail"
+    assert b"Set-Cookie" not in replay.headers
+    mw.spider_closed(spider)
@@ -4,12 +4,11 @@ import os
 from urllib.parse import parse_qs
 
 import pytest
-from scrapy.http import Request, TextResponse
+from scrapy.http import TextResponse
 
 from provider_scrape import normalization as norm
 from provider_scrape.items import InspectionItem, ProviderItem
 from provider_scrape.spiders.kentucky import (
-    AURA_URL,
     MAX_ERROR_RETRIES,
     KentuckySpider,
     _num,
@@ -47,20 +46,34 @@ def spider():
 
 
 # --- response builders --------------------------------------------------- #
+#
+# Every call goes out through the spider's Aura client, so the tests build the
+# real request and feed the fixture back through its callback (the client's
+# demultiplexer), exactly as the engine would.
 
-def search_response(payload, zip5=42101, attempt=1):
-    req = Request(AURA_URL, method="POST", meta={"zip": zip5, "attempt": attempt})
-    return TextResponse(url=AURA_URL, body=json.dumps(payload).encode(),
-                        encoding="utf-8", request=req)
+def aura_response(request, payload):
+    return TextResponse(url=request.url, body=json.dumps(payload).encode(),
+                        encoding="utf-8", request=request)
 
 
-def detail_response(payload, item=None, provider_id=1):
+def respond(request, payload):
+    return list(request.callback(aura_response(request, payload)))
+
+
+def search_request(spider, zip5=42101):
+    return next(spider.aura.requests([spider._search_action(zip5)]))
+
+
+def run_search(spider, payload, zip5=42101):
+    return respond(search_request(spider, zip5), payload)
+
+
+def run_detail(spider, payload, item=None, provider_id=1, license_number="L1"):
     if item is None:
         item = ProviderItem()
-    req = Request(AURA_URL, method="POST",
-                  meta={"item": item, "provider_id": provider_id})
-    return TextResponse(url=AURA_URL, body=json.dumps(payload).encode(),
-                        encoding="utf-8", request=req)
+    request = next(spider.aura.requests(
+        [spider._detail_action(provider_id, license_number, item)]))
+    return respond(request, payload)
 
 
 def split_search_outputs(outputs):
@@ -205,7 +218,7 @@ def test_concurrency_arg_reaches_the_crawler_settings(arg, expected):
 
 def test_parse_search_golden_yields_24_detail_requests(spider):
     payload = _load_fixture("ky_search_42101.json")
-    outputs = list(spider.parse_search(search_response(payload, zip5=42101)))
+    outputs = run_search(spider, payload, zip5=42101)
     searches, details, items = split_search_outputs(outputs)
     assert searches == []
     assert items == []
@@ -222,7 +235,7 @@ def test_parse_search_golden_yields_24_detail_requests(spider):
 def test_parse_search_empty_zip_is_quiet(spider, caplog):
     payload = _load_fixture("ky_search_empty.json")
     with caplog.at_level(logging.WARNING):
-        outputs = list(spider.parse_search(search_response(payload, zip5=49999)))
+        outputs = run_search(spider, payload, zip5=49999)
     assert outputs == []
     assert not any(r.levelno >= logging.WARNING for r in caplog.records)
     assert spider.zips_done == 1
@@ -232,27 +245,28 @@ def test_parse_search_empty_zip_is_quiet(spider, caplog):
 def test_parse_search_error_state_retries_then_gives_up(spider, caplog):
     payload = _load_fixture("ky_search_error.json")
     with caplog.at_level(logging.WARNING):
-        outputs = list(spider.parse_search(
-            search_response(payload, zip5=40999, attempt=1)))
+        outputs = run_search(spider, payload, zip5=40999)
     assert spider.error_state_count == 1
     assert len(outputs) == 1
     retry_req = outputs[0]
     assert _decode_message(retry_req)["actions"][0]["params"]["method"] == \
         "getChildCareProviderDetails"
-    assert retry_req.meta["attempt"] == 2
+    assert retry_req.meta["aura_actions"][0].attempt == 2
     assert any("Aura state" in r.getMessage() for r in caplog.records)
 
-    outputs2 = list(spider.parse_search(
-        search_response(payload, zip5=40999, attempt=MAX_ERROR_RETRIES + 1)))
-    assert outputs2 == []
+    for _ in range(MAX_ERROR_RETRIES - 1):
+        (retry_req,) = respond(retry_req, payload)
+    assert respond(retry_req, payload) == []
+    assert spider.error_state_count == MAX_ERROR_RETRIES + 1
     assert 40999 in spider.zips_failed
+    assert spider.zips_done == 1
 
 
 def test_parse_search_dedupes_across_zips(spider):
     payload = _load_fixture("ky_search_42101.json")
-    list(spider.parse_search(search_response(payload, zip5=42101)))
+    run_search(spider, payload, zip5=42101)
     seen_after_first = len(spider.seen)
-    outputs = list(spider.parse_search(search_response(payload, zip5=42101)))
+    outputs = run_search(spider, payload, zip5=42101)
     assert outputs == []
     assert len(spider.seen) == seen_after_first == 24
 
@@ -264,8 +278,7 @@ def test_parse_detail_center_golden(spider):
     provider_id = _num(record["ProviderId"])
     item = spider._item_from_summary(record, provider_id)
     payload = _load_fixture("ky_detail_center.json")
-    result = next(spider.parse_detail(
-        detail_response(payload, item=item, provider_id=provider_id)))
+    result = run_detail(spider, payload, item=item, provider_id=provider_id)[0]
 
     assert isinstance(result, ProviderItem)
     assert result["provider_name"] == "Warren County Head Start & Child Care Center"
@@ -295,8 +308,7 @@ def test_golden_item_has_no_undefined_fields(spider):
     provider_id = _num(record["ProviderId"])
     item = spider._item_from_summary(record, provider_id)
     payload = _load_fixture("ky_detail_center.json")
-    result = next(spider.parse_detail(
-        detail_response(payload, item=item, provider_id=provider_id)))
+    result = run_detail(spider, payload, item=item, provider_id=provider_id)[0]
     assert dict(result)  # constructing/serializing raises on an undefined field
 
 
@@ -319,8 +331,7 @@ def test_parse_detail_home_golden(spider):
     }
     item = spider._item_from_summary(record, 103038)
     payload = _load_fixture("ky_detail_home.json")
-    result = next(spider.parse_detail(
-        detail_response(payload, item=item, provider_id=103038)))
+    result = run_detail(spider, payload, item=item, provider_id=103038)[0]
 
     assert result["license_number"] == "C68494"
     assert norm.facility_category_from_type(result["provider_type"]) == \
@@ -334,34 +345,75 @@ def test_parse_detail_empty_keeps_summary_item(spider):
     item["provider_name"] = "Some Provider"
     item["license_number"] = "L999999"
     payload = _load_fixture("ky_detail_empty.json")
-    result = next(spider.parse_detail(
-        detail_response(payload, item=item, provider_id=999)))
+    result = run_detail(spider, payload, item=item, provider_id=999)[0]
     assert result["license_number"] == "L999999"
     assert "capacity" not in result
     assert "inspections" not in result
     assert spider.detail_failures == 1
 
 
-def test_detail_errback_emits_summary_only_item(spider):
+def test_detail_transport_failure_emits_summary_only_item(spider):
     item = ProviderItem()
     item["provider_name"] = "Timeout Provider"
     item["license_number"] = "L123456"
+    request = next(spider.aura.requests(
+        [spider._detail_action(42, "L123456", item)]))
 
     class _Failure:
-        request = Request(AURA_URL, meta={"item": item, "provider_id": 42})
         value = TimeoutError("connection reset")
+    _Failure.request = request
 
-    out = list(spider.detail_errback(_Failure()))
+    out = list(request.errback(_Failure()))
     assert out == [item]
     assert spider.detail_failures == 1
 
 
+def test_detail_error_state_is_retried_then_emits_summary_item(spider):
+    item = ProviderItem()
+    item["license_number"] = "L123456"
+    payload = _load_fixture("ky_search_error.json")  # same ERROR envelope
+    (retry,) = run_detail(spider, payload, item=item, provider_id=42)
+    assert _decode_message(retry)["actions"][0]["params"]["method"] == \
+        "fetchBrightwheelDetailsForProvider"
+    for _ in range(MAX_ERROR_RETRIES - 1):
+        (retry,) = respond(retry, payload)
+    assert respond(retry, payload) == [item]
+    assert spider.detail_failures == 1
+
+
+def test_batch_arg_packs_searches_and_demuxes_per_zip():
+    spider = KentuckySpider(zips="42101,40999,49999", batch=3)
+    (request,) = list(spider.start_requests())
+    zips = [a.cb_kwargs["zip5"] for a in request.meta["aura_actions"]]
+    assert zips == [42101, 40999, 49999]
+    message = _decode_message(request)
+    assert [a["id"] for a in message["actions"]] == ["0;a", "1;a", "2;a"]
+
+    hits = _load_fixture("ky_search_42101.json")["actions"][0]
+    error = _load_fixture("ky_search_error.json")["actions"][0]
+    empty = _load_fixture("ky_search_empty.json")["actions"][0]
+    payload = {"actions": [dict(hits, id="0;a"), dict(error, id="1;a"),
+                           dict(empty, id="2;a")]}
+    outputs = respond(request, payload)
+
+    # Only the ERROR ZIP is retried; it rides in the first POST along with
+    # the first details the hits produced, three actions per POST.
+    batches = [o.meta["aura_actions"] for o in outputs]
+    assert all(len(b) <= 3 for b in batches)
+    actions = [a for b in batches for a in b]
+    searches = [a for a in actions if a.method == "getChildCareProviderDetails"]
+    assert [a.cb_kwargs["zip5"] for a in searches] == [40999]
+    assert len(actions) - len(searches) == 24
+    assert len(outputs) == 9
+    assert spider.zips_done == 2  # 42101 and 49999; 40999 still in flight
+    assert spider.error_state_count == 1
+
+
 def test_inspection_join_poc(spider):
     item = ProviderItem()
     item["license_number"] = "L353576"
     payload = _load_fixture("ky_detail_poc.json")
-    result = next(spider.parse_detail(
-        detail_response(payload, item=item, provider_id=403)))
+    result = run_detail(spider, payload, item=item, provider_id=403)[0]
 
     inspections = result["inspections"]
     assert len(inspections) == 20
@@ -388,8 +440,7 @@ def test_ongoing_processes_and_max_inspections(spider):
     item = ProviderItem()
     item["license_number"] = "L356054"
     payload = _load_fixture("ky_detail_ongoing.json")
-    result = next(spider.parse_detail(
-        detail_response(payload, item=item, provider_id=1500)))
+    result = run_detail(spider, payload, item=item, provider_id=1500)[0]
 
     assert result["ky_ongoing_processes"] == [
         {"process_type": "Adverse Action", "status": "On-going"},
@@ -409,8 +460,7 @@ def test_tristate_flags(spider, source_field, item_field):
             "mapResponse"]["KICCSDataDetails"]
         kiccs[source_field] = raw
         item = ProviderItem()
-        result = next(spider.parse_detail(
-            detail_response(payload, item=item, provider_id=84)))
+        result = run_detail(spider, payload, item=item, provider_id=84)[0]
         if expected is None:
             assert item_field not in result  # null -> unset, not False
         else:
@@ -430,3 +480,19 @@ def test_kentucky_status_mapping():
 ])
 def test_kentucky_facility_category_mapping(provider_type, category):
     assert norm.facility_category_from_type(provider_type) == category
+
+
+def test_partition_plan_records_zip_hits_and_defers_cold_zips(tmp_path):
+    from provider_scrape.partition import COLD_PRIORITY, PartitionPlan
+
+    spider = KentuckySpider(zips="42101,49999,49998", batch=2)
+    spider.partitions = PartitionPlan(str(tmp_path / "plan.sqlite"))
+    run_search(spider, _load_fixture("ky_search_42101.json"), zip5=42101)
+    for _ in range(2):
+        run_search(spider, _load_fixture("ky_search_empty.json"), zip5=49999)
+        run_search(spider, _load_fixture("ky_search_empty.json"), zip5=49998)
+
+    requests = list(spider.start_requests())
+    assert [[a.cb_kwargs["zip5"] for a in r.meta["aura_actions"]]
+            for r in requests] == [[42101], [49999]]
+    assert [r.priority for r in requests] == [0, COLD_PRIORITY]
@@ -0,0 +1,168 @@
+"""Tests for the incremental-crawl provider manifest (provider_scrape.manifest)
+and the ManifestPipeline that opens it and records fresh items."""
+import logging
+import os
+from types import SimpleNamespace
+
+import pytest
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+
+from provider_scrape.items import ProviderItem
+from provider_scrape.manifest import (
+    IncrementalManifestMixin,
+    ProviderManifest,
+    fingerprint,
+    incremental_requested,
+    item_from_manifest,
+    manifest_path,
+)
+from provider_scrape.pipelines import ManifestPipeline
+from provider_scrape.spiders.kansas import SEARCH_URL, KansasSpider
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class _Spider(IncrementalManifestMixin):
+    name = "teststate"
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+        self.logger = logging.getLogger("test.manifest")
+
+
+def _crawler(tmp_path):
+    crawler = SimpleNamespace(
+        settings=Settings({"PROVIDER_MANIFEST_DIR": str(tmp_path)}))
+    crawler.stats = MemoryStatsCollector(crawler)
+    return crawler
+
+
+def _open(spider, tmp_path):
+    spider.crawler = _crawler(tmp_path)
+    spider.settings = spider.crawler.settings
+    pipeline = ManifestPipeline()
+    pipeline.open_spider(spider)
+    return pipeline
+
+
+def _item(**fields):
+    item = ProviderItem()
+    item.update({"source_state": "TS", "provider_name": "Little Acorns",
+                 "license_number": "L-1", **fields})
+    return item
+
+
+def test_fingerprint_ignores_key_order_and_tracks_values():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1", True), ("true", True), ("Yes", True),
+    ("0", False), ("false", False), ("", False), (None, False),
+])
+def test_incremental_requested(value, expected):
+    spider = SimpleNamespace() if value is None else \
+        SimpleNamespace(incremental=value)
+    assert incremental_requested(spider) is expected
+
+
+def test_manifest_roundtrip_and_fingerprint_mismatch(tmp_path):
+    manifest = ProviderManifest(manifest_path(str(tmp_path), "teststate"))
+    manifest.record("L-1", "fp-a", {"provider_name": "Little Acorns"})
+
+    assert manifest.lookup("L-1", "fp-a") == {"provider_name": "Little Acorns"}
+    assert manifest.lookup("L-1", "fp-b") is None  # listing row changed
+    assert manifest.lookup("L-2", "fp-a") is None  # never seen
+    assert len(manifest) == 1
+    manifest.close()
+
+
+def test_item_from_manifest_drops_undeclared_fields():
+    item = item_from_manifest({"provider_name": "X", "retired_field": 1})
+    assert isinstance(item, ProviderItem)
+    assert dict(item) == {"provider_name": "X"}
+
+
+def test_mixin_is_a_noop_without_incremental(tmp_path):
+    spider = _Spider()
+    pipeline = _open(spider, tmp_path)
+    assert spider.manifest is None
+    assert spider.manifest_reuse("L-1", {"city": "Topeka"}) is None
+    assert pipeline.process_item(_item(), spider)["license_number"] == "L-1"
+    assert not os.path.exists(manifest_path(str(tmp_path), "teststate"))
+
+
+def test_second_run_reuses_unchanged_and_refetches_changed(tmp_path):
+    row = {"city": "Topeka", "status": "Licensed"}
+
+    first = _Spider(incremental="1")
+    pipeline = _open(first, tmp_path)
+    assert first.manifest_reuse("L-1", row) is None  # unknown -> crawl it
+    pipeline.process_item(_item(capacity=12), first)
+    pipeline.close_spider(first)
+    assert first.crawler.stats.get_value("manifest/recorded") == 1
+
+    second = _Spider(incremental="1")
+    pipeline = _open(second, tmp_path)
+    cached = second.manifest_reuse("L-1", dict(row))
+    assert isinstance(cached, ProviderItem)
+    assert cached["capacity"] == 12
+    # A re-emitted item passes through without being re-recorded.
+    pipeline.process_item(cached, second)
+    assert second.crawler.stats.get_value("manifest/reused") == 1
+    assert second.crawler.stats.get_value("manifest/recorded") is None
+
+    # A changed listing row is a miss.
+    assert second.manifest_reuse("L-1", {**row, "status": "Closed"}) is None
+    pipeline.close_spider(second)
+
+
+def test_forget_keeps_partial_items_out_of_the_manifest(tmp_path):
+    spider = _Spider(incremental="1")
+    pipeline = _open(spider, tmp_path)
+    spider.manifest_reuse("L-1", {"city": "Topeka"})
+    spider.manifest_forget("L-1")  # e.g. the detail fetch failed
+    pipeline.process_item(_item(), spider)
+    assert len(spider.manifest) == 0
+    pipeline.close_spider(spider)
+
+
+def test_pipeline_warns_for_spider_without_mixin(tmp_path, caplog):
+    spider = SimpleNamespace(name="other", incremental="1",
+                             settings=_crawler(tmp_path).settings,
+                             logger=logging.getLogger("test.manifest"))
+    pipeline = ManifestPipeline()
+    with caplog.at_level(logging.WARNING):
+        pipeline.open_spider(spider)
+    assert "does not support incremental" in caplog.text
+
+
+def test_kansas_reuses_unchanged_rows_instead_of_minting(tmp_path):
+    with open(os.path.join(FIXTURES, "ks_results_page.html"), "rb") as fh:
+        body = fh.read()
+
+    def results():
+        req = Request(SEARCH_URL, meta={"county": "Crawford", "page": 1})
+        return HtmlResponse(url=SEARCH_URL, body=body, encoding="utf-8",
+                            request=req)
+
+    first = KansasSpider(incremental="1")
+    pipeline = _open(first, tmp_path)
+    mints = [r for r in first.parse_results(results()) if "row" in r.meta]
+    assert len(mints) == 10
+    # Stand in for parse_detail: record one complete item per minted row.
+    for req in mints:
+        pipeline.process_item(
+            _item(license_number=req.meta["row"]["license_number"]), first)
+    pipeline.close_spider(first)
+
+    second = KansasSpider(incremental="1")
+    pipeline = _open(second, tmp_path)
+    outputs = list(second.parse_results(results()))
+    pipeline.close_spider(second)
+
+    assert not [r for r in outputs if isinstance(r, Request) and "row" in r.meta]
+    assert len([o for o in outputs if isinstance(o, ProviderItem)]) == 10
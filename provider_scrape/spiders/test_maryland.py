@@ -1,4 +1,5 @@
 import json
+import os
 
 import pytest
 import scrapy
@@ -6,6 +7,11 @@ from scrapy.http import HtmlResponse, Request, TextResponse
 from provider_scrape.spiders.maryland import (
     MarylandSpider,
     extract_address_from_pdf,
+    _address_from_ocr_text,
+    _render_address_band,
+    ADDRESS_BAND,
+    OCR_CACHE_VERSION,
+    OCR_SCALE,
     MAX_NAV_ATTEMPTS,
     MAX_CHAIN_RESTARTS,
     MAX_DETAIL_REPRIMES,
@@ -1401,3 +1407,540 @@ async def test_parse_inspection_pdf_keeps_fallback_on_ocr_failure(spider):
 
     assert len(results) == 1
     assert results[0]["address"] == "Howard Street, Baltimore, MD 21201"
+
+
+# --------------------------------------------------------------------------- #
+# OCR process pool (-a ocr_workers)
+# --------------------------------------------------------------------------- #
+class _InlinePool:
+    """OcrPool stand-in that runs the job in-process and tracks its slots."""
+
+    def __init__(self):
+        self.released = 0
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+    def release(self):
+        self.released += 1
+
+
+def _fake_crawler():
+    from scrapy.settings import Settings
+    from scrapy.signalmanager import SignalManager
+    from scrapy.statscollectors import MemoryStatsCollector
+
+    crawler = SimpleNamespace(settings=Settings(), signals=SignalManager())
+    crawler.stats = MemoryStatsCollector(crawler)
+    return crawler
+
+
+def test_ocr_workers_builds_pool_only_with_fallback():
+    spider = MarylandSpider.from_crawler(
+        _fake_crawler(), proxies="off", ocr_workers="3", ocr_queue="4",
+        ocr_cache="off")
+    assert spider.ocr_pool.workers == 3
+    assert spider.ocr_pool.max_pending == 4
+    assert spider.ocr_pool._executor is None  # started lazily
+    # Stats are attached at spider_opened: crawler.stats doesn't exist yet
+    # when a real Crawler builds the spider.
+    spider.crawler.signals.send_catch_log(
+        signal=scrapy.signals.spider_opened, spider=spider)
+    spider._stall_task.stop()
+    assert spider.ocr_pool.stats is spider.crawler.stats
+
+    off = MarylandSpider.from_crawler(
+        _fake_crawler(), proxies="off", ocr_workers="3", ocr_fallback="false",
+        ocr_cache="off")
+    assert off.ocr_pool is None
+    assert MarylandSpider(proxies="off").ocr_pool is None
+
+
+def test_pdf_requests_wait_in_the_spider_while_the_ocr_pool_is_full():
+    spider = MarylandSpider.from_crawler(
+        _fake_crawler(), proxies="off", ocr_workers="1", ocr_queue="1",
+        ocr_cache="off")
+    spider.crawler.engine = Mock()
+    first, held = ProviderItem(license_number="1"), ProviderItem(license_number="2")
+    (request,) = spider._address_fallback(first, "https://www.checkccmd.org/1.pdf")
+    assert request.meta["ocr_slot"] is True
+    assert request.errback == spider._inspection_pdf_failed
+    # Pool full: nothing is yielded, so no download slot is taken meanwhile.
+    assert list(spider._address_fallback(held, "https://www.checkccmd.org/2.pdf")) == []
+    spider.crawler.engine.crawl.assert_not_called()
+
+    spider._release_ocr_slot(request.meta)
+    (scheduled,) = [c.args[0] for c in spider.crawler.engine.crawl.call_args_list]
+    assert scheduled.cb_kwargs["item"] is held and scheduled.meta["ocr_slot"] is True
+
+
+@pytest.mark.asyncio
+async def test_parse_inspection_pdf_uses_pool_and_releases_slot(spider):
+    spider.ocr_pool = _InlinePool()
+    item = ProviderItem(provider_name="P", address="Howard Street")
+    request = Request(url="https://www.checkccmd.org/x.pdf",
+                      meta={"ocr_slot": True})
+    response = HtmlResponse(url=request.url, body=b"%PDF", request=request)
+    with patch(
+        "provider_scrape.spiders.maryland.extract_address_from_pdf",
+        return_value="325 N Howard Street, Baltimore, MD 21201",
+    ):
+        results = [i async for i in spider.parse_inspection_pdf(response, item=item)]
+    assert results[0]["address"] == "325 N Howard Street, Baltimore, MD 21201"
+    assert spider.ocr_pool.released == 1
+    assert response.meta["ocr_slot"] is False
+
+
+def test_failed_pdf_download_releases_slot_and_keeps_item(spider):
+    from twisted.python.failure import Failure
+
+    spider.ocr_pool = _InlinePool()
+    item = ProviderItem(provider_name="P", address="Howard Street")
+    request = Request(url="https://www.checkccmd.org/x.pdf",
+                      cb_kwargs={"item": item}, meta={"ocr_slot": True})
+    failure = Failure(TimeoutError("slow"))
+    failure.request = request
+    assert list(spider._inspection_pdf_failed(failure)) == [item]
+    assert spider.ocr_pool.released == 1
+
+
+def test_partial_items_are_not_stored_as_complete(spider):
+    from twisted.python.failure import Failure
+
+    url = "https://www.checkccmd.org/FacilityDetail.aspx?fi=134978"
+    item = ProviderItem(provider_name="P", address="Howard Street",
+                        provider_url=url)
+    spider._manifest_pending()["134978"] = "fp"
+    request = Request(url="https://www.checkccmd.org/x.pdf",
+                      cb_kwargs={"item": item})
+    failure = Failure(TimeoutError("slow"))
+    failure.request = request
+    assert list(spider._inspection_pdf_failed(failure)) == [item]
+
+    # Neither the manifest nor the checkpoint keeps the degraded item, so the
+    # next (or resumed) run fetches the detail again.
+    assert not spider.manifest_capture(item)
+    assert spider.checkpoint_key(item) is None
+    # Only that emission: a later complete item for the fi is keyed again.
+    assert spider.checkpoint_key(item) == "134978"
+
+
+@pytest.mark.asyncio
+async def test_failed_ocr_marks_item_partial(spider):
+    url = "https://www.checkccmd.org/FacilityDetail.aspx?fi=134978"
+    item = ProviderItem(provider_name="P", address="Howard Street",
+                        provider_url=url)
+    request = Request(url="https://www.checkccmd.org/x.pdf")
+    response = HtmlResponse(url=request.url, body=b"%PDF", request=request)
+    with patch("provider_scrape.spiders.maryland.extract_address_from_pdf",
+               return_value=None):
+        [result] = [i async for i in spider.parse_inspection_pdf(response, item=item)]
+    assert result["address"] == "Howard Street"
+    assert spider.checkpoint_key(item) is None
+
+
+# --------------------------------------------------------------------------- #
+# Address-band render + OCR result cache (-a ocr_cache)
+# --------------------------------------------------------------------------- #
+INSPECTION_PDF = os.path.join(
+    os.path.dirname(__file__), "fixtures", "md_inspection_report_center.pdf")
+
+
+def _inspection_pdf_bytes():
+    with open(INSPECTION_PDF, "rb") as handle:
+        return handle.read()
+
+
+def test_render_address_band_matches_full_render_crop():
+    import pypdfium2 as pdfium
+
+    pdf_bytes = _inspection_pdf_bytes()
+    buffer, width, height, stride = _render_address_band(pdf_bytes)
+    assert (width, height) == (3300, ADDRESS_BAND[1] - ADDRESS_BAND[0])
+
+    # The pre-ROI pipeline: render the whole page at 2x, then crop with PIL.
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        full = pdf[0].render(scale=OCR_SCALE).to_pil().convert("L")
+    finally:
+        pdf.close()
+    expected = full.crop((0, ADDRESS_BAND[0], 3300, ADDRESS_BAND[1]))
+    rows = [buffer[y * stride:y * stride + width] for y in range(height)]
+    assert b"".join(rows) == expected.tobytes()
+    assert min(buffer) < 128  # the ADDRESS text is inside the band
+
+
+def test_address_from_ocr_text():
+    assert _address_from_ocr_text(
+        "REPORT\nADDRESS: 325 N Howard Street Baltimore MD 21201\n"
+    ) == "325 N Howard Street Baltimore, MD 21201"
+    assert _address_from_ocr_text(
+        "ADDRESS:\n325 N Howard Street Baltimore MD 21201"
+    ) == "325 N Howard Street Baltimore, MD 21201"
+    assert _address_from_ocr_text("INSPECTION REPORT\nLICENSE 150301\n") == ""
+
+
+def test_ocr_result_cache_roundtrip(tmp_path):
+    from provider_scrape.ocr_pool import OcrResultCache
+
+    path = str(tmp_path / "ocr.sqlite")
+    cache = OcrResultCache(path, version="v1")
+    key = cache.key(b"%PDF-1")
+    assert cache.get(key) is None
+    cache.put(key, "325 N Howard Street, Baltimore, MD 21201")
+    cache.put(cache.key(b"%PDF-2"), "")
+    cache.close()
+
+    reopened = OcrResultCache(path, version="v1")
+    assert reopened.get(key) == "325 N Howard Street, Baltimore, MD 21201"
+    assert reopened.get(reopened.key(b"%PDF-2")) == ""
+    # A new calibration tag never sees the old results.
+    assert OcrResultCache(path, version="v2").key(b"%PDF-1") != key
+    reopened.close()
+
+
+def test_ocr_cache_opened_by_from_crawler(tmp_path):
+    path = str(tmp_path / "ocr.sqlite")
+    spider = MarylandSpider.from_crawler(
+        _fake_crawler(), proxies="off", ocr_cache=path)
+    assert spider.ocr_cache is not None
+    assert spider.ocr_cache.version == OCR_CACHE_VERSION
+    spider.ocr_cache.close()
+
+    assert MarylandSpider(proxies="off", ocr_cache=path).ocr_cache is None
+    assert MarylandSpider.from_crawler(
+        _fake_crawler(), proxies="off", ocr_cache=path, ocr_fallback="false",
+    ).ocr_cache is None
+
+
+def _pdf_response(body, meta=None):
+    request = Request(url="https://www.checkccmd.org/x.pdf", meta=meta or {})
+    return HtmlResponse(url=request.url, body=body, request=request)
+
+
+@pytest.mark.asyncio
+async def test_parse_inspection_pdf_cache_hit_skips_ocr(spider, tmp_path):
+    from provider_scrape.ocr_pool import OcrResultCache
+
+    spider.crawler = _fake_crawler()
+    spider.ocr_cache = OcrResultCache(str(tmp_path / "ocr.sqlite"))
+    spider.ocr_pool = _InlinePool()
+    body = _inspection_pdf_bytes()
+    spider.ocr_cache.put(spider.ocr_cache.key(body),
+                         "325 N Howard Street, Baltimore, MD 21201")
+
+    item = ProviderItem(provider_name="P", address="Howard Street")
+    response = _pdf_response(body, meta={"ocr_slot": True})
+    with patch(
+        "provider_scrape.spiders.maryland.extract_address_from_pdf",
+        side_effect=AssertionError("OCR must not run on a cache hit"),
+    ):
+        results = [i async for i in spider.parse_inspection_pdf(response, item=item)]
+    assert results[0]["address"] == "325 N Howard Street, Baltimore, MD 21201"
+    assert spider.ocr_pool.released == 1
+    assert spider.crawler.stats.get_value("ocr_cache/hit") == 1
+    spider.ocr_cache.close()
+
+
+@pytest.mark.asyncio
+async def test_parse_inspection_pdf_caches_definitive_results_only(spider, tmp_path):
+    from provider_scrape.ocr_pool import OcrResultCache
+
+    spider.crawler = _fake_crawler()
+    spider.ocr_cache = OcrResultCache(str(tmp_path / "ocr.sqlite"))
+    item = ProviderItem(provider_name="P", address="Howard Street")
+
+    # OCR ran and found no ADDRESS line: cached, address left alone.
+    with patch("provider_scrape.spiders.maryland.extract_address_from_pdf",
+               return_value=""):
+        results = [i async for i in spider.parse_inspection_pdf(
+            _pdf_response(b"%PDF-empty"), item=item)]
+    assert results[0]["address"] == "Howard Street"
+    assert spider.ocr_cache.get(spider.ocr_cache.key(b"%PDF-empty")) == ""
+
+    # OCR failed: not cached, so the next run retries it.
+    with patch("provider_scrape.spiders.maryland.extract_address_from_pdf",
+               return_value=None):
+        [i async for i in spider.parse_inspection_pdf(
+            _pdf_response(b"%PDF-broken"), item=item)]
+    assert spider.ocr_cache.get(spider.ocr_cache.key(b"%PDF-broken")) is None
+    assert spider.crawler.stats.get_value("ocr_cache/miss") == 2
+    spider.ocr_cache.close()
+
+
+def test_proxy_health_arg_enables_weighted_pool():
+    s = MarylandSpider(proxies="1.1.1.1:80,2.2.2.2:81", proxy_env="/nonexistent",
+                       proxy_health="true", proxy_cooloff="30")
+    assert s.proxy_pool.health is not None
+    assert s.proxy_pool.health.cooloff == 30.0
+    plain = MarylandSpider(proxies="1.1.1.1:80", proxy_env="/nonexistent")
+    assert plain.proxy_pool.health is None
+
+
+def test_pagination_restart_may_repin_only_with_proxy_health():
+    failure = _failed_pagination_failure()
+    failure.request.meta.update(proxy="http://u:p@1.1.1.1:80", download_slot="webshare-0")
+    s = MarylandSpider(proxies="1.1.1.1:80,2.2.2.2:81", proxy_env="/nonexistent",
+                       proxy_health="true")
+    out = s._pagination_errback(failure)
+    assert "proxy" not in out.meta and "download_slot" not in out.meta
+    assert out.meta["proxy_repin"] is True
+
+    plain = MarylandSpider(proxies="1.1.1.1:80,2.2.2.2:81", proxy_env="/nonexistent")
+    out = plain._pagination_errback(_failed_pagination_failure())
+    assert "proxy_repin" not in out.meta
+
+
+def test_adaptive_delay_arg_enables_aimd():
+    crawler = _fake_crawler()
+    MarylandSpider.from_crawler(crawler, proxies="off", ocr_cache="off",
+                                adaptive_delay="true")
+    assert crawler.settings.getbool("RATELIMIT_AIMD_ENABLED")
+    assert crawler.settings.getfloat("RATELIMIT_AIMD_MIN_DELAY") == 31
+    assert crawler.settings.get("RATELIMIT_AIMD_STATE").endswith(
+        os.path.join("ratelimit", "maryland.json"))
+
+    lowered = _fake_crawler()
+    MarylandSpider.from_crawler(lowered, proxies="off", ocr_cache="off",
+                                adaptive_delay="true", delay="20")
+    assert lowered.settings.getfloat("RATELIMIT_AIMD_MIN_DELAY") == 20
+
+    plain = _fake_crawler()
+    MarylandSpider.from_crawler(plain, proxies="off", ocr_cache="off")
+    assert not plain.settings.getbool("RATELIMIT_AIMD_ENABLED")
+
+
+def test_autotune_arg_enables_global_autotuner():
+    crawler = _fake_crawler()
+    MarylandSpider.from_crawler(crawler, proxies="off", ocr_cache="off",
+                                autotune="true")
+    assert crawler.settings.getbool("AUTOTUNE_ENABLED")
+    assert MarylandSpider.custom_settings["AUTOTUNE_SCOPE"] == "global"
+    assert MarylandSpider.custom_settings["AUTOTUNE_DOMAINS"] == ["checkccmd.org"]
+
+    plain = _fake_crawler()
+    MarylandSpider.from_crawler(plain, proxies="off", ocr_cache="off")
+    assert not plain.settings.getbool("AUTOTUNE_ENABLED")
+
+
+def _checkpointed_spider(tmp_path):
+    from provider_scrape.checkpoint import CrawlCheckpoint
+
+    s = MarylandSpider(proxies="off", checkpoint=str(tmp_path / "cp.sqlite"))
+    s.checkpoint = CrawlCheckpoint(s.checkpoint_path)
+    return s
+
+
+def test_checkpoint_arg_defaults_off_and_opens_in_from_crawler(tmp_path):
+    assert MarylandSpider(proxies="off").checkpoint_path is None
+    assert MarylandSpider(proxies="off", checkpoint="true").checkpoint_path == "default"
+
+    path = str(tmp_path / "cp.sqlite")
+    crawler = _fake_crawler()
+    s = MarylandSpider.from_crawler(crawler, proxies="off", ocr_cache="off",
+                                    checkpoint=path)
+    assert s.checkpoint.path == path
+    s.checkpoint.close()
+
+
+def test_parse_results_checkpoints_pending_details_and_completed_shards(tmp_path):
+    s = _checkpointed_spider(tmp_path)
+    request = Request(url="https://www.checkccmd.org/SearchResults.aspx")
+    response = HtmlResponse(
+        url=request.url, body=RESULTS_HTML, encoding="utf-8", request=request
+    )
+
+    list(s.parse_results(response, county_key="TestCounty [CTR]"))
+
+    pending = {fi: (url, fields) for fi, url, fields in s.checkpoint.pending()}
+    assert set(pending) == {"463466", "134978"}
+    url, fields = pending["134978"]
+    assert url.startswith("https://www.checkccmd.org/FacilityDetail.aspx")
+    assert fields == {"address": "N Howard Street, Baltimore, MD 21201",
+                      "school_name": "Lincoln Elementary", "program_type": "CTR"}
+    # More pages to go: the shard isn't complete yet.
+    assert s.checkpoint.completed_shards() == {}
+
+    # The last page (no next link) completes the shard with its counts.
+    last_html = "\n".join(
+        line for line in RESULTS_HTML.splitlines() if "__doPostBack" not in line)
+    last = HtmlResponse(url=request.url, body=last_html.replace("8476", "2"),
+                        encoding="utf-8", request=request)
+    list(s.parse_results(last, county_key="Small [CTR]"))
+    assert s.checkpoint.completed_shards() == {"Small [CTR]": (2, 2)}
+
+
+def test_resume_replays_items_reissues_details_and_skips_done_shards(tmp_path):
+    s = _checkpointed_spider(tmp_path)
+    s.checkpoint.complete_shard("Howard [Centers]", 40, 40)
+    s.checkpoint.add_pending([
+        ("111", "https://www.checkccmd.org/FacilityDetail.aspx?fi=111",
+         {"address": "1 Main St", "school_name": None, "program_type": "CTR"}),
+        ("222", "https://www.checkccmd.org/FacilityDetail.aspx?fi=222",
+         {"address": None, "school_name": None, "program_type": None}),
+    ])
+    s.checkpoint.record_item("222", {
+        "provider_name": "Done Daycare",
+        "provider_url": "https://www.checkccmd.org/FacilityDetail.aspx?fi=222",
+    })
+
+    out = list(s._resume_from_checkpoint())
+
+    items = [o for o in out if isinstance(o, ProviderItem)]
+    requests = [o for o in out if isinstance(o, Request)]
+    assert [i["provider_name"] for i in items] == ["Done Daycare"]
+    (detail,) = requests
+    assert detail.url.endswith("fi=111")
+    assert detail.callback == s.parse_detail
+    assert detail.cb_kwargs["address"] == "1 Main St"
+    assert detail.meta["cookiejar"] == DETAIL_COOKIEJAR
+    assert detail.headers.get("Referer").decode() == SEARCH_RESULTS_REFERER
+    assert s.seen_fi == {"111", "222"}
+    assert s._shard_done("Howard [Centers]")
+    assert not s._shard_done("Howard [Homes]")
+    assert s.declared_total_by_county["Howard [Centers]"] == 40
+    assert s.found_count_by_county["Howard [Centers]"] == 40
+
+
+def test_closed_clears_checkpoint_only_when_finished(tmp_path):
+    s = _checkpointed_spider(tmp_path)
+    s.checkpoint.complete_shard("Howard [Centers]", 40, 40)
+    s.closed("shutdown")
+
+    s = _checkpointed_spider(tmp_path)
+    assert s.checkpoint.resumable
+    s.closed("finished")
+
+    s = _checkpointed_spider(tmp_path)
+    assert not s.checkpoint.resumable
+    s.checkpoint.close()
+
+
+def test_stall_close_with_checkpoint_asks_for_a_retry(tmp_path, caplog):
+    s = _checkpointed_spider(tmp_path)
+    s._stall_windows = STALL_CLOSE_WINDOWS - 1
+    s._stall_last_responses = s._stall_last_progress = 0
+    engine = Mock()
+    s.crawler = SimpleNamespace(stats=_stats_from({}), engine=engine)
+
+    s._check_stall()
+
+    engine.close_spider.assert_called_once()
+    assert "Retryable Error" in caplog.text
+    s.checkpoint.close()
+
+
+def _queued_spider(tmp_path, role="worker"):
+    crawler = _fake_crawler()
+    crawler.engine = Mock()
+    s = MarylandSpider.from_crawler(
+        crawler, proxies="off", ocr_cache="off", role=role, worker_id="w1",
+        queue=f"sqlite:///{tmp_path}/queue.sqlite", checkpoint="true",
+    )
+    s._work_task = Mock()   # started (no reactor in tests)
+    return s
+
+
+def _search_page():
+    request = Request(url="https://www.checkccmd.org/")
+    return HtmlResponse(
+        url=request.url, body=SEARCH_PAGE_HTML, encoding="utf-8", request=request
+    )
+
+
+def test_role_must_be_worker_or_coordinator():
+    with pytest.raises(ValueError):
+        MarylandSpider(proxies="off", role="merger")
+
+
+def test_coordinator_enqueues_shards_instead_of_crawling(tmp_path):
+    s = _queued_spider(tmp_path, role="coordinator")
+    assert s.checkpoint is None   # the queue supersedes the checkpoint
+
+    assert list(s.parse(_search_page())) == []
+
+    leased = s.work_queue.lease("w1", limit=10)
+    assert [w.id for w in leased] == [
+        "shard:Alpha County [Center]",
+        "shard:Beta County [Center]",
+        "shard:Alpha County [Homes]",
+        "shard:Beta County [Homes]",
+    ]
+    assert leased[0].payload == {
+        "county": "Alpha County", "fac_type": "Center", "status": None}
+
+
+def test_worker_turns_leased_work_into_shard_and_detail_requests(tmp_path):
+    s = _queued_spider(tmp_path)
+    list(s.parse(_search_page()))
+    s.work_queue.put([
+        ("shard:Alpha County [Homes/Open]", "shard",
+         {"county": "Alpha County", "fac_type": "Homes", "status": "Open",
+          "status_label": "Open"}, 1),
+        ("detail:7", "detail",
+         {"url": "https://www.checkccmd.org/FacilityDetail.aspx?fi=7",
+          "fields": {"address": "1 Main St", "school_name": None,
+                     "program_type": "CTR"}}, 0),
+    ])
+
+    s._work_tick()
+
+    shard, detail = [c.args[0] for c in s.crawler.engine.crawl.call_args_list]
+    assert shard.callback == s.parse_county_search
+    assert shard.cb_kwargs == {"county_key": "Alpha County [Homes/Open]",
+                               "county": "Alpha County", "fac_type": "Homes",
+                               "status": "Open"}
+    assert s.parsed_pages_by_county["Alpha County [Homes/Open]"] == set()
+    assert detail.callback == s.parse_detail
+    assert detail.cb_kwargs["address"] == "1 Main St"
+    assert detail.meta["cookiejar"] == DETAIL_COOKIEJAR
+    assert detail.headers.get("Referer").decode() == SEARCH_RESULTS_REFERER
+
+
+def test_worker_enqueues_listed_details_and_completes_its_shard(tmp_path):
+    s = _queued_spider(tmp_path)
+    request = Request(url="https://www.checkccmd.org/SearchResults.aspx")
+    response = HtmlResponse(
+        url=request.url, body=RESULTS_HTML, encoding="utf-8", request=request
+    )
+
+    out = list(s.parse_results(response, county_key="TestCounty [CTR]"))
+
+    # No local detail fetches -- only the next page of the chain.
+    assert [type(r) for r in out] == [scrapy.FormRequest]
+    details = s.work_queue.lease("w2", limit=5)
+    assert [w.id for w in details] == ["detail:463466", "detail:134978"]
+    assert details[1].payload["fields"]["school_name"] == "Lincoln Elementary"
+
+    last_html = "\n".join(
+        line for line in RESULTS_HTML.splitlines() if "__doPostBack" not in line)
+    last = HtmlResponse(url=request.url, body=last_html.replace("8476", "2"),
+                        encoding="utf-8", request=request)
+    list(s.parse_results(last, county_key="Small [CTR]"))
+    assert list(s.work_queue.results(kind="shard")) == [
+        ("shard:Small [CTR]", "shard", {"declared": 2, "found": 2})]
+
+    # The item built from a detail completes that detail's work item.
+    s.work_capture(ProviderItem(
+        provider_name="Kiddie Kare",
+        provider_url="https://www.checkccmd.org/FacilityDetail.aspx?fi=134978"))
+    assert [r[0] for r in s.work_queue.results(kind="detail")] == ["detail:134978"]
+
+
+def test_worker_splits_an_oversized_shard_onto_the_queue(tmp_path):
+    s = _queued_spider(tmp_path)
+    s._license_status_options = [("Open", "Open"), ("Closed", "Closed")]
+    request = Request(url="https://www.checkccmd.org/SearchResults.aspx")
+    response = HtmlResponse(  # RESULTS_HTML declares 8476 (> SHARD_SPLIT_THRESHOLD)
+        url=request.url, body=RESULTS_HTML, encoding="utf-8", request=request
+    )
+
+    out = list(s.parse_results(response, county_key="Big County [Homes]",
+                               allow_split=True, county="Big County",
+                               fac_type="Homes"))
+
+    assert out == []
+    assert [w.id for w in s.work_queue.lease("w2", limit=5)] == [
+        "shard:Big County [Homes/Open]", "shard:Big County [Homes/Closed]"]
+    assert [r[0] for r in s.work_queue.results(kind="shard")] == [
+        "shard:Big County [Homes]"]
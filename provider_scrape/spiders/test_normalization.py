@@ -8,6 +8,8 @@ fake spider, so they are fast and framework-light.
 import copy
 import logging
 
+import pytest
+
 from provider_scrape import normalization
 from provider_scrape.pipelines import NormalizationPipeline
 from provider_scrape.items import ProviderItem
@@ -20,6 +22,9 @@ class FakeSettings:
     def getbool(self, key, default=False):
         return bool(self._values.get(key, default))
 
+    def getint(self, key, default=0):
+        return int(self._values.get(key, default))
+
 
 class FakeSpider:
     """Minimal stand-in exposing the attributes the pipeline touches."""
@@ -30,6 +35,28 @@ class FakeSpider:
         self.logger = logging.getLogger("fake.%s" % name)
 
 
+@pytest.fixture
+def memo():
+    """Fresh value caches and learned date shapes; both restored afterwards."""
+    learned = dict(normalization._LEARNED_DATE_SHAPES)
+    sizes = {name: m.maxsize for name, m in normalization._MEMOIZED.items()}
+    configured = normalization._memo_size
+
+    def configure(maxsize):
+        normalization.configure_memoization(maxsize)
+        for m in normalization._MEMOIZED.values():
+            m.clear()
+
+    configure(16)
+    yield configure
+    for name, m in normalization._MEMOIZED.items():
+        m.configure(sizes[name])
+        m.clear()
+    normalization._memo_size = configured
+    normalization._LEARNED_DATE_SHAPES.clear()
+    normalization._LEARNED_DATE_SHAPES.update(learned)
+
+
 # --------------------------------------------------------------------------- #
 # Task 02 — scaffold / pipeline wiring (already-clean data is left unchanged)
 # --------------------------------------------------------------------------- #
@@ -194,6 +221,44 @@ def test_normalize_date_non_string_unchanged():
     assert normalization.normalize_date(20240101) == 20240101
 
 
+def test_normalize_date_fast_path_validates_like_strptime(caplog):
+    """The shape-sniffing parser accepts exactly the calendar dates strptime
+    did: invalid days/months, a mixed separator and a 2-digit year all still
+    fall through to the unchanged-and-logged branch."""
+    assert normalization.normalize_date("2/29/2024") == "2024-02-29"
+    assert normalization.normalize_date("2000/2/29") == "2000-02-29"
+    assert normalization.normalize_date("Sep 30, 2025 10:15 AM") == "2025-09-30"
+    with caplog.at_level(logging.WARNING, logger="provider_scrape.normalization"):
+        for bad in ("2/29/2023", "1900-02-29", "04/31/2025", "00/10/2025",
+                    "2025-13-01", "2024-01/02", "1/2/24", "Smarch 3, 2024"):
+            assert normalization.normalize_date(bad) == bad
+    assert len(caplog.records) == 8
+
+
+def test_normalize_date_learns_each_fields_format(memo):
+    memo(0)  # every call parses (and learns)
+    hint = ("XX", "license_expiration_test")
+    assert normalization.normalize_date("Oct 1, 2025", hint) == "2025-10-01"
+    assert normalization._LEARNED_DATE_SHAPES[hint] == 2
+    # A learned shape is only an ordering: other shapes still parse.
+    assert normalization.normalize_date("10/02/2025", hint) == "2025-10-02"
+    assert normalization._LEARNED_DATE_SHAPES[hint] == 1
+    assert normalization.normalize_date("2025-10-03", hint) == "2025-10-03"
+
+
+def test_parse_date_is_memoized_on_the_value_alone(memo):
+    before = normalization.memo_stats()["normalize_date"]
+    first, second = ("XX", "date_a"), ("XX", "date_b")
+    assert normalization.normalize_date("Oct 4, 2025", first) == "2025-10-04"
+    assert normalization.normalize_date("Oct 4, 2025", second) == "2025-10-04"
+    assert normalization.normalize_date("Oct 4, 2025") == "2025-10-04"
+    after = normalization.memo_stats()["normalize_date"]
+    assert (after[0] - before[0], after[1] - before[1]) == (2, 1)
+    # Only the miss consulted (and taught) a hint.
+    assert normalization._LEARNED_DATE_SHAPES[first] == 2
+    assert second not in normalization._LEARNED_DATE_SHAPES
+
+
 def test_normalize_item_converts_common_date_fields():
     item = {
         "status_date": "3/1/2025",
@@ -542,3 +607,345 @@ def test_normalize_item_still_parses_when_a_component_missing():
             "city": "Warwick", "state": "RI"}
     out = normalization.normalize_item(item, "rhode_island")
     assert out["zip"] == "02886"
+
+
+# --------------------------------------------------------------------------- #
+# Memoized per-value helpers
+# --------------------------------------------------------------------------- #
+
+def test_memoized_helpers_count_hits_and_still_warn(caplog, memo):
+    before = normalization.memo_stats()
+    for _ in range(3):
+        assert normalization.canonical_status(" Licensed ") == "active"
+        assert normalization.normalize_date("1/2/2024") == "2024-01-02"
+    with caplog.at_level("WARNING"):
+        assert normalization.canonical_status("Nonsense Status") == "unknown"
+        assert normalization.canonical_status("Nonsense Status") == "unknown"
+    # The value is cached, the warning is not: it is logged on every call.
+    assert caplog.text.count("unmapped status") == 2
+    after = normalization.memo_stats()
+    hits = after["canonical_status"][0] - before["canonical_status"][0]
+    misses = after["canonical_status"][1] - before["canonical_status"][1]
+    assert (hits, misses) == (3, 2)
+    assert after["normalize_date"][0] - before["normalize_date"][0] == 2
+
+
+def test_memoization_can_be_disabled(memo):
+    memo(0)
+    before = normalization.memo_stats()
+    assert normalization.title_case_name("SMITH'S DAYCARE LLC") == \
+        "Smith's Daycare LLC"
+    assert normalization.facility_category_from_type(
+        "Licensed Group (Probational)") == \
+        normalization.facility_category_from_type("Licensed Group")
+    assert normalization.memo_stats() == before
+
+
+def test_pipeline_reports_memo_stats(memo):
+    from types import SimpleNamespace
+
+    from scrapy.settings import Settings
+    from scrapy.statscollectors import MemoryStatsCollector
+
+    spider = FakeSpider(settings_values={"NORMALIZE_ENABLED": True,
+                                         "NORMALIZE_MEMO_SIZE": 16})
+    crawler = SimpleNamespace(settings=Settings())
+    crawler.stats = MemoryStatsCollector(crawler)
+    spider.crawler = crawler
+    pipeline = NormalizationPipeline()
+    pipeline.open_spider(spider)
+    for _ in range(5):
+        item = ProviderItem()
+        item["status"] = "Revoked License Pipeline Test"
+        pipeline.process_item(item, spider)
+    pipeline.close_spider(spider)
+    assert crawler.stats.get_value("normalize/memo/canonical_status/misses") == 1
+    assert crawler.stats.get_value("normalize/memo/canonical_status/hits") == 4
+
+
+def test_memo_caches_are_sized_once_per_process(memo, caplog):
+    normalization._memo_size = None
+    first = FakeSpider("first", {"NORMALIZE_MEMO_SIZE": 32})
+    NormalizationPipeline().open_spider(first)
+    assert normalization.canonical_status("Licensed") == "active"
+    warm = normalization.memo_stats()["canonical_status"]
+
+    # A second spider of the same process asking for another size neither
+    # resizes nor clears the caches the first one is using.
+    second = FakeSpider("second", {"NORMALIZE_MEMO_SIZE": 8})
+    with caplog.at_level(logging.WARNING):
+        NormalizationPipeline().open_spider(second)
+    assert "NORMALIZE_MEMO_SIZE=8 ignored" in caplog.text
+    assert normalization._MEMOIZED["canonical_status"].maxsize == 32
+    assert normalization.canonical_status("Licensed") == "active"
+    hits, misses = normalization.memo_stats()["canonical_status"]
+    assert (hits - warm[0], misses - warm[1]) == (1, 0)
+
+
+def test_pipeline_normalizes_item_and_inspections_in_place():
+    from provider_scrape.items import InspectionItem
+
+    spider = FakeSpider(settings_values={"NORMALIZE_ENABLED": True})
+    pipeline = NormalizationPipeline()
+    pipeline.open_spider(spider)
+    inspection = InspectionItem(date="3/1/2025", type="  Routine   Visit ")
+    item = ProviderItem(status="Active", provider_type="Licensed Group",
+                        inspections=[inspection])
+
+    assert pipeline.process_item(item, spider) is item
+    # Inspections come out as plain dicts, whatever the spider built.
+    assert item["inspections"] == [{"date": "2025-03-01", "type": "Routine Visit"}]
+    assert type(item["inspections"][0]) is dict
+    assert item["facility_category"] == \
+        normalization.facility_category_from_type("Licensed Group")
+
+    plain = {"status": "Active", "inspections": [{"date": "3/2/2025"}]}
+    assert pipeline.process_item(plain, spider) is plain
+    assert plain["inspections"][0]["date"] == "2025-03-02"
+
+
+def test_pipeline_keeps_the_csv_inspections_column_format():
+    import io
+
+    from scrapy.exporters import CsvItemExporter
+
+    from provider_scrape.items import InspectionItem
+
+    spider = FakeSpider(settings_values={"NORMALIZE_ENABLED": True})
+    pipeline = NormalizationPipeline()
+    pipeline.open_spider(spider)
+    item = ProviderItem(provider_name="Acme", inspections=[
+        InspectionItem(type="Routine", date="3/1/2025", report_url="u1"),
+        InspectionItem(type="Complaint", date="4/2/2025")])
+    pipeline.process_item(item, spider)
+
+    out = io.BytesIO()
+    exporter = CsvItemExporter(out, fields_to_export=["provider_name",
+                                                      "inspections"])
+    exporter.start_exporting()
+    exporter.export_item(item)
+    exporter.finish_exporting()
+    # One line, each inspection's keys in the order the spider set them.
+    assert out.getvalue().decode().splitlines()[1] == (
+        "Acme,\"[{'type': 'Routine', 'date': '2025-03-01', 'report_url': 'u1'}, "
+        "{'type': 'Complaint', 'date': '2025-04-02'}]\"")
+
+
+def test_fields_normalize_item_may_add_are_declared_on_provider_item():
+    """The pipeline writes into a ProviderItem's field dict directly, past
+    Item's undeclared-field check, so every key a step can add must exist."""
+    added = set(normalization.FIELD_COLLAPSE_MAP) | {
+        "facility_category", "city", "state", "zip"}
+    assert added <= set(ProviderItem.fields)
+
+
+# --------------------------------------------------------------------------- #
+# Batch (columnar) normalization
+# --------------------------------------------------------------------------- #
+def _fixture_records():
+    """Every flat-ish record (a dict inside a list) in the JSON fixtures."""
+    import glob
+    import json
+    import os
+
+    records = []
+
+    def walk(node):
+        if isinstance(node, list):
+            records.extend(n for n in node if isinstance(n, dict))
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict):
+            for child in node.values():
+                walk(child)
+
+    fixtures = os.path.join(os.path.dirname(__file__), "fixtures", "*.json")
+    for path in sorted(glob.glob(fixtures)):
+        with open(path, encoding="utf-8") as fh:
+            walk(json.load(fh))
+    return records
+
+
+def _edge_rows():
+    return [
+        {"provider_name": "  SMITH'S  DAYCARE LLC ", "status": "Active",
+         "provider_type": "Licensed Group (Probational)", "capacity": "64",
+         "address": "12 Main St, Hartford, CT 06103, USA",
+         "license_expiration": "6/30/2027", "ut_meals": "Lunch",
+         "latitude": "41.76", "co_head_start": "No"},
+        {"status": "Active", "provider_type": None, "capacity": 1,
+         "address": "12 Main St, Hartford, CT 06103, USA", "city": "Hartford",
+         "ga_meals": "Snacks", "nj_meal_options": "Breakfast"},
+        {"capacity": 1.0, "ages_served": [" infants ", "", "toddlers"],
+         "license_begin_date": "February 30, 2024", "meals": "Dinner",
+         "ut_meals": "Lunch", "address": "no zip here", "az_headstart": True},
+        {"capacity": True, "status": "  ", "address": None, "zip": "06103",
+         "languages": [" English ", "Spanish "], "status_date": "N/A"},
+        {},
+    ]
+
+
+def test_normalize_batch_matches_normalize_item_on_fixtures():
+    import json
+
+    from provider_scrape.spiders.delaware import DelawareSpider
+
+    spider = DelawareSpider()
+    rows = _fixture_records() + _edge_rows() + [
+        dict(spider._build_provider_item(row))
+        for row in _fixture_records()
+        if "resource_id" in row and "resource_type" in row]
+    assert len(rows) > 100
+    per_item = [normalization.normalize_item(copy.deepcopy(r), "delaware")
+                for r in rows]
+    batched = normalization.normalize_batch(
+        [copy.deepcopy(r) for r in rows], "delaware")
+    assert [list(r.items()) for r in batched] == \
+        [list(r.items()) for r in per_item]
+    assert json.dumps(batched, default=str) == json.dumps(per_item, default=str)
+
+
+def test_normalize_columns_computes_each_distinct_value_once(monkeypatch):
+    calls = []
+    real = normalization.canonical_status
+    monkeypatch.setattr(normalization, "canonical_status",
+                        lambda v: calls.append(v) or real(v))
+    columns = {"status": ["Active", "Active", None, "Closed", "Active"],
+               "provider_type": [normalization.MISSING] * 5}
+    normalization.normalize_columns(columns, "test_state")
+    assert sorted(calls) == ["Active", "Closed"]
+    assert columns["status"][:2] == [real("Active")] * 2
+    assert "facility_category" not in columns
+
+
+def test_batch_normalized_items_skip_normalize_item_in_pipeline(monkeypatch):
+    from types import SimpleNamespace
+
+    from scrapy.settings import Settings
+
+    from provider_scrape.batch_normalization import BatchNormalizationMixin
+    from provider_scrape.items import InspectionItem
+
+    class BulkSpider(BatchNormalizationMixin):
+        name = "test_state"
+        logger = logging.getLogger("fake.bulk")
+
+        def __init__(self, **settings):
+            self.settings = Settings({"NORMALIZE_BATCH_SIZE": 2, **settings})
+            self.crawler = SimpleNamespace(settings=self.settings, stats=None)
+
+    def built():
+        return [ProviderItem(status="Active", capacity=" 12 ",
+                             inspections=[InspectionItem(date="1/2/2025")])
+                for _ in range(3)]
+
+    spider = BulkSpider()
+    items = list(spider.normalized_batches(iter(built())))
+    assert len(spider.prenormalized) == 3
+    assert items[0]["capacity"] == 12
+
+    pipeline = NormalizationPipeline()
+    pipeline.open_spider(spider)
+    monkeypatch.setattr(normalization.NormalizationPlan, "run", None)  # unused
+    for item in items:
+        pipeline.process_item(item, spider)
+    assert len(spider.prenormalized) == 0
+    assert items[2]["inspections"][0]["date"] == "2025-01-02"
+    monkeypatch.undo()
+
+    # Off: the items come out as built and the pipeline does the work.
+    off = BulkSpider(NORMALIZE_BATCH_SIZE=0)
+    assert [i["capacity"] for i in off.normalized_batches(built())] == [" 12 "] * 3
+    assert off.prenormalized is None
+
+
+# --------------------------------------------------------------------------- #
+# Per-state normalization plans
+# --------------------------------------------------------------------------- #
+def test_plan_matches_normalize_item_and_widens_on_new_fields():
+    rows = _edge_rows() + _fixture_records()
+    plan = normalization.NormalizationPlan("delaware")
+    planned = [plan.run(copy.deepcopy(r)) for r in rows]
+    per_item = [normalization.normalize_item(copy.deepcopy(r), "delaware")
+                for r in rows]
+    assert [list(r.items()) for r in planned] == \
+        [list(r.items()) for r in per_item]
+    assert plan.widened > 0
+    assert plan.items == len(rows)
+
+
+def test_plan_counts_batches_like_single_items():
+    rows = _edge_rows() + _fixture_records()
+    single = normalization.NormalizationPlan("delaware")
+    for row in rows:
+        single.run(copy.deepcopy(row))
+    batched = normalization.NormalizationPlan("delaware")
+    batch = copy.deepcopy(rows)
+    batched.run_batch(batch[:7])
+    batched.run_batch(batch[7:])
+    assert batched.items == single.items
+    assert batched.counts == single.counts
+    assert batched.fields == single.fields
+
+
+def test_pipeline_plan_report_covers_batch_normalized_items(caplog):
+    from types import SimpleNamespace
+
+    from scrapy.settings import Settings
+    from scrapy.statscollectors import MemoryStatsCollector
+
+    from provider_scrape.batch_normalization import BatchNormalizationMixin
+
+    class BulkSpider(BatchNormalizationMixin):
+        name = "test_state"
+        logger = logging.getLogger("fake.bulk")
+
+    spider = BulkSpider()
+    spider.settings = Settings({"NORMALIZE_BATCH_SIZE": 2})
+    spider.crawler = SimpleNamespace(settings=spider.settings)
+    spider.crawler.stats = MemoryStatsCollector(spider.crawler)
+    pipeline = NormalizationPipeline()
+    pipeline.open_spider(spider)
+    built = [ProviderItem(status="Active", capacity="3") for _ in range(3)]
+    for item in spider.normalized_batches(built):
+        pipeline.process_item(item, spider)
+    with caplog.at_level(logging.INFO):
+        pipeline.close_spider(spider)
+    assert "test_state: 3 item(s)" in caplog.text
+    assert spider.crawler.stats.get_value("normalize/plan/status") == 3
+    assert spider.crawler.stats.get_value("normalize/plan/numeric") == 3
+
+
+def test_plan_compiles_only_the_steps_a_state_needs():
+    plan = normalization.NormalizationPlan("connecticut")
+    plan.run({"provider_name": "ACME", "status": "Active",
+              "ct_license_type": "Center", "license_expiration": ""})
+    names = [name for name, _ in plan.steps]
+    assert names == ["whitespace", "name_case", "collapse", "dates", "status"]
+    assert plan.counts["collapse"] == 1
+    assert plan.counts["dates"] == 0  # cleaned to None first
+    report = plan.report()
+    assert "steps run: whitespace 1, name_case 1, collapse 1, dates 0, " \
+           "status 1" in report
+    assert "never needed: numeric, facility_category, address" in report
+
+
+def test_pipeline_reports_plan_stats():
+    from types import SimpleNamespace
+
+    from scrapy.settings import Settings
+    from scrapy.statscollectors import MemoryStatsCollector
+
+    spider = FakeSpider(settings_values={"NORMALIZE_ENABLED": True})
+    crawler = SimpleNamespace(settings=Settings())
+    crawler.stats = MemoryStatsCollector(crawler)
+    spider.crawler = crawler
+    pipeline = NormalizationPipeline()
+    pipeline.open_spider(spider)
+    for status in ("Active", None):
+        pipeline.process_item(ProviderItem(status=status, capacity="3"), spider)
+    pipeline.close_spider(spider)
+    assert crawler.stats.get_value("normalize/plan/status") == 1
+    assert crawler.stats.get_value("normalize/plan/numeric") == 2
+    assert crawler.stats.get_value("normalize/plan/fields") == 2
+    assert crawler.stats.get_value("normalize/plan/address") is None
@@ -5,12 +5,14 @@ import json
 import base64
 from scrapy_playwright.page import PageMethod
 from ..items import ProviderItem, InspectionItem
+from ..batch_normalization import BatchNormalizationMixin
 
 
-class TxhhsSpider(scrapy.Spider):
+class TxhhsSpider(BatchNormalizationMixin, scrapy.Spider):
     name = "texas"
 
     custom_settings = {
+        'STALLWATCH_ENABLED': True,
         'DOWNLOAD_HANDLERS': {
             'http': 'scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler',
             'https': 'scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler',
@@ -132,31 +134,8 @@ class TxhhsSpider(scrapy.Spider):
             csv_files = io.StringIO(csv_data)
             reader = csv.DictReader(csv_files)
 
-            for row in reader:
-                provider = ProviderItem()
-                provider['source_state'] = "Texas"
-                provider['provider_url'] = base_url + row['Operation #']
-                provider['tx_operation_id'] = row['Operation #']
-                provider['tx_agency_number'] = row['Agency Number']
-                provider['provider_name'] = row['Operation/Caregiver Name']
-                provider['address'] = f"{row['Address']} {row['City']}, {row['State']} {row['Zip']}"
-                provider['county'] = row['County']
-                provider['phone'] = row['Phone']
-                provider['provider_type'] = row['Type']
-                provider['status'] = row['Status']
-                provider['status_date'] = row['Issue Date']
-                provider['capacity'] = row['Capacity']
-                provider['email'] = row['Email Address']
-                provider['infant'] = row['Infant']
-                provider['toddler'] = row['Toddler']
-                provider['preschool'] = row['Preschool']
-                provider['school'] = row['School']
-                provider['hours'] = row['Hours']
-                provider['tx_rising_star'] = row['Texas Rising Star '] # yes the trailing space is necessary for the key to match
-                provider['scholarships_accepted'] = row['Accepts ChildCare Scholarships']
-                provider['deficiencies'] = row['Deficiencies']
-
-                yield provider
+            yield from self.normalized_batches(
+                self._build_provider(row, base_url) for row in reader)
 
 
 
@@ -165,3 +144,29 @@ class TxhhsSpider(scrapy.Spider):
             self.logger.error(f"Error parsing CSV: {e}")
 
         self.logger.info("Parsing complete")
+
+    def _build_provider(self, row, base_url):
+        """One ``ProviderItem`` from a row of the export."""
+        provider = ProviderItem()
+        provider['source_state'] = "Texas"
+        provider['provider_url'] = base_url + row['Operation #']
+        provider['tx_operation_id'] = row['Operation #']
+        provider['tx_agency_number'] = row['Agency Number']
+        provider['provider_name'] = row['Operation/Caregiver Name']
+        provider['address'] = f"{row['Address']} {row['City']}, {row['State']} {row['Zip']}"
+        provider['county'] = row['County']
+        provider['phone'] = row['Phone']
+        provider['provider_type'] = row['Type']
+        provider['status'] = row['Status']
+        provider['status_date'] = row['Issue Date']
+        provider['capacity'] = row['Capacity']
+        provider['email'] = row['Email Address']
+        provider['infant'] = row['Infant']
+        provider['toddler'] = row['Toddler']
+        provider['preschool'] = row['Preschool']
+        provider['school'] = row['School']
+        provider['hours'] = row['Hours']
+        provider['tx_rising_star'] = row['Texas Rising Star '] # yes the trailing space is necessary for the key to match
+        provider['scholarships_accepted'] = row['Accepts ChildCare Scholarships']
+        provider['deficiencies'] = row['Deficiencies']
+        return provider
@@ -2,8 +2,9 @@ import scrapy
 import json
 import urllib.parse
 from provider_scrape.items import ProviderItem
+from provider_scrape.partition import PartitionPlannerMixin
 
-class UtahSpider(scrapy.Spider):
+class UtahSpider(PartitionPlannerMixin, scrapy.Spider):
     name = "utah"
     allowed_domains = ["jobs.utah.gov"]
 
@@ -59,12 +60,14 @@ class UtahSpider(scrapy.Spider):
     ]
 
     def start_requests(self):
-        for zip_code in self.UT_ZIP_CODES:
+        # With -a partition=1, ZIPs that keep coming back empty are skipped
+        # (or re-checked at low priority); see provider_scrape/partition.py
+        for zip_code, priority in self.partition_plan(self.UT_ZIP_CODES):
             # We can run these concurrently because we aren't using a browser
             # We start at page 0
-            yield self.generate_search_request(zip_code, page=0)
+            yield self.generate_search_request(zip_code, page=0, priority=priority)
 
-    def generate_search_request(self, zip_code, page):
+    def generate_search_request(self, zip_code, page, priority=0):
         # Construct URL with pagination parameters
         # Note: The 'sort' parameter in the curl was ','. I'll leave it empty or minimal.
         # Original: page=0&size=10&sort=,&miles=1&latitude=0&longitude=0
@@ -95,7 +98,8 @@ class UtahSpider(scrapy.Spider):
                 'Referer': 'https://jobs.utah.gov/'
             },
             callback=self.parse_search,
-            meta={'zip_code': zip_code, 'page': page}
+            meta={'zip_code': zip_code, 'page': page},
+            priority=priority
         )
 
     def parse_search(self, response):
@@ -122,8 +126,12 @@ class UtahSpider(scrapy.Spider):
         current_page = data.get('number', 0)
         total_pages = data.get('totalPages', 0)
 
+        if current_page == 0:
+            self.partition_record(response.meta['zip_code'],
+                                  data.get('totalElements', len(providers)))
         if current_page < total_pages - 1:
-            yield self.generate_search_request(response.meta['zip_code'], current_page + 1)
+            yield self.generate_search_request(response.meta['zip_code'], current_page + 1,
+                                               priority=response.request.priority)
 
     def parse_detail(self, response):
         search_data = response.meta['search_data']
@@ -265,11 +265,11 @@ class StealthContextMiddleware:
         return mw
 
     def spider_opened(self, spider):
-        from scrapy_playwright.handler import ScrapyPlaywrightDownloadHandler
+        from provider_scrape.handlers import playwright_handler_of
 
         handlers = spider.crawler.engine.downloader.handlers._handlers
-        handler = handlers.get("https")
-        if not isinstance(handler, ScrapyPlaywrightDownloadHandler):
+        handler = playwright_handler_of(handlers.get("https"))
+        if handler is None:
             spider.logger.warning(
                 "StealthContextMiddleware: scrapy-playwright handler not "
                 "found; stealth patches NOT applied."
@@ -310,6 +310,7 @@ class WisconsinSpider(PlaywrightErrbackMixin, scrapy.Spider):
     allowed_domains = ["childcarefinder.wisconsin.gov"]
 
     custom_settings = {
+        "STALLWATCH_ENABLED": True,
         "CONCURRENT_REQUESTS": 4,
         "CONCURRENT_REQUESTS_PER_DOMAIN": 4,
         "RETRY_TIMES": 3,
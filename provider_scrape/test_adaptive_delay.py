@@ -0,0 +1,63 @@
+import json
+
+from provider_scrape.adaptive_delay import AimdDelay
+
+
+def _aimd(**kwargs):
+    kwargs.setdefault("hour", lambda: 14)
+    return AimdDelay(min_delay=30, max_delay=120, step=1.0, backoff=2.0,
+                     clean_streak=3, **kwargs)
+
+
+def test_clean_streak_tightens_additively_down_to_the_floor():
+    aimd = _aimd()
+    assert aimd.start("host", 33) == 33
+    drops = [aimd.on_success("host") for _ in range(12)]
+    # One 1s step per 3 clean responses, stopping at min_delay.
+    assert [d for d in drops if d is not None] == [32, 31, 30]
+    assert aimd.delay("host") == 30
+
+
+def test_trip_backs_off_multiplicatively_and_resets_the_streak():
+    aimd = _aimd()
+    aimd.start("host", 33)
+    aimd.on_success("host")
+    aimd.on_success("host")
+    assert aimd.on_trip("host") == 66
+    assert aimd.on_trip("host") == 120  # capped at max_delay
+    # The pre-trip streak doesn't carry over.
+    assert aimd.on_success("host") is None
+
+
+def test_unknown_key_is_ignored():
+    aimd = _aimd()
+    assert aimd.on_success("nope") is None
+    assert aimd.on_trip("nope") is None
+
+
+def test_learned_delays_persist_per_hour(tmp_path):
+    path = str(tmp_path / "state" / "aimd.json")
+    hour = {"now": 14}
+    aimd = _aimd(state_path=path, hour=lambda: hour["now"])
+    aimd.start("host|1.1.1.1:80", 33)
+    aimd.on_trip("host|1.1.1.1:80")  # 66 at 14:00
+    hour["now"] = 3
+    for _ in range(3):
+        aimd.on_success("host|1.1.1.1:80")  # 65 at 03:00
+    aimd.save()
+
+    saved = json.load(open(path))["keys"]["host|1.1.1.1:80"]
+    assert saved["delay"] == 65
+    assert saved["by_hour"] == {"14": 66, "3": 65}
+
+    # A run starting at 14:00 resumes from that hour's value; an hour with no
+    # history falls back to the latest; an unseen key to the configured delay.
+    assert _aimd(state_path=path, hour=lambda: 14).start("host|1.1.1.1:80", 33) == 66
+    assert _aimd(state_path=path, hour=lambda: 9).start("host|1.1.1.1:80", 33) == 65
+    assert _aimd(state_path=path).start("other", 33) == 33
+
+
+def test_unreadable_state_is_ignored(tmp_path):
+    path = tmp_path / "aimd.json"
+    path.write_text("{not json")
+    assert _aimd(state_path=str(path)).start("host", 40) == 40
@@ -0,0 +1,175 @@
+import json
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from scrapy.http import HtmlResponse, TextResponse
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+
+from provider_scrape.aura import (
+    AuraAction,
+    AuraClient,
+    extract_fwuid,
+    load_aura_json,
+)
+
+URL = "https://example.my.site.com/s/sfsites/aura?r=1"
+PAGE = "https://example.my.site.com/s/search"
+
+
+class _Spider:
+    """Records what each action's callback/errback saw."""
+
+    def __init__(self):
+        self.crawler = SimpleNamespace(settings=Settings())
+        self.crawler.stats = MemoryStatsCollector(self.crawler)
+        self.got, self.failed = [], []
+
+    def on_result(self, result, key):
+        self.got.append((key, result["returnValue"]))
+        yield {"key": key}
+
+    def on_failure(self, reason, key):
+        self.failed.append((key, str(reason)))
+
+
+def _client(spider, **kwargs):
+    kwargs.setdefault("batch_size", 2)
+    kwargs.setdefault("max_retries", 1)
+    return AuraClient(spider, URL, {"mode": "PROD", "fwuid": "OLD"},
+                      page_uri="/s/search", fwuid_url=PAGE, **kwargs)
+
+
+def _actions(client, spider, keys):
+    return [client.action("Ctl", "find", {"k": k}, callback=spider.on_result,
+                          errback=spider.on_failure, key=k) for k in keys]
+
+
+def _respond(request, payload):
+    body = payload if isinstance(payload, str) else json.dumps(payload)
+    return list(request.callback(TextResponse(
+        url=request.url, body=body.encode(), encoding="utf-8", request=request)))
+
+
+def _form(request):
+    return {k: v[0] for k, v in parse_qs(request.body.decode()).items()}
+
+
+def test_load_aura_json_strips_error_wrapper():
+    assert load_aura_json('*/{"event": 1}/*ERROR*/') == {"event": 1}
+    assert load_aura_json('{"actions": []}') == {"actions": []}
+
+
+def test_extract_fwuid_patterns():
+    assert extract_fwuid('x "fwuid":"abc_123" y') == "abc_123"
+    assert extract_fwuid("%22fwuid%22%3A%22enc123%22") == "enc123"
+    token = "A" * 24
+    assert extract_fwuid(f"/s/sfsites/auraFW/javascript/{token}/aura_prod.js") == token
+    assert extract_fwuid("<html></html>") is None
+
+
+def test_requests_pack_actions_and_context():
+    spider = _Spider()
+    client = _client(spider)
+    requests = list(client.requests(_actions(client, spider, "abc")))
+    assert [len(r.meta["aura_actions"]) for r in requests] == [2, 1]
+    form = _form(requests[0])
+    message = json.loads(form["message"])
+    assert [a["id"] for a in message["actions"]] == ["0;a", "1;a"]
+    assert [a["params"]["params"] for a in message["actions"]] == [{"k": "a"}, {"k": "b"}]
+    assert json.loads(form["aura.context"])["fwuid"] == "OLD"
+    assert form["aura.pageURI"] == "/s/search"
+    assert spider.crawler.stats.get_value("aura/requests") == 2
+    assert spider.crawler.stats.get_value("aura/actions") == 3
+
+
+def test_demux_retries_only_failed_actions_then_errbacks():
+    spider = _Spider()
+    client = _client(spider)
+    (request,) = client.requests(_actions(client, spider, "ab"))
+    out = _respond(request, {"actions": [
+        {"id": "1;a", "state": "ERROR", "returnValue": None},
+        {"id": "0;a", "state": "SUCCESS", "returnValue": "A"},
+    ]})
+    assert spider.got == [("a", "A")]
+    assert out[0] == {"key": "a"}
+    (retry,) = out[1:]
+    assert [a.cb_kwargs["key"] for a in retry.meta["aura_actions"]] == ["b"]
+    # max_retries=1: the second ERROR is final and goes to the errback.
+    assert _respond(retry, {"actions": [{"id": "0;a", "state": "ERROR"}]}) == []
+    assert spider.failed == [("b", "Aura state='ERROR'")]
+    assert client.error_states == 2
+
+
+def test_transport_failure_goes_to_every_errback():
+    spider = _Spider()
+    client = _client(spider)
+    (request,) = client.requests(_actions(client, spider, "ab"))
+    failure = SimpleNamespace(request=request, value=TimeoutError("reset"))
+    assert list(request.errback(failure)) == []
+    assert [k for k, _ in spider.failed] == ["a", "b"]
+
+
+def test_callbacks_may_yield_more_actions_which_are_batched():
+    spider = _Spider()
+    client = _client(spider)
+
+    def fan_out(result, key):
+        for k in ("x", "y", "z"):
+            yield client.action("Ctl", "detail", {"k": k},
+                                callback=spider.on_result, key=k)
+
+    (request,) = client.requests(
+        [AuraAction("Ctl", "find", {}, fan_out, cb_kwargs={"key": "root"})])
+    out = _respond(request, {"actions": [{"id": "0;a", "state": "SUCCESS"}]})
+    assert [[a.cb_kwargs["key"] for a in r.meta["aura_actions"]] for r in out] == \
+        [["x", "y"], ["z"]]
+
+
+def test_stale_fwuid_is_refreshed_once_for_every_parked_action():
+    spider = _Spider()
+    client = _client(spider, batch_size=1)
+    first, second, late = client.requests(_actions(client, spider, "abc"))
+    stale = '*/{"event": {"descriptor": "markup://aura:clientOutOfSync"}}/*ERROR*/'
+
+    (refresh,) = _respond(first, stale)
+    assert refresh.url == PAGE
+    assert _respond(second, stale) == []  # parked behind the same refresh
+    assert spider.crawler.stats.get_value("aura/fwuid_refreshes") == 1
+
+    page = HtmlResponse(url=PAGE, body=b'<script>{"fwuid":"NEW"}</script>',
+                        request=refresh)
+    reissued = list(refresh.callback(page))
+    assert [r.meta["aura_actions"][0].cb_kwargs["key"] for r in reissued] == ["a", "b"]
+    assert all(json.loads(_form(r)["aura.context"])["fwuid"] == "NEW"
+               for r in reissued)
+
+    # Sent with the old fwuid before the refresh landed: just resent.
+    (resent,) = _respond(late, stale)
+    assert resent.meta["aura_fwuid"] == "NEW"
+
+    # Stale again on the new fwuid: the one refresh is spent, so give up.
+    assert _respond(reissued[0], stale) == []
+    assert spider.failed == [("a", "stale fwuid, no refresh left")]
+
+
+def test_failed_refresh_sends_the_actions_errbacks_yield():
+    spider = _Spider()
+    client = _client(spider, batch_size=1)
+
+    def fall_back(reason, key):
+        spider.failed.append((key, str(reason)))
+        yield client.action("Ctl", "fallback", {"k": key},
+                            callback=spider.on_result, key=key)
+
+    (request,) = client.requests([client.action(
+        "Ctl", "find", {}, callback=spider.on_result, errback=fall_back,
+        key="a")])
+    stale = '*/{"event": {"descriptor": "markup://aura:clientOutOfSync"}}/*ERROR*/'
+    (refresh,) = _respond(request, stale)
+
+    failure = SimpleNamespace(request=refresh, value=TimeoutError("reset"))
+    (resent,) = list(refresh.errback(failure))
+    assert spider.failed == [("a", "fwuid refresh failed: reset")]
+    assert [a.method for a in resent.meta["aura_actions"]] == ["fallback"]
+    assert not client._refreshing
@@ -0,0 +1,74 @@
+"""Tests for provider_scrape/checkpoint.py and CheckpointPipeline."""
+from types import SimpleNamespace
+
+from provider_scrape.checkpoint import CrawlCheckpoint
+from provider_scrape.items import ProviderItem
+from provider_scrape.pipelines import CheckpointPipeline
+
+
+def test_progress_survives_a_reopen(tmp_path):
+    path = str(tmp_path / "sub" / "cp.sqlite")
+    cp = CrawlCheckpoint(path)
+    assert not cp.resumable
+    cp.complete_shard("A [Homes]", 12, 11)
+    cp.add_pending([("1", "https://x/?fi=1", {"address": "1 Main"}),
+                    ("2", "https://x/?fi=2", {"address": None})])
+    assert cp.record_item("1", {"provider_name": "One", "inspections": []})
+    cp.close()
+
+    cp = CrawlCheckpoint(path)
+    assert cp.resumable
+    assert cp.completed_shards() == {"A [Homes]": (12, 11)}
+    # Emitting an item retires its pending detail.
+    assert cp.pending() == [("2", "https://x/?fi=2", {"address": None})]
+    assert list(cp.emitted_items()) == [
+        ("1", {"provider_name": "One", "inspections": []})]
+    assert cp.summary() == {"shards": 1, "pending": 1, "items": 1}
+    cp.close()
+
+
+def test_replayed_items_and_emitted_details_are_not_rerecorded(tmp_path):
+    cp = CrawlCheckpoint(str(tmp_path / "cp.sqlite"))
+    assert cp.record_item("1", {"provider_name": "first"})
+    assert not cp.record_item("1", {"provider_name": "replayed"})
+    assert not cp.record_item(None, {"provider_name": "no key"})
+    cp.add_pending([("1", "https://x/?fi=1", {})])
+    assert cp.pending() == []
+    assert [item for _, item in cp.emitted_items()] == [{"provider_name": "first"}]
+    cp.close()
+
+
+def test_clear_and_stale_checkpoints_start_fresh(tmp_path):
+    path = str(tmp_path / "cp.sqlite")
+    now = [1_000_000.0]
+    cp = CrawlCheckpoint(path, clock=lambda: now[0])
+    cp.complete_shard("A [Homes]", 1, 1)
+    cp.close()
+
+    now[0] += 3 * 86400
+    cp = CrawlCheckpoint(path, max_age_days=14, clock=lambda: now[0])
+    assert cp.resumable
+    cp.close()
+
+    now[0] += 15 * 86400
+    cp = CrawlCheckpoint(path, max_age_days=14, clock=lambda: now[0])
+    assert not cp.resumable
+    cp.record_item("9", {})
+    cp.clear()
+    assert not cp.resumable
+    cp.close()
+
+
+def test_pipeline_records_raw_items_under_the_spider_key(tmp_path):
+    cp = CrawlCheckpoint(str(tmp_path / "cp.sqlite"))
+    spider = SimpleNamespace(
+        checkpoint=cp, checkpoint_key=lambda item: item.get("license_number"))
+    item = ProviderItem(license_number="L-1", provider_name="One")
+
+    assert CheckpointPipeline().process_item(item, spider) is item
+    assert list(cp.emitted_items()) == [
+        ("L-1", {"license_number": "L-1", "provider_name": "One"})]
+
+    # No checkpoint on the spider: a pass-through.
+    assert CheckpointPipeline().process_item(item, SimpleNamespace()) is item
+    cp.close()
@@ -0,0 +1,404 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+from scrapy import Request
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from scrapy.settings import Settings
+from scrapy.signalmanager import SignalManager
+from scrapy.statscollectors import MemoryStatsCollector
+
+from provider_scrape.extensions import (
+    ConcurrencyAutotuner,
+    MetricsExporter,
+    StallWatchdog,
+)
+
+URL = "https://www.checkccmd.org/FacilityDetail.aspx?ft=&fn=1"
+
+
+class _Slot:
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.delay = 0.0
+        self.queue = []
+        self.transferring = set()
+
+
+class _Downloader:
+    def __init__(self, total=5):
+        self.total_concurrency = total
+        self.active = set()
+        self.slots = {}
+
+    def get_slot_key(self, request):
+        return request.meta.get("download_slot", "www.checkccmd.org")
+
+
+def _autotuner(downloader=None, **overrides):
+    settings = Settings({
+        "AUTOTUNE_ENABLED": True,
+        "AUTOTUNE_MIN_CONCURRENCY": 2,
+        "AUTOTUNE_MAX_CONCURRENCY": 10,
+        "AUTOTUNE_MIN_SAMPLES": 3,
+        **overrides,
+    })
+    crawler = SimpleNamespace(settings=settings, signals=SignalManager())
+    crawler.stats = MemoryStatsCollector(crawler)
+    crawler.engine = SimpleNamespace(downloader=downloader or _Downloader())
+    return ConcurrencyAutotuner.from_crawler(crawler)
+
+
+def _download(ext, latency=None, status=200, url=URL, slot=None, failed=False):
+    request = Request(url, meta={"download_slot": slot} if slot else {})
+    if not failed:
+        if latency is not None:
+            request.meta["download_latency"] = latency
+        ext.response_downloaded(Response(url, status=status), request, None)
+    ext.request_left_downloader(request, None)
+
+
+def _window(ext, latencies, **kwargs):
+    for latency in latencies:
+        _download(ext, latency, **kwargs)
+    ext.tick()
+
+
+def test_disabled_by_default():
+    crawler = SimpleNamespace(settings=Settings(), signals=SignalManager())
+    with pytest.raises(NotConfigured):
+        ConcurrencyAutotuner.from_crawler(crawler)
+
+
+def test_global_scope_climbs_while_saturated_and_latency_flat():
+    downloader = _Downloader(total=5)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global")
+    downloader.active = set(range(5))
+    _window(ext, [2.0, 2.1, 1.9])
+    assert downloader.total_concurrency == 6
+    downloader.active = set(range(6))
+    _window(ext, [2.0, 2.0, 2.0])
+    assert downloader.total_concurrency == 7
+    assert ext.stats.get_value("autotune/global/concurrency") == 7
+    assert ext.stats.get_value("autotune/global/adjustments") == 2
+
+
+def test_no_increase_without_saturation():
+    downloader = _Downloader(total=5)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global")
+    downloader.active = {1, 2}
+    _window(ext, [2.0, 2.0, 2.0])
+    assert downloader.total_concurrency == 5
+    assert ext.stats.get_value("autotune/global/concurrency") == 5
+
+
+def test_backs_off_when_latency_shows_queueing():
+    downloader = _Downloader(total=8)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global")
+    _window(ext, [2.0, 2.0, 2.0])  # base latency
+    _window(ext, [8.0, 9.0, 8.0])  # 8 * (1 - 2/8) = 6 queued > beta
+    assert downloader.total_concurrency == 7
+
+
+def test_collapse_halves_and_respects_the_floor():
+    downloader = _Downloader(total=6)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global")
+    _download(ext, 2.0)
+    for _ in range(3):
+        _download(ext, failed=True)  # timeouts
+    ext.tick()
+    assert downloader.total_concurrency == 3
+    _download(ext, status=503)
+    _download(ext, status=504)
+    _download(ext, status=429)
+    ext.tick()
+    assert downloader.total_concurrency == 2
+
+
+def test_too_few_samples_holds():
+    downloader = _Downloader(total=5)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global")
+    downloader.active = set(range(5))
+    _window(ext, [2.0, 2.0])
+    assert downloader.total_concurrency == 5
+
+
+def test_domains_filter_ignores_other_hosts():
+    downloader = _Downloader(total=5)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global",
+                     AUTOTUNE_DOMAINS=["checkccmd.org"])
+    downloader.active = set(range(5))
+    for _ in range(5):
+        _download(ext, 1.0, url="https://findaprogram.marylandexcels.org/api/x")
+    ext.tick()
+    assert downloader.total_concurrency == 5
+
+
+def test_slot_scope_tunes_each_slot_independently():
+    downloader = _Downloader(total=32)
+    downloader.slots = {"a": _Slot(3), "b": _Slot(3)}
+    downloader.slots["a"].queue = ["pending"]
+    ext = _autotuner(downloader)
+    for _ in range(3):
+        _download(ext, 1.0, slot="a")
+        _download(ext, 1.0, slot="b")
+    ext.tick()
+    assert downloader.slots["a"].concurrency == 4
+    assert downloader.slots["b"].concurrency == 3  # idle capacity: hold
+    assert downloader.total_concurrency == 32
+
+
+def test_clamps_an_out_of_bounds_start():
+    downloader = _Downloader(total=16)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global")
+    _window(ext, [2.0, 2.0, 2.0])
+    assert downloader.total_concurrency == 10
+
+
+def test_error_pages_count_as_answered_but_not_timed():
+    downloader = _Downloader(total=5)
+    ext = _autotuner(downloader, AUTOTUNE_SCOPE="global")
+    _window(ext, [2.0, 2.0, 2.0])
+    for _ in range(3):
+        _download(ext, 0.1, status=403)
+    _window(ext, [2.0, 2.0, 2.0])
+    assert ext._base["global"] == 2.0
+
+
+# --------------------------------------------------------------------------- #
+# MetricsExporter
+# --------------------------------------------------------------------------- #
+def _exporter(tmp_path, downloader=None, **overrides):
+    settings = Settings({
+        "METRICS_ENABLED": True,
+        "METRICS_TEXTFILE": str(tmp_path / "metrics" / "%(spider)s.prom"),
+        "METRICS_LATENCY_BUCKETS": [1, 10],
+        **overrides,
+    })
+    crawler = SimpleNamespace(settings=settings, signals=SignalManager())
+    crawler.stats = MemoryStatsCollector(crawler)
+    crawler.engine = SimpleNamespace(
+        downloader=downloader or _Downloader(),
+        _slot=SimpleNamespace(scheduler=["a", "b", "c"]),
+    )
+    ext = MetricsExporter.from_crawler(crawler)
+    ext.spider_name = "maryland"
+    return ext
+
+
+def test_metrics_disabled_or_without_an_output_is_not_configured(tmp_path):
+    crawler = SimpleNamespace(settings=Settings(), signals=SignalManager())
+    with pytest.raises(NotConfigured):
+        MetricsExporter.from_crawler(crawler)
+    crawler.settings = Settings({"METRICS_ENABLED": True})
+    with pytest.raises(NotConfigured):
+        MetricsExporter.from_crawler(crawler)
+
+
+def test_metrics_label_by_host_and_proxy(tmp_path):
+    ext = _exporter(tmp_path)
+    _download(ext, 0.5)
+    _download(ext, 12.0, status=403)
+    proxied = Request(URL, meta={"proxy": "http://u:p@1.1.1.1:80",
+                                 "download_slot": "webshare-0",
+                                 "download_latency": 5.0})
+    ext.response_downloaded(Response(URL, status=200), proxied, None)
+    ext.request_left_downloader(proxied, None)
+    _download(ext, failed=True)
+
+    text = ext.render()
+    direct = 'spider="maryland",host="www.checkccmd.org",proxy="direct"'
+    assert f'scrapy_download_latency_seconds_bucket{{{direct},le="1"}} 1' in text
+    assert f'scrapy_download_latency_seconds_bucket{{{direct},le="10"}} 1' in text
+    assert f'scrapy_download_latency_seconds_bucket{{{direct},le="+Inf"}} 2' in text
+    assert f"scrapy_download_latency_seconds_sum{{{direct}}} 12.5" in text
+    assert f'scrapy_responses_total{{{direct},status="403"}} 1' in text
+    assert f"scrapy_download_errors_total{{{direct}}} 1" in text
+    assert ('scrapy_download_latency_seconds_count{spider="maryland",'
+            'host="www.checkccmd.org",proxy="webshare-0"} 1') in text
+    assert text.endswith("# EOF\n")
+
+
+def test_metrics_items_stats_and_queues(tmp_path):
+    downloader = _Downloader()
+    slot = _Slot(1)
+    slot.queue = ["q1", "q2"]
+    slot.transferring = {"t"}
+    downloader.slots = {"webshare-0": slot}
+    downloader.active = {1, 2, 3}
+    ext = _exporter(tmp_path, downloader)
+    for _ in range(4):
+        ext.item_scraped({}, None, None)
+    ext.stats.set_value("retry/count", 7)
+    ext.stats.set_value("ratelimit/backoff/timeout", 2)
+    ext.stats.set_value("playwright/page_count", 5)
+    ext.stats.set_value("playwright/page_count/closed", 3)
+
+    text = ext.render()
+    assert 'scrapy_items_scraped_total{spider="maryland"} 4' in text
+    assert 'scrapy_retries_total{spider="maryland"} 7' in text
+    assert ('scrapy_ratelimit_backoffs_total{spider="maryland",'
+            'reason="timeout"} 2') in text
+    assert 'scrapy_scheduler_pending{spider="maryland"} 3' in text
+    assert 'scrapy_downloader_active{spider="maryland"} 3' in text
+    assert 'scrapy_slot_queued{spider="maryland",slot="webshare-0"} 2' in text
+    assert 'scrapy_slot_transferring{spider="maryland",slot="webshare-0"} 1' in text
+    assert 'scrapy_playwright_pages_open{spider="maryland"} 2' in text
+    assert "# TYPE scrapy_items_scraped counter" in text
+
+
+def test_metrics_items_per_minute_uses_the_last_interval(tmp_path):
+    ext = _exporter(tmp_path, METRICS_INTERVAL=15)
+    ext._items_mark = (1000.0, 0)
+    ext._items = 10
+    assert ext._items_rate(1030.0) == 20.0
+    ext._items = 12
+    assert ext._items_rate(1035.0) == 20.0  # under one interval: unchanged
+    assert ext._items_rate(1060.0) == 4.0
+
+
+def test_metrics_textfile_is_written_per_spider(tmp_path):
+    ext = _exporter(tmp_path)
+    _download(ext, 0.5)
+    ext.write_textfile()
+    text = (tmp_path / "metrics" / "maryland.prom").read_text()
+    assert "scrapy_responses_total" in text
+    assert not (tmp_path / "metrics" / "maryland.prom.tmp").exists()
+
+
+def test_metrics_label_values_are_escaped(tmp_path):
+    ext = _exporter(tmp_path)
+    ext.spider_name = 'odd"name\\'
+    assert 'spider="odd\\"name\\\\"' in ext.render()
+
+
+# --------------------------------------------------------------------------- #
+# StallWatchdog
+# --------------------------------------------------------------------------- #
+class _Page:
+    def __init__(self, url):
+        self.url = url
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class _Engine:
+    def __init__(self, downloader):
+        self.downloader = downloader
+        self._slot = SimpleNamespace(scheduler=["pending"])
+        self.crawled = []
+        self.closed = []
+
+    def crawl(self, request):
+        self.crawled.append(request)
+
+    def close_spider(self, spider, reason):
+        self.closed.append(reason)
+
+
+def _watchdog(pages=(), **overrides):
+    settings = Settings({"STALLWATCH_ENABLED": True, "STALLWATCH_WINDOWS": 2,
+                         **overrides})
+    crawler = SimpleNamespace(settings=settings, signals=SignalManager())
+    crawler.stats = MemoryStatsCollector(crawler)
+    downloader = _Downloader()
+    downloader.slots = {"www.checkccmd.org": _Slot(1)}
+    context = SimpleNamespace(pages=list(pages))
+    wrapper = SimpleNamespace(context=context, semaphore=SimpleNamespace(_value=0))
+    playwright = SimpleNamespace(context_wrappers={"default": wrapper})
+    downloader.handlers = SimpleNamespace(_handlers={
+        "https": SimpleNamespace(playwright_handler=playwright)})
+    crawler.engine = _Engine(downloader)
+    ext = StallWatchdog.from_crawler(crawler)
+    ext.spider = SimpleNamespace(name="ohio", logger=logging.getLogger("ohio"))
+    return ext
+
+
+def test_watchdog_is_quiet_while_progress_continues():
+    ext = _watchdog()
+    for n in range(1, 6):
+        ext.stats.set_value("response_received_count", n)
+        ext.check()
+    assert ext.stats.get_value("stallwatch/stalls") is None
+
+
+@pytest.mark.asyncio
+async def test_watchdog_closes_leaked_pages_then_retries(caplog):
+    leaked = _Page("https://example.org/search")
+    ext = _watchdog(pages=[leaked])
+    ext.stats.set_value("item_scraped_count", 3)
+    request = Request("https://example.org/detail/1")
+    ext.request_reached_downloader(request, None)
+    ext.check()  # progress: 3 items
+    with caplog.at_level(logging.ERROR):
+        ext.check()  # stalled window 1
+        assert not caplog.text
+        ext.check()  # window 2: stall -> diagnostics + close_pages
+        await asyncio.sleep(0)
+    assert "STALL: no responses or items" in caplog.text
+    assert "slot www.checkccmd.org: 0 in flight, 0 queued" in caplog.text
+    assert "oldest" in caplog.text and "https://example.org/detail/1" in caplog.text
+    assert "1 page(s) holding the semaphore, 0 free" in caplog.text
+    assert "page open" in caplog.text and "https://example.org/search" in caplog.text
+    assert leaked.closed
+    assert ext.crawler.engine.closed == []
+
+    caplog.clear()
+    with caplog.at_level(logging.ERROR):
+        ext.check()  # still stalled -> retry
+    assert "Retryable Error" in caplog.text
+    assert ext.crawler.engine.closed == ["stalled"]
+    ext.check()  # nothing left to do; closes only once
+    assert ext.crawler.engine.closed == ["stalled"]
+    assert ext.stats.get_value("stallwatch/stalls") == 1
+    assert ext.stats.get_value("stallwatch/action/close_pages") == 1
+    assert ext.stats.get_value("stallwatch/action/retry") == 1
+
+
+def test_watchdog_progress_resets_the_escalation():
+    ext = _watchdog(STALLWATCH_ACTIONS=["close"])
+    ext.check()  # stalled window 1
+    ext.stats.set_value("response_received_count", 1)
+    ext.check()  # progress
+    ext.check()  # stalled window 1 again
+    assert ext.crawler.engine.closed == []
+
+
+def test_watchdog_reschedules_requests_stuck_since_the_stall():
+    ext = _watchdog(STALLWATCH_ACTIONS=["reschedule"])
+    stuck = Request("https://example.org/slow", meta={"playwright_page": object()})
+    ext.request_reached_downloader(stuck, None)
+    done = Request("https://example.org/done")
+    ext.request_reached_downloader(done, None)
+    ext.request_left_downloader(done, None)
+    ext._in_flight[id(stuck)] = (stuck, 0.0)  # in flight since long ago
+    ext.check()
+    ext.check()
+    (again,) = ext.crawler.engine.crawled
+    assert again.url == stuck.url and again.dont_filter
+    assert "playwright_page" not in again.meta
+    assert again.meta["stallwatch_rescheduled"] == 1
+
+
+def test_watchdog_rejects_unknown_actions():
+    with pytest.raises(NotConfigured):
+        _watchdog(STALLWATCH_ACTIONS=["reboot"])
+
+
+def test_watchdog_is_opt_in_per_spider():
+    from provider_scrape import settings as project_settings
+    from provider_scrape.spiders.texas import TxhhsSpider
+
+    settings = Settings()
+    settings.setmodule(project_settings)
+    crawler = SimpleNamespace(settings=settings, signals=SignalManager())
+    with pytest.raises(NotConfigured):
+        StallWatchdog(crawler)
+    assert TxhhsSpider.custom_settings["STALLWATCH_ENABLED"] is True
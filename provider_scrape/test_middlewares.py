@@ -1,3 +1,4 @@
+import json
 import logging
 from types import SimpleNamespace
 
@@ -243,6 +244,20 @@ def test_timeout_backoff_gives_up_and_stops_further_retries():
     assert req.meta["dont_retry"] is True
 
 
+def test_timeout_backoff_counts_cooldowns_and_give_ups_in_stats():
+    from scrapy.statscollectors import MemoryStatsCollector
+
+    mw = _backoff_mw()
+    mw.crawler.stats = MemoryStatsCollector(mw.crawler)
+    mw.process_exception(Request(DETAIL, meta={"timeout_backoff": True}),
+                         TxTimeoutError(), _backoff_spider())
+    mw.process_exception(
+        Request(DETAIL, meta={"timeout_backoff": True, "timeout_retries": 4}),
+        TxTimeoutError(), _backoff_spider())
+    assert mw.crawler.stats.get_value("ratelimit/backoff/timeout") == 1
+    assert mw.crawler.stats.get_value("ratelimit/gave_up/timeout") == 1
+
+
 def test_pause_slot_never_dips_below_base_delay():
     slot = SimpleNamespace(delay=33.0, randomize_delay=False)
     downloader = SimpleNamespace(
@@ -261,3 +276,135 @@ def test_pause_slot_never_dips_below_base_delay():
         pending = getattr(slot, "_ratelimit_restore", None)
         if pending is not None and pending.active():
             pending.cancel()
+
+
+def test_cached_responses_do_not_feed_pool_health():
+    mw = ProxyPoolMiddleware()
+    pool = _pool()
+    pool.enable_health(fail_threshold=1)
+    spider = _spider(pool)
+    for status in (200, 403, 503):
+        req = Request(DETAIL)
+        mw.process_request(req, spider)
+        req.meta["download_latency"] = 9.0
+        mw.process_response(
+            req, Response(DETAIL, status=status, request=req, flags=["cached"]),
+            spider)
+    for proxy_id in ("ws-0", "ws-1"):
+        snapshot = pool.health.snapshot(proxy_id)
+        assert snapshot["latency"] != 9.0
+        assert not snapshot["quarantined"] and snapshot["quarantines"] == 0
+
+
+def test_outcomes_feed_pool_health_and_quarantine(caplog):
+    mw = ProxyPoolMiddleware()
+    pool = _pool()
+    pool.enable_health(fail_threshold=2)
+    spider = _spider(pool)
+    ok = Request(DETAIL)
+    mw.process_request(ok, spider)  # ws-0
+    ok.meta["download_latency"] = 2.5
+    mw.process_response(ok, Response(DETAIL, status=200, request=ok), spider)
+    assert pool.health.snapshot("ws-0")["latency"] == 2.5
+
+    bad = Request(DETAIL, meta={"proxy_affinity": "Allegany"})
+    mw.process_request(bad, spider)  # ws-0 (first sticky key)
+    with caplog.at_level(logging.WARNING):
+        mw.process_response(bad, Response(DETAIL, status=503, request=bad), spider)
+        mw.process_exception(bad, TxTimeoutError(), spider)
+    assert pool.health.is_quarantined("ws-0")
+    assert "ws-0 quarantined" in caplog.text
+
+    # Rotating traffic now avoids ws-0; a repin-flagged chain request moves.
+    nxt = Request(DETAIL)
+    mw.process_request(nxt, spider)
+    assert nxt.meta["download_slot"] == "ws-1"
+    again = Request(DETAIL, meta={"proxy_affinity": "Allegany", "proxy_repin": True})
+    mw.process_request(again, spider)
+    assert again.meta["download_slot"] == "ws-1"
+
+
+# --- RateLimitBackoffMiddleware AIMD delay ---
+
+
+def _aimd_mw(slot, tmp_path=None):
+    downloader = SimpleNamespace(
+        get_slot_key=lambda r: "webshare-0", slots={"webshare-0": slot}
+    )
+    overrides = {
+        "RATELIMIT_AIMD_ENABLED": True,
+        "RATELIMIT_AIMD_MIN_DELAY": 31,
+        "RATELIMIT_AIMD_STEP": 1.0,
+        "RATELIMIT_AIMD_CLEAN_STREAK": 2,
+        "RATELIMIT_AIMD_BACKOFF": 2.0,
+    }
+    if tmp_path is not None:
+        overrides["RATELIMIT_AIMD_STATE"] = str(tmp_path / "aimd.json")
+    return _backoff_mw(engine=SimpleNamespace(downloader=downloader), **overrides)
+
+
+def _cancel_restore(slot):
+    pending = getattr(slot, "_ratelimit_restore", None)
+    if pending is not None and pending.active():
+        pending.cancel()
+
+
+def test_aimd_is_off_by_default():
+    assert _backoff_mw().aimd is None
+
+
+def test_aimd_tightens_after_clean_streak():
+    slot = SimpleNamespace(delay=33.0, randomize_delay=False)
+    mw = _aimd_mw(slot)
+    req = Request(DETAIL, meta={"proxy": "http://u:p@1.1.1.1:80"})
+    for _ in range(4):
+        mw.process_response(req, Response(DETAIL, status=200, request=req),
+                            _backoff_spider())
+    assert slot.delay == 31.0
+    assert mw.aimd.delay("www.checkccmd.org|1.1.1.1:80") == 31.0
+
+
+def test_aimd_ignores_responses_from_the_http_cache(tmp_path):
+    slot = SimpleNamespace(delay=33.0, randomize_delay=False)
+    mw = _aimd_mw(slot, tmp_path)
+    req = Request(DETAIL)
+    for status in (200, 200, 200, 403):
+        resp = Response(DETAIL, status=status, request=req, flags=["cached"])
+        assert mw.process_response(req, resp, _backoff_spider()) is resp
+    assert slot.delay == 33.0
+    mw._save_aimd()
+    assert not (tmp_path / "aimd.json").exists()  # nothing learned to persist
+
+
+def test_aimd_trip_resumes_at_the_backed_off_delay(tmp_path):
+    slot = SimpleNamespace(delay=33.0, randomize_delay=False)
+    mw = _aimd_mw(slot, tmp_path)
+    req = Request(DETAIL)
+    try:
+        out = mw.process_response(req, Response(DETAIL, status=403, request=req),
+                                  _backoff_spider())
+        assert out.meta["ratelimit_retries"] == 1
+        # Paused at max(cooldown, learned) and restored to the learned 66s,
+        # not the configured 33s.
+        assert slot.delay == 66.0
+        assert slot._ratelimit_saved == (66.0, False)
+    finally:
+        _cancel_restore(slot)
+    mw._save_aimd()
+    state = json.loads((tmp_path / "aimd.json").read_text())
+    assert state["keys"]["www.checkccmd.org"]["delay"] == 66.0
+
+
+def test_aimd_success_during_cooldown_updates_the_restore_target():
+    slot = SimpleNamespace(delay=33.0, randomize_delay=False)
+    mw = _aimd_mw(slot)
+    req = Request(DETAIL, meta={"timeout_backoff": True})
+    try:
+        mw.process_exception(req, TxTimeoutError(), _backoff_spider())  # 66
+        for _ in range(2):
+            mw.process_response(req, Response(DETAIL, status=200, request=req),
+                                _backoff_spider())
+        assert slot._ratelimit_saved[0] == 65.0
+        assert slot.delay == 66.0  # the pause itself is untouched
+    finally:
+        _cancel_restore(slot)
@@ -0,0 +1,63 @@
+"""Tests for the OCR process pool and its download backpressure
+(provider_scrape.ocr_pool)."""
+import asyncio
+import operator
+
+from scrapy.http import Request
+
+from provider_scrape.ocr_pool import OcrPool
+
+
+def _pdf(name):
+    return Request(f"https://example.com/{name}.pdf")
+
+
+def test_slots_bound_in_flight_pdfs():
+    scheduled = []
+    pool = OcrPool(1, max_pending=2, schedule=scheduled.append)
+    a, b, c, d = (_pdf(n) for n in "abcd")
+    assert pool.admit(a) is a and pool.admit(b) is b
+    assert pool.admit(c) is None and pool.admit(d) is None   # held back
+    assert a.meta["ocr_slot"] is True and "ocr_slot" not in c.meta
+    assert (pool.pending, pool.held) == (2, 2)
+
+    pool.release()                        # a's slot passes straight to c
+    assert scheduled == [c] and c.meta["ocr_slot"] is True
+    assert (pool.pending, pool.held) == (2, 1)
+    pool.release()
+    pool.release()
+    assert scheduled == [c, d]
+    pool.release()
+    pool.release()
+    pool.release()                        # an extra release is ignored
+    assert (pool.pending, pool.held) == (0, 0)
+
+
+def test_held_pdfs_leave_other_requests_flowing():
+    # The requests Scrapy is given while the pool is full: the held PDF is
+    # not among them, so it holds no CONCURRENT_REQUESTS slot and the page
+    # is fetched right away.
+    scheduled = []
+    pool = OcrPool(1, max_pending=1, schedule=scheduled.append)
+    first, second = _pdf("first"), _pdf("second")
+    page = Request("https://example.com/detail")
+    yielded = [r for r in (pool.admit(first), pool.admit(second), page) if r]
+    assert yielded == [first, page]
+    pool.release()                        # first's OCR finished
+    assert scheduled == [second]
+
+
+def test_admit_never_holds_without_a_scheduler():
+    pool = OcrPool(1, max_pending=1)
+    assert pool.admit(_pdf("a")) is not None
+    assert pool.admit(_pdf("b")) is not None
+    assert pool.held == 0
+
+
+def test_run_executes_in_a_worker_process():
+    pool = OcrPool(1)
+    try:
+        assert asyncio.run(pool.run(operator.add, 2, 3)) == 5
+    finally:
+        pool.shutdown()
+    assert pool._executor is None
@@ -0,0 +1,160 @@
+"""Tests for provider_scrape/partition.py and the spiders that plan with it."""
+from types import SimpleNamespace
+
+from scrapy.settings import Settings
+from scrapy.signalmanager import SignalManager
+from scrapy.statscollectors import MemoryStatsCollector
+
+from provider_scrape.partition import (
+    AUDIT_ROTATION,
+    COLD_PRIORITY,
+    PartitionPlan,
+    partition_mode,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+def _plan(tmp_path):
+    return PartitionPlan(str(tmp_path / "plan.sqlite"), clock=_Clock())
+
+
+def test_partition_mode():
+    assert partition_mode(SimpleNamespace(partition="1")) == "plan"
+    assert partition_mode(SimpleNamespace(partition="Audit")) == "audit"
+    assert partition_mode(SimpleNamespace(partition="0")) is None
+    assert partition_mode(SimpleNamespace()) is None
+
+
+def test_areas_go_cold_after_two_empty_runs_and_rotate_back(tmp_path):
+    plan = _plan(tmp_path)
+    areas = [f"{z}" for z in range(40000, 40020)]
+    assert plan.plan(areas) == [(a, 0) for a in areas]  # all new
+    assert plan.counts["new"] == 20
+
+    for _ in range(2):
+        for area in areas:
+            plan.record(area, 3 if area == "40000" else 0)
+    planned = plan.plan(areas)
+    # The one area with providers, then the stalest 1/AUDIT_ROTATION of the
+    # cold ones, at low priority; the rest are skipped.
+    share = -(-19 // AUDIT_ROTATION)
+    assert planned[0] == ("40000", 0)
+    assert [p for _, p in planned[1:]] == [COLD_PRIORITY] * share
+    assert plan.counts["skipped"] == 19 - share
+
+    # The re-checked ones are no longer the stalest: the next run re-checks
+    # different areas.
+    for area, _ in planned[1:]:
+        plan.record(area, 0)
+    rechecked = {a for a, _ in planned[1:]}
+    assert not rechecked & {a for a, _ in plan.plan(areas)[1:]}
+
+
+def test_one_empty_answer_keeps_an_area_hot_and_audit_plans_everything(tmp_path):
+    plan = _plan(tmp_path)
+    plan.record("a", 5)
+    plan.record("a", 0)
+    plan.record("b", 0)
+    plan.record("b", 0)
+    assert plan.plan(["a", "b"]) == [("a", 0), ("b", COLD_PRIORITY)]
+    assert plan.plan(["a", "b"], audit=True) == [("a", 0), ("b", 0)]
+    assert plan.counts["rechecked"] == 1
+
+
+def test_capped_area_is_planned_as_children_and_merged_back(tmp_path):
+    plan = _plan(tmp_path)
+
+    def children(area):
+        return [f"{area}.{i}" for i in range(2)] if area.count(".") < 2 else None
+
+    plan.record("p", 100, capped=True)
+    assert plan.plan(["p"], children=children, cap=100) == [("p.0", 0), ("p.1", 0)]
+    assert plan.counts["split"] == 1
+
+    # A child that saturated too is split one level further.
+    plan.record("p.0", 100, capped=True)
+    plan.record("p.1", 40)
+    assert [a for a, _ in plan.plan(["p"], children=children, cap=100)] == \
+        ["p.0.0", "p.0.1", "p.1"]
+
+    # Once the children thin out below the cap, the parent is searched again.
+    plan.record("p.0", 30)
+    assert plan.plan(["p"], children=children, cap=100) == [("p", 0)]
+    assert plan.counts["merged"] == 1
+
+
+def _crawler(tmp_path):
+    crawler = SimpleNamespace(
+        settings=Settings({"PROVIDER_MANIFEST_DIR": str(tmp_path)}),
+        signals=SignalManager())
+    crawler.stats = MemoryStatsCollector(crawler)
+    return crawler
+
+
+def test_utah_searches_only_planned_zips(tmp_path):
+    from scrapy import signals
+
+    from provider_scrape.spiders.utah import UtahSpider
+
+    crawler = _crawler(tmp_path)
+    spider = UtahSpider(partition="1")
+    spider.crawler = crawler
+    spider.partition_setup(crawler)
+    assert (tmp_path / "utah.partitions.sqlite").exists()
+    for zip_code in UtahSpider.UT_ZIP_CODES[1:]:
+        for _ in range(2):
+            spider.partition_record(zip_code, 0)
+    spider.partition_record(UtahSpider.UT_ZIP_CODES[0], 4)
+
+    requests = list(spider.start_requests())
+    assert requests[0].meta["zip_code"] == UtahSpider.UT_ZIP_CODES[0]
+    assert requests[0].priority == 0
+    assert len(requests) == 1 + -(-(len(UtahSpider.UT_ZIP_CODES) - 1) // AUDIT_ROTATION)
+    assert all(r.priority == COLD_PRIORITY for r in requests[1:])
+    assert crawler.stats.get_value("partition/hot") == 1
+
+    crawler.signals.send_catch_log(signals.spider_closed, spider=spider)
+    assert spider.partitions is None
+
+
+def test_planning_is_off_by_default(tmp_path):
+    from provider_scrape.spiders.utah import UtahSpider
+
+    spider = UtahSpider()
+    spider.partition_setup(_crawler(tmp_path))
+    assert spider.partitions is None
+    spider.partition_record("84001", 0)  # a no-op
+    assert len(list(spider.start_requests())) == len(UtahSpider.UT_ZIP_CODES)
+    assert not list(tmp_path.iterdir())
+
+
+def test_north_dakota_plans_a_saturated_node_as_its_children(tmp_path):
+    from provider_scrape.spiders.north_dakota import (
+        NorthDakotaSpider,
+        node_key,
+        parse_node_key,
+    )
+
+    crawler = _crawler(tmp_path)
+    spider = NorthDakotaSpider(partition="1")
+    spider.crawler = crawler
+    spider.partition_setup(crawler)
+    first = list(spider.start_requests())[0]
+    parent = node_key(first.meta["lat"], first.meta["lon"],
+                      first.meta["half_mi"], first.meta["depth"])
+    spider.partition_record(parent, 100, capped=True)
+
+    planned = list(spider.start_requests())
+    kids = spider.partition_children(parent)
+    assert len(kids) == 4
+    assert [node_key(r.meta["lat"], r.meta["lon"], r.meta["half_mi"],
+                     r.meta["depth"]) for r in planned[:4]] == kids
+    assert all(parse_node_key(k)[3] == 1 for k in kids)
@@ -0,0 +1,192 @@
+"""Tests for provider_scrape/work_queue.py (queue backends + worker mixin).
+
+The queue contract tests run against every backend; the Redis one needs
+``fakeredis`` (with ``lupa`` for its Lua scripts) and is skipped without it.
+"""
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+import scrapy
+from scrapy.exceptions import DontCloseSpider
+
+from provider_scrape.work_queue import (
+    DistributedCrawlMixin,
+    RedisWorkQueue,
+    SqliteWorkQueue,
+    open_work_queue,
+    work_id,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def open_queue(request, tmp_path, clock):
+    """Factory for handles on one shared queue (as separate workers hold)."""
+    if request.param == "sqlite":
+        def factory(**kwargs):
+            return SqliteWorkQueue(str(tmp_path / "q.sqlite"), clock=clock, **kwargs)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        server = fakeredis.FakeServer()
+
+        def factory(**kwargs):
+            client = fakeredis.FakeRedis(server=server, decode_responses=True)
+            return RedisWorkQueue("redis://fake", prefix="test", clock=clock,
+                                  client=client, **kwargs)
+    return factory
+
+
+@pytest.fixture
+def queue(open_queue):
+    q = open_queue(max_attempts=2)
+    yield q
+    q.close()
+
+
+def _items(*ids, priority=0):
+    return [(work_id("detail", i), "detail", {"fi": i}, priority) for i in ids]
+
+
+def test_put_is_idempotent_and_lease_is_exclusive(queue, open_queue):
+    assert queue.put(_items("1", "2", "3")) == 3
+    assert queue.put(_items("2", "4")) == 1
+
+    other = open_queue()
+    a = queue.lease("a", ttl=60, limit=2)
+    b = other.lease("b", ttl=60, limit=5)
+    other.close()
+    assert [w.id for w in a] == ["detail:1", "detail:2"]
+    assert [w.id for w in b] == ["detail:3", "detail:4"]
+    assert a[0].payload == {"fi": "1"} and a[0].attempts == 1
+    assert queue.counts() == {"pending": 0, "leased": 4, "done": 0, "failed": 0}
+
+
+def test_higher_priority_items_lease_first(queue):
+    queue.put(_items("1", "2"))
+    queue.put([(work_id("shard", "A [Homes]"), "shard", {"county": "A"}, 1)])
+    assert [w.kind for w in queue.lease("a", limit=3)] == ["shard", "detail", "detail"]
+
+
+def test_expired_leases_return_to_pending_until_attempts_run_out(queue, clock):
+    queue.put(_items("1"))
+    queue.lease("a", ttl=60)
+    clock.now += 30
+    assert queue.heartbeat(["detail:1"], "a", ttl=60) == 1
+    assert queue.heartbeat(["detail:1"], "b", ttl=60) == 0
+    clock.now += 59
+    assert queue.lease("b") == []           # renewed: still a's
+
+    clock.now += 2                          # a died: the lease expires
+    (retry,) = queue.lease("b", ttl=60)
+    assert retry.attempts == 2
+    clock.now += 61                         # b died too: attempts used up
+    assert queue.lease("c") == []
+    assert queue.counts()["failed"] == 1
+    assert queue.failed() == ["detail:1"]
+
+
+def test_release_requeues_and_complete_keeps_the_first_result(queue):
+    queue.put(_items("1", "2"))
+    queue.lease("a", limit=2)
+    assert not queue.release("detail:1", "b")
+    assert queue.release("detail:1", "a")
+    assert [w.id for w in queue.lease("b")] == ["detail:1"]
+
+    assert queue.complete("detail:2", {"name": "first"})
+    assert not queue.complete("detail:2", {"name": "late duplicate"})
+    # An item nobody enqueued (re-emitted from the manifest) is added as done.
+    assert queue.complete("detail:9", {"name": "reused"})
+    assert list(queue.results(kind="detail")) == [
+        ("detail:2", "detail", {"name": "first"}),
+        ("detail:9", "detail", {"name": "reused"}),
+    ]
+    assert queue.counts() == {"pending": 0, "leased": 1, "done": 2, "failed": 0}
+
+
+def test_open_work_queue_picks_the_backend_from_the_url(tmp_path):
+    q = open_work_queue(f"sqlite:///{tmp_path}/a/q.sqlite")
+    assert isinstance(q, SqliteWorkQueue) and q.path == f"{tmp_path}/a/q.sqlite"
+    q.close()
+    with pytest.raises(ValueError):
+        open_work_queue("memcached://queue-host:11211")
+
+
+def test_open_work_queue_namespaces_redis_keys_by_name():
+    pytest.importorskip("redis")
+    q = open_work_queue("redis://queue-host:6379/0", name="maryland")
+    assert isinstance(q, RedisWorkQueue)
+    assert q.path == "redis://queue-host:6379/0"
+    assert all(key.startswith("maryland:") for key in q._keys)
+
+
+class _Worker(DistributedCrawlMixin, scrapy.Spider):
+    name = "worker"
+
+    def work_requests(self, work):
+        return [scrapy.Request(f"https://example.com/{work.payload['fi']}")]
+
+    def work_item_id(self, item):
+        return work_id("detail", item["fi"])
+
+
+def _worker(queue, batch=2):
+    spider = _Worker()
+    spider.crawler = SimpleNamespace(engine=Mock(), stats=None,
+                                     signals=Mock())
+    spider.work_queue = queue
+    spider.work_worker = "w1"
+    spider.work_batch = batch
+    spider.work_setup(spider.crawler)
+    spider._work_task = Mock()   # started (no reactor in tests)
+    return spider
+
+
+def test_worker_tops_up_to_its_batch_and_completes_items(queue):
+    queue.put(_items("1", "2", "3"))
+    spider = _worker(queue)
+
+    spider._work_tick()
+    crawled = [c.args[0].url for c in spider.crawler.engine.crawl.call_args_list]
+    assert crawled == ["https://example.com/1", "https://example.com/2"]
+
+    spider.work_capture({"fi": "1", "name": "One"})
+    assert set(spider._work_held) == {"detail:2"}
+    spider._work_tick()
+    assert spider.crawler.engine.crawl.call_count == 3
+    assert list(queue.results()) == [
+        ("detail:1", "detail", {"fi": "1", "name": "One"})]
+
+
+def test_idle_worker_releases_stuck_items_and_waits_for_others(queue, clock):
+    queue.put(_items("1"))
+    spider = _worker(queue, batch=1)
+    spider._work_tick()
+    queue.put(_items("2"))
+    queue.lease("w2")                       # detail:2 is another worker's
+
+    # Idle with detail:1 held: it can't be in flight, so it goes back (and,
+    # with attempts left, is leased straight back to this worker).
+    with pytest.raises(DontCloseSpider):
+        spider._work_idle()
+    assert spider.crawler.engine.crawl.call_count == 2
+    spider.work_done("detail:1", {"fi": "1"})
+
+    # Nothing to lease, but w2 still holds detail:2: keep waiting.
+    with pytest.raises(DontCloseSpider):
+        spider._work_idle()
+    queue.complete("detail:2", {"fi": "2"})
+    spider._work_idle()                     # drained: free to close
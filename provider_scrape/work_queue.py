@@ -0,0 +1,566 @@
+"""Shared work queue for crawling one state from several worker processes.
+
+Maryland's throughput scales with the number of distinct egress IPs (see
+``proxy_pool.py``), and one process is also bounded by the origin's global
+concurrency knee. Distributed mode splits the crawl across processes --
+possibly on different hosts, each with its own IPs -- that share a queue of
+work items:
+
+* a **coordinator** (``-a role=coordinator``) loads the search form once and
+  enqueues one ``shard`` item per (county, facility type) search;
+* **workers** (``-a queue=<url>``) lease items, heartbeat their leases while
+  working on them and complete them. A worker paginating a shard enqueues each
+  provider it lists as a ``detail`` item, so any worker (any IP) can fetch it;
+* a **merger** (``scripts/merge_work_queue.py``) writes the completed items to
+  the state's output file(s).
+
+A lease that isn't renewed (a worker crashed or lost the network) expires and
+the item goes back to ``pending`` for another worker, up to ``max_attempts``
+leases before it is marked ``failed``. Enqueueing is idempotent on the item id,
+so a provider listed by two shards is fetched once.
+
+Backends (chosen by :func:`open_work_queue` from the queue URL):
+
+* :class:`SqliteWorkQueue` -- ``sqlite:///path`` or a bare path. Local (one
+  host, any number of processes).
+* :class:`RedisWorkQueue` -- ``redis://host:port/db`` (or ``rediss://``), any
+  Redis-compatible server with Lua scripting, for workers on several hosts
+  (egress IPs are per machine). Needs the ``redis`` package
+  (``requirements-redis.txt``), imported only when such a URL is used.
+
+Spider-side wiring lives in :class:`DistributedCrawlMixin`.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+
+from itemadapter import ItemAdapter
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from scrapy.utils.spider import iterate_spider_output
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_TTL = 600         # seconds a lease lives without a heartbeat
+DEFAULT_MAX_ATTEMPTS = 3        # leases per item before it is marked failed
+WORK_TICK_INTERVAL = 15         # seconds between heartbeat + top-up passes
+
+STATES = ("pending", "leased", "done", "failed")
+
+
+class WorkItem:
+    """One leased unit of work: ``kind`` (e.g. ``"shard"``/``"detail"``) plus
+    the JSON ``payload`` it was enqueued with."""
+
+    __slots__ = ("id", "kind", "payload", "attempts")
+
+    def __init__(self, id, kind, payload, attempts=0):
+        self.id = id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"WorkItem({self.id!r}, attempt {self.attempts})"
+
+
+def work_id(kind, key):
+    """Queue id of the ``kind`` item for ``key`` (stable across workers)."""
+    return f"{kind}:{key}"
+
+
+def open_work_queue(url, name="workqueue", **kwargs):
+    """Open the queue backend a ``-a queue=<url>`` names (see module docstring).
+
+    ``name`` namespaces the Redis keys, so several states can share a server.
+    Raises ``ValueError`` for an unknown URL scheme.
+    """
+    url = str(url)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisWorkQueue(url, prefix=name, **kwargs)
+    if "://" in url and not url.startswith("sqlite:///"):
+        raise ValueError(f"unsupported queue URL {url!r}")
+    if url.startswith("sqlite:///"):
+        # sqlite:///relative/path, sqlite:////absolute/path (SQLAlchemy style).
+        url = url[len("sqlite:///"):]
+    return SqliteWorkQueue(url, **kwargs)
+
+
+class SqliteWorkQueue:
+    """Work queue in one SQLite file (WAL). Leasing runs in an immediate
+    transaction, so concurrent workers on one host never lease the same item.
+    ``clock`` is injectable for tests."""
+
+    def __init__(self, path, max_attempts=DEFAULT_MAX_ATTEMPTS, clock=time.time):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self.max_attempts = max(1, int(max_attempts))
+        self._clock = clock
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS work ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " id TEXT UNIQUE NOT NULL, kind TEXT NOT NULL, payload TEXT NOT NULL,"
+            " priority INTEGER NOT NULL DEFAULT 0,"
+            " state TEXT NOT NULL DEFAULT 'pending', worker TEXT,"
+            " lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " result TEXT)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS work_state ON work (state, priority, seq)")
+
+    def put(self, items):
+        """Enqueue ``(id, kind, payload, priority)`` tuples; ids already known
+        (in any state) are ignored. Returns how many were new."""
+        rows = [(id, kind, json.dumps(payload, ensure_ascii=False), priority)
+                for id, kind, payload, priority in items]
+        if not rows:
+            return 0
+        before = self.conn.total_changes
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO work (id, kind, payload, priority)"
+            " VALUES (?, ?, ?, ?)", rows)
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def _reclaim(self, now):
+        """Return expired leases to pending (or fail them past max_attempts)."""
+        self.conn.execute(
+            "UPDATE work SET state = CASE WHEN attempts >= ? THEN 'failed'"
+            " ELSE 'pending' END, worker = NULL, lease_expires = NULL"
+            " WHERE state = 'leased' AND lease_expires < ?",
+            (self.max_attempts, now))
+
+    def lease(self, worker, ttl=DEFAULT_LEASE_TTL, limit=1):
+        """Lease up to ``limit`` pending items to ``worker`` for ``ttl`` seconds,
+        highest priority first."""
+        if limit < 1:
+            return []
+        now = self._clock()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim(now)
+            rows = self.conn.execute(
+                "SELECT id, kind, payload, attempts FROM work WHERE state = 'pending'"
+                " ORDER BY priority DESC, seq LIMIT ?", (int(limit),)).fetchall()
+            self.conn.executemany(
+                "UPDATE work SET state = 'leased', worker = ?, lease_expires = ?,"
+                " attempts = attempts + 1 WHERE id = ?",
+                [(worker, now + ttl, row[0]) for row in rows])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [WorkItem(id, kind, json.loads(payload), attempts + 1)
+                for id, kind, payload, attempts in rows]
+
+    def heartbeat(self, ids, worker, ttl=DEFAULT_LEASE_TTL):
+        """Extend ``worker``'s leases on ``ids``; returns how many it still held."""
+        before = self.conn.total_changes
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany(
+            "UPDATE work SET lease_expires = ? WHERE id = ? AND state = 'leased'"
+            " AND worker = ?",
+            [(self._clock() + ttl, id, worker) for id in ids])
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def complete(self, id, result=None, kind=None):
+        """Mark ``id`` done with its ``result``. Accepted from any worker, even
+        after its lease expired -- finished work isn't redone -- but only the
+        first completion is kept. Returns whether this one was.
+
+        An id never enqueued (a worker produced it without leasing, e.g. an
+        item re-emitted from the incremental manifest) is added as done, with
+        ``kind`` defaulting to the id's ``kind:`` prefix.
+        """
+        cursor = self.conn.execute(
+            "INSERT INTO work (id, kind, payload, state, result)"
+            " VALUES (?, ?, 'null', 'done', ?) ON CONFLICT (id) DO UPDATE SET"
+            " state = 'done', worker = NULL, lease_expires = NULL,"
+            " result = excluded.result WHERE state != 'done'",
+            (id, kind or id.split(":", 1)[0],
+             json.dumps(result, ensure_ascii=False, default=str)))
+        return cursor.rowcount > 0
+
+    def release(self, id, worker):
+        """Give back ``worker``'s lease on ``id`` without a result (it will be
+        retried, or fail once it has used up ``max_attempts``)."""
+        cursor = self.conn.execute(
+            "UPDATE work SET state = CASE WHEN attempts >= ? THEN 'failed'"
+            " ELSE 'pending' END, worker = NULL, lease_expires = NULL"
+            " WHERE id = ? AND state = 'leased' AND worker = ?",
+            (self.max_attempts, id, worker))
+        return cursor.rowcount > 0
+
+    def counts(self):
+        """``{state: n}`` for every state (expired leases count as pending)."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._reclaim(self._clock())
+        self.conn.execute("COMMIT")
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(self.conn.execute(
+            "SELECT state, COUNT(*) FROM work GROUP BY state"))
+        return counts
+
+    def results(self, kind=None):
+        """``(id, kind, result)`` for every done item, in enqueue order."""
+        query = "SELECT id, kind, result FROM work WHERE state = 'done'"
+        args = ()
+        if kind is not None:
+            query += " AND kind = ?"
+            args = (kind,)
+        for id, item_kind, result in self.conn.execute(query + " ORDER BY seq", args):
+            yield id, item_kind, json.loads(result)
+
+    def failed(self):
+        """Ids of items that used up their attempts."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT id FROM work WHERE state = 'failed' ORDER BY seq")]
+
+    def close(self):
+        self.conn.close()
+
+
+# Shared by the RedisWorkQueue scripts. KEYS: items, pending, leases, owner,
+# attempts, done, failed, order (see RedisWorkQueue for what each holds).
+_LUA_PRELUDE = """
+local items, pending, leases, owner = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local attempts, done, failed, order = KEYS[5], KEYS[6], KEYS[7], KEYS[8]
+local function score(id)
+  local priority = cjson.decode(redis.call('HGET', items, id))['priority']
+  return -tonumber(priority) * 1e12 + tonumber(redis.call('HGET', order, id))
+end
+local function requeue(id, max_attempts)
+  if redis.call('HEXISTS', done, id) == 1 then return end
+  if tonumber(redis.call('HGET', attempts, id) or 0) >= max_attempts then
+    redis.call('SADD', failed, id)
+  else
+    redis.call('ZADD', pending, score(id), id)
+  end
+end
+local function reclaim(now, max_attempts)
+  for _, id in ipairs(redis.call('ZRANGEBYSCORE', leases, '-inf', '(' .. now)) do
+    redis.call('ZREM', leases, id)
+    redis.call('HDEL', owner, id)
+    requeue(id, max_attempts)
+  end
+end
+"""
+
+# ARGV: id, entry, priority, id, entry, priority, ...
+_LUA_PUT = """
+local added = 0
+for i = 1, #ARGV, 3 do
+  local id = ARGV[i]
+  if redis.call('HSETNX', items, id, ARGV[i + 1]) == 1 then
+    redis.call('HSET', order, id, redis.call('INCR', KEYS[9]))
+    redis.call('ZADD', pending, score(id), id)
+    added = added + 1
+  end
+end
+return added
+"""
+
+# ARGV: now, ttl, limit, worker, max_attempts -> {id, attempts, entry, ...}
+_LUA_LEASE = """
+local now = tonumber(ARGV[1])
+reclaim(now, tonumber(ARGV[5]))
+local leased = {}
+for _ = 1, tonumber(ARGV[3]) do
+  local popped = redis.call('ZPOPMIN', pending)
+  if #popped == 0 then break end
+  local id = popped[1]
+  local count = redis.call('HINCRBY', attempts, id, 1)
+  redis.call('HSET', owner, id, ARGV[4])
+  redis.call('ZADD', leases, now + tonumber(ARGV[2]), id)
+  table.insert(leased, id)
+  table.insert(leased, count)
+  table.insert(leased, redis.call('HGET', items, id))
+end
+return leased
+"""
+
+# ARGV: expires, worker, id, id, ...
+_LUA_HEARTBEAT = """
+local renewed = 0
+for i = 3, #ARGV do
+  if redis.call('HGET', owner, ARGV[i]) == ARGV[2]
+      and redis.call('ZSCORE', leases, ARGV[i]) then
+    redis.call('ZADD', leases, ARGV[1], ARGV[i])
+    renewed = renewed + 1
+  end
+end
+return renewed
+"""
+
+# ARGV: id, result, entry (used if the id was never enqueued)
+_LUA_COMPLETE = """
+local id = ARGV[1]
+if redis.call('HSETNX', done, id, ARGV[2]) == 0 then return 0 end
+if redis.call('HSETNX', items, id, ARGV[3]) == 1 then
+  redis.call('HSET', order, id, redis.call('INCR', KEYS[9]))
+end
+redis.call('ZREM', leases, id)
+redis.call('ZREM', pending, id)
+redis.call('HDEL', owner, id)
+redis.call('SREM', failed, id)
+return 1
+"""
+
+# ARGV: id, worker, max_attempts
+_LUA_RELEASE = """
+local id = ARGV[1]
+if redis.call('HGET', owner, id) ~= ARGV[2] then return 0 end
+if redis.call('ZREM', leases, id) == 0 then return 0 end
+redis.call('HDEL', owner, id)
+requeue(id, tonumber(ARGV[3]))
+return 1
+"""
+
+# ARGV: now, max_attempts -> {pending, leased, done, failed}
+_LUA_COUNTS = """
+reclaim(tonumber(ARGV[1]), tonumber(ARGV[2]))
+return {redis.call('ZCARD', pending), redis.call('ZCARD', leases),
+        redis.call('HLEN', done), redis.call('SCARD', failed)}
+"""
+
+
+class RedisWorkQueue:
+    """Work queue on a Redis-compatible server, same contract as
+    :class:`SqliteWorkQueue`. Every key lives under ``prefix``:
+
+    * ``items`` (hash) id -> ``{"kind", "payload", "priority"}``, ``order``
+      (hash) id -> enqueue sequence number (from the ``seq`` counter);
+    * ``pending`` (sorted set) scored by priority, then enqueue order;
+    * ``leases`` (sorted set) scored by lease expiry, ``owner`` (hash)
+      id -> worker, ``attempts`` (hash);
+    * ``done`` (hash) id -> result, ``failed`` (set).
+
+    Every state change (put, lease with its reclaim of expired leases,
+    heartbeat, complete, release) is one Lua script, which the server runs
+    atomically, so two workers can't both win the same item and a crash
+    between commands can't leave an item half-moved. Needs the ``redis``
+    package (``requirements-redis.txt``); ``client`` is injectable for tests.
+    """
+
+    _KEYS = ("items", "pending", "leases", "owner", "attempts", "done",
+             "failed", "order", "seq")
+
+    def __init__(self, url, prefix="workqueue", max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 clock=time.time, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.redis = client
+        self.path = url
+        self.max_attempts = max(1, int(max_attempts))
+        self._clock = clock
+        prefix = prefix.rstrip(":") + ":"
+        self._keys = [prefix + name for name in self._KEYS]
+        self._scripts = {
+            name: client.register_script(_LUA_PRELUDE + body)
+            for name, body in (("put", _LUA_PUT), ("lease", _LUA_LEASE),
+                               ("heartbeat", _LUA_HEARTBEAT),
+                               ("complete", _LUA_COMPLETE),
+                               ("release", _LUA_RELEASE),
+                               ("counts", _LUA_COUNTS))
+        }
+
+    def _run(self, name, *args):
+        return self._scripts[name](keys=self._keys, args=args)
+
+    def _key(self, name):
+        return self._keys[self._KEYS.index(name)]
+
+    def put(self, items):
+        args = []
+        for id, kind, payload, priority in items:
+            args += [id, json.dumps({"kind": kind, "payload": payload,
+                                     "priority": priority}, ensure_ascii=False),
+                     priority]
+        return int(self._run("put", *args)) if args else 0
+
+    def lease(self, worker, ttl=DEFAULT_LEASE_TTL, limit=1):
+        if limit < 1:
+            return []
+        flat = self._run("lease", repr(self._clock()), ttl, int(limit), worker,
+                         self.max_attempts)
+        leased = []
+        for i in range(0, len(flat), 3):
+            entry = json.loads(flat[i + 2])
+            leased.append(WorkItem(flat[i], entry["kind"], entry["payload"],
+                                   int(flat[i + 1])))
+        return leased
+
+    def heartbeat(self, ids, worker, ttl=DEFAULT_LEASE_TTL):
+        if not ids:
+            return 0
+        return int(self._run("heartbeat", repr(self._clock() + ttl), worker,
+                             *ids))
+
+    def complete(self, id, result=None, kind=None):
+        entry = json.dumps({"kind": kind or id.split(":", 1)[0],
+                            "payload": None, "priority": 0})
+        return bool(self._run(
+            "complete", id,
+            json.dumps(result, ensure_ascii=False, default=str), entry))
+
+    def release(self, id, worker):
+        return bool(self._run("release", id, worker, self.max_attempts))
+
+    def counts(self):
+        return dict(zip(STATES, (int(n) for n in self._run(
+            "counts", repr(self._clock()), self.max_attempts))))
+
+    def results(self, kind=None):
+        # Read-only: one MULTI snapshot of the three hashes, in enqueue order.
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hgetall(self._key("done"))
+        pipe.hgetall(self._key("order"))
+        pipe.hgetall(self._key("items"))
+        done, order, entries = pipe.execute()
+        for id in sorted(done, key=lambda id: int(order.get(id) or 0)):
+            item_kind = json.loads(entries[id])["kind"]
+            if kind is None or item_kind == kind:
+                yield id, item_kind, json.loads(done[id])
+
+    def failed(self):
+        order = self.redis.hgetall(self._key("order"))
+        return sorted(self.redis.smembers(self._key("failed")),
+                      key=lambda id: int(order.get(id) or 0))
+
+    def close(self):
+        self.redis.close()
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class DistributedCrawlMixin:
+    """Spider-side worker loop for distributed mode (see the module docstring).
+
+    Usage:
+        * inherit before ``scrapy.Spider``; set ``self.work_queue`` (see
+          :func:`open_work_queue`) and call ``self.work_setup(crawler)`` in
+          ``from_crawler``.
+        * implement :meth:`work_requests` (the requests for one leased item) and
+          :meth:`work_item_id` (the detail item id a built item completes).
+        * call ``self.work_start()`` once the spider can serve leased work (e.g.
+          after loading a search form). From then on the worker heartbeats its
+          leases and tops itself up to ``work_batch`` held items every
+          ``WORK_TICK_INTERVAL`` seconds, and stays open while the queue still
+          has unfinished work.
+        * call ``self.work_done(id, result)`` when an item without a scraped
+          item of its own (e.g. a shard) finishes. ``WorkQueuePipeline``
+          completes items via :meth:`work_capture`.
+
+    Held items still unfinished when the spider goes idle can't be in flight
+    any more (a dropped request, a truncated chain); they are released so the
+    queue retries them, on this or another worker.
+    """
+
+    work_queue = None
+    work_worker = None
+    work_batch = 8
+    work_lease_ttl = DEFAULT_LEASE_TTL
+
+    def work_setup(self, crawler):
+        self._work_held = {}
+        self._work_task = None
+        crawler.signals.connect(self._work_idle, signal=signals.spider_idle)
+        crawler.signals.connect(self._work_stop, signal=signals.spider_closed)
+
+    def work_requests(self, work):
+        """Requests (or items) for one leased :class:`WorkItem`."""
+        raise NotImplementedError
+
+    def work_item_id(self, item):
+        """Queue id a scraped item completes, or ``None``."""
+        return None
+
+    def _work_stat(self, key, count=1):
+        stats = getattr(getattr(self, "crawler", None), "stats", None)
+        if stats is not None:
+            stats.inc_value(f"workqueue/{key}", count)
+
+    def work_start(self):
+        from twisted.internet import task
+
+        if self._work_task is not None:
+            return
+        self._work_task = task.LoopingCall(self._work_tick)
+        self._work_task.start(WORK_TICK_INTERVAL, now=True)
+
+    def _work_tick(self):
+        if self._work_held:
+            self.work_queue.heartbeat(list(self._work_held), self.work_worker,
+                                      self.work_lease_ttl)
+        self._work_fill()
+
+    def _work_fill(self):
+        leased = self.work_queue.lease(
+            self.work_worker, self.work_lease_ttl,
+            limit=self.work_batch - len(self._work_held))
+        engine = self.crawler.engine
+        for work in leased:
+            self._work_held[work.id] = work
+            self._work_stat(f"leased/{work.kind}")
+            for request in iterate_spider_output(self.work_requests(work)):
+                engine.crawl(request)
+        return leased
+
+    def work_done(self, id, result=None):
+        """Complete ``id`` in the queue (held here or not) with ``result``."""
+        self._work_held.pop(id, None)
+        if self.work_queue.complete(id, result):
+            self._work_stat(f"completed/{id.split(':', 1)[0]}")
+        else:
+            self._work_stat("duplicate")
+
+    def work_capture(self, item):
+        """Complete the item a scraped ``item`` belongs to (``WorkQueuePipeline``)."""
+        id = self.work_item_id(item)
+        if id is not None:
+            self.work_done(id, ItemAdapter(item).asdict())
+
+    def _work_idle(self, *args, **kwargs):
+        if self._work_task is None:
+            return
+        if self._work_held:
+            self.logger.warning(
+                f"Work queue: {len(self._work_held)} leased item(s) finished "
+                f"without a result; returning them to the queue: "
+                f"{sorted(self._work_held)[:5]}")
+            for id in list(self._work_held):
+                self.work_queue.release(id, self.work_worker)
+            self._work_stat("released", len(self._work_held))
+            self._work_held.clear()
+        if self._work_fill():
+            raise DontCloseSpider
+        counts = self.work_queue.counts()
+        if counts["pending"] or counts["leased"]:
+            # Other workers still hold leases that may expire back to us (or
+            # enqueue details from their shards): wait rather than exit.
+            raise DontCloseSpider
+        self.logger.info(f"Work queue drained: {counts}")
+
+    def _work_stop(self, *args, **kwargs):
+        if self._work_task is not None and self._work_task.running:
+            self._work_task.stop()
+        if self.work_queue is None:
+            return
+        # Hand unfinished leases back now instead of making others wait out
+        # the TTL.
+        for id in list(getattr(self, "_work_held", {})):
+            self.work_queue.release(id, self.work_worker)
+        self.work_queue.close()
@@ -34,9 +34,40 @@ SOURCES_SCRIPT="$(dirname "$0")/scripts/generate_sources.py"
 # refreshes the writable, bind-mounted webshare.env automatically at startup.
 REFRESH_PROXIES="${REFRESH_PROXIES:-false}"
 PROXY_SCRIPT="$(dirname "$0")/scripts/update_webshare_proxies.py"
+# With a truthy PROBE_PROXIES the refresh also probes every endpoint and keeps
+# only the working ones, fastest first (update_webshare_proxies.py --probe).
+PROBE_PROXIES="${PROBE_PROXIES:-false}"
 WEBSHARE_ENV="$(dirname "$0")/webshare.env"
+# Incremental mode (opt-in with -i): spiders that keep a provider manifest skip
+# detail fetches for providers whose listing row is unchanged since the last
+# run and re-emit the stored item instead. Manifests live under
+# ${OUTPUT_DIR}manifests/ so they persist alongside the output. Only the spiders
+# listed here understand -a incremental; the rest crawl in full as usual.
+INCREMENTAL=false
+INCREMENTAL_SPIDERS="maryland kansas kentucky connecticut"
+# Spiders that search area by area (ZIPs, grid nodes) and, in incremental mode,
+# plan the search from previous runs: areas that keep coming back empty are
+# skipped or re-checked on a rotating slice (-a partition=1; plans sit next
+# to the manifests). Mirrors PartitionPlannerMixin in scripts/run_spiders.py.
+PARTITION_SPIDERS="kentucky utah north_dakota"
+# Spiders that checkpoint their progress and resume from it on a retry (a
+# crash or stall-close no longer restarts a multi-day crawl from scratch).
+# Checkpoints live under ${OUTPUT_DIR}checkpoints/ and are cleared once a run
+# finishes. Mirrors CHECKPOINT_SPIDERS in scripts/run_spiders.py.
+CHECKPOINT_SPIDERS="maryland"
 # Space-separated list of spiders that require a virtual display
 XVFB_SPIDERS="new_jersey rhode_island arizona wisconsin"
+# Single-process mode (opt-in with -s): run every spider in one Python process
+# via scripts/run_spiders.py instead of one `scrapy crawl` per spider. Same
+# output/log layout, concurrency (-c) and Retryable Error retries; geocoding
+# (-g) runs per spider after the whole batch finishes.
+SINGLE_PROCESS=false
+RUNNER_SCRIPT="$(dirname "$0")/scripts/run_spiders.py"
+# Optional live metrics (opt-in via env): with METRICS_DIR set, every spider
+# rewrites ${METRICS_DIR}/<spider>.prom (OpenMetrics text) every 15s for
+# Prometheus' node_exporter textfile collector, so a stalled spider in a
+# parallel run shows up on a dashboard instead of in a grep of its log.
+METRICS_DIR="${METRICS_DIR:-}"
 # Maryland has a multi-day single-IP run time, so it's usually crawled on its
 # own. -m drops it from the run so the quicker states can be tossed together.
 SKIP_MARYLAND=false
@@ -48,20 +79,25 @@ usage() {
   echo "  -d   directory to use for spider logging and output files (default: $DEFAULT_OUTPUT_DIR)" >&2
   echo "  -f   output format(s): json, csv, or both as a comma/space list, e.g. -f json,csv (default: $DEFAULT_FORMAT)" >&2
   echo "  -g   after each spider, geocode records missing coordinates (enriches each -f format)" >&2
+  echo "  -i   incremental: skip detail fetches for providers unchanged since the last run ($INCREMENTAL_SPIDERS)" >&2
+  echo "       and search areas that keep coming back empty ($PARTITION_SPIDERS)" >&2
   echo "  -m   run every state except Maryland (it's slow, so it's usually run on its own)" >&2
   echo "  -p   before crawling, refresh the Webshare proxy pool in webshare.env (no-op if absent)" >&2
+  echo "  -s   run all spiders in one process (scripts/run_spiders.py) instead of one per spider" >&2
   echo "  -u   after all spiders finish, upload the output files to a Hugging Face dataset" >&2
   echo "  spider names default to the output of 'scrapy list'" >&2
 }
 
-while getopts ":c:d:f:gmpuh" opt; do
+while getopts ":c:d:f:gimpsuh" opt; do
   case $opt in
   c) CONCURRENCY=$OPTARG ;;
   d) OUTPUT_DIR=$OPTARG ;;
   f) FORMAT=$OPTARG ;;
   g) GEOCODE=true ;;
+  i) INCREMENTAL=true ;;
   m) SKIP_MARYLAND=true ;;
   p) REFRESH_PROXIES=true ;;
+  s) SINGLE_PROCESS=true ;;
   u) UPLOAD=true ;;
   h)
     usage
@@ -132,6 +168,35 @@ if [ $OUTPUT_DIR ]; then
   [[ "${OUTPUT_DIR}" != */ ]] && OUTPUT_DIR="${OUTPUT_DIR}/"
 fi
 
+# Geocoding is best-effort enrichment: a failure here must not fail the
+# (already successful) scrape, so we swallow its exit status.
+geocode_spider() {
+  local spider_name=$1
+  local log_file="${spider_name}.log"
+  [ "$GEOCODE" = true ] || return 0
+  # Enrich every format we emitted. The shared geocode cache means the second
+  # file's addresses are already resolved, so a both-run costs one network
+  # pass, not one per format.
+  echo "Geocoding $spider_name..."
+  # Opt-in: persist/reuse the cache at a caller-provided path (e.g. a mounted
+  # volume). Unset -> the script's default location.
+  local cache_args=()
+  [ -n "$GEOCODE_CACHE" ] && cache_args=(--cache "$GEOCODE_CACHE")
+  local geocode_ok=true
+  local fmt
+  for fmt in $FORMAT; do
+    python "$GEOCODE_SCRIPT" \
+      "${OUTPUT_DIR}${spider_name}.${fmt}" \
+      "${cache_args[@]}" \
+      >>"${OUTPUT_DIR}${log_file}" 2>&1 || geocode_ok=false
+  done
+  if [ "$geocode_ok" = true ]; then
+    echo "Geocoding $spider_name completed."
+  else
+    echo "Geocoding $spider_name failed (see ${log_file})."
+  fi
+}
+
 run_spider() {
   local spider_name=$1
   local log_file="${spider_name}.log"
@@ -150,8 +215,26 @@ run_spider() {
     echo "Crawling $spider_name..."
     local cmd_prefix=()
     grep -qw "$spider_name" <<<"$XVFB_SPIDERS" && cmd_prefix=(xvfb-run -a -s "-screen 0 1920x1080x24")
+    local incremental_args=()
+    if [ "$INCREMENTAL" = true ] && grep -qw "$spider_name" <<<"$INCREMENTAL_SPIDERS"; then
+      incremental_args=(-a incremental=1 -s PROVIDER_MANIFEST_DIR="${OUTPUT_DIR}manifests")
+    fi
+    if [ "$INCREMENTAL" = true ] && grep -qw "$spider_name" <<<"$PARTITION_SPIDERS"; then
+      incremental_args+=(-a partition=1 -s PROVIDER_MANIFEST_DIR="${OUTPUT_DIR}manifests")
+    fi
+    local checkpoint_args=()
+    if grep -qw "$spider_name" <<<"$CHECKPOINT_SPIDERS"; then
+      checkpoint_args=(-a checkpoint="${OUTPUT_DIR}checkpoints/${spider_name}.sqlite")
+    fi
+    local metrics_args=()
+    if [ -n "$METRICS_DIR" ]; then
+      metrics_args=(-s METRICS_ENABLED=True -s METRICS_TEXTFILE="${METRICS_DIR%/}/${spider_name}.prom")
+    fi
     "${cmd_prefix[@]}" scrapy crawl $spider_name \
       "${output_args[@]}" \
+      "${incremental_args[@]}" \
+      "${checkpoint_args[@]}" \
+      "${metrics_args[@]}" \
       -s LOG_FILE="${OUTPUT_DIR}${log_file}" \
       -s LOG_LEVEL=$LOG_LEVEL \
       -s LOG_FILE_APPEND=False
@@ -163,30 +246,7 @@ run_spider() {
       sleep 5
     else
       echo "Crawling $spider_name completed successfully."
-      # Geocoding is best-effort enrichment: a failure here must not fail
-      # the (already successful) scrape, so we swallow its exit status.
-      if [ "$GEOCODE" = true ]; then
-        # Enrich every format we emitted. The shared geocode cache means
-        # the second file's addresses are already resolved, so a both-run
-        # costs one network pass, not one per format.
-        echo "Geocoding $spider_name..."
-        # Opt-in: persist/reuse the cache at a caller-provided path (e.g.
-        # a mounted volume). Unset -> the script's default location.
-        local cache_args=()
-        [ -n "$GEOCODE_CACHE" ] && cache_args=(--cache "$GEOCODE_CACHE")
-        local geocode_ok=true
-        for fmt in "${formats[@]}"; do
-          python "$GEOCODE_SCRIPT" \
-            "${OUTPUT_DIR}${spider_name}.${fmt}" \
-            "${cache_args[@]}" \
-            >>"${OUTPUT_DIR}${log_file}" 2>&1 || geocode_ok=false
-        done
-        if [ "$geocode_ok" = true ]; then
-          echo "Geocoding $spider_name completed."
-        else
-          echo "Geocoding $spider_name failed (see ${log_file})."
-        fi
-      fi
+      geocode_spider "$spider_name"
       return 0
     fi
   done
@@ -195,10 +255,13 @@ run_spider() {
   return 1
 }
 
-export -f run_spider
+export -f run_spider geocode_spider
 export LOG_LEVEL
 export MAX_RETRIES
 export OUTPUT_DIR FORMAT XVFB_SPIDERS
+export INCREMENTAL INCREMENTAL_SPIDERS PARTITION_SPIDERS
+export CHECKPOINT_SPIDERS
+export METRICS_DIR
 export GEOCODE GEOCODE_SCRIPT GEOCODE_CACHE
 
 # Optional pre-run proxy refresh (-p flag or a truthy REFRESH_PROXIES env var).
@@ -210,7 +273,9 @@ if [ "$REFRESH_PROXIES" = true ]; then
   echo "======================="
   if [ -f "$WEBSHARE_ENV" ]; then
     echo "Refreshing Webshare proxy pool from $WEBSHARE_ENV ..."
-    if python "$PROXY_SCRIPT" --env-file "$WEBSHARE_ENV"; then
+    PROBE_ARGS=()
+    case "${PROBE_PROXIES,,}" in 1 | true | yes | on) PROBE_ARGS=(--probe) ;; esac
+    if python "$PROXY_SCRIPT" --env-file "$WEBSHARE_ENV" "${PROBE_ARGS[@]}"; then
       echo "Proxy pool refresh finished."
     else
       echo "Proxy refresh failed; continuing with the existing endpoints."
@@ -225,8 +290,28 @@ fi
 echo "Starting spiders run..."
 echo "======================="
 
-# Run spiders in parallel using xargs
-printf "%s\n" "${SPIDERS_TO_RUN[@]}" | xargs -P "$CONCURRENCY" -I {} -n 1 bash -c 'run_spider "$@"' _ {}
+if [ "$SINGLE_PROCESS" = true ]; then
+  # One process for the whole batch, so a display (when any selected spider
+  # needs one) must cover all of it.
+  runner_prefix=()
+  for spider in "${SPIDERS_TO_RUN[@]}"; do
+    if grep -qw "$spider" <<<"$XVFB_SPIDERS"; then
+      runner_prefix=(xvfb-run -a -s "-screen 0 1920x1080x24")
+      break
+    fi
+  done
+  runner_args=(-c "$CONCURRENCY" -d "$OUTPUT_DIR" -f "$FORMAT"
+    --max-retries "$MAX_RETRIES" --log-level "$LOG_LEVEL")
+  [ "$INCREMENTAL" = true ] && runner_args+=(-i)
+  [ -n "$METRICS_DIR" ] && runner_args+=(--metrics-dir "$METRICS_DIR")
+  "${runner_prefix[@]}" python "$RUNNER_SCRIPT" "${runner_args[@]}" "${SPIDERS_TO_RUN[@]}"
+  for spider in "${SPIDERS_TO_RUN[@]}"; do
+    geocode_spider "$spider"
+  done
+else
+  # Run spiders in parallel using xargs
+  printf "%s\n" "${SPIDERS_TO_RUN[@]}" | xargs -P "$CONCURRENCY" -I {} -n 1 bash -c 'run_spider "$@"' _ {}
+fi
 
 echo "Spider runs completed."
 
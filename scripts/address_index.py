@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Build an offline address-point index for geocoding.
+
+Loads address-point CSV file(s) into the SQLite index that
+``geocode_enrich.py --backend address-index`` reads; the index itself lives in
+``provider_scrape/address_index.py`` (see its docstring for the key scheme and
+the accepted columns).
+
+Usage::
+
+    python scripts/address_index.py -o address_index.sqlite points.csv
+    python scripts/address_index.py -o address_index.sqlite tx.csv ca.csv
+"""
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from provider_scrape.address_index import DEFAULT_INDEX_PATH, build_index  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="+",
+                        help="address-point CSV file(s) to load")
+    parser.add_argument("-o", "--output", default=DEFAULT_INDEX_PATH,
+                        help="index path, created or extended "
+                             "(default: %(default)s)")
+    args = parser.parse_args(argv)
+    try:
+        loaded, skipped = build_index(args.sources, args.output)
+    except (OSError, ValueError) as error:
+        print("error: %s" % error, file=sys.stderr)
+        return 1
+    print("Loaded %d address point(s) into %s (%d row(s) skipped: no street "
+          "or coordinate)" % (loaded, args.output, skipped))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
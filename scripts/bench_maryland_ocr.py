@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Time the Maryland inspection-PDF address pipeline, stage by stage.
+
+Compares, per document:
+
+* ``full``  -- the original pipeline: render the whole page at 2x, convert to
+  PIL, crop the ADDRESS band;
+* ``band``  -- ``_render_address_band``: pdfium renders only the band, as raw
+  8-bit gray;
+* ``cache`` -- an ``OcrResultCache`` hit (SHA-256 of the PDF + SQLite lookup),
+  i.e. the cost of a report already OCR'd in an earlier run;
+* ``ocr``   -- Tesseract on the band, only when tessdata is installed (see
+  MARYLAND.md), reporting whether the address was found.
+
+Defaults to the committed fixture report; pass real inspection PDFs to measure
+on production documents.
+
+Usage::
+
+    python scripts/bench_maryland_ocr.py
+    python scripts/bench_maryland_ocr.py -n 50 reports/*.pdf
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pypdfium2 as pdfium  # noqa: E402
+
+from provider_scrape.ocr_pool import OcrResultCache  # noqa: E402
+from provider_scrape.spiders import maryland  # noqa: E402
+
+DEFAULT_PDFS = [os.path.join(REPO_ROOT, "provider_scrape", "spiders", "fixtures",
+                             "md_inspection_report_center.pdf")]
+
+
+def _full_render_crop(pdf_bytes):
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        img = pdf[0].render(scale=maryland.OCR_SCALE).to_pil()
+    finally:
+        pdf.close()
+    top, bottom = maryland.ADDRESS_BAND
+    return img.crop((0, top, img.width, bottom))
+
+
+def _timed(fn, arg, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(arg)
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def _have_tessdata():
+    return os.path.exists(
+        os.path.join(maryland.TESSDATA_DIR, "eng.traineddata"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", default=DEFAULT_PDFS,
+                        help="inspection report PDF(s) (default: the fixture)")
+    parser.add_argument("-n", "--repeat", type=int, default=20,
+                        help="timed iterations per document per stage "
+                             "(default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    ocr = _have_tessdata()
+    if not ocr:
+        print("(no eng.traineddata under %s: skipping the OCR stage)"
+              % maryland.TESSDATA_DIR)
+    with tempfile.TemporaryDirectory() as scratch:
+        cache = OcrResultCache(os.path.join(scratch, "ocr.sqlite"),
+                               version=maryland.OCR_CACHE_VERSION)
+        print("%-40s %9s %9s %9s %9s  address" % (
+            "document", "full ms", "band ms", "cache ms", "ocr ms"))
+        for path in args.pdfs:
+            with open(path, "rb") as handle:
+                pdf_bytes = handle.read()
+            full_ms, _ = _timed(_full_render_crop, pdf_bytes, args.repeat)
+            band_ms, _ = _timed(maryland._render_address_band, pdf_bytes,
+                                args.repeat)
+            ocr_ms, address = None, ""
+            if ocr:
+                ocr_ms, address = _timed(maryland.extract_address_from_pdf,
+                                         pdf_bytes, max(1, args.repeat // 10))
+            cache.put(cache.key(pdf_bytes), address or "")
+            cache_ms, _ = _timed(lambda b: cache.get(cache.key(b)), pdf_bytes,
+                                 args.repeat)
+            print("%-40s %9.2f %9.2f %9.3f %9s  %s" % (
+                os.path.basename(path)[:40], full_ms, band_ms, cache_ms,
+                "-" if ocr_ms is None else "%.1f" % ocr_ms, address or "-"))
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Time NormalizationPipeline's per-item overhead on inspection-heavy items.
+
+Compares, per item:
+
+* ``legacy``   -- the original ``process_item``: ``ItemAdapter.asdict()`` (a
+  deep copy that turns every nested ``InspectionItem`` into a new dict),
+  normalize the copy, then write every key back through the adapter;
+* ``in-place`` -- the current ``process_item``: the item's own field dict is
+  normalized in place; each inspection becomes a plain dict (as exporters
+  expect) and is normalized.
+
+The items are ``ProviderItem``s shaped like a Connecticut/Wisconsin provider
+with a long inspection history (``--inspections`` each, dates in M/D/YYYY,
+untrimmed text, a violations list), built fresh for every pass outside the
+timed region. Both paths are checked to produce the same exported item.
+
+Usage::
+
+    python scripts/bench_normalization_pipeline.py
+    python scripts/bench_normalization_pipeline.py -n 500 --inspections 120
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from itemadapter import ItemAdapter  # noqa: E402
+from scrapy.settings import Settings  # noqa: E402
+
+from provider_scrape import normalization  # noqa: E402
+from provider_scrape.items import InspectionItem, ProviderItem  # noqa: E402
+from provider_scrape.pipelines import NormalizationPipeline  # noqa: E402
+
+SPIDER = SimpleNamespace(name="connecticut", settings=Settings(),
+                         logger=logging.getLogger("bench"))
+
+
+def legacy_process_item(item, spider):
+    """The asdict/write-back ``process_item`` the pipeline replaced."""
+    adapter = ItemAdapter(item)
+    data = adapter.asdict()
+    data = normalization.normalize_item(data, spider.name)
+    if data.get("inspections"):
+        data["inspections"] = [
+            normalization.normalize_inspection(i, spider.name)
+            for i in data["inspections"]
+        ]
+    for key, value in data.items():
+        adapter[key] = value
+    return item
+
+
+def build_item(inspections):
+    item = ProviderItem()
+    item["provider_name"] = "  BRIGHT   BEGINNINGS LEARNING CENTER LLC "
+    item["provider_type"] = "Child Care Learning Center"
+    item["status"] = "Active"
+    item["address"] = "12 Main St,  Hartford, CT 06103, USA"
+    item["phone"] = "(860) 555-0100"
+    item["capacity"] = "64"
+    item["license_number"] = "DCCC-12345"
+    item["license_expiration"] = "6/30/2027"
+    item["ct_license_type"] = "Child Care Center"
+    item["inspections"] = []
+    for i in range(inspections):
+        entry = InspectionItem()
+        entry["date"] = f"{i % 12 + 1}/{i % 28 + 1}/20{10 + i % 15}"
+        entry["type"] = " Routine  Inspection " if i % 3 else "Complaint"
+        entry["original_status"] = "Non-Compliant " if i % 4 == 0 else "Compliant"
+        entry["corrective_status"] = "Corrected" if i % 4 == 0 else None
+        entry["status_updated"] = f"{i % 12 + 1}/15/20{10 + i % 15} 10:30 AM"
+        entry["report_url"] = f"https://example.org/reports/{i}.pdf"
+        entry["va_violations"] = [" 22VAC40-185-60 ", "", "22VAC40-185-70"]
+        item["inspections"].append(entry)
+    return item
+
+
+def _timed(process, items):
+    start = time.perf_counter()
+    for item in items:
+        process(item, SPIDER)
+    return (time.perf_counter() - start) * 1e6 / len(items)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeat", type=int, default=200,
+                        help="items per path (default: %(default)s)")
+    parser.add_argument("--inspections", type=int, default=60,
+                        help="inspections per item (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    pipeline = NormalizationPipeline()
+    pipeline.open_spider(SPIDER)
+    expected = ItemAdapter(legacy_process_item(
+        build_item(args.inspections), SPIDER)).asdict()
+    got = ItemAdapter(pipeline.process_item(
+        build_item(args.inspections), SPIDER)).asdict()
+    if got != expected:
+        print("MISMATCH: the in-place pipeline exported a different item")
+        return 1
+
+    legacy_us = _timed(legacy_process_item,
+                       [build_item(args.inspections) for _ in range(args.repeat)])
+    inplace_us = _timed(pipeline.process_item,
+                        [build_item(args.inspections) for _ in range(args.repeat)])
+    print("%d item(s) x %d inspection(s)" % (args.repeat, args.inspections))
+    print("%-9s %10s %8s" % ("path", "us/item", "speedup"))
+    for name, us in (("legacy", legacy_us), ("in-place", inplace_us)):
+        print("%-9s %10.1f %7.2fx" % (name, us, legacy_us / us))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Time ``normalize_date``'s shape-sniffing parser against the strptime loop.
+
+Compares, over every date-like value in the committed JSON fixtures (string
+values under a key containing "date"):
+
+* ``legacy`` -- the original parser: strip a clock time with a regex, then
+  try each ``_NUMERIC_DATE_PATTERNS`` entry through ``datetime.strptime``
+  (every miss raising a ValueError) and finally the month-name form;
+* ``sniff``  -- the current ``_parse_date``: one precompiled regex per date
+  shape, the ISO string built from the captured parts, no ``datetime``;
+* ``hinted`` -- the same with a ``(state, field)`` hint, so each field's
+  learned shape is tried first.
+
+Memoization is switched off for the run so every call is measured, and the
+two parsers' results are compared value by value (any mismatch is listed and
+the exit status is 1). The one expected difference is years below 1000: glibc's
+``strftime("%Y")`` doesn't zero-pad them (``0001-01-01`` came out as
+``1-01-01``), the sniffing parser always does; those are only counted.
+
+Usage::
+
+    python scripts/bench_normalize_date.py
+    python scripts/bench_normalize_date.py -n 200 dates.json
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from provider_scrape import normalization  # noqa: E402
+
+DEFAULT_FIXTURES = sorted(glob.glob(os.path.join(
+    REPO_ROOT, "provider_scrape", "spiders", "fixtures", "*.json")))
+
+
+def legacy_parse_date(value):
+    """The strptime-based parser ``_parse_date`` replaced, kept as a baseline."""
+    candidate = value.strip()
+    if "T" in candidate:
+        candidate = candidate.split("T", 1)[0]
+    candidate = re.sub(
+        r"\s+\d{1,2}:\d{2}(?::\d{2})?(?:\s*[AaPp][Mm])?$", "", candidate
+    ).strip()
+    for pattern in normalization._NUMERIC_DATE_PATTERNS:
+        try:
+            return datetime.strptime(candidate, pattern).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    parsed = normalization._parse_month_name_date(candidate)
+    if parsed is not None:
+        return parsed.strftime("%Y-%m-%d")
+    return None
+
+
+def _date_values(node, key, hint, out):
+    if isinstance(node, dict):
+        for child_key, child in node.items():
+            _date_values(child, child_key, hint, out)
+    elif isinstance(node, list):
+        for child in node:
+            _date_values(child, key, hint, out)
+    elif isinstance(node, str) and node.strip() and "date" in key.lower():
+        out.append((node, (hint, key)))
+
+
+def collect(paths):
+    """``[(value, (fixture, key))]`` for every date-like fixture value."""
+    values = []
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            _date_values(json.load(handle), "", os.path.basename(path), values)
+    return values
+
+
+def _same(legacy, sniffed):
+    """Equal, or differing only by the legacy parser's unpadded year."""
+    if legacy == sniffed:
+        return True
+    if legacy is None or sniffed is None:
+        return False
+    legacy_year, legacy_rest = legacy.split("-", 1)
+    sniffed_year, sniffed_rest = sniffed.split("-", 1)
+    return legacy_rest == sniffed_rest and int(legacy_year) == int(sniffed_year)
+
+
+def _timed(fn, values, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in values:
+            fn(*args)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(values))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", default=DEFAULT_FIXTURES,
+                        help="JSON file(s) to collect dates from "
+                             "(default: the spider fixtures)")
+    parser.add_argument("-n", "--repeat", type=int, default=50,
+                        help="timed passes over the values (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    values = collect(args.fixtures)
+    if not values:
+        print("no date values found")
+        return 1
+    # _parse_date is the uncached parse (normalize_date memoizes around it).
+    compared = [(v, legacy_parse_date(v), normalization._parse_date(v))
+                for v, _ in values]
+    legacy_us = _timed(legacy_parse_date, [(v,) for v, _ in values],
+                       args.repeat)
+    sniff_us = _timed(normalization._parse_date, [(v,) for v, _ in values],
+                      args.repeat)
+    hinted_us = _timed(normalization._parse_date, values, args.repeat)
+
+    mismatches = [row for row in compared if not _same(row[1], row[2])]
+    padded = sum(1 for _, old, new in compared if old != new) - len(mismatches)
+    parsed = sum(1 for v, _ in values if legacy_parse_date(v) is not None)
+    print("%d value(s) (%d distinct, %d parseable) from %d file(s), %d pass(es)"
+          % (len(values), len({v for v, _ in values}), parsed,
+             len(args.fixtures), args.repeat))
+    print("%-8s %10s %8s" % ("parser", "us/value", "speedup"))
+    for name, us in (("legacy", legacy_us), ("sniff", sniff_us),
+                     ("hinted", hinted_us)):
+        print("%-8s %10.3f %7.1fx" % (name, us, legacy_us / us))
+    if padded:
+        print("%d value(s) with a year below 1000, now zero-padded" % padded)
+    for value, old, new in mismatches:
+        print("MISMATCH %r: legacy=%r sniff=%r" % (value, old, new))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,12 +7,30 @@ back. Records that already carry coordinates are stamped ``source="state"``;
 records with no usable address are skipped.
 
 The file format is inferred from each path's extension: ``.csv`` is read/written
-as CSV (a header row plus one row per record), anything else as a JSON array. A
+as CSV (a header row plus one row per record), ``.jsonl`` as JSON Lines (one
+record per line), anything else as a JSON array. A
 CSV run gains the ``geocode_source`` / ``geocode_confidence`` columns (and
 ``latitude`` / ``longitude`` if they were absent), appended after the original
 columns; existing column order is preserved. This means a csv-only scrape can be
 enriched on its own, without a JSON alongside it.
 
+``--stream`` enriches a JSON Lines or CSV input record by record instead of
+loading it: peak memory is bounded by ``--batch-size`` (the unique cache-miss
+addresses waiting for the next Census batch), not by the file, so a large state
+(california, texas) can be geocoded alongside running spiders on a small
+container. See :func:`enrich_file_streaming`.
+
+Census chunks go out through a bounded pool (``--workers``, default one at a
+time) under a global requests-per-minute cap (``--rpm``), and the chunk size
+adapts: it halves when a chunk times out (the chunk is re-queued in smaller
+pieces) and grows again when answers come back fast. See :func:`_query_census`.
+
+``--backend address-index`` resolves cache misses offline from a local
+address-point index (``scripts/address_index.py``) instead of Census; its
+matches are stamped ``geocode_source="address_index"`` and cached alongside
+Census outcomes under the same address keys. Its misses are not cached, so a
+later Census run still queries them.
+
 All the pure decision logic lives in ``provider_scrape/geocoding.py``; this file
 owns the I/O: reading/writing JSON or CSV, the SQLite cache, and the HTTP calls.
 
@@ -21,6 +39,9 @@ Usage:
     .venv/bin/python scripts/geocode_enrich.py state_output/ohio.csv
     .venv/bin/python scripts/geocode_enrich.py -o out.json ohio.json alabama.json
     .venv/bin/python scripts/geocode_enrich.py --dry-run --limit 100 texas.csv
+    .venv/bin/python scripts/geocode_enrich.py --stream state_output/texas.jsonl
+    .venv/bin/python scripts/geocode_enrich.py --workers 4 --rpm 30 california.json
+    .venv/bin/python scripts/geocode_enrich.py --backend address-index texas.json
 
 See ``tasks/geocoding_epic/geocoding_plan.md``.
 """
@@ -30,10 +51,14 @@ import io
 import json
 import logging
 import os
+import shutil
 import sqlite3
 import sys
+import tempfile
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 
 import requests
@@ -42,14 +67,20 @@ REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
-from provider_scrape import geocoding  # noqa: E402
+from provider_scrape import address_index, geocoding  # noqa: E402
 
 logger = logging.getLogger("geocode_enrich")
 
 DEFAULT_CACHE_PATH = os.path.join(REPO_ROOT, "geocode_cache.sqlite")
+DEFAULT_CACHE_LRU = 50000   # in-memory outcomes in front of SQLite (--cache-lru)
 DEFAULT_TIMEOUT = 120       # seconds; Census batch responses can be slow
 DEFAULT_MAX_RETRIES = 4
 BACKOFF_BASE = 3            # seconds; exponential: 3, 6, 12, ...
+DEFAULT_WORKERS = 1         # concurrent Census batches (--workers)
+DEFAULT_RPM = 20            # global cap on Census POSTs per minute (--rpm)
+MIN_BATCH_SIZE = 100        # adaptive chunking never shrinks below this
+FAST_RESPONSE_FRACTION = 0.25   # a chunk back within this share of --timeout
+BATCH_GROWTH = 1.5              # ... grows the next one by this factor
 
 
 # --------------------------------------------------------------------------- #
@@ -60,9 +91,20 @@ class GeocodeCache:
 
     Stores the *outcome* (source/confidence/coords), not the raw Census row, so
     a hit can be applied to an item directly.
+
+    The bulk API is what enrichment uses: :meth:`get_many` looks keys up with
+    chunked ``IN (...)`` queries and :meth:`put_many` writes a whole Census
+    chunk in one transaction, so parallel geocode steps sharing this file
+    contend for the write lock (and fsync) once per chunk rather than once per
+    address. An optional in-memory LRU (``lru_size`` entries) sits in front of
+    SQLite; ``stats`` counts hits, misses and time spent, for
+    :func:`_print_stats`.
     """
 
-    def __init__(self, path):
+    # Well under SQLite's bound-parameter limit (999 on older builds).
+    LOOKUP_CHUNK = 500
+
+    def __init__(self, path, lru_size=0):
         # A generous busy timeout + WAL keeps the shared cache safe when
         # run_spiders.sh runs several geocode steps in parallel (each writing
         # this one file).
@@ -77,25 +119,76 @@ class GeocodeCache:
             " matched_address TEXT, fetched_at TEXT)"
         )
         self.conn.commit()
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self.stats = defaultdict(float)
+
+    def _remember(self, key, outcome):
+        if not self.lru_size:
+            return
+        self._lru[key] = outcome
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
 
     def get(self, key):
-        cur = self.conn.execute(
-            "SELECT latitude, longitude, source, confidence"
-            " FROM geocode_cache WHERE address_key = ?", (key,))
-        row = cur.fetchone()
-        if row is None:
-            return None
-        return {"latitude": row[0], "longitude": row[1],
-                "source": row[2], "confidence": row[3]}
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Return ``{key: outcome}`` for the keys that are cached (misses are
+        simply absent)."""
+        started = time.perf_counter()
+        found = {}
+        wanted = []
+        unique = list(dict.fromkeys(keys))
+        for key in unique:
+            outcome = self._lru.get(key)
+            if outcome is not None:
+                self._lru.move_to_end(key)
+                found[key] = outcome
+                self.stats["lru_hits"] += 1
+            else:
+                wanted.append(key)
+        for start in range(0, len(wanted), self.LOOKUP_CHUNK):
+            chunk = wanted[start:start + self.LOOKUP_CHUNK]
+            cur = self.conn.execute(
+                "SELECT address_key, latitude, longitude, source, confidence"
+                " FROM geocode_cache WHERE address_key IN (%s)"
+                % ",".join("?" * len(chunk)), chunk)
+            self.stats["queries"] += 1
+            for row in cur:
+                outcome = {"latitude": row[1], "longitude": row[2],
+                           "source": row[3], "confidence": row[4]}
+                found[row[0]] = outcome
+                self._remember(row[0], outcome)
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(unique) - len(found)
+        self.stats["lookup_seconds"] += time.perf_counter() - started
+        return found
 
     def put(self, key, latitude, longitude, source, confidence, matched):
-        self.conn.execute(
-            "INSERT OR REPLACE INTO geocode_cache"
-            " (address_key, latitude, longitude, source, confidence,"
-            "  matched_address, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (key, latitude, longitude, source, confidence, matched,
-             datetime.now(timezone.utc).isoformat()))
-        self.conn.commit()
+        self.put_many([(key, latitude, longitude, source, confidence, matched)])
+
+    def put_many(self, rows):
+        """Write ``(key, latitude, longitude, source, confidence, matched)``
+        rows in a single transaction."""
+        rows = list(rows)
+        if not rows:
+            return
+        started = time.perf_counter()
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO geocode_cache"
+                " (address_key, latitude, longitude, source, confidence,"
+                "  matched_address, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [tuple(row) + (fetched_at,) for row in rows])
+        for key, latitude, longitude, source, confidence, _ in rows:
+            self._remember(key, {"latitude": latitude, "longitude": longitude,
+                                 "source": source, "confidence": confidence})
+        self.stats["writes"] += len(rows)
+        self.stats["commits"] += 1
+        self.stats["write_seconds"] += time.perf_counter() - started
 
     def close(self):
         self.conn.close()
@@ -104,12 +197,20 @@ class GeocodeCache:
 class NullCache:
     """Drop-in cache that never hits (for ``--no-cache``)."""
 
+    stats = None
+
     def get(self, key):
         return None
 
+    def get_many(self, keys):
+        return {}
+
     def put(self, *args):
         pass
 
+    def put_many(self, rows):
+        pass
+
     def close(self):
         pass
 
@@ -117,11 +218,6 @@ class NullCache:
 # --------------------------------------------------------------------------- #
 # Census batch client
 # --------------------------------------------------------------------------- #
-def _chunks(seq, size):
-    for start in range(0, len(seq), size):
-        yield seq[start:start + size]
-
-
 def _rows_to_csv(rows):
     """Serialize batch rows to a CSV string (no header), quoting as needed."""
     buffer = io.StringIO()
@@ -130,15 +226,22 @@ def _rows_to_csv(rows):
     return buffer.getvalue()
 
 
-def _post_batch(rows, benchmark, timeout, max_retries):
+def _post_batch(rows, benchmark, timeout, max_retries, limiter=None,
+                retry_timeouts=True):
     """POST one chunk of rows to Census; return parsed CSV response rows.
 
     Retries on network errors / 5xx with exponential backoff. Raises the last
     exception if every attempt fails (the caller decides how fatal that is).
+    Every attempt, retries included, first takes a slot from ``limiter`` (a
+    :class:`RateLimiter`) when one is given. With ``retry_timeouts=False`` a
+    timeout is raised at once instead of retried at the same size -- the
+    adaptive scheduler would rather split the chunk.
     """
     payload = _rows_to_csv(rows).encode("utf-8")
     last_error = None
     for attempt in range(1, max_retries + 1):
+        if limiter is not None:
+            limiter.acquire()
         try:
             response = requests.post(
                 geocoding.CENSUS_BATCH_URL,
@@ -166,6 +269,8 @@ def _post_batch(rows, benchmark, timeout, max_retries):
                     "page) -- is the geocode step running through a blocked IP?")
             return list(csv.reader(io.StringIO(text)))
         except (requests.RequestException, ) as error:
+            if not retry_timeouts and isinstance(error, requests.Timeout):
+                raise
             last_error = error
             if attempt < max_retries:
                 delay = BACKOFF_BASE * (2 ** (attempt - 1))
@@ -176,6 +281,195 @@ def _post_batch(rows, benchmark, timeout, max_retries):
     raise last_error
 
 
+class RateLimiter:
+    """Thread-safe global cap on Census requests per minute.
+
+    Hands out evenly spaced start slots (``60 / per_minute`` seconds apart)
+    across every worker, so ``--workers`` raises throughput only as far as
+    politeness allows. ``per_minute`` of 0 disables the cap.
+    """
+
+    def __init__(self, per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+
+
+class BatchSizeController:
+    """Adaptive Census chunk size.
+
+    Starts at ``--batch-size``. A chunk that times out halves the size (down
+    to :data:`MIN_BATCH_SIZE`, or the starting size if that is smaller) and is
+    re-queued to go out again in smaller pieces; a full-size chunk answered in
+    under :data:`FAST_RESPONSE_FRACTION` of the timeout grows the size by
+    :data:`BATCH_GROWTH`, up to the Census limit. A chunk already at the
+    minimum retries its timeouts in place (``--max-retries``, with backoff).
+    """
+
+    def __init__(self, initial, timeout, maximum=geocoding.MAX_BATCH_SIZE):
+        self.maximum = maximum
+        self.minimum = min(MIN_BATCH_SIZE, initial)
+        self.size = max(self.minimum, min(initial, maximum))
+        self.fast = timeout * FAST_RESPONSE_FRACTION
+
+    def record_success(self, rows, elapsed):
+        if rows >= self.size and elapsed < self.fast:
+            grown = min(self.maximum, int(self.size * BATCH_GROWTH))
+            if grown > self.size:
+                logger.debug("Census answered %d rows in %.1fs; batch size "
+                             "%d -> %d", rows, elapsed, self.size, grown)
+                self.size = grown
+
+    def record_timeout(self, rows):
+        shrunk = max(self.minimum, min(self.size, rows) // 2)
+        if shrunk < self.size:
+            logger.info("Census timed out on %d rows; batch size %d -> %d",
+                        rows, self.size, shrunk)
+        self.size = shrunk
+
+
+def _timed_post(chunk, args, limiter, retry_timeouts):
+    started = time.monotonic()
+    rows = _post_batch(chunk, args.benchmark, args.timeout, args.max_retries,
+                       limiter, retry_timeouts)
+    return rows, time.monotonic() - started
+
+
+def _query_census(query_rows, args, handle_chunk):
+    """Geocode ``query_rows`` in adaptively sized chunks, ``--workers`` at once.
+
+    ``handle_chunk(chunk, response_rows)`` is called on *this* thread as each
+    chunk completes (so cache writes stay on the SQLite connection's thread
+    and land chunk by chunk), with ``response_rows=None`` for a chunk that
+    failed permanently. Chunks may complete out of order; query ids map
+    results back, not positions within a chunk.
+    """
+    controller = BatchSizeController(args.batch_size, args.timeout)
+    limiter = RateLimiter(args.rpm)
+    remaining = deque(query_rows)
+    in_flight = {}
+    sent = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        while remaining or in_flight:
+            while remaining and len(in_flight) < max(1, args.workers):
+                take = min(controller.size, len(remaining))
+                chunk = [remaining.popleft() for _ in range(take)]
+                sent += 1
+                logger.info("Census batch %d: querying %d addresses "
+                            "(%d more queued)", sent, len(chunk), len(remaining))
+                # A chunk that can't be split further retries its timeouts
+                # in place, with the usual backoff, before it is given up.
+                future = pool.submit(_timed_post, chunk, args, limiter,
+                                     len(chunk) <= controller.minimum)
+                in_flight[future] = (sent, chunk)
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                number, chunk = in_flight.pop(future)
+                try:
+                    response_rows, elapsed = future.result()
+                except requests.Timeout as error:
+                    controller.record_timeout(len(chunk))
+                    if len(chunk) > controller.size:
+                        logger.warning("Census batch %d timed out (%s); "
+                                       "re-queueing its %d addresses",
+                                       number, error, len(chunk))
+                        remaining.extendleft(reversed(chunk))
+                        continue
+                    logger.error("Census batch %d timed out at the minimum "
+                                 "batch size after %d attempts; leaving these "
+                                 "records unresolved", number, args.max_retries)
+                    handle_chunk(chunk, None)
+                    continue
+                except requests.RequestException as error:
+                    logger.error("Census batch %d failed permanently: %s; "
+                                 "leaving these records unresolved",
+                                 number, error)
+                    handle_chunk(chunk, None)
+                    continue
+                controller.record_success(len(chunk), elapsed)
+                handle_chunk(chunk, response_rows)
+
+
+def _results_by_id(response_rows):
+    results = {}
+    for fields in response_rows:
+        parsed = geocoding.parse_response_line(fields)
+        if parsed and parsed.get("id") is not None:
+            results[parsed["id"]] = parsed
+    return results
+
+
+# --------------------------------------------------------------------------- #
+# Geocoding backends
+# --------------------------------------------------------------------------- #
+class CensusBackend:
+    """The US Census batch geocoder, over the network (the default).
+
+    A backend has a ``source`` (the ``geocode_source`` its matches are stamped
+    with) and ``geocode(query_rows, args, handle_chunk)``, which resolves
+    ``[id, street, city, state, zip]`` rows and calls
+    ``handle_chunk(chunk, results_by_id)`` on the calling thread as each chunk
+    completes -- results shaped like ``geocoding.parse_response_line`` output,
+    or ``None`` for a chunk that failed.
+    """
+
+    source = geocoding.SOURCE_CENSUS
+    # Census's "no match" is final, so it is cached to skip the retry.
+    caches_misses = True
+
+    def geocode(self, query_rows, args, handle_chunk):
+        def handle_response(chunk, response_rows):
+            handle_chunk(chunk, None if response_rows is None
+                         else _results_by_id(response_rows))
+
+        _query_census(query_rows, args, handle_response)
+
+    def close(self):
+        pass
+
+
+class AddressIndexBackend:
+    """Offline lookups in a local address-point index built by
+    ``scripts/address_index.py``. In-process, so ``--workers``/``--rpm`` do
+    not apply; rows are still resolved (and cached) a batch at a time.
+
+    Only matches are cached: an address missing from (or a tie in) the index
+    may still resolve through Census, which a later run must get to ask."""
+
+    source = geocoding.SOURCE_ADDRESS_INDEX
+    caches_misses = False
+
+    def __init__(self, path):
+        self.index = address_index.AddressIndex(path)
+
+    def geocode(self, query_rows, args, handle_chunk):
+        for start in range(0, len(query_rows), args.batch_size):
+            chunk = query_rows[start:start + args.batch_size]
+            logger.info("Address index: looking up %d addresses", len(chunk))
+            handle_chunk(chunk, self.index.lookup_many(chunk))
+
+    def close(self):
+        self.index.close()
+
+
+def make_backend(args):
+    if args.backend == "address-index":
+        return AddressIndexBackend(args.address_index)
+    return CensusBackend()
+
+
 # --------------------------------------------------------------------------- #
 # Enrichment of one file
 # --------------------------------------------------------------------------- #
@@ -183,7 +477,7 @@ def _outcome_bucket(record):
     """Fine-grained stats bucket for an enriched (non-state) record."""
     source = record.get("geocode_source")
     confidence = record.get("geocode_confidence")
-    if source == geocoding.SOURCE_CENSUS:
+    if source in geocoding.GEOCODED_SOURCES:
         return "geocoded_exact" if confidence == "exact" else "geocoded_approx"
     return "unmatched_tie" if confidence == "tie" else "unmatched_no_match"
 
@@ -198,8 +492,12 @@ def _apply_cached(record, cached):
         record["longitude"] = cached["longitude"]
 
 
-def enrich_records(records, cache, args):
-    """Enrich a list of records in place; return a counters dict."""
+def enrich_records(records, cache, args, backend=None):
+    """Enrich a list of records in place; return a counters dict.
+
+    ``backend`` resolves cache misses (default :class:`CensusBackend`).
+    """
+    backend = backend or CensusBackend()
     counters = defaultdict(int)
 
     # 1. Partition: already-has-coords (stamp state), no-address (skip), or a
@@ -221,8 +519,9 @@ def enrich_records(records, cache, args):
     #    a repeated address is only queried once.
     key_to_indices = defaultdict(list)
     representative_row = {}
+    cached_by_key = cache.get_many([key for _, _, key in candidates])
     for index, row, key in candidates:
-        cached = cache.get(key)
+        cached = cached_by_key.get(key)
         if cached is not None:
             _apply_cached(records[index], cached)
             counters["cache_hit"] += 1
@@ -245,51 +544,43 @@ def enrich_records(records, cache, args):
         return counters
 
     # 3. Network pass. Query rows carry a positional id into ``unique_keys`` so
-    #    responses map back regardless of order.
+    #    responses map back regardless of order (or which chunk they rode in).
     query_rows = [
         [str(position)] + representative_row[key][1:]
         for position, key in enumerate(unique_keys)
     ]
-    total_chunks = (len(query_rows) + args.batch_size - 1) // args.batch_size
-    for chunk_number, chunk in enumerate(_chunks(query_rows, args.batch_size), 1):
-        logger.info("Census batch %d/%d: querying %d addresses",
-                    chunk_number, total_chunks, len(chunk))
-        try:
-            response_rows = _post_batch(
-                chunk, args.benchmark, args.timeout, args.max_retries)
-        except requests.RequestException as error:
-            logger.error("Census batch %d/%d failed permanently: %s; leaving "
-                         "these records unresolved", chunk_number, total_chunks,
-                         error)
-            counters["query_failed"] += len(chunk)
-            continue
-        results_by_id = {}
-        for fields in response_rows:
-            parsed = geocoding.parse_response_line(fields)
-            if parsed and parsed.get("id") is not None:
-                results_by_id[parsed["id"]] = parsed
 
+    def handle_chunk(chunk, results_by_id):
+        if results_by_id is None:
+            counters["query_failed"] += len(chunk)
+            return
+        outcomes = []
         # Each query row's id (row[0]) is its position into ``unique_keys``.
         for row in chunk:
             unique_key = unique_keys[int(row[0])]
             result = results_by_id.get(row[0]) or {"match": "No_Match"}
             for index in key_to_indices[unique_key]:
-                geocoding.apply_result(records[index], result)
+                geocoding.apply_result(records[index], result, backend.source)
                 counters[_outcome_bucket(records[index])] += 1
             enriched = records[key_to_indices[unique_key][0]]
-            is_census = (
-                enriched.get("geocode_source") == geocoding.SOURCE_CENSUS)
-            cache.put(
+            matched = (enriched.get("geocode_source")
+                       in geocoding.GEOCODED_SOURCES)
+            if not (matched or backend.caches_misses):
+                continue
+            outcomes.append((
                 unique_key,
-                enriched.get("latitude") if is_census else None,
-                enriched.get("longitude") if is_census else None,
+                enriched.get("latitude") if matched else None,
+                enriched.get("longitude") if matched else None,
                 enriched.get("geocode_source"),
                 enriched.get("geocode_confidence"),
-                result.get("matched_address"))
+                result.get("matched_address")))
+        cache.put_many(outcomes)
+
+    backend.geocode(query_rows, args, handle_chunk)
     return counters
 
 
-def _print_stats(path, counters):
+def _print_stats(path, counters, cache_stats=None):
     total = (counters["state"] + counters["skipped_no_address"]
              + counters["candidates"])
     geocoded = counters["geocoded_exact"] + counters["geocoded_approx"]
@@ -312,6 +603,25 @@ def _print_stats(path, counters):
     if counters["query_failed"]:
         print("    query failed        : %d" % counters["query_failed"])
     print("  match rate (of attempted): %.1f%%" % rate)
+    if cache_stats:
+        looked_up = cache_stats["hits"] + cache_stats["misses"]
+        print("  cache lookups         : %d (%d hit, %d miss; %d from memory) "
+              "in %d queries, %.1f ms"
+              % (looked_up, cache_stats["hits"], cache_stats["misses"],
+                 cache_stats["lru_hits"], cache_stats["queries"],
+                 1000 * cache_stats["lookup_seconds"]))
+        print("  cache writes          : %d in %d transactions, %.1f ms"
+              % (cache_stats["writes"], cache_stats["commits"],
+                 1000 * cache_stats["write_seconds"]))
+
+
+def _cache_stats_since(cache, before):
+    """Per-file view of a cache's cumulative ``stats`` (``None`` for caches
+    that keep none, e.g. :class:`NullCache`)."""
+    if cache.stats is None:
+        return None
+    return defaultdict(float, {key: value - before.get(key, 0)
+                               for key, value in cache.stats.items()})
 
 
 def _is_csv(path):
@@ -319,8 +629,13 @@ def _is_csv(path):
     return os.path.splitext(path)[1].lower() == ".csv"
 
 
+def _is_jsonl(path):
+    """True when ``path`` should be treated as JSON Lines (by its extension)."""
+    return os.path.splitext(path)[1].lower() == ".jsonl"
+
+
 def _read_records(path):
-    """Load records from a JSON array or a CSV file.
+    """Load records from a JSON array, a JSON Lines or a CSV file.
 
     Returns ``(records, base_fieldnames)``: a list of dict records, and the CSV
     header (so column order survives the round-trip) or ``None`` for JSON. CSV
@@ -332,6 +647,8 @@ def _read_records(path):
             reader = csv.DictReader(handle)
             records = [dict(row) for row in reader]
             return records, list(reader.fieldnames or [])
+    if _is_jsonl(path):
+        return list(_iter_records(path)), None
     with open(path, "r", encoding="utf-8") as handle:
         records = json.load(handle)
     if not isinstance(records, list):
@@ -360,29 +677,300 @@ def _write_records(path, records, base_fieldnames):
             writer = csv.DictWriter(handle, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(records)
+    elif _is_jsonl(path):
+        with open(path, "w", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
     else:
         with open(path, "w", encoding="utf-8") as handle:
             json.dump(records, handle, ensure_ascii=False, indent=2)
 
 
-def enrich_file(path, cache, args):
-    records, base_fieldnames = _read_records(path)
+def enrich_file(path, cache, args, backend=None):
+    stats_before = dict(cache.stats or {})
+    if args.stream:
+        counters = enrich_file_streaming(path, cache, args, backend)
+    else:
+        records, base_fieldnames = _read_records(path)
+
+        counters = enrich_records(records, cache, args, backend)
+
+        out_path = args.output or path
+        if not args.dry_run:
+            _write_records(out_path, records, base_fieldnames)
+            logger.info("Wrote %s", out_path)
+    _print_stats(path, counters, _cache_stats_since(cache, stats_before))
+    return counters
+
+
+# --------------------------------------------------------------------------- #
+# Streaming enrichment (--stream): JSON Lines / CSV, one record at a time
+# --------------------------------------------------------------------------- #
+# Columns enrichment may add. A streamed CSV has to commit to its header before
+# it has seen every outcome, so any of these the input lacks are appended up
+# front, in this order.
+ENRICHMENT_COLUMNS = ("latitude", "longitude", "geocode_source",
+                      "geocode_confidence")
+# Records per cache lookup in each streaming pass.
+STREAM_BLOCK_SIZE = GeocodeCache.LOOKUP_CHUNK
+
+
+def _iter_records(path):
+    """Yield dict records one at a time from a JSON Lines or CSV file."""
+    if _is_csv(path):
+        with open(path, "r", newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                yield dict(row)
+        return
+    with open(path, "r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("%s line %d is not a JSON object"
+                                 % (path, line_number))
+            yield record
+
 
-    counters = enrich_records(records, cache, args)
+def _csv_header(path):
+    with open(path, "r", newline="", encoding="utf-8") as handle:
+        return next(csv.reader(handle), [])
 
+
+class _StreamWriter:
+    """Write records one at a time in the format implied by ``path``.
+
+    Output goes to a sibling temp file that :meth:`commit` moves over ``path``,
+    so enriching in place never truncates the input while the write pass is
+    still reading it, and an interrupted run leaves the original untouched.
+    """
+
+    def __init__(self, path, fieldnames):
+        self.path = path
+        self.tmp_path = path + ".geocode-tmp"
+        self.handle = open(self.tmp_path, "w", newline="", encoding="utf-8")
+        self.count = 0
+        self.csv_writer = None
+        self.jsonl = _is_jsonl(path)
+        if _is_csv(path):
+            self.csv_writer = csv.DictWriter(self.handle, fieldnames=fieldnames)
+            self.csv_writer.writeheader()
+        elif not self.jsonl:
+            self.handle.write("[")
+
+    def write(self, record):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(record)
+        elif self.jsonl:
+            self.handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self.handle.write(("\n" if self.count == 0 else ",\n")
+                              + json.dumps(record, ensure_ascii=False))
+        self.count += 1
+
+    def commit(self):
+        if self.csv_writer is None and not self.jsonl:
+            self.handle.write("\n]\n")
+        self.handle.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.handle.close()
+        os.remove(self.tmp_path)
+
+
+def _resolve_pending(pending, cache, args, counters, backend, uncached):
+    """Geocode one buffer of unique cache-miss addresses and cache every
+    outcome (unmatched included), so the write pass can apply them as hits.
+
+    ``pending`` maps address key -> representative batch row; query ids are
+    positions into it, as in :func:`enrich_records`. An outcome the backend
+    doesn't cache (an address-index miss) goes into ``uncached`` instead, in
+    the cache's outcome shape, for this run's write pass only.
+    """
+    keys = list(pending)
+    query_rows = [[str(position)] + pending[key][1:]
+                  for position, key in enumerate(keys)]
+
+    def handle_chunk(chunk, results_by_id):
+        if results_by_id is None:
+            counters["query_failed"] += len(chunk)
+            return
+        outcomes = []
+        for row in chunk:
+            result = results_by_id.get(row[0]) or {"match": "No_Match"}
+            outcome = geocoding.apply_result({}, result, backend.source)
+            matched = (outcome.get("geocode_source")
+                       in geocoding.GEOCODED_SOURCES)
+            if not (matched or backend.caches_misses):
+                uncached[keys[int(row[0])]] = {
+                    "latitude": None, "longitude": None,
+                    "source": outcome.get("geocode_source"),
+                    "confidence": outcome.get("geocode_confidence")}
+                continue
+            outcomes.append((
+                keys[int(row[0])],
+                outcome.get("latitude") if matched else None,
+                outcome.get("longitude") if matched else None,
+                outcome.get("geocode_source"),
+                outcome.get("geocode_confidence"),
+                result.get("matched_address")))
+        cache.put_many(outcomes)
+
+    backend.geocode(query_rows, args, handle_chunk)
+
+
+def _record_blocks(path):
+    """``_iter_records`` in blocks of ``(index, record)`` pairs, so each
+    streaming pass can look a block's addresses up with one ``get_many``."""
+    block = []
+    for index, record in enumerate(_iter_records(path)):
+        block.append((index, record))
+        if len(block) >= STREAM_BLOCK_SIZE:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _stream_resolve(path, cache, args, backend):
+    """Pass 1 of :func:`enrich_file_streaming`: count, and geocode misses into
+    the cache. Returns ``(counters, fieldnames, uncached)``: the CSV output
+    header, and the outcomes the backend left out of the cache."""
+    counters = defaultdict(int)
+    uncached = {}
+    fieldnames = _csv_header(path) if _is_csv(path) else []
+    seen_fields = set(fieldnames)
+    pending = {}            # unique miss key -> representative batch row
+    dry_run_seen = set()    # --dry-run never fills the cache, so dedup here
+    # Enough misses to keep every worker busy with one full batch. Checked
+    # between blocks, so a flush never races a block's cache lookup.
+    buffer_size = args.batch_size * max(1, args.workers)
+    for block in _record_blocks(path):
+        keyed = []
+        for index, record in block:
+            for field in record:
+                if field not in seen_fields:
+                    seen_fields.add(field)
+                    fieldnames.append(field)
+            if geocoding.has_coordinates(record):
+                counters["state"] += 1
+                continue
+            row = geocoding.build_batch_row(index, record)
+            if row is None:
+                counters["skipped_no_address"] += 1
+                continue
+            keyed.append((row, geocoding.cache_key(row)))
+        cached = cache.get_many(
+            [key for _, key in keyed
+             if key not in pending and key not in dry_run_seen])
+        for row, key in keyed:
+            counters["candidates"] += 1
+            if key in pending or key in dry_run_seen:
+                counters["dedup_saved"] += 1
+                continue
+            if key in cached:
+                counters["cache_hit"] += 1
+                continue
+            if args.limit is not None and counters["to_query"] >= args.limit:
+                continue
+            counters["to_query"] += 1
+            if args.dry_run:
+                dry_run_seen.add(key)
+                continue
+            pending[key] = row
+        if len(pending) >= buffer_size:
+            _resolve_pending(pending, cache, args, counters, backend, uncached)
+            pending = {}
+    if pending:
+        _resolve_pending(pending, cache, args, counters, backend, uncached)
+    if args.dry_run:
+        logger.info("Dry run: would query %d unique address(es).",
+                    counters["to_query"])
+    for column in ENRICHMENT_COLUMNS:
+        if column not in seen_fields:
+            fieldnames.append(column)
+    return counters, fieldnames, uncached
+
+
+def _stream_write(path, out_path, fieldnames, cache, counters, uncached):
+    """Pass 2 of :func:`enrich_file_streaming`: apply outcomes and write."""
+    writer = _StreamWriter(out_path, fieldnames)
+    try:
+        for block in _record_blocks(path):
+            keys = {}
+            for index, record in block:
+                if geocoding.has_coordinates(record):
+                    geocoding.mark_state_source(record)
+                    continue
+                row = geocoding.build_batch_row(index, record)
+                if row is not None:
+                    keys[index] = geocoding.cache_key(row)
+            cached = cache.get_many(list(keys.values()))
+            for index, record in block:
+                key = keys.get(index)
+                outcome = cached.get(key) or uncached.get(key)
+                if outcome is not None:
+                    _apply_cached(record, outcome)
+                    counters[_outcome_bucket(record)] += 1
+                writer.write(record)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.commit()
+
+
+def enrich_file_streaming(path, cache, args, backend=None):
+    """Enrich a JSON Lines or CSV file without loading it into memory.
+
+    Two passes over the input, each holding one record at a time:
+
+    1. *Resolve*: partition each record as :func:`enrich_records` does and look
+       its address up in the cache, buffering only the unique misses. Every
+       ``--batch-size`` of them goes to Census and the outcomes go straight
+       into the cache, after which the buffer is dropped.
+    2. *Write*: re-read the input and stream each record, its outcome applied
+       from the cache, to the output (``-o`` may pick a different format,
+       including a JSON array), replacing it only once complete.
+
+    Peak memory is one Census batch per worker (plus a block of records being
+    looked up, and the address-index backend's uncached misses), not the file. An address that repeats after its batch was sent
+    is answered from the cache, so it counts as a cache hit rather than a
+    dedup. With ``--no-cache`` the passes share a
+    throwaway cache file instead.
+    """
+    backend = backend or CensusBackend()
+    if not (_is_csv(path) or _is_jsonl(path)):
+        raise ValueError(
+            "--stream reads .jsonl or .csv input; %s is neither" % path)
     out_path = args.output or path
-    if not args.dry_run:
-        _write_records(out_path, records, base_fieldnames)
-        logger.info("Wrote %s", out_path)
-    _print_stats(path, counters)
+    scratch_dir = None
+    if isinstance(cache, NullCache):
+        scratch_dir = tempfile.mkdtemp(prefix="geocode-")
+        cache = GeocodeCache(os.path.join(scratch_dir, "cache.sqlite"),
+                             lru_size=args.cache_lru)
+    try:
+        counters, fieldnames, uncached = _stream_resolve(
+            path, cache, args, backend)
+        if not args.dry_run:
+            _stream_write(path, out_path, fieldnames, cache, counters,
+                          uncached)
+            logger.info("Wrote %s", out_path)
+    finally:
+        if scratch_dir is not None:
+            cache.close()
+            shutil.rmtree(scratch_dir, ignore_errors=True)
     return counters
 
 
 def build_arg_parser():
     parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
     parser.add_argument("inputs", nargs="+",
-                        help="state output file(s) to enrich; JSON or CSV, "
-                             "detected by the .json/.csv extension")
+                        help="state output file(s) to enrich; JSON, JSON Lines "
+                             "or CSV, detected by the .json/.jsonl/.csv "
+                             "extension")
     parser.add_argument("-o", "--output",
                         help="write to this path instead of in place; its "
                              "extension picks the output format "
@@ -391,11 +979,31 @@ def build_arg_parser():
                         help="SQLite cache path (default: %(default)s)")
     parser.add_argument("--no-cache", action="store_true",
                         help="ignore the cache (do not read or write it)")
+    parser.add_argument("--cache-lru", type=int, default=DEFAULT_CACHE_LRU,
+                        help="outcomes kept in memory in front of the SQLite "
+                             "cache, 0 to disable (default: %(default)s)")
+    parser.add_argument("--backend", choices=("census", "address-index"),
+                        default="census",
+                        help="where cache misses are geocoded: the Census "
+                             "batch API, or an offline index built by "
+                             "scripts/address_index.py (default: %(default)s)")
+    parser.add_argument("--address-index",
+                        default=address_index.DEFAULT_INDEX_PATH,
+                        help="address-point index for --backend address-index "
+                             "(default: %(default)s)")
     parser.add_argument("--benchmark", default=geocoding.CENSUS_BENCHMARK,
                         help="Census benchmark (default: %(default)s)")
     parser.add_argument("--batch-size", type=int,
                         default=geocoding.MAX_BATCH_SIZE,
-                        help="addresses per Census request (default: %(default)s)")
+                        help="addresses per Census request to start with; "
+                             "shrinks on timeouts, grows on fast answers "
+                             "(default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Census batches in flight at once "
+                             "(default: %(default)s)")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM,
+                        help="max Census requests per minute across all "
+                             "workers, 0 for no cap (default: %(default)s)")
     parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT,
                         help="per-request timeout seconds (default: %(default)s)")
     parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
@@ -405,6 +1013,9 @@ def build_arg_parser():
                              "(for testing on large files)")
     parser.add_argument("--dry-run", action="store_true",
                         help="partition and report only; no network, no write")
+    parser.add_argument("--stream", action="store_true",
+                        help="enrich .jsonl/.csv input record by record; "
+                             "memory is bounded by --batch-size, not file size")
     parser.add_argument("-v", "--verbose", action="store_true",
                         help="debug-level logging")
     return parser
@@ -418,13 +1029,21 @@ def main(argv=None):
 
     if args.output and len(args.inputs) > 1:
         build_arg_parser().error("-o/--output is only valid with one input")
+    if args.stream and not all(_is_csv(p) or _is_jsonl(p) for p in args.inputs):
+        build_arg_parser().error("--stream needs .jsonl or .csv inputs")
 
-    cache = NullCache() if args.no_cache else GeocodeCache(args.cache)
+    try:
+        backend = make_backend(args)
+    except FileNotFoundError as error:
+        build_arg_parser().error(str(error))
+    cache = (NullCache() if args.no_cache
+             else GeocodeCache(args.cache, lru_size=args.cache_lru))
     try:
         for path in args.inputs:
-            enrich_file(path, cache, args)
+            enrich_file(path, cache, args, backend)
     finally:
         cache.close()
+        backend.close()
 
 
 if __name__ == "__main__":
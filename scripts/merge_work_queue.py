@@ -0,0 +1,144 @@
+"""Merge a distributed crawl's work queue into the state's output file(s).
+
+Distributed mode (``provider_scrape/work_queue.py``) leaves each provider's
+final (normalized) item on the shared queue as its ``detail`` item's result.
+This writes them out with Scrapy's own feed exporters -- the same JSON / JSON
+Lines / CSV a single ``scrapy crawl maryland -O maryland.json`` would produce,
+format chosen by extension -- and reports the queue's state and completeness:
+the providers the completed shards declared vs the items merged.
+
+Exits non-zero while the queue still has pending/leased work (the crawl isn't
+finished; ``--allow-partial`` writes what there is anyway) or when items
+failed for good.
+
+Usage:
+    .venv/bin/python scripts/merge_work_queue.py --queue sqlite:///queue/maryland.sqlite \\
+        -o state_output/maryland.json -o state_output/maryland.csv
+    .venv/bin/python scripts/merge_work_queue.py --queue redis://queue-host:6379/0 \\
+        --name maryland -o state_output/maryland.json
+"""
+import argparse
+import logging
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("SCRAPY_SETTINGS_MODULE", "provider_scrape.settings")
+
+from scrapy.exporters import (  # noqa: E402
+    CsvItemExporter,
+    JsonItemExporter,
+    JsonLinesItemExporter,
+)
+from scrapy.utils.project import get_project_settings  # noqa: E402
+
+from provider_scrape.work_queue import open_work_queue  # noqa: E402
+
+logger = logging.getLogger("merge_work_queue")
+
+EXPORTERS = {
+    ".json": JsonItemExporter,
+    ".jsonl": JsonLinesItemExporter,
+    ".csv": CsvItemExporter,
+}
+
+
+def exporter_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORTERS:
+        raise ValueError(f"unsupported output format {ext!r} (use .json, .jsonl or .csv)")
+    return EXPORTERS[ext]
+
+
+def merge(queue, outputs, encoding="utf-8"):
+    """Write every completed detail item to each of ``outputs``; returns the
+    number of items written (per file)."""
+    handles, exporters = [], []
+    for path in outputs:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(path + ".tmp", "wb")
+        exporter = exporter_for(path)(handle, encoding=encoding)
+        exporter.start_exporting()
+        handles.append(handle)
+        exporters.append(exporter)
+    written = 0
+    try:
+        for _, _, item in queue.results(kind="detail"):
+            if not item:
+                continue
+            for exporter in exporters:
+                exporter.export_item(item)
+            written += 1
+        for exporter in exporters:
+            exporter.finish_exporting()
+    finally:
+        for handle in handles:
+            handle.close()
+    for path in outputs:
+        os.replace(path + ".tmp", path)
+    return written
+
+
+def declared_total(queue):
+    """Providers declared by the completed (unsplit) shards."""
+    return sum((result or {}).get("declared") or 0
+               for _, _, result in queue.results(kind="shard"))
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queue", required=True,
+                        help="queue URL the workers ran with (-a queue=...)")
+    parser.add_argument("--name", default="maryland",
+                        help="queue name (Redis key prefix; default: maryland)")
+    parser.add_argument("-o", "--output", action="append", required=True,
+                        help="output file (.json, .jsonl or .csv); repeatable")
+    parser.add_argument("--allow-partial", action="store_true",
+                        help="merge even while work is still pending or leased")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    try:
+        for path in args.output:
+            exporter_for(path)
+    except ValueError as e:
+        logger.error("%s", e)
+        return 2
+    queue = open_work_queue(args.queue, name=args.name)
+    try:
+        counts = queue.counts()
+        logger.info("Queue %s: %s", args.queue, counts)
+        unfinished = counts["pending"] + counts["leased"]
+        if unfinished and not args.allow_partial:
+            logger.error("%d work item(s) still pending or leased; the crawl "
+                         "isn't finished (use --allow-partial to merge anyway).",
+                         unfinished)
+            return 1
+        encoding = get_project_settings().get("FEED_EXPORT_ENCODING") or "utf-8"
+        written = merge(queue, args.output, encoding=encoding)
+        declared = declared_total(queue)
+        logger.info("Merged %d items into %s (%d providers declared).",
+                    written, ", ".join(args.output), declared)
+        if declared and written < declared:
+            logger.error("Merge INCOMPLETE: %d items for %d declared providers "
+                         "(%d missing).", written, declared, declared - written)
+        failed = queue.failed()
+        if failed:
+            logger.error("%d work item(s) failed after every attempt, e.g. %s",
+                         len(failed), ", ".join(failed[:5]))
+            return 1
+        return 0
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+"""Run many spiders in one process (one asyncio reactor) instead of one
+``scrapy crawl`` per state.
+
+``run_spiders.sh`` forks a ``scrapy crawl`` per spider through xargs, so every
+state pays Python/Scrapy/Twisted import time and reactor startup on its own.
+This runner schedules all selected spiders on a single ``CrawlerRunner`` and
+keeps the shell script's contract:
+
+* **Global concurrency budget** (``-c``): at most N spiders crawl at once.
+* **Browser slots** (``--browser-slots``): of those, at most M may be browser
+  spiders (``BROWSER_SPIDERS``). Each browser spider still gets its own
+  Playwright driver/browser -- its handler only launches Playwright on the
+  first ``meta["playwright"]`` request (``provider_scrape/handlers.py``) and
+  the stealth middlewares patch that per-crawler handler, so one shared browser
+  isn't safe -- but the slots bound how many browsers are alive together, which
+  is what sizes the container's memory.
+* **Retry on "Retryable Error"**: a spider whose log contains that marker is
+  re-crawled (after ``RETRY_DELAY`` seconds) up to ``--max-retries`` attempts,
+  exactly like ``run_spider`` in the shell script.
+* **Same output layout**: ``<dir>/<spider>.<fmt>`` per format (overwritten, as
+  with ``-O``) and ``<dir>/<spider>.log`` per spider, truncated per attempt.
+
+Every ``REPORT_INTERVAL`` seconds it logs aggregate throughput across the
+running spiders, and it ends with a per-spider summary (status, attempts,
+items). Exit status is non-zero when any spider failed.
+
+Browser spiders that need a display (``XVFB_SPIDERS`` in the shell script) need
+it for the whole process: ``run_spiders.sh -s`` wraps this runner in
+``xvfb-run`` when any of them is selected.
+
+Run:  ``python scripts/run_spiders.py -c 5 -d state_output/ -f json,csv ohio texas``
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("SCRAPY_SETTINGS_MODULE", "provider_scrape.settings")
+
+from scrapy.crawler import Crawler, CrawlerRunner  # noqa: E402
+from scrapy.spiderloader import SpiderLoader  # noqa: E402
+from scrapy.utils.log import configure_logging  # noqa: E402
+from scrapy.utils.project import get_project_settings  # noqa: E402
+from scrapy.utils.reactor import install_reactor  # noqa: E402
+from twisted.internet import defer, task  # noqa: E402
+
+from provider_scrape import normalization  # noqa: E402
+from provider_scrape.manifest import IncrementalManifestMixin  # noqa: E402
+from provider_scrape.partition import PartitionPlannerMixin  # noqa: E402
+
+logger = logging.getLogger("run_spiders")
+
+DEFAULT_CONCURRENCY = 5
+DEFAULT_BROWSER_SLOTS = 2
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_FORMAT = "json"
+RETRY_DELAY = 5             # seconds between attempts, as in run_spiders.sh
+REPORT_INTERVAL = 60.0      # seconds between aggregate throughput reports
+RETRYABLE_MARKER = "Retryable Error"
+LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+LOG_DATEFORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Spiders that send ``meta["playwright"]`` requests (i.e. launch a browser).
+# Guarded against drift by scripts/test_run_spiders.py.
+BROWSER_SPIDERS = frozenset({
+    "arizona", "arkansas", "florida", "illinois", "minnesota",
+    "montana", "nevada", "new_jersey", "north_carolina", "rhode_island",
+    "texas", "wisconsin",
+})
+
+# Spiders that resume a crashed/stalled run from a checkpoint (``-a
+# checkpoint=<path>``; see provider_scrape/checkpoint.py), kept under
+# ``<dir>/checkpoints/`` so a retry attempt picks up where the last one stopped.
+# Mirrors CHECKPOINT_SPIDERS in run_spiders.sh.
+CHECKPOINT_SPIDERS = frozenset({"maryland"})
+
+
+def parse_formats(value):
+    """``"json,csv"`` / ``"json csv"`` -> ``["json", "csv"]`` (validated, de-duped)."""
+    formats = []
+    for fmt in value.lower().replace(",", " ").split():
+        if fmt not in ("json", "csv"):
+            raise ValueError(
+                f"Invalid format {fmt!r}: use json, csv, or both (e.g. -f json,csv)")
+        if fmt not in formats:
+            formats.append(fmt)
+    if not formats:
+        raise ValueError("No valid output format specified (use json, csv, or both)")
+    return formats
+
+
+def feeds_for(spider_name, output_dir, formats):
+    """``FEEDS`` for one spider: one overwritten file per format, like ``-O``."""
+    return {
+        os.path.join(output_dir, f"{spider_name}.{fmt}"): {
+            "format": fmt, "overwrite": True,
+        }
+        for fmt in formats
+    }
+
+
+class SpiderLogHandler(logging.FileHandler):
+    """Per-spider log file in a shared process, plus "Retryable Error" tracking.
+
+    Claims records tagged with this spider (Scrapy's components and
+    ``spider.logger`` pass ``extra={"spider": ...}``) and records from the
+    spider's own module logger. Everything else (another spider, the runner)
+    is left to the other handlers.
+    """
+
+    def __init__(self, path, spider_name, module, level=logging.NOTSET):
+        super().__init__(path, mode="w", encoding="utf-8")
+        self.setLevel(level)
+        self.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATEFORMAT))
+        self.spider_name = spider_name
+        self.module = module
+        self.retryable = False
+
+    def filter(self, record):
+        spider = getattr(record, "spider", None)
+        if spider is not None:
+            claimed = getattr(spider, "name", None) == self.spider_name
+        else:
+            claimed = (record.name == self.module
+                       or record.name.startswith(self.module + "."))
+        return claimed and super().filter(record)
+
+    def emit(self, record):
+        super().emit(record)
+        if RETRYABLE_MARKER in record.getMessage():
+            self.retryable = True
+
+
+class SpiderJob:
+    """Bookkeeping for one spider across its attempts."""
+
+    def __init__(self, name):
+        self.name = name
+        self.attempts = 0
+        self.status = "queued"
+        self.items = 0
+        self.elapsed = 0.0
+        self.crawler = None
+
+
+class MultiSpiderRunner:
+    """Schedule ``spider_names`` on one ``CrawlerRunner`` (see module docstring)."""
+
+    def __init__(self, settings, spider_names, output_dir, formats,
+                 concurrency=DEFAULT_CONCURRENCY,
+                 browser_slots=DEFAULT_BROWSER_SLOTS,
+                 max_retries=DEFAULT_MAX_RETRIES, incremental=False,
+                 clock=None):
+        self.settings = settings
+        self.output_dir = output_dir
+        self.formats = formats
+        self.max_retries = max_retries
+        self.incremental = incremental
+        self.jobs = [SpiderJob(name) for name in spider_names]
+        self.slots = defer.DeferredSemaphore(max(1, concurrency))
+        self.browser_slots = defer.DeferredSemaphore(max(1, browser_slots))
+        self.runner = CrawlerRunner(settings)
+        # The normalization value caches are process-wide: size them once from
+        # the project settings, not per spider as each pipeline opens.
+        normalization.configure_memoization(settings.getint(
+            "NORMALIZE_MEMO_SIZE", normalization.DEFAULT_MEMO_SIZE))
+        if clock is None:
+            from twisted.internet import reactor as clock
+        self.clock = clock
+        self._report_loop = None
+        self._started = None
+
+    def _crawler_settings(self, name):
+        settings = self.settings.copy()
+        settings.set("FEEDS", feeds_for(name, self.output_dir, self.formats),
+                     priority="cmdline")
+        # Logging is routed per spider by SpiderLogHandler, not LOG_FILE.
+        settings.set("LOG_FILE", None, priority="cmdline")
+        if self.incremental:
+            settings.set("PROVIDER_MANIFEST_DIR",
+                         os.path.join(self.output_dir, "manifests"),
+                         priority="cmdline")
+        return settings
+
+    def _spider_kwargs(self, spidercls):
+        kwargs = {}
+        if self.incremental and issubclass(spidercls, IncrementalManifestMixin):
+            kwargs["incremental"] = "1"
+        if self.incremental and issubclass(spidercls, PartitionPlannerMixin):
+            kwargs["partition"] = "1"
+        if spidercls.name in CHECKPOINT_SPIDERS:
+            kwargs["checkpoint"] = os.path.join(
+                self.output_dir, "checkpoints", f"{spidercls.name}.sqlite")
+        return kwargs
+
+    @defer.inlineCallbacks
+    def _crawl_once(self, job):
+        """One attempt. Fires ``True`` when the attempt logged a Retryable Error."""
+        spidercls = self.runner.spider_loader.load(job.name)
+        handler = SpiderLogHandler(
+            os.path.join(self.output_dir, f"{job.name}.log"), job.name,
+            spidercls.__module__,
+            level=self.settings.get("LOG_LEVEL", "INFO"))
+        logging.root.addHandler(handler)
+        crawler = Crawler(spidercls, self._crawler_settings(job.name))
+        job.crawler = crawler
+        try:
+            yield self.runner.crawl(crawler, **self._spider_kwargs(spidercls))
+        finally:
+            logging.root.removeHandler(handler)
+            handler.close()
+            if crawler.stats is not None:
+                job.items = crawler.stats.get_value("item_scraped_count", 0)
+        return handler.retryable
+
+    @defer.inlineCallbacks
+    def _run_job(self, job):
+        # The browser slot first: a browser spider waiting for one mustn't
+        # sit on a global slot another (non-browser) spider could run in.
+        is_browser = job.name in BROWSER_SPIDERS
+        if is_browser:
+            yield self.browser_slots.acquire()
+        try:
+            yield self.slots.acquire()
+            start = time.monotonic()
+            try:
+                job.status = "running"
+                while job.attempts < self.max_retries:
+                    job.attempts += 1
+                    logger.info("Crawling %s (attempt %d/%d)...", job.name,
+                                job.attempts, self.max_retries)
+                    try:
+                        retryable = yield self._crawl_once(job)
+                    except Exception:
+                        logger.exception("Crawl of %s crashed", job.name)
+                        job.status = "failed"
+                        return
+                    if not retryable:
+                        job.status = "ok"
+                        logger.info("Crawling %s completed successfully "
+                                    "(%d items).", job.name, job.items)
+                        return
+                    logger.warning("Retryable Error detected for %s.", job.name)
+                    if job.attempts < self.max_retries:
+                        logger.info("Retrying %s in %d seconds.", job.name,
+                                    RETRY_DELAY)
+                        yield task.deferLater(self.clock, RETRY_DELAY,
+                                              lambda: None)
+                job.status = "failed"
+                logger.error("Failed to crawl %s after %d attempts.", job.name,
+                             self.max_retries)
+            finally:
+                job.elapsed = time.monotonic() - start
+                job.crawler = None
+                self.slots.release()
+        finally:
+            if is_browser:
+                self.browser_slots.release()
+
+    def _report(self):
+        """Aggregate throughput across every spider (INFO)."""
+        running = [j for j in self.jobs if j.status == "running"]
+        done = sum(1 for j in self.jobs if j.status in ("ok", "failed"))
+        queued = sum(1 for j in self.jobs if j.status == "queued")
+        items = sum(j.items for j in self.jobs if j.crawler is None)
+        responses = 0
+        for job in running:
+            stats = job.crawler.stats if job.crawler is not None else None
+            if stats is not None:
+                items += stats.get_value("item_scraped_count", 0)
+                responses += stats.get_value("response_received_count", 0)
+        minutes = max((time.monotonic() - self._started) / 60.0, 1e-9)
+        logger.info(
+            "Runner: %d running (%s), %d done, %d queued; %d items total "
+            "(%.0f items/min), %d responses across running spiders",
+            len(running), ", ".join(j.name for j in running) or "-", done,
+            queued, items, items / minutes, responses)
+
+    def summary_lines(self):
+        lines = [f"{'spider':<16} {'status':<8} {'attempts':>8} {'items':>8} "
+                 f"{'minutes':>8}"]
+        for job in self.jobs:
+            lines.append(f"{job.name:<16} {job.status:<8} {job.attempts:>8} "
+                         f"{job.items:>8} {job.elapsed / 60.0:>8.1f}")
+        return lines
+
+    @property
+    def failed(self):
+        return [j.name for j in self.jobs if j.status != "ok"]
+
+    @defer.inlineCallbacks
+    def run(self):
+        self._started = time.monotonic()
+        self._report_loop = task.LoopingCall(self._report)
+        self._report_loop.clock = self.clock
+        self._report_loop.start(REPORT_INTERVAL, now=False)
+        try:
+            yield defer.DeferredList([self._run_job(job) for job in self.jobs])
+        finally:
+            if self._report_loop.running:
+                self._report_loop.stop()
+        for line in self.summary_lines():
+            logger.info(line)
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("spiders", nargs="*",
+                        help="spider names (default: every spider)")
+    parser.add_argument("-c", "--concurrency", type=int,
+                        default=DEFAULT_CONCURRENCY,
+                        help="spiders crawling at once (default: %(default)s)")
+    parser.add_argument("--browser-slots", type=int,
+                        default=DEFAULT_BROWSER_SLOTS,
+                        help="browser spiders crawling at once, within -c "
+                             "(default: %(default)s)")
+    parser.add_argument("-d", "--output-dir", default="./",
+                        help="directory for output and log files "
+                             "(default: %(default)s)")
+    parser.add_argument("-f", "--format", default=DEFAULT_FORMAT,
+                        help="json, csv, or both as a comma/space list "
+                             "(default: %(default)s)")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help="attempts per spider on a Retryable Error "
+                             "(default: %(default)s)")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="run manifest-capable spiders with -a incremental=1 "
+                             "and area-search spiders with -a partition=1")
+    parser.add_argument("--log-level", default="INFO",
+                        help="per-spider log level (default: %(default)s)")
+    parser.add_argument("--metrics-dir",
+                        help="write each spider's live metrics (OpenMetrics "
+                             "text) to <dir>/<spider>.prom")
+    return parser
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    try:
+        formats = parse_formats(args.format)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    settings = get_project_settings()
+    settings.set("LOG_LEVEL", args.log_level.upper(), priority="cmdline")
+    if args.metrics_dir:
+        # MetricsExporter fills in %(spider)s, so one setting covers every crawler.
+        settings.set("METRICS_ENABLED", True, priority="cmdline")
+        settings.set("METRICS_TEXTFILE",
+                     os.path.join(args.metrics_dir, "%(spider)s.prom"),
+                     priority="cmdline")
+    install_reactor(settings["TWISTED_REACTOR"])
+    from twisted.internet import reactor
+
+    configure_logging(settings, install_root_handler=False)
+    logging.root.setLevel(settings["LOG_LEVEL"])
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATEFORMAT))
+    console.addFilter(logging.Filter("run_spiders"))
+    logging.root.addHandler(console)
+
+    available = SpiderLoader.from_settings(settings).list()
+    names = args.spiders or sorted(available)
+    unknown = sorted(set(names) - set(available))
+    if unknown:
+        parser.error(f"unknown spider(s): {', '.join(unknown)}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    runner = MultiSpiderRunner(
+        settings, names, args.output_dir, formats,
+        concurrency=args.concurrency, browser_slots=args.browser_slots,
+        max_retries=args.max_retries, incremental=args.incremental)
+    logger.info("Running %d spiders in one process (concurrency %d, %d browser "
+                "slot(s)): %s", len(names), args.concurrency, args.browser_slots,
+                " ".join(names))
+
+    d = runner.run()
+    d.addErrback(lambda failure: logger.error("Runner failed: %s", failure))
+    d.addBoth(lambda _: reactor.stop())
+    reactor.run()
+    if runner.failed:
+        logger.error("Failed spiders: %s", " ".join(runner.failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
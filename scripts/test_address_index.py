@@ -0,0 +1,164 @@
+"""Tests for the address-point index (provider_scrape/address_index.py), its
+builder script (scripts/address_index.py) and the offline geocoding backend it
+feeds in geocode_enrich.py (no network).
+
+Run with the project virtualenv: ``.venv/bin/pytest scripts/test_address_index.py``.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import address_index as address_index_cli
+import geocode_enrich
+from provider_scrape import address_index
+
+# OpenAddresses-style columns: a separate house NUMBER, REGION for state.
+_POINTS = (
+    "LON,LAT,NUMBER,STREET,UNIT,CITY,REGION,POSTCODE\n"
+    "-97.7431,30.2672,100,Congress Ave,,Austin,TX,78701\n"
+    "-97.7431,30.2672,100,Congress Ave,2,Austin,TX,78701\n"   # unit duplicate
+    "-97.7500,30.2700,5,Oak St,,Austin,TX,78701\n"
+    "-97.8000,30.3000,5,Oak St,,Rollingwood,TX,78701\n"       # same street+zip
+    "-97.7000,30.2000,,Nowhere Rd,,Austin,TX,78701\n"          # no number: kept
+    ",,9,Missing Coord Ln,,Austin,TX,78701\n"                  # skipped
+)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    source = tmp_path / "points.csv"
+    source.write_text(_POINTS, encoding="utf-8")
+    path = str(tmp_path / "index.sqlite")
+    assert address_index.build_index([str(source)], path) == (5, 1)
+    return path
+
+
+def _row(id_, street, city="Austin", state="TX", zip_code="78701"):
+    return [id_, street, city, state, zip_code]
+
+
+def test_column_map_requires_street_and_coordinates():
+    assert address_index._column_map(["Street", "Lat", "Lon"]) == {
+        "street": "Street", "latitude": "Lat", "longitude": "Lon"}
+    with pytest.raises(ValueError):
+        address_index._column_map(["street", "city"])
+
+
+def test_lookup_exact_fallback_tie_and_miss(index_path):
+    index = address_index.AddressIndex(index_path)
+    results = index.lookup_many([
+        _row("0", "100  CONGRESS AVE"),                   # cache_key normalization
+        _row("1", "100 Congress Ave", city="Wrong City"),  # street + zip
+        _row("2", "100 Congress Ave", zip_code=""),        # street + city + state
+        _row("3", "5 Oak St", city=""),                    # street+zip is shared
+        _row("4", "1 Unknown Way"),
+    ])
+    index.close()
+
+    assert results["0"]["match"] == "Match"
+    assert results["0"]["match_type"] == "Exact"
+    assert (results["0"]["latitude"], results["0"]["longitude"]) == (
+        "30.2672", "-97.7431")
+    assert results["1"]["match_type"] == "Non_Exact"
+    assert results["2"]["match_type"] == "Non_Exact"
+    assert results["3"]["match"] == "Tie"
+    assert results["4"]["match"] == "No_Match"
+
+
+def test_missing_index_is_reported():
+    with pytest.raises(FileNotFoundError):
+        address_index.AddressIndex("/nonexistent/index.sqlite")
+
+
+def test_enrich_with_index_backend_is_offline_and_cached(
+        index_path, tmp_path, monkeypatch):
+    def no_network(*a, **k):
+        raise AssertionError("the index backend must not call Census")
+
+    monkeypatch.setattr(geocode_enrich, "_post_batch", no_network)
+    path = tmp_path / "texas.jsonl"
+    path.write_text(
+        json.dumps({"provider_name": "A", "address": "100 Congress Ave",
+                    "city": "Austin", "state": "TX", "zip": "78701"}) + "\n"
+        + json.dumps({"provider_name": "B", "address": "1 Unknown Way",
+                      "city": "Austin", "state": "TX", "zip": "78701"}) + "\n",
+        encoding="utf-8")
+    cache = geocode_enrich.GeocodeCache(str(tmp_path / "cache.sqlite"))
+    backend = geocode_enrich.AddressIndexBackend(index_path)
+    args = geocode_enrich.build_arg_parser().parse_args([str(path), "--stream"])
+
+    counters = geocode_enrich.enrich_file(str(path), cache, args, backend)
+    backend.close()
+
+    assert counters["geocoded_exact"] == 1
+    assert counters["unmatched_no_match"] == 1
+    out = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+    assert out[0]["geocode_source"] == "address_index"
+    assert out[0]["latitude"] == "30.2672"
+    assert out[1]["geocode_source"] == "unmatched"
+    # Landed in the shared cache under the usual address key.
+    row = geocode_enrich.geocoding.build_batch_row(0, out[0])
+    cached = cache.get(geocode_enrich.geocoding.cache_key(row))
+    assert cached["source"] == "address_index"
+    # The miss isn't cached: a later Census run still gets to resolve it.
+    row = geocode_enrich.geocoding.build_batch_row(1, out[1])
+    assert cache.get(geocode_enrich.geocoding.cache_key(row)) is None
+    cache.close()
+
+
+def test_enrich_records_with_index_backend_caches_only_matches(
+        index_path, tmp_path):
+    records = [{"address": "100 Congress Ave", "city": "Austin", "state": "TX",
+                "zip": "78701"},
+               {"address": "1 Unknown Way", "city": "Austin", "state": "TX",
+                "zip": "78701"}]
+    cache = geocode_enrich.GeocodeCache(str(tmp_path / "cache.sqlite"))
+    backend = geocode_enrich.AddressIndexBackend(index_path)
+    args = geocode_enrich.build_arg_parser().parse_args(["placeholder"])
+    geocode_enrich.enrich_records(records, cache, args, backend)
+    backend.close()
+
+    assert records[1]["geocode_confidence"] == "no_match"
+    keys = [geocode_enrich.geocoding.cache_key(
+        geocode_enrich.geocoding.build_batch_row(i, r))
+        for i, r in enumerate(records)]
+    assert list(cache.get_many(keys)) == [keys[0]]
+    cache.close()
+
+
+def test_conflicting_exact_duplicates_are_a_tie(tmp_path):
+    source = tmp_path / "points.csv"
+    source.write_text(
+        "LON,LAT,NUMBER,STREET,CITY,REGION,POSTCODE\n"
+        "-97.7431,30.2672,100,Congress Ave,Austin,TX,78701\n"
+        "-97.9000,30.9000,100,Congress Ave,Austin,TX,78701\n",
+        encoding="utf-8")
+    path = str(tmp_path / "index.sqlite")
+    address_index.build_index([str(source)], path)
+    index = address_index.AddressIndex(path)
+    results = index.lookup_many([_row("0", "100 Congress Ave")])
+    index.close()
+    assert results["0"]["match"] == "Tie"
+
+
+def test_main_build_cli(tmp_path, capsys):
+    source = tmp_path / "points.csv"
+    source.write_text(_POINTS, encoding="utf-8")
+    out = str(tmp_path / "index.sqlite")
+    assert address_index_cli.main(["-o", out, str(source)]) == 0
+    assert "Loaded 5 address point(s)" in capsys.readouterr().out
+    assert address_index_cli.main(["-o", out, str(tmp_path / "missing.csv")]) == 1
+
+
+def test_geocode_enrich_runs_as_a_module():
+    # ``python -m scripts.geocode_enrich`` has no scripts/ on sys.path, so the
+    # index must be imported from the package, not as a sibling script.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.geocode_enrich", "--help"],
+        cwd=root, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "--address-index" in result.stdout
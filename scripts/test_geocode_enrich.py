@@ -14,6 +14,7 @@ import pytest
 import requests
 
 import geocode_enrich
+from provider_scrape import geocoding
 
 
 # --------------------------------------------------------------------------- #
@@ -141,6 +142,115 @@ def test_enrich_file_csv_to_json_conversion(tmp_path, monkeypatch):
     assert written[0]["geocode_source"] == "state"
 
 
+# --------------------------------------------------------------------------- #
+# --stream: JSON Lines / CSV, record by record
+# --------------------------------------------------------------------------- #
+def _census_match(query_rows):
+    """Canned Census answer: every queried address matches exactly."""
+    return [[row[0], "in", "Match", "Exact", row[1].upper(),
+             "-89.6501,39.7817", "id", "L"] for row in query_rows]
+
+
+def test_stream_jsonl_batches_misses_and_keeps_order(tmp_path, monkeypatch):
+    path = tmp_path / "texas.jsonl"
+    records = [
+        {"provider_name": "Has Coords", "latitude": "40.0", "longitude": "-82.0"},
+        {"provider_name": "A", "address": "1 Main St", "city": "Austin",
+         "state": "TX", "zip": "78701"},
+        {"provider_name": "A again", "address": "1 Main St", "city": "Austin",
+         "state": "TX", "zip": "78701"},
+        {"provider_name": "B", "address": "2 Main St", "city": "Austin",
+         "state": "TX", "zip": "78701"},
+        {"provider_name": "C", "address": "3 Main St", "city": "Austin",
+         "state": "TX", "zip": "78701"},
+        {"provider_name": "No Address"},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records),
+                    encoding="utf-8")
+    batches = []
+
+    def fake_post(chunk, *rest):
+        batches.append(len(chunk))
+        return _census_match(chunk)
+
+    monkeypatch.setattr(geocode_enrich, "_post_batch", fake_post)
+    counters = geocode_enrich.enrich_file(
+        str(path), geocode_enrich.NullCache(), _args(stream=True, batch_size=2))
+
+    # Only unique misses are buffered, and never more than a batch of them.
+    assert batches == [2, 1]
+    assert counters["candidates"] == 4
+    assert counters["to_query"] == 3
+    assert counters["dedup_saved"] == 1
+    assert counters["geocoded_exact"] == 4
+    assert counters["state"] == 1
+    assert counters["skipped_no_address"] == 1
+
+    out = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+    assert [r["provider_name"] for r in out] == [r["provider_name"] for r in records]
+    assert out[0]["geocode_source"] == "state"
+    assert out[2]["latitude"] == "39.7817"
+    assert out[4]["geocode_confidence"] == "exact"
+    assert "geocode_source" not in out[5]
+    assert not (tmp_path / "texas.jsonl.geocode-tmp").exists()
+
+
+def test_stream_resolves_cache_hits_without_querying(tmp_path, monkeypatch):
+    cache = geocode_enrich.GeocodeCache(str(tmp_path / "cache.sqlite"))
+    row = geocoding.build_batch_row(0, {"address": "1 Main St", "city": "Austin",
+                                        "state": "TX", "zip": "78701"})
+    cache.put(geocoding.cache_key(row), None, None, "unmatched", "tie", None)
+    path = tmp_path / "in.csv"
+    path.write_text("provider_name,address,city,state,zip\n"
+                    "A,1 Main St,Austin,TX,78701\n", encoding="utf-8")
+
+    def fail(*a, **k):
+        raise AssertionError("cache hit must not query Census")
+
+    monkeypatch.setattr(geocode_enrich, "_post_batch", fail)
+    out = tmp_path / "out.csv"
+    counters = geocode_enrich.enrich_file(
+        str(path), cache, _args(stream=True, output=str(out)))
+    cache.close()
+
+    assert counters["cache_hit"] == 1
+    assert counters["unmatched_tie"] == 1
+    with open(out, newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        rows = list(reader)
+    # Enrichment columns the input lacked are appended after its header.
+    assert reader.fieldnames == [
+        "provider_name", "address", "city", "state", "zip",
+        "latitude", "longitude", "geocode_source", "geocode_confidence"]
+    assert rows[0]["geocode_confidence"] == "tie"
+    assert rows[0]["latitude"] == ""
+
+
+def test_stream_jsonl_to_json_array_and_dry_run(tmp_path, monkeypatch):
+    path = tmp_path / "in.jsonl"
+    path.write_text('{"provider_name": "A", "address": "1 Main St", '
+                    '"city": "Austin", "state": "TX", "zip": "78701"}\n',
+                    encoding="utf-8")
+    monkeypatch.setattr(geocode_enrich, "_post_batch",
+                        lambda chunk, *rest: _census_match(chunk))
+
+    dry = geocode_enrich.enrich_file(
+        str(path), geocode_enrich.NullCache(), _args(stream=True, dry_run=True))
+    assert dry["to_query"] == 1
+    assert "geocode_source" not in path.read_text("utf-8")
+
+    out = tmp_path / "out.json"
+    geocode_enrich.enrich_file(
+        str(path), geocode_enrich.NullCache(),
+        _args(stream=True, output=str(out)))
+    assert json.loads(out.read_text("utf-8"))[0]["geocode_source"] == "census"
+
+
+def test_stream_rejects_json_array_input(tmp_path):
+    with pytest.raises(SystemExit):
+        geocode_enrich.main([str(tmp_path / "ohio.json"), "--stream", "--no-cache"])
+
+
 # --------------------------------------------------------------------------- #
 # WAF / non-CSV response handling
 # --------------------------------------------------------------------------- #
@@ -184,3 +294,165 @@ def test_post_batch_parses_valid_csv(monkeypatch):
         [["0", "1 Main St", "Madison", "WI", "53719"]],
         "Public_AR_Current", timeout=5, max_retries=1)
     assert rows and rows[0][0] == "0" and rows[0][2] == "Match"
+
+
+# --------------------------------------------------------------------------- #
+# Concurrent submission: rate cap, adaptive batch size, worker pool
+# --------------------------------------------------------------------------- #
+def test_rate_limiter_spaces_requests_across_callers():
+    now = [100.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+
+    limiter = geocode_enrich.RateLimiter(30, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+    assert slept == [2.0, 4.0]  # 30/min -> one start every 2s
+    geocode_enrich.RateLimiter(0, sleep=sleep).acquire()  # 0 disables the cap
+    assert slept == [2.0, 4.0]
+
+
+def test_batch_size_controller_shrinks_and_grows():
+    controller = geocode_enrich.BatchSizeController(1000, timeout=120)
+    controller.record_timeout(1000)
+    assert controller.size == 500
+    controller.record_success(500, elapsed=100)   # slow: hold
+    assert controller.size == 500
+    controller.record_success(200, elapsed=1)     # partial chunk: hold
+    assert controller.size == 500
+    controller.record_success(500, elapsed=1)     # full and fast: grow
+    assert controller.size == 750
+    for _ in range(10):
+        controller.record_timeout(controller.size)
+    assert controller.size == geocode_enrich.MIN_BATCH_SIZE
+    for _ in range(20):
+        controller.record_success(controller.size, elapsed=1)
+    assert controller.size == geocode_enrich.geocoding.MAX_BATCH_SIZE
+
+
+def test_post_batch_raises_timeouts_at_once_when_asked(monkeypatch):
+    calls = []
+
+    def timeout(*a, **k):
+        calls.append(1)
+        raise requests.Timeout("slow")
+
+    monkeypatch.setattr(geocode_enrich.requests, "post", timeout)
+    with pytest.raises(requests.Timeout):
+        geocode_enrich._post_batch(
+            [["0", "1 Main St", "Madison", "WI", "53719"]],
+            "Public_AR_Current", 5, 4, None, False)
+    assert len(calls) == 1
+
+
+def test_query_census_requeues_timed_out_chunk_smaller(monkeypatch):
+    sizes = []
+
+    def fake_post(chunk, *rest):
+        sizes.append(len(chunk))
+        if len(chunk) > 2:
+            raise requests.Timeout("too big")
+        return _census_match(chunk)
+
+    monkeypatch.setattr(geocode_enrich, "_post_batch", fake_post)
+    monkeypatch.setattr(geocode_enrich, "MIN_BATCH_SIZE", 1)
+    rows = [[str(i), "%d Main St" % i, "Austin", "TX", "78701"] for i in range(4)]
+    answered = []
+    geocode_enrich._query_census(
+        rows, _args(batch_size=4, workers=2, rpm=0),
+        lambda chunk, response: answered.extend(r[0] for r in response))
+    assert sizes[0] == 4 and sorted(sizes[1:]) == [2, 2]
+    assert sorted(answered) == ["0", "1", "2", "3"]
+
+
+def test_query_census_retries_timeouts_once_chunks_cannot_shrink(monkeypatch):
+    calls = []
+
+    def fake_post(chunk, benchmark, timeout, max_retries, limiter,
+                  retry_timeouts):
+        calls.append((len(chunk), retry_timeouts))
+        if len(chunk) > 1:
+            raise requests.Timeout("too big")
+        return _census_match(chunk)
+
+    monkeypatch.setattr(geocode_enrich, "_post_batch", fake_post)
+    monkeypatch.setattr(geocode_enrich, "MIN_BATCH_SIZE", 1)
+    rows = [[str(i), "%d Main St" % i, "Austin", "TX", "78701"] for i in range(2)]
+    geocode_enrich._query_census(
+        rows, _args(batch_size=2, workers=1, rpm=0), lambda chunk, response: None)
+    # The 2-row chunk is split rather than retried; the 1-row pieces, at the
+    # minimum, let _post_batch retry a timeout before giving up.
+    assert calls == [(2, False), (1, True), (1, True)]
+
+
+def test_enrich_records_with_workers_maps_every_chunk(monkeypatch):
+    monkeypatch.setattr(geocode_enrich, "_post_batch",
+                        lambda chunk, *rest: _census_match(chunk))
+    records = [{"address": "%d Main St" % i, "city": "Austin", "state": "TX",
+                "zip": "78701"} for i in range(7)]
+    counters = geocode_enrich.enrich_records(
+        records, geocode_enrich.NullCache(),
+        _args(batch_size=2, workers=3, rpm=0))
+    assert counters["geocoded_exact"] == 7
+    assert all(r["geocode_source"] == "census" for r in records)
+
+
+# --------------------------------------------------------------------------- #
+# GeocodeCache bulk API
+# --------------------------------------------------------------------------- #
+def _outcome_row(key, source="census"):
+    return (key, "39.7", "-89.6", source, "exact", "MATCHED")
+
+
+def test_cache_get_many_chunks_lookups(tmp_path, monkeypatch):
+    monkeypatch.setattr(geocode_enrich.GeocodeCache, "LOOKUP_CHUNK", 2)
+    cache = geocode_enrich.GeocodeCache(str(tmp_path / "c.sqlite"))
+    cache.put_many([_outcome_row("a"), _outcome_row("b"), _outcome_row("c")])
+    assert cache.stats["commits"] == 1 and cache.stats["writes"] == 3
+
+    found = cache.get_many(["a", "b", "c", "x", "a"])
+    assert set(found) == {"a", "b", "c"}
+    assert found["a"] == {"latitude": "39.7", "longitude": "-89.6",
+                          "source": "census", "confidence": "exact"}
+    assert cache.stats["queries"] == 2          # 4 unique keys, chunks of 2
+    assert (cache.stats["hits"], cache.stats["misses"]) == (3, 1)
+    assert cache.get("x") is None
+    cache.close()
+
+
+def test_cache_lru_answers_repeat_lookups_from_memory(tmp_path):
+    cache = geocode_enrich.GeocodeCache(str(tmp_path / "c.sqlite"), lru_size=2)
+    cache.put_many([_outcome_row("a"), _outcome_row("b"), _outcome_row("c")])
+    # Only the two most recent writes are held in memory.
+    cache.get_many(["b", "c"])
+    assert cache.stats["lru_hits"] == 2 and cache.stats["queries"] == 0
+    cache.get_many(["a"])
+    assert cache.stats["queries"] == 1
+    cache.close()
+
+
+def test_enrich_file_writes_one_transaction_per_chunk(tmp_path, monkeypatch,
+                                                      capsys):
+    monkeypatch.setattr(geocode_enrich, "_post_batch",
+                        lambda chunk, *rest: _census_match(chunk))
+    path = tmp_path / "in.csv"
+    path.write_text(
+        "provider_name,address,city,state,zip\n"
+        + "".join("P%d,%d Main St,Austin,TX,78701\n" % (i, i) for i in range(5)),
+        encoding="utf-8")
+    cache = geocode_enrich.GeocodeCache(str(tmp_path / "c.sqlite"))
+    # timeout=0: nothing counts as "fast", so the chunk size stays at 2.
+    out = str(tmp_path / "out.csv")
+    geocode_enrich.enrich_file(
+        str(path), cache, _args(batch_size=2, rpm=0, timeout=0, output=out))
+    assert cache.stats["writes"] == 5
+    assert cache.stats["commits"] == 3       # chunks of 2, 2, 1
+    assert "cache writes          : 5 in 3 transactions" in capsys.readouterr().out
+
+    # A warm re-run is all hits and never reaches Census.
+    monkeypatch.setattr(geocode_enrich, "_post_batch", None)
+    counters = geocode_enrich.enrich_file(str(path), cache, _args(output=out))
+    assert counters["cache_hit"] == 5
+    cache.close()
@@ -0,0 +1,54 @@
+"""Tests for scripts/merge_work_queue.py (SQLite queue, no crawl).
+
+Run with the project virtualenv: ``.venv/bin/pytest scripts/test_merge_work_queue.py``.
+"""
+import csv
+import json
+
+import merge_work_queue as mwq
+from provider_scrape.work_queue import SqliteWorkQueue
+
+
+def _queue(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    queue = SqliteWorkQueue(path)
+    queue.put([
+        ("shard:A [Homes]", "shard", {"county": "A"}, 1),
+        ("detail:1", "detail", {"url": "u1"}, 0),
+        ("detail:2", "detail", {"url": "u2"}, 0),
+    ])
+    return queue, f"sqlite:///{path}"
+
+
+def test_merge_writes_finished_items_in_every_format(tmp_path):
+    queue, url = _queue(tmp_path)
+    queue.complete("shard:A [Homes]", {"declared": 2, "found": 2})
+    queue.complete("detail:1", {"provider_name": "Ünë", "license_number": "1"})
+    queue.complete("detail:2", {"provider_name": "Two", "license_number": "2"})
+    queue.close()
+    out = tmp_path / "out"
+
+    assert mwq.main(["--queue", url, "-o", str(out / "maryland.json"),
+                     "-o", str(out / "maryland.csv")]) == 0
+
+    items = json.loads((out / "maryland.json").read_text(encoding="utf-8"))
+    assert [i["provider_name"] for i in items] == ["Ünë", "Two"]
+    with open(out / "maryland.csv", newline="", encoding="utf-8") as handle:
+        assert [r["license_number"] for r in csv.DictReader(handle)] == ["1", "2"]
+
+
+def test_merge_refuses_an_unfinished_queue_unless_partial(tmp_path):
+    queue, url = _queue(tmp_path)
+    queue.complete("detail:1", {"provider_name": "One"})
+    queue.close()
+    target = tmp_path / "maryland.json"
+
+    assert mwq.main(["--queue", url, "-o", str(target)]) == 1
+    assert not target.exists()
+    assert mwq.main(["--queue", url, "-o", str(target), "--allow-partial"]) == 0
+    assert len(json.loads(target.read_text())) == 1
+
+
+def test_merge_rejects_unknown_formats(tmp_path):
+    _, url = _queue(tmp_path)
+    assert mwq.main(["--queue", url, "-o", str(tmp_path / "out.xml")]) == 2
@@ -0,0 +1,208 @@
+"""Tests for scripts/run_spiders.py, the single-process multi-spider runner
+(no network, no real crawls).
+
+Run with the project virtualenv: ``.venv/bin/pytest scripts/test_run_spiders.py``.
+"""
+import inspect
+import logging
+
+import pytest
+from scrapy.settings import Settings
+from twisted.internet import defer, task
+
+import run_spiders
+
+
+class _Spider:
+    def __init__(self, name):
+        self.name = name
+
+
+def _record(name="scrapy.core.engine", msg="hello", spider=None):
+    record = logging.LogRecord(name, logging.INFO, __file__, 1, msg, None, None)
+    if spider is not None:
+        record.spider = spider
+    return record
+
+
+def _runner(tmp_path, names, outcomes, **kwargs):
+    """A runner whose crawls are replaced by scripted per-attempt outcomes.
+
+    ``outcomes[name]`` lists each attempt's result: ``True`` (logged a
+    Retryable Error), ``False`` (clean) or an exception instance (crash).
+    """
+    clock = task.Clock()
+    runner = run_spiders.MultiSpiderRunner(
+        Settings(), names, str(tmp_path), ["json"], clock=clock, **kwargs)
+    running = []
+
+    def fake_crawl_once(job):
+        running.append(job.name)
+        result = outcomes[job.name].pop(0)
+        if isinstance(result, Exception):
+            return defer.fail(result)
+        return defer.succeed(result)
+
+    runner._crawl_once = fake_crawl_once
+    return runner, clock, running
+
+
+def test_parse_formats():
+    assert run_spiders.parse_formats("json") == ["json"]
+    assert run_spiders.parse_formats("JSON, csv json") == ["json", "csv"]
+    with pytest.raises(ValueError):
+        run_spiders.parse_formats("xml")
+    with pytest.raises(ValueError):
+        run_spiders.parse_formats(" , ")
+
+
+def test_feeds_match_the_shell_layout(tmp_path):
+    feeds = run_spiders.feeds_for("ohio", str(tmp_path), ["json", "csv"])
+    assert feeds == {
+        str(tmp_path / "ohio.json"): {"format": "json", "overwrite": True},
+        str(tmp_path / "ohio.csv"): {"format": "csv", "overwrite": True},
+    }
+
+
+def test_log_handler_claims_only_its_spider(tmp_path):
+    handler = run_spiders.SpiderLogHandler(
+        str(tmp_path / "texas.log"), "texas", "provider_scrape.spiders.texas")
+    try:
+        assert handler.filter(_record(spider=_Spider("texas")))
+        assert not handler.filter(_record(spider=_Spider("ohio")))
+        assert handler.filter(_record(name="provider_scrape.spiders.texas"))
+        assert not handler.filter(_record(name="provider_scrape.spiders.ohio"))
+        assert not handler.filter(_record(name="run_spiders"))
+    finally:
+        handler.close()
+
+
+def test_log_handler_flags_retryable_error(tmp_path):
+    handler = run_spiders.SpiderLogHandler(
+        str(tmp_path / "texas.log"), "texas", "provider_scrape.spiders.texas")
+    try:
+        handler.handle(_record(spider=_Spider("texas"), msg="fine"))
+        assert handler.retryable is False
+        handler.handle(_record(spider=_Spider("texas"), msg="Retryable Error"))
+        assert handler.retryable is True
+    finally:
+        handler.close()
+    assert "Retryable Error" in (tmp_path / "texas.log").read_text()
+
+
+def test_retryable_spider_is_rerun_until_clean(tmp_path):
+    runner, clock, running = _runner(
+        tmp_path, ["texas"], {"texas": [True, True, False]}, max_retries=6)
+    d = runner.run()
+    clock.advance(run_spiders.RETRY_DELAY)
+    clock.advance(run_spiders.RETRY_DELAY)
+    assert d.called
+    job = runner.jobs[0]
+    assert (job.status, job.attempts) == ("ok", 3)
+    assert runner.failed == []
+
+
+def test_retries_are_capped(tmp_path):
+    runner, clock, _ = _runner(
+        tmp_path, ["texas"], {"texas": [True, True]}, max_retries=2)
+    d = runner.run()
+    clock.advance(run_spiders.RETRY_DELAY)
+    # No pointless delay after the final attempt.
+    assert d.called
+    assert runner.jobs[0].status == "failed"
+    assert runner.failed == ["texas"]
+
+
+def test_crash_fails_the_spider_without_retry(tmp_path):
+    runner, _, _ = _runner(
+        tmp_path, ["ohio", "utah"], {"ohio": [RuntimeError("boom")],
+                                     "utah": [False]})
+    runner.run()
+    assert [j.status for j in runner.jobs] == ["failed", "ok"]
+    assert runner.jobs[0].attempts == 1
+
+
+def test_concurrency_budget_holds_later_spiders_back(tmp_path):
+    runner, clock, running = _runner(
+        tmp_path, ["ohio", "utah", "iowa"],
+        {"ohio": [True, False], "utah": [False], "iowa": [False]},
+        concurrency=1)
+    runner.run()
+    # ohio holds the only slot through its retry delay.
+    assert running == ["ohio"]
+    clock.advance(run_spiders.RETRY_DELAY)
+    assert running == ["ohio", "ohio", "utah", "iowa"]
+
+
+def test_browser_slots_bound_browser_spiders(tmp_path):
+    runner, clock, running = _runner(
+        tmp_path, ["texas", "florida", "ohio"],
+        {"texas": [True, False], "florida": [False], "ohio": [False]},
+        concurrency=3, browser_slots=1)
+    runner.run()
+    # florida waits for texas's browser slot; ohio (no browser) doesn't.
+    assert running == ["texas", "ohio"]
+    clock.advance(run_spiders.RETRY_DELAY)
+    assert running == ["texas", "ohio", "texas", "florida"]
+
+
+def test_browser_spider_waits_without_holding_a_global_slot(tmp_path):
+    runner, clock, running = _runner(
+        tmp_path, ["texas", "florida", "ohio"],
+        {"texas": [True, False], "florida": [False], "ohio": [False]},
+        concurrency=2, browser_slots=1)
+    runner.run()
+    # florida queues for the browser slot; ohio still gets the second
+    # global slot instead of waiting behind it.
+    assert running == ["texas", "ohio"]
+    clock.advance(run_spiders.RETRY_DELAY)
+    assert running == ["texas", "ohio", "texas", "florida"]
+
+
+def test_browser_spiders_match_the_spider_sources():
+    """BROWSER_SPIDERS must list exactly the spiders that issue Playwright
+    requests, or the browser-slot budget silently stops meaning anything."""
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    loader = SpiderLoader.from_settings(get_project_settings())
+    uses_browser = set()
+    for name in loader.list():
+        source = inspect.getsource(inspect.getmodule(loader.load(name)))
+        if '"playwright": True' in source or "playwright=True" in source:
+            uses_browser.add(name)
+    assert uses_browser == set(run_spiders.BROWSER_SPIDERS)
+
+
+def test_checkpoint_spiders_resume_from_the_output_dir(tmp_path):
+    from provider_scrape.manifest import IncrementalManifestMixin
+
+    class Maryland(IncrementalManifestMixin):
+        name = "maryland"
+
+    class Ohio:
+        name = "ohio"
+
+    runner = run_spiders.MultiSpiderRunner(
+        Settings(), [], str(tmp_path), ["json"], incremental=True,
+        clock=task.Clock())
+    assert runner._spider_kwargs(Maryland) == {
+        "incremental": "1",
+        "checkpoint": str(tmp_path / "checkpoints" / "maryland.sqlite"),
+    }
+    assert runner._spider_kwargs(Ohio) == {}
+
+
+def test_incremental_runs_plan_area_searches(tmp_path):
+    from provider_scrape.partition import PartitionPlannerMixin
+
+    class Utah(PartitionPlannerMixin):
+        name = "utah"
+
+    incremental = run_spiders.MultiSpiderRunner(
+        Settings(), [], str(tmp_path), ["json"], incremental=True,
+        clock=task.Clock())
+    assert incremental._spider_kwargs(Utah) == {"partition": "1"}
+    full = run_spiders.MultiSpiderRunner(
+        Settings(), [], str(tmp_path), ["json"], clock=task.Clock())
+    assert full._spider_kwargs(Utah) == {}
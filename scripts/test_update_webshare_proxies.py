@@ -0,0 +1,161 @@
+"""Tests for scripts/update_webshare_proxies.py's ``--probe`` mode, against
+throwaway local proxies (no network).
+
+Run with the project virtualenv:
+``.venv/bin/pytest scripts/test_update_webshare_proxies.py``.
+"""
+import base64
+import json
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+import update_webshare_proxies as uwp
+from provider_scrape.proxy_pool import health_report_path, load_pool
+
+TARGET = "http://www.checkccmd.org/"
+
+
+class _FakeProxy(socketserver.ThreadingTCPServer):
+    """Answers every request head with ``status`` after ``delay`` seconds."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, status=200, delay=0.0):
+        self.status, self.delay, self.heads = status, delay, []
+        super().__init__(("127.0.0.1", 0), _FakeProxyHandler)
+        threading.Thread(target=self.serve_forever, args=(0.05,),
+                         daemon=True).start()
+
+    @property
+    def endpoint(self):
+        return "127.0.0.1:%d" % self.server_address[1]
+
+
+class _FakeProxyHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        head = []
+        while True:
+            line = self.rfile.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            head.append(line.decode("latin-1").strip())
+        self.server.heads.append(head)
+        time.sleep(self.server.delay)
+        self.wfile.write(b"HTTP/1.1 %d X\r\nContent-Length: 0\r\n\r\n"
+                         % self.server.status)
+
+
+def _dead_endpoint():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return "127.0.0.1:%d" % port
+
+
+@pytest.fixture
+def proxies():
+    servers = {"fast": _FakeProxy(), "slow": _FakeProxy(delay=0.15),
+               "blocked": _FakeProxy(status=403)}
+    yield servers
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
+
+
+def test_probe_endpoints_measures_and_classifies(proxies):
+    dead = _dead_endpoint()
+    endpoints = [proxies["slow"].endpoint, dead, proxies["blocked"].endpoint,
+                 proxies["fast"].endpoint]
+    results = uwp.probe_endpoints(endpoints, TARGET, "user", "pass",
+                                  timeout=5, concurrency=2)
+
+    assert [r["endpoint"] for r in results] == endpoints
+    slow, gone, blocked, fast = results
+    assert slow["healthy"] and fast["healthy"]
+    assert slow["first_byte_ms"] > fast["first_byte_ms"]
+    assert fast["connect_ms"] is not None
+    assert not gone["healthy"] and gone["error"]
+    assert not blocked["healthy"] and blocked["status"] == 403
+    assert uwp.rank_healthy(results) == [fast["endpoint"], slow["endpoint"]]
+
+    # An http target goes out in absolute form with the proxy credentials.
+    head = proxies["fast"].heads[0]
+    assert head[0] == "HEAD %s HTTP/1.1" % TARGET
+    token = base64.b64encode(b"user:pass").decode()
+    assert "Proxy-Authorization: Basic %s" % token in head
+
+
+def test_probe_timeout_is_reported_not_raised():
+    server = _FakeProxy(delay=1.0)
+    try:
+        (result,) = uwp.probe_endpoints([server.endpoint], TARGET, timeout=0.2)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not result["healthy"]
+    assert "timed out" in result["error"]
+
+
+def test_https_target_refused_tunnel_is_unhealthy():
+    server = _FakeProxy(status=407)
+    try:
+        (result,) = uwp.probe_endpoints(
+            [server.endpoint], "https://www.checkccmd.org/", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert server.heads[0][0] == "CONNECT www.checkccmd.org:443 HTTP/1.1"
+    assert not result["healthy"] and result["status"] == 407
+
+
+def _env(tmp_path, endpoints):
+    path = tmp_path / "webshare.env"
+    path.write_text("# pool\nwebshare_proxy_username=u\n"
+                    "webshare_proxy_password=p\n"
+                    "webshare_proxy_endpoints=%s\n" % ",".join(endpoints))
+    return str(path)
+
+
+def test_main_probe_keeps_healthy_endpoints_ranked(tmp_path, proxies):
+    dead = _dead_endpoint()
+    env = _env(tmp_path, [dead, proxies["slow"].endpoint,
+                          proxies["blocked"].endpoint, proxies["fast"].endpoint])
+    assert uwp.main(["--env-file", env, "--probe", "--probe-target", TARGET,
+                     "--probe-timeout", "5"]) == 0
+
+    text = open(env).read()
+    assert "# pool\n" in text
+    assert "webshare_proxy_endpoints=%s,%s\n" % (
+        proxies["fast"].endpoint, proxies["slow"].endpoint) in text
+
+    report = json.load(open(health_report_path(env)))
+    assert report["target"] == TARGET
+    assert len(report["proxies"]) == 4
+
+    # The pool seeds its health weights from the report's latencies.
+    pool = load_pool(env_path=env, id_prefix="webshare")
+    assert set(pool.probe_latency) == {"webshare-0", "webshare-1"}
+    health = pool.enable_health()
+    fast_latency = health.snapshot("webshare-0")["latency"]
+    assert fast_latency < health.snapshot("webshare-1")["latency"]
+    assert health.weight("webshare-0") > health.weight("webshare-1")
+
+
+def test_main_probe_leaves_env_alone_when_nothing_passes(tmp_path, proxies):
+    env = _env(tmp_path, [_dead_endpoint(), proxies["blocked"].endpoint])
+    before = open(env).read()
+    assert uwp.main(["--env-file", env, "--probe", "--probe-target", TARGET,
+                     "--probe-timeout", "5"]) == 1
+    assert open(env).read() == before
+
+
+def test_main_without_probe_or_download_url_is_a_noop(tmp_path):
+    env = _env(tmp_path, ["1.1.1.1:80"])
+    assert uwp.main(["--env-file", env]) == 0
+    assert open(env).read().endswith("webshare_proxy_endpoints=1.1.1.1:80\n")
@@ -19,27 +19,52 @@ It is safe to call unconditionally:
   pool. Wrap the call in ``|| true`` at a build/run site that must not abort on
   a Webshare hiccup.
 
+``--probe`` additionally checks every endpoint before it is written: each is
+tried concurrently (``--probe-concurrency`` at a time) by tunnelling a ``HEAD``
+for ``--probe-target`` through it, timing the TCP connect and the target's
+first response byte. Only endpoints that answer with a non-error status are
+kept, fastest first, and a JSON report (``webshare_health.json`` next to the
+env file) records every result; ``load_pool`` reads its latencies to seed the
+pool's health weights. If no endpoint passes, nothing is written. Without a
+``webshare_download_url``, ``--probe`` checks the endpoints already listed.
+
 Usage::
 
     python scripts/update_webshare_proxies.py                # rewrite webshare.env
     python scripts/update_webshare_proxies.py --dry-run      # show changes only
     python scripts/update_webshare_proxies.py --env-file X   # a different file
+    python scripts/update_webshare_proxies.py --probe        # keep working ones
 """
 import argparse
+import asyncio
+import base64
+import json
 import os
+import ssl
 import sys
+import time
 import urllib.error
 import urllib.request
+from datetime import datetime, timezone
+from urllib.parse import unquote, urlsplit
 
 # Reuse the exact env-file parser the pool itself uses, so the two never drift.
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from provider_scrape.proxy_pool import load_env_file  # noqa: E402
+from provider_scrape.proxy_pool import (  # noqa: E402
+    health_report_path,
+    load_env_file,
+)
 
 DEFAULT_ENV_FILE = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "webshare.env"
 )
 ENDPOINTS_KEY = "webshare_proxy_endpoints"
 DOWNLOAD_URL_KEY = "webshare_download_url"
+# The host the Maryland spider pools; probing it (not a generic echo service)
+# also catches an IP the site itself is currently blocking.
+DEFAULT_PROBE_TARGET = "https://www.checkccmd.org/"
+DEFAULT_PROBE_CONCURRENCY = 16
+DEFAULT_PROBE_TIMEOUT = 20.0
 
 
 def fetch_endpoints(url, timeout):
@@ -90,6 +115,154 @@ def rewrite_endpoints_line(text, endpoints):
     return out
 
 
+async def _read_status(reader):
+    """Read an HTTP response head; return its status code (or raise)."""
+    status_line = await reader.readline()
+    parts = status_line.decode("latin-1").split()
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ConnectionError(f"bad proxy response {status_line[:60]!r}")
+    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+        pass
+    return int(parts[1])
+
+
+async def probe_endpoint(endpoint, target, username=None, password=None,
+                         timeout=DEFAULT_PROBE_TIMEOUT):
+    """Probe one ``host:port`` proxy against ``target``; never raises.
+
+    Returns ``{endpoint, healthy, connect_ms, first_byte_ms, status, error}``.
+    ``connect_ms`` is the TCP connect to the proxy; ``first_byte_ms`` runs from
+    sending the request (after the CONNECT tunnel and TLS handshake, for an
+    https target) to the target's status line. Healthy means a 2xx/3xx.
+    """
+    result = {"endpoint": endpoint, "healthy": False, "connect_ms": None,
+              "first_byte_ms": None, "status": None, "error": None}
+    target_parts = urlsplit(target)
+    host = target_parts.hostname
+    https = target_parts.scheme == "https"
+    port = target_parts.port or (443 if https else 80)
+    path = target_parts.path or "/"
+    auth = ""
+    if username and password:
+        token = base64.b64encode(f"{username}:{password}".encode()).decode()
+        auth = f"Proxy-Authorization: Basic {token}\r\n"
+    if "://" in endpoint:
+        proxy = urlsplit(endpoint)
+        proxy_host, proxy_port = proxy.hostname, proxy.port or 80
+        if proxy.username and proxy.password:
+            token = base64.b64encode(
+                f"{unquote(proxy.username)}:{unquote(proxy.password)}".encode()
+            ).decode()
+            auth = f"Proxy-Authorization: Basic {token}\r\n"
+    else:
+        proxy_host, _, proxy_port = endpoint.rpartition(":")
+    writer = None
+
+    async def run():
+        nonlocal writer
+        start = time.perf_counter()
+        reader, writer = await asyncio.open_connection(proxy_host, int(proxy_port))
+        result["connect_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        if https:
+            writer.write(f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}"
+                         f"\r\n{auth}\r\n".encode())
+            await writer.drain()
+            status = await _read_status(reader)
+            if status != 200:
+                result["status"] = status
+                raise ConnectionError(f"CONNECT refused ({status})")
+            await writer.start_tls(ssl.create_default_context(),
+                                   server_hostname=host)
+            request_target, proxy_auth = path, ""
+        else:
+            request_target, proxy_auth = target, auth
+        sent = time.perf_counter()
+        writer.write(f"HEAD {request_target} HTTP/1.1\r\nHost: {host}\r\n"
+                     f"User-Agent: webshare-probe\r\n{proxy_auth}"
+                     f"Connection: close\r\n\r\n".encode())
+        await writer.drain()
+        result["status"] = await _read_status(reader)
+        result["first_byte_ms"] = round((time.perf_counter() - sent) * 1000, 1)
+        result["healthy"] = 200 <= result["status"] < 400
+
+    try:
+        await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        result["error"] = f"timed out after {timeout:g}s"
+    except (OSError, ConnectionError, ValueError, ssl.SSLError) as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        if writer is not None:
+            writer.close()
+    return result
+
+
+async def _probe_all(endpoints, target, username, password, timeout,
+                     concurrency):
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(endpoint):
+        async with slots:
+            return await probe_endpoint(endpoint, target, username, password,
+                                        timeout)
+
+    return await asyncio.gather(*(bounded(e) for e in endpoints))
+
+
+def probe_endpoints(endpoints, target=DEFAULT_PROBE_TARGET, username=None,
+                    password=None, timeout=DEFAULT_PROBE_TIMEOUT,
+                    concurrency=DEFAULT_PROBE_CONCURRENCY):
+    """Probe all endpoints concurrently; results in ``endpoints`` order."""
+    return asyncio.run(_probe_all(endpoints, target, username, password,
+                                  timeout, concurrency))
+
+
+def rank_healthy(results):
+    """Healthy endpoints, fastest first (first byte, then connect)."""
+    healthy = [r for r in results if r["healthy"]]
+    healthy.sort(key=lambda r: (r["first_byte_ms"], r["connect_ms"]))
+    return [r["endpoint"] for r in healthy]
+
+
+def write_report(path, target, results):
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "target": target,
+        "proxies": list(results),
+    }
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+
+
+def _probe_and_rank(args, env, endpoints):
+    """Probe ``endpoints``, write the report, and return the healthy ones
+    ranked -- or ``[]`` (after an error message) when none passed."""
+    print(f"Probing {len(endpoints)} endpoints against {args.probe_target} "
+          f"({args.probe_concurrency} at a time) ...")
+    results = probe_endpoints(
+        endpoints, args.probe_target,
+        env.get("webshare_proxy_username"), env.get("webshare_proxy_password"),
+        timeout=args.probe_timeout, concurrency=args.probe_concurrency,
+    )
+    for r in results:
+        if r["healthy"]:
+            print(f"  ok   {r['endpoint']}  connect {r['connect_ms']:.0f}ms, "
+                  f"first byte {r['first_byte_ms']:.0f}ms")
+        else:
+            print(f"  FAIL {r['endpoint']}  "
+                  f"{r['error'] or 'status %s' % r['status']}")
+    report = args.report or health_report_path(args.env_file)
+    if not args.dry_run:
+        write_report(report, args.probe_target, results)
+        print(f"Wrote probe report to {report}.")
+    ranked = rank_healthy(results)
+    if not ranked:
+        print("ERROR: no endpoint passed the probe; existing endpoints left "
+              "unchanged.", file=sys.stderr)
+    return ranked
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -104,6 +277,26 @@ def main(argv=None):
         "--dry-run", action="store_true",
         help="fetch and report changes but do not write the file",
     )
+    parser.add_argument(
+        "--probe", action="store_true",
+        help="probe every endpoint and keep only working ones, fastest first",
+    )
+    parser.add_argument(
+        "--probe-target", default=DEFAULT_PROBE_TARGET,
+        help=f"URL each proxy is probed against (default: {DEFAULT_PROBE_TARGET})",
+    )
+    parser.add_argument(
+        "--probe-concurrency", type=int, default=DEFAULT_PROBE_CONCURRENCY,
+        help=f"proxies probed at once (default: {DEFAULT_PROBE_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--probe-timeout", type=float, default=DEFAULT_PROBE_TIMEOUT,
+        help=f"per-proxy probe timeout in seconds (default: {DEFAULT_PROBE_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--report", default=None,
+        help="probe report path (default: <env-file>_health.json)",
+    )
     args = parser.parse_args(argv)
 
     # Skip cleanly when there is nothing to do — building/running without a pool
@@ -113,26 +306,35 @@ def main(argv=None):
         return 0
     env = load_env_file(args.env_file)
     url = env.get(DOWNLOAD_URL_KEY)
-    if not url:
+    old = [e for e in (env.get(ENDPOINTS_KEY) or "").split(",") if e]
+    if url:
+        print(f"Fetching proxy list for {args.env_file} ...")
+        try:
+            endpoints = fetch_endpoints(url, args.timeout)
+        except (urllib.error.URLError, OSError) as exc:
+            print(f"ERROR: could not download proxy list: {exc}", file=sys.stderr)
+            print("Existing endpoints left unchanged.", file=sys.stderr)
+            return 1
+
+        if not endpoints:
+            print("ERROR: proxy list was empty; existing endpoints left unchanged.", file=sys.stderr)
+            return 1
+    elif args.probe and old:
+        print(f"No {DOWNLOAD_URL_KEY} in {args.env_file}; probing the "
+              f"{len(old)} listed endpoints.")
+        endpoints = list(old)
+    else:
         print(f"No {DOWNLOAD_URL_KEY} in {args.env_file}; nothing to update.")
         return 0
 
-    print(f"Fetching proxy list for {args.env_file} ...")
-    try:
-        endpoints = fetch_endpoints(url, args.timeout)
-    except (urllib.error.URLError, OSError) as exc:
-        print(f"ERROR: could not download proxy list: {exc}", file=sys.stderr)
-        print("Existing endpoints left unchanged.", file=sys.stderr)
-        return 1
-
-    if not endpoints:
-        print("ERROR: proxy list was empty; existing endpoints left unchanged.", file=sys.stderr)
-        return 1
+    if args.probe:
+        endpoints = _probe_and_rank(args, env, endpoints)
+        if not endpoints:
+            return 1
 
-    old = [e for e in (env.get(ENDPOINTS_KEY) or "").split(",") if e]
     added = [e for e in endpoints if e not in set(old)]
     removed = [e for e in old if e not in set(endpoints)]
-    print(f"Fetched {len(endpoints)} endpoints "
+    print(f"{'Kept' if args.probe else 'Fetched'} {len(endpoints)} endpoints "
           f"({len(added)} new, {len(removed)} gone, {len(old)} previously listed).")
     for e in added:
         print(f"  + {e}")